@@ -25,6 +25,7 @@ MindBridge CLI
   init                             ローカル初期設定（.env 生成）
   clean [--with-uv-cache]          Pythonキャッシュ削除
   run                              ローカル起動（uv 使用）
+  rebuild-indexes [--vault PATH]   日次集計・キーワードインデックスを再構築
 
 
 例:
@@ -50,6 +51,9 @@ case "$cmd" in
   run)
     cmd_run "$@"
     ;;
+  rebuild-indexes)
+    cmd_rebuild_indexes "$@"
+    ;;
   *)
     warn "未知のコマンド: $cmd"
     usage
@@ -81,3 +81,9 @@ cmd_run() {
   fi
   exec uv run python -m src.main
 }
+
+cmd_rebuild_indexes() {
+  require_cmd uv
+  # --vault 省略時は .env の OBSIDIAN_VAULT_PATH を使用
+  uv run python -m src.obsidian.rebuild_indexes "$@"
+}
@@ -24,6 +24,7 @@ from src.ai.models import (
     TagResult,
 )
 from src.config import get_settings
+from src.monitoring.metrics import record_external_call
 from src.utils.mixins import LoggerMixin
 
 
@@ -309,10 +310,20 @@ class GeminiClient(LoggerMixin):
                 )
 
                 api_call_started = True
-                response = await self._client.aio.models.generate_content(
-                    model=self.model_config.model_name,
-                    contents=prompt,
-                    config=generation_config,
+                call_started_at = time.perf_counter()
+                try:
+                    response = await self._client.aio.models.generate_content(
+                        model=self.model_config.model_name,
+                        contents=prompt,
+                        config=generation_config,
+                    )
+                except Exception:
+                    record_external_call(
+                        "gemini", False, time.perf_counter() - call_started_at
+                    )
+                    raise
+                record_external_call(
+                    "gemini", True, time.perf_counter() - call_started_at
                 )
 
                 self._register_request()
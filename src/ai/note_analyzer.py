@@ -254,6 +254,10 @@ class AdvancedNoteAnalyzer(LoggerMixin):
                 "attempted_at": datetime.now().isoformat(),
             }
 
+    async def close(self) -> None:
+        """URL 取得用の共有セッションを閉じる"""
+        await self.url_extractor.close()
+
     async def _process_urls_in_content(self, content: str) -> dict[str, Any]:
         """コンテンツ内の URL を処理"""
         try:
@@ -265,13 +269,17 @@ class AdvancedNoteAnalyzer(LoggerMixin):
             if not url_results.get("processed_urls"):
                 return url_results
 
-            # 各 URL の内容を要約
+            # 各 URL の内容を要約（本文が変わっていなければキャッシュを再利用）
             summaries = []
             for url_data in url_results["processed_urls"]:
                 try:
-                    summary = await self.ai_processor.summarize_url_content(
-                        url_data["url"], url_data["content"]
-                    )
+                    summary = self.url_extractor.get_cached_summary(url_data["url"])
+                    if summary is None:
+                        summary = await self.ai_processor.summarize_url_content(
+                            url_data["url"], url_data["content"]
+                        )
+                        if summary:
+                            self.url_extractor.store_summary(url_data["url"], summary)
 
                     if summary:
                         summaries.append(
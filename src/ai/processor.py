@@ -19,6 +19,7 @@ from src.ai.models import (
     ProcessingSettings,
     ProcessingStats,
 )
+from src.monitoring.metrics import record_cache_lookup, timed
 from src.utils.lru_cache import MemoryOptimizedCache
 from src.utils.memory_manager import get_memory_manager
 from src.utils.mixins import LoggerMixin
@@ -133,6 +134,7 @@ class AIProcessor(LoggerMixin):
     def _get_from_cache(self, content_hash: str) -> AIProcessingResult | None:
         """キャッシュから結果を取得（ LRU 最適化）"""
         cache_entry = self._cache.get(content_hash)
+        record_cache_lookup("ai_processing", cache_entry is not None)
 
         if cache_entry is None:
             return None
@@ -273,6 +275,7 @@ class AIProcessor(LoggerMixin):
 
         return result
 
+    @timed("ai.process_text")
     async def process_text(
         self, text: str, message_id: int, force_reprocess: bool = False
     ) -> AIProcessingResult:
@@ -0,0 +1,251 @@
+"""
+URL content cache for web enrichment
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.utils.mixins import LoggerMixin
+
+CACHE_DB_NAME = "url_cache.sqlite3"
+# 最後の取得からこの時間を過ぎたエントリは削除する
+DEFAULT_MAX_AGE_HOURS = 24 * 30
+# 古いエントリの削除を行う間隔
+PURGE_INTERVAL_SECONDS = 24 * 3600
+
+# 正規化時に取り除くトラッキング用クエリパラメータ
+TRACKING_PARAMS = frozenset(
+    {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref_src"}
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_cache (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    summary TEXT,
+    summary_hash TEXT
+)
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    キャッシュキー用に URL を正規化
+
+    スキームとホストの小文字化、既定ポート・フラグメント・トラッキング用
+    パラメータの除去、クエリパラメータの並べ替えを行う。
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def content_hash(content: str) -> str:
+    """抽出済み本文のハッシュ（要約の再利用判定用）"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedURL:
+    """キャッシュされた URL 1 件分のデータ"""
+
+    url: str
+    fetched_at: float
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    result: dict[str, Any]
+    summary: str | None = None
+
+    @property
+    def age_hours(self) -> float:
+        return (time.time() - self.fetched_at) / 3600
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """条件付きリクエスト用のヘッダー"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class URLContentCache(LoggerMixin):
+    """URL 内容のキャッシュ
+
+    正規化した URL ごとに 1 行の SQLite テーブルへ、抽出結果（JSON）と
+    ETag / Last-Modified、取得時刻、AI 要約を保持する。要約は抽出本文の
+    ハッシュと一緒に保存し、本文が変わった場合は破棄する。
+    ``max_age_hours`` を過ぎたエントリは起動時と、以降は 1 日 1 回
+    （保存時）に削除する。
+    """
+
+    def __init__(
+        self, cache_dir: Path, max_age_hours: float = DEFAULT_MAX_AGE_HOURS
+    ) -> None:
+        """
+        初期化処理
+
+        Args:
+            cache_dir: キャッシュディレクトリ
+            max_age_hours: エントリの保持期間（時間）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_age_hours = max_age_hours
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / CACHE_DB_NAME
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+        if hasattr(os, "chmod"):
+            try:
+                os.chmod(self.db_path, 0o600)
+            except OSError:
+                self.logger.warning(
+                    "Failed to tighten URL cache permissions",
+                    cache_file=str(self.db_path),
+                )
+
+        self._last_purge = 0.0
+        self._maybe_purge()
+
+    def close(self) -> None:
+        """DB 接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, url: str) -> CachedURL | None:
+        """キャッシュを取得（正規化済み URL で検索）"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT url, fetched_at, etag, last_modified, content_hash, "
+                    "payload, summary, summary_hash FROM url_cache WHERE url = ?",
+                    (normalize_url(url),),
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning("Failed to read URL cache", url=url, error=str(e))
+            return None
+
+        if row is None:
+            return None
+
+        key, fetched_at, etag, last_modified, digest, payload, summary, s_hash = row
+        return CachedURL(
+            url=key,
+            fetched_at=fetched_at,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=digest,
+            result=json.loads(payload),
+            summary=summary if s_hash == digest else None,
+        )
+
+    def store(
+        self,
+        url: str,
+        result: dict[str, Any],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """抽出結果を保存（本文が変わらなければ要約は維持）"""
+        digest = content_hash(result.get("content", ""))
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO url_cache "
+                    "(url, fetched_at, etag, last_modified, content_hash, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET "
+                    "fetched_at = excluded.fetched_at, etag = excluded.etag, "
+                    "last_modified = excluded.last_modified, "
+                    "content_hash = excluded.content_hash, payload = excluded.payload",
+                    (
+                        normalize_url(url),
+                        time.time(),
+                        etag,
+                        last_modified,
+                        digest,
+                        json.dumps(result, ensure_ascii=False),
+                    ),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning("Failed to write URL cache", url=url, error=str(e))
+        self._maybe_purge()
+
+    def touch(self, url: str) -> None:
+        """再検証（ 304 ）後に取得時刻を更新"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE url_cache SET fetched_at = ? WHERE url = ?",
+                    (time.time(), normalize_url(url)),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning("Failed to touch URL cache", url=url, error=str(e))
+
+    def store_summary(self, url: str, summary: str) -> None:
+        """現在の本文に対する AI 要約を保存"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE url_cache SET summary = ?, summary_hash = content_hash "
+                    "WHERE url = ?",
+                    (summary, normalize_url(url)),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning("Failed to store URL summary", url=url, error=str(e))
+
+    def purge_older_than(self, max_age_hours: float) -> int:
+        """古いエントリを削除"""
+        cutoff = time.time() - max_age_hours * 3600
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM url_cache WHERE fetched_at < ?", (cutoff,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _maybe_purge(self) -> None:
+        """前回の削除から PURGE_INTERVAL_SECONDS 経過していれば古いエントリを削除"""
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        try:
+            purged = self.purge_older_than(self.max_age_hours)
+        except sqlite3.Error as e:
+            self.logger.warning("Failed to purge URL cache", error=str(e))
+            return
+        if purged:
+            self.logger.info("Purged stale URL cache entries", entries=purged)
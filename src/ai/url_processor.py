@@ -3,22 +3,51 @@ URL content processor for web scraping and summarization
 """
 
 import asyncio
+import importlib.util
 import re
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
 import aiohttp
 from bs4 import BeautifulSoup
 
+from src.ai.url_cache import (
+    DEFAULT_MAX_AGE_HOURS,
+    CachedURL,
+    URLContentCache,
+    normalize_url,
+)
+from src.monitoring.metrics import record_cache_lookup
 from src.utils.mixins import LoggerMixin
 
+# lxml が利用可能ならそちらでパースする（ html.parser より高速）
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+READ_CHUNK_SIZE = 16 * 1024
+
 
 class URLContentExtractor(LoggerMixin):
     """URL内容抽出システム"""
 
-    def __init__(self) -> None:
-        """初期化"""
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        cache_fresh_hours: float = 24.0,
+        per_host_limit: int = 2,
+        use_cache: bool = True,
+        cache_max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            cache_dir: URL キャッシュのディレクトリ
+            cache_fresh_hours: 再検証せずにキャッシュを返す期間（時間）
+            per_host_limit: ホストごとの同時取得数
+            use_cache: キャッシュを使用するか
+            cache_max_age_hours: キャッシュエントリの保持期間（時間）
+        """
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -32,6 +61,25 @@ class URLContentExtractor(LoggerMixin):
         # タイムアウト設定
         self.timeout = aiohttp.ClientTimeout(total=30, connect=10)
 
+        # 共有セッションとホストごとの同時接続制限
+        self.per_host_limit = per_host_limit
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+        # キャッシュ設定
+        self.cache_fresh_hours = cache_fresh_hours
+        self.cache: URLContentCache | None = None
+        if use_cache:
+            if cache_dir is None:
+                cache_dir = Path.cwd() / ".cache" / "url"
+            try:
+                self.cache = URLContentCache(cache_dir, cache_max_age_hours)
+            except Exception as e:
+                self.logger.warning(
+                    "URL cache unavailable", cache_dir=str(cache_dir), error=str(e)
+                )
+
         self.logger.info("URL content extractor initialized")
 
     def extract_urls_from_text(self, text: str) -> list[str]:
@@ -62,8 +110,11 @@ class URLContentExtractor(LoggerMixin):
             ):
                 valid_urls.append(url)
 
-        # 重複を削除して返す
-        return list(set(valid_urls))
+        # 重複（正規化後に同じ URL を含む）を削除して返す
+        unique_urls: dict[str, str] = {}
+        for url in valid_urls:
+            unique_urls.setdefault(normalize_url(url), url)
+        return list(unique_urls.values())
 
     async def fetch_url_content(
         self, url: str, max_content_length: int = 50000
@@ -71,6 +122,9 @@ class URLContentExtractor(LoggerMixin):
         """
         URLの内容を取得
 
+        キャッシュが新しければそのまま返し、古ければ ETag / Last-Modified で
+        再検証する（ 304 の場合はキャッシュを返す）。
+
         Args:
             url: 対象URL
             max_content_length: 最大コンテンツ長
@@ -78,15 +132,29 @@ class URLContentExtractor(LoggerMixin):
         Returns:
             URL内容データ（失敗時はNone）
         """
+        cached = self.cache.get(url) if self.cache else None
+        if cached is not None and cached.age_hours < self.cache_fresh_hours:
+            record_cache_lookup("url_content", True)
+            self.logger.debug("URL cache hit", url=url)
+            return self._from_cache(cached)
+        if self.cache:
+            record_cache_lookup("url_content", False)
+
         try:
             self.logger.debug("Fetching URL content", url=url)
 
+            session = self._get_session()
+            headers = cached.validators if cached is not None else {}
             async with (
-                aiohttp.ClientSession(
-                    timeout=self.timeout, headers=self.headers
-                ) as session,
-                session.get(url) as response,
+                self._host_semaphore(url),
+                session.get(url, headers=headers) as response,
             ):
+                if response.status == 304 and cached is not None:
+                    self.logger.debug("URL not modified", url=url)
+                    if self.cache:
+                        self.cache.touch(url)
+                    return self._from_cache(cached)
+
                 if response.status != 200:
                     self.logger.warning(
                         "HTTP error when fetching URL",
@@ -108,45 +176,39 @@ class URLContentExtractor(LoggerMixin):
                     )
                     return None
 
-                # 内容を読み込み（サイズ制限あり）
-                raw_content = await response.read()
-                if len(raw_content) > max_content_length:
-                    self.logger.warning(
-                        "Content too large, truncating",
-                        url=url,
-                        size=len(raw_content),
-                    )
-                    raw_content = raw_content[:max_content_length]
-
-                # HTMLをパース
-                soup = BeautifulSoup(raw_content, "html.parser")
-
-                # メタデータを抽出
-                title = self._extract_title(soup)
-                description = self._extract_description(soup)
-
-                # メインコンテンツを抽出
-                main_content = self._extract_main_content(soup)
-
-                # 結果を構築
-                result = {
-                    "url": url,
-                    "title": title,
-                    "description": description,
-                    "content": main_content,
-                    "extracted_at": datetime.now().isoformat(),
-                    "content_length": len(main_content),
-                    "status_code": response.status,
-                }
-
-                self.logger.debug(
-                    "URL content fetched successfully",
-                    url=url,
-                    title=title[:50] if title else "No title",
-                    content_length=len(main_content),
-                )
+                # 上限に達した時点で読み込みを打ち切る
+                raw_content = await self._read_limited(response, max_content_length)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                status = response.status
+
+            # HTMLのパースはワーカースレッドで行う
+            title, description, main_content = await asyncio.to_thread(
+                self._parse_html, raw_content
+            )
 
-                return result
+            # 結果を構築
+            result = {
+                "url": url,
+                "title": title,
+                "description": description,
+                "content": main_content,
+                "extracted_at": datetime.now().isoformat(),
+                "content_length": len(main_content),
+                "status_code": status,
+            }
+
+            if self.cache:
+                self.cache.store(url, result, etag=etag, last_modified=last_modified)
+
+            self.logger.debug(
+                "URL content fetched successfully",
+                url=url,
+                title=title[:50] if title else "No title",
+                content_length=len(main_content),
+            )
+
+            return {**result, "from_cache": False}
 
         except TimeoutError:
             self.logger.warning("Timeout when fetching URL", url=url)
@@ -165,6 +227,75 @@ class URLContentExtractor(LoggerMixin):
             )
             return None
 
+    def get_cached_summary(self, url: str) -> str | None:
+        """現在の本文に対するキャッシュ済み AI 要約を取得"""
+        if not self.cache:
+            return None
+        cached = self.cache.get(url)
+        return cached.summary if cached is not None else None
+
+    def store_summary(self, url: str, summary: str) -> None:
+        """AI 要約をキャッシュに保存"""
+        if self.cache:
+            self.cache.store_summary(url, summary)
+
+    async def close(self) -> None:
+        """共有セッションを閉じる"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """イベントループごとの共有セッションを取得"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout, headers=self.headers
+            )
+            self._session_loop = loop
+            self._host_semaphores.clear()
+        return self._session
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """ホストごとの同時接続数を制限するセマフォ"""
+        host = (urlparse(url).hostname or "").lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    async def _read_limited(
+        response: aiohttp.ClientResponse, max_content_length: int
+    ) -> bytes:
+        """最大長までストリームで読み込む"""
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_content_length:
+                break
+        return b"".join(chunks)[:max_content_length]
+
+    @staticmethod
+    def _from_cache(cached: CachedURL) -> dict[str, Any]:
+        return {**cached.result, "from_cache": True}
+
+    def _parse_html(self, raw_content: bytes) -> tuple[str, str, str]:
+        """HTMLからタイトル・説明・本文を抽出（ブロッキング処理）"""
+        soup = BeautifulSoup(raw_content, HTML_PARSER)
+        return (
+            self._extract_title(soup),
+            self._extract_description(soup),
+            self._extract_main_content(soup),
+        )
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """タイトルを抽出"""
         # <title>タグから
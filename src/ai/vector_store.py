@@ -39,8 +39,8 @@ except ImportError:
 
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+# scikit-learn は import に時間がかかるため、使用時に読み込む
 
 
 class NoteEmbedding:
@@ -130,6 +130,8 @@ class VectorStore(LoggerMixin):
         self.embeddings: dict[str, NoteEmbedding] = {}
 
         # TF-IDF バックアップ検索用
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=1000, stop_words="english", ngram_range=(1, 2)
         )
@@ -585,6 +587,8 @@ class VectorStore(LoggerMixin):
         self, embedding1: list[float], embedding2: list[float]
     ) -> float:
         """コサイン類似度を計算"""
+        from sklearn.metrics.pairwise import cosine_similarity
+
         try:
             vec1 = np.array(embedding1).reshape(1, -1)
             vec2 = np.array(embedding2).reshape(1, -1)
@@ -641,6 +645,8 @@ class VectorStore(LoggerMixin):
         self, query_text: str, limit: int, exclude_files: set[str]
     ) -> list[SemanticSearchResult]:
         """TF-IDF フォールバック検索"""
+        from sklearn.metrics.pairwise import cosine_similarity
+
         try:
             if self.tfidf_matrix is None or not self.file_paths_index:
                 return []
@@ -2,6 +2,7 @@
 
 import os
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -22,6 +23,7 @@ from src.audio.models import (
     TranscriptionResult,
 )
 from src.config import get_settings
+from src.monitoring.metrics import record_external_call, timed
 from src.utils.mixins import LoggerMixin
 
 _FILLER_VARIANTS = [
@@ -208,6 +210,7 @@ class SpeechProcessor(LoggerMixin):
             self.logger.debug("Error checking local Whisper availability", error=str(e))
             return False
 
+    @timed("speech.process_audio_file")
     async def process_audio_file(
         self, file_data: bytes, filename: str, channel_name: str | None = None
     ) -> AudioProcessingResult:
@@ -281,7 +284,21 @@ class SpeechProcessor(LoggerMixin):
                 )
 
             # Google Cloud Speech-to-Text API で文字起こし
-            transcription_result = await self._transcribe_audio(file_data, audio_format)
+            call_started_at = time.perf_counter()
+            try:
+                transcription_result = await self._transcribe_audio(
+                    file_data, audio_format
+                )
+            except Exception:
+                record_external_call(
+                    "speech", False, time.perf_counter() - call_started_at
+                )
+                raise
+            record_external_call(
+                "speech",
+                transcription_result.model_used != "error",
+                time.perf_counter() - call_started_at,
+            )
             transcription_result = self._apply_transcript_postprocessing(
                 transcription_result
             )
@@ -1150,16 +1167,14 @@ class SpeechProcessor(LoggerMixin):
     ) -> str:
         """手動処理用に音声ファイルを保存"""
         try:
+            from src.obsidian.change_feed import get_change_feed
             from src.obsidian.models import VaultFolder
 
             # Obsidian vault 内の audio フォルダに保存
             settings = get_settings()
 
-            audio_dir = (
-                Path(settings.obsidian_vault_path)
-                / VaultFolder.ATTACHMENTS.value
-                / "Audio"
-            )
+            vault_path = Path(settings.obsidian_vault_path)
+            audio_dir = vault_path / VaultFolder.ATTACHMENTS.value / "Audio"
             audio_dir.mkdir(parents=True, exist_ok=True)
 
             # ユニークなファイル名を生成
@@ -1173,6 +1188,8 @@ class SpeechProcessor(LoggerMixin):
             # ファイルを保存
             async with aiofiles.open(saved_path, "wb") as f:
                 await f.write(file_data)
+            # Git 同期の対象に加える
+            get_change_feed(vault_path).record(saved_path)
 
             self.logger.info(
                 "Audio file saved for manual processing",
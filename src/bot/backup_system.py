@@ -2,7 +2,7 @@
 Data backup and storage management system
 """
 
-import zipfile
+import threading
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -12,6 +12,14 @@ from discord.ext import commands, tasks
 
 from src.bot.notification_system import NotificationCategory, NotificationLevel
 from src.config import get_settings
+from src.obsidian.backup import (
+    BackupCancelledError,
+    BackupProgress,
+    get_content_store,
+    run_backup_task,
+    run_in_backup_executor,
+)
+from src.obsidian.backup.backup_executor import extract_zip
 from src.obsidian.github_sync import GitHubObsidianSync
 from src.utils.mixins import LoggerMixin
 
@@ -40,6 +48,7 @@ class BackupStatus(str, Enum):
     FAILED = "failed"
     IN_PROGRESS = "in_progress"
     PARTIAL = "partial"
+    CANCELLED = "cancelled"
 
 
 class DataBackupSystem(LoggerMixin):
@@ -54,6 +63,12 @@ class DataBackupSystem(LoggerMixin):
         # バックアップ設定
         self.backup_dir = Path.cwd() / "backups"
         self.backup_dir.mkdir(exist_ok=True)
+        # 各ファイルの内容は一度だけ保存し、バックアップは manifest として記録
+        self.store = get_content_store(self.backup_dir / "store")
+
+        # 実行中のバックアップの進捗とキャンセル要求
+        self.backup_progress: BackupProgress | None = None
+        self._cancel_event: threading.Event | None = None
 
         # バックアップ履歴
         self.backup_history: list[dict[str, Any]] = []
@@ -212,6 +227,18 @@ class DataBackupSystem(LoggerMixin):
 
             return backup_result
 
+        except BackupCancelledError as e:
+            cancelled_result = {
+                "backup_id": backup_id,
+                "type": backup_type.value,
+                "start_time": datetime.now(),
+                "status": BackupStatus.CANCELLED.value,
+                "error": str(e),
+            }
+            self._record_backup(cancelled_result)
+            self.logger.info("Backup cancelled", backup_id=backup_id)
+            return cancelled_result
+
         except Exception as e:
             error_result = {
                 "backup_id": backup_id,
@@ -239,164 +266,115 @@ class DataBackupSystem(LoggerMixin):
 
     async def _run_full_backup(self, backup_id: str) -> dict[str, Any]:
         """フルバックアップ実行"""
-        backup_path = self.backup_dir / f"{backup_id}_full.zip"
-        files_backed_up = 0
-        total_size = 0
-
-        with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for source_name, source_path in self.backup_sources.items():
-                if source_path.exists():
-                    if source_path.is_dir():
-                        for file_path in source_path.rglob("*"):
-                            if file_path.is_file():
-                                try:
-                                    arc_name = f"{source_name}/{file_path.relative_to(source_path)}"
-                                    zip_file.write(file_path, arc_name)
-                                    files_backed_up += 1
-                                    total_size += file_path.stat().st_size
-                                except Exception as e:
-                                    self.logger.warning(
-                                        f"Failed to backup file {file_path}: {e}"
-                                    )
-                    else:
-                        try:
-                            arc_name = f"{source_name}/{source_path.name}"
-                            zip_file.write(source_path, arc_name)
-                            files_backed_up += 1
-                            total_size += source_path.stat().st_size
-                        except Exception as e:
-                            self.logger.warning(
-                                f"Failed to backup file {source_path}: {e}"
-                            )
-
-        return {
-            "backup_file": str(backup_path),
-            "files_backed_up": files_backed_up,
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
-        }
+        return await self._store_snapshot(
+            backup_id, BackupType.FULL, list(self.backup_sources.items())
+        )
 
     async def _run_incremental_backup(self, backup_id: str) -> dict[str, Any]:
-        """増分バックアップ実行"""
+        """
+        増分バックアップ実行
+
+        前回から変更のないファイルは読み込まずに前回の内容を参照するため、
+        各増分バックアップの manifest だけで全体を復元できる。
+        """
         # 前回のバックアップ時間を取得
         last_backup_time = self._get_last_backup_time()
 
-        backup_path = self.backup_dir / f"{backup_id}_incremental.zip"
-        files_backed_up = 0
-        total_size = 0
-
-        with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for source_name, source_path in self.backup_sources.items():
-                if source_path.exists() and source_path.is_dir():
-                    for file_path in source_path.rglob("*"):
-                        if file_path.is_file():
-                            try:
-                                # ファイルの更新時間をチェック
-                                file_mtime = datetime.fromtimestamp(
-                                    file_path.stat().st_mtime
-                                )
-                                if (
-                                    last_backup_time is None
-                                    or file_mtime > last_backup_time
-                                ):
-                                    arc_name = f"{source_name}/{file_path.relative_to(source_path)}"
-                                    zip_file.write(file_path, arc_name)
-                                    files_backed_up += 1
-                                    total_size += file_path.stat().st_size
-                            except Exception as e:
-                                self.logger.warning(
-                                    f"Failed to backup file {file_path}: {e}"
-                                )
-
-        return {
-            "backup_file": str(backup_path),
-            "files_backed_up": files_backed_up,
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
-            "last_backup_time": (
-                last_backup_time.isoformat() if last_backup_time else None
-            ),
-        }
+        result = await self._store_snapshot(
+            backup_id, BackupType.INCREMENTAL, list(self.backup_sources.items())
+        )
+        result["files_in_snapshot"] = result["files_backed_up"]
+        result["files_backed_up"] = (
+            result["files_backed_up"] - result["unchanged_files"]
+        )
+        result["last_backup_time"] = (
+            last_backup_time.isoformat() if last_backup_time else None
+        )
+        return result
 
     async def _run_obsidian_backup(self, backup_id: str) -> dict[str, Any]:
         """Obsidian 専用バックアップ"""
-        backup_path = self.backup_dir / f"{backup_id}_obsidian.zip"
-        files_backed_up = 0
-        total_size = 0
-
         obsidian_path = self.backup_sources.get("obsidian_vault")
         if not obsidian_path or not obsidian_path.exists():
             return {
-                "backup_file": str(backup_path),
+                "backup_file": None,
                 "files_backed_up": 0,
                 "total_size_mb": 0,
                 "error": "Obsidian vault path not found",
             }
 
-        with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for file_path in obsidian_path.rglob("*"):
-                if file_path.is_file():
-                    try:
-                        arc_name = str(file_path.relative_to(obsidian_path))
-                        zip_file.write(file_path, arc_name)
-                        files_backed_up += 1
-                        total_size += file_path.stat().st_size
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Failed to backup Obsidian file {file_path}: {e}"
-                        )
-
-        return {
-            "backup_file": str(backup_path),
-            "files_backed_up": files_backed_up,
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
-        }
+        return await self._store_snapshot(
+            backup_id, BackupType.OBSIDIAN_ONLY, [("", obsidian_path)]
+        )
 
     async def _run_config_backup(self, backup_id: str) -> dict[str, Any]:
         """設定専用バックアップ"""
-        backup_path = self.backup_dir / f"{backup_id}_config.zip"
-        files_backed_up = 0
-        total_size = 0
-
         config_path = self.backup_sources.get("config")
         if not config_path or not config_path.exists():
             return {
-                "backup_file": str(backup_path),
+                "backup_file": None,
                 "files_backed_up": 0,
                 "total_size_mb": 0,
                 "error": "Config path not found",
             }
 
-        with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for file_path in config_path.rglob("*"):
-                if file_path.is_file():
-                    try:
-                        arc_name = str(file_path.relative_to(config_path))
-                        zip_file.write(file_path, arc_name)
-                        files_backed_up += 1
-                        total_size += file_path.stat().st_size
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Failed to backup config file {file_path}: {e}"
-                        )
-
         # 追加設定ファイル
         additional_configs = [".env", ".env.development", "pyproject.toml"]
-        for config_file in additional_configs:
-            config_file_path = Path.cwd() / config_file
-            if config_file_path.exists():
-                try:
-                    zip_file.write(config_file_path, config_file)
-                    files_backed_up += 1
-                    total_size += config_file_path.stat().st_size
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to backup config file {config_file_path}: {e}"
-                    )
+        sources = [("", config_path)] + [
+            ("", Path.cwd() / config_file) for config_file in additional_configs
+        ]
+        return await self._store_snapshot(backup_id, BackupType.CONFIG_ONLY, sources)
 
-        return {
-            "backup_file": str(backup_path),
-            "files_backed_up": files_backed_up,
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
+    async def _store_snapshot(
+        self,
+        backup_id: str,
+        backup_type: BackupType,
+        sources: list[tuple[str, Path]],
+    ) -> dict[str, Any]:
+        """
+        コンテンツストアに manifest を作成
+
+        ファイルの読み込みと圧縮はバックアップ専用のスレッドで並行して行い、
+        進捗は backup_progress に反映する。 cancel_backup() で中断できる。
+        """
+        self._cancel_event = threading.Event()
+        try:
+            _manifest, stats = await run_backup_task(
+                self.store.snapshot,
+                backup_id,
+                backup_type.value,
+                sources,
+                progress=self._on_backup_progress,
+                cancel=self._cancel_event,
+            )
+        finally:
+            self._cancel_event = None
+
+        result: dict[str, Any] = {
+            "backup_file": str(self.store.manifest_path(backup_id, backup_type.value)),
+            "files_backed_up": stats.files,
+            "unchanged_files": stats.unchanged_files,
+            "total_size_mb": round(stats.total_bytes / (1024 * 1024), 2),
+            "stored_size_mb": round(stats.stored_bytes / (1024 * 1024), 2),
+            "dedup_ratio": round(stats.dedup_ratio, 4),
+            "snapshot_duration_seconds": round(stats.duration, 2),
         }
+        if stats.errors:
+            result["errors"] = [f"{stats.errors} files could not be read"]
+        return result
+
+    def _on_backup_progress(self, progress: BackupProgress) -> None:
+        """進捗イベント（イベントループ上で呼ばれる）"""
+        self.backup_progress = progress
+        self.logger.debug("Backup progress", **progress.to_dict())
+
+    def cancel_backup(self) -> bool:
+        """実行中のバックアップを中断（中断要求を送った場合は True ）"""
+        if self._cancel_event is None:
+            return False
+        self._cancel_event.set()
+        self.logger.info("Backup cancellation requested")
+        return True
 
     async def _save_to_destination(
         self,
@@ -420,20 +398,31 @@ class DataBackupSystem(LoggerMixin):
     ) -> dict[str, Any]:
         """バックアップからの復元"""
         try:
-            # バックアップファイルを検索
-            backup_files = list(self.backup_dir.glob(f"{backup_id}*"))
-            if not backup_files:
-                return {"error": f"Backup {backup_id} not found"}
-
-            backup_file = backup_files[0]
             restore_target = target_directory or Path.cwd() / "restore" / backup_id
-            restore_target.mkdir(parents=True, exist_ok=True)
-
-            files_restored = 0
-
-            with zipfile.ZipFile(backup_file, "r") as zip_file:
-                zip_file.extractall(restore_target)
-                files_restored = len(zip_file.namelist())
+            manifest_kind = self._find_manifest_kind(backup_id)
+
+            if manifest_kind is not None:
+                restore_target.mkdir(parents=True, exist_ok=True)
+                files_restored = await run_backup_task(
+                    self.store.restore,
+                    backup_id,
+                    manifest_kind,
+                    restore_target,
+                    progress=self._on_backup_progress,
+                )
+            else:
+                # 旧形式（ zip ）のバックアップファイルを検索
+                backup_files = list(self.backup_dir.glob(f"{backup_id}*.zip"))
+                if not backup_files:
+                    return {"error": f"Backup {backup_id} not found"}
+
+                restore_target.mkdir(parents=True, exist_ok=True)
+                files_restored = await run_backup_task(
+                    extract_zip,
+                    backup_files[0],
+                    restore_target,
+                    progress=self._on_backup_progress,
+                )
 
             restore_result = {
                 "backup_id": backup_id,
@@ -456,9 +445,28 @@ class DataBackupSystem(LoggerMixin):
             self.logger.error(f"Backup restore failed: {e}", exc_info=True)
             return {"error": str(e)}
 
+    def _find_manifest_kind(self, backup_id: str) -> str | None:
+        """backup_id の manifest があるバックアップタイプ"""
+        for backup_type in BackupType:
+            try:
+                if self.store.manifest_path(backup_id, backup_type.value).exists():
+                    return backup_type.value
+            except ValueError:
+                return None
+        return None
+
     async def _cleanup_old_backups(self) -> None:
-        """古いバックアップファイルのクリーンアップ"""
+        """古いバックアップのクリーンアップ（ manifest の削除と未参照データの回収）"""
         try:
+            await run_in_backup_executor(
+                self.store.apply_retention,
+                {
+                    backup_type.value: self.max_backup_files
+                    for backup_type in BackupType
+                },
+            )
+
+            # 旧形式（ zip ）のバックアップファイル
             backup_files = sorted(
                 self.backup_dir.glob("backup_*.zip"),
                 key=lambda f: f.stat().st_mtime,
@@ -531,6 +539,8 @@ class DataBackupSystem(LoggerMixin):
                 "value": (
                     f"ファイル数: {backup_result.get('files_backed_up', 0)}件\n"
                     f"サイズ: {backup_result.get('total_size_mb', 0)}MB\n"
+                    f"新規保存: {backup_result.get('stored_size_mb', 0)}MB\n"
+                    f"重複排除率: {backup_result.get('dedup_ratio', 0) * 100:.1f}%\n"
                     f"所要時間: {backup_result.get('duration_seconds', 0):.1f}秒"
                 ),
                 "inline": False,
@@ -603,9 +613,11 @@ class DataBackupSystem(LoggerMixin):
             )
 
             backup_files = list(self.backup_dir.glob("backup_*.zip"))
-            total_backup_size = sum([f.stat().st_size for f in backup_files]) / (
-                1024 * 1024
-            )
+            store_usage = self.store.usage()
+            total_backup_size = (
+                sum([f.stat().st_size for f in backup_files])
+                + store_usage["stored_bytes"]
+            ) / (1024 * 1024)
 
             return {
                 "auto_backup_enabled": self.auto_backup_enabled,
@@ -613,12 +625,15 @@ class DataBackupSystem(LoggerMixin):
                 "total_backups": len(self.backup_history),
                 "successful_backups": successful_backups,
                 "recent_backups": recent_backups,
-                "backup_files_count": len(backup_files),
+                "backup_files_count": len(backup_files) + store_usage["manifests"],
                 "total_backup_size_mb": round(total_backup_size, 2),
                 "last_backup": self.backup_history[-1] if self.backup_history else None,
                 "backup_destinations": [
                     dest.value for dest in self.backup_destinations
                 ],
+                "backup_progress": (
+                    self.backup_progress.to_dict() if self.backup_progress else None
+                ),
             }
 
         except Exception as e:
@@ -1,6 +1,7 @@
 """Discord bot client implementation"""
 
 import asyncio
+import time
 from collections.abc import Coroutine
 from datetime import datetime, timedelta
 from typing import Any
@@ -12,6 +13,13 @@ from src.bot.channel_config import ChannelConfig
 from src.bot.handlers import MessageHandler
 from src.bot.metrics import APIUsageMonitor, SystemMetrics
 from src.config import get_settings
+from src.monitoring.metrics import (
+    MESSAGE_PIPELINE_SECONDS,
+    MESSAGES_IN_PROGRESS,
+    MESSAGES_TOTAL,
+    get_metrics_registry,
+)
+from src.monitoring.startup import VAULT_SYNC_STEP, get_startup_tracker
 from src.utils.mixins import LoggerMixin
 
 
@@ -52,8 +60,9 @@ class DiscordBot(LoggerMixin):
         self.last_activity: datetime | None = None
 
         # Initialize monitoring components
-        self.system_metrics = SystemMetrics()
-        self.api_usage_monitor = APIUsageMonitor()
+        # Exported at /metrics through the process-wide registry
+        self.system_metrics = SystemMetrics(get_metrics_registry())
+        self.api_usage_monitor = APIUsageMonitor(get_metrics_registry())
 
         self._startup_tasks: set[asyncio.Task[Any]] = set()
 
@@ -152,6 +161,8 @@ class DiscordBot(LoggerMixin):
             self.last_activity = datetime.now()
             self.system_metrics.increment_message_count()
 
+            received_at = time.perf_counter()
+            MESSAGES_IN_PROGRESS.inc()
             try:
                 self.logger.debug(
                     "Processing message",
@@ -176,10 +187,22 @@ class DiscordBot(LoggerMixin):
                     "type": str(message.channel.type),
                 }
 
+                # Notes are not written while the startup vault sync may still
+                # reset the vault; messages wait for it instead of being dropped
+                await get_startup_tracker().wait_for(VAULT_SYNC_STEP)
+                handler_started_at = time.perf_counter()
+                MESSAGE_PIPELINE_SECONDS.observe(
+                    handler_started_at - received_at, stage="vault_sync_wait"
+                )
+
                 # Process message through the message handler
                 await self.message_handler.process_message(
                     message, message_data, channel_info
                 )
+                MESSAGE_PIPELINE_SECONDS.observe(
+                    time.perf_counter() - handler_started_at, stage="handler"
+                )
+                MESSAGES_TOTAL.inc(outcome="success")
                 self.system_metrics.increment_ai_success()
                 self.logger.debug(
                     "Message processed successfully", message_id=message.id
@@ -193,6 +216,7 @@ class DiscordBot(LoggerMixin):
                     channel=channel_name,
                     exc_info=True,
                 )
+                MESSAGES_TOTAL.inc(outcome="error")
                 self.system_metrics.increment_ai_failure()
                 self.system_metrics.add_error(
                     {
@@ -202,6 +226,11 @@ class DiscordBot(LoggerMixin):
                         "channel": channel_name,
                     }
                 )
+            finally:
+                MESSAGES_IN_PROGRESS.dec()
+                MESSAGE_PIPELINE_SECONDS.observe(
+                    time.perf_counter() - received_at, stage="total"
+                )
 
             # Process bot commands
             await self.bot.process_commands(message)
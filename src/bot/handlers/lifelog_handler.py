@@ -162,6 +162,10 @@ class LifelogHandler(LoggerMixin):
                 async with aiofiles.open(local_file_path, "w", encoding="utf-8") as f:
                     await f.write(note_content)
 
+                from src.obsidian.change_feed import get_change_feed
+
+                get_change_feed(vault_path).record(local_file_path)
+
                 self.logger.info(
                     "ライフログ Obsidian ノートを作成しました",
                     file_path=file_path,
@@ -312,17 +312,24 @@ class NoteHandler(LoggerMixin):
             # STEP 3: GitHub sync (only if local file was created)
             if local_file_created:
                 try:
+                    from src.obsidian.change_feed import get_change_feed
                     from src.obsidian.github_sync import GitHubObsidianSync
-
-                    # Create GitHub sync instance
-                    sync_client = GitHubObsidianSync()
-
-                    # Check configuration
-                    if sync_client.is_configured:
-                        # Execute auto sync
-                        await sync_client.sync_to_github(
-                            commit_message=f"Auto-sync Enhanced YAML: {title_preview}"
-                        )
+                    from src.obsidian.sync_scheduler import get_sync_scheduler
+
+                    # A running scheduler commits the note with its next batch
+                    get_change_feed(vault_path).record(local_file_path)
+                    if get_sync_scheduler() is None:
+                        # Create GitHub sync instance
+                        sync_client = GitHubObsidianSync()
+
+                        # Check configuration
+                        if sync_client.is_configured:
+                            # Execute auto sync
+                            await sync_client.sync_to_github(
+                                commit_message=(
+                                    f"Auto-sync Enhanced YAML: {title_preview}"
+                                )
+                            )
 
                 except Exception as e:
                     self.logger.debug(
@@ -11,6 +11,7 @@ import aiofiles
 import aiohttp
 import discord
 
+from src.obsidian.change_feed import record_vault_write
 from src.utils.mixins import LoggerMixin
 
 
@@ -550,6 +551,8 @@ class MessageProcessor(LoggerMixin):
                     async with aiofiles.open(save_path, "wb") as file:
                         async for chunk in response.content.iter_chunked(8192):
                             await file.write(chunk)
+                    # Vault 内に保存した場合は Git 同期の対象に加える
+                    record_vault_write(save_path)
 
                     self.logger.info(
                         "Attachment downloaded",
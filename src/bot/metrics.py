@@ -1,48 +1,100 @@
 """System metrics and monitoring functionality for Discord bot"""
 
+from collections import deque
 from datetime import datetime
 from typing import Any
 
+from src.monitoring.metrics import LATENCY_BUCKETS, BoundHistogram, MetricsRegistry
 from src.utils.mixins import LoggerMixin
 
+TRACKED_APIS = ("gemini", "speech")
+
 
 class SystemMetrics(LoggerMixin):
-    """システムメトリクス収集とパフォーマンス監視"""
-
-    def __init__(self) -> None:
-        self.metrics: dict[str, Any] = {
-            "total_messages_processed": 0,
-            "successful_ai_requests": 0,
-            "failed_ai_requests": 0,
-            "api_usage_minutes": 0.0,
-            "obsidian_files_created": 0,
-            "errors_last_hour": 0,
-            "warnings_last_hour": 0,
-            "system_start_time": datetime.now(),
-        }
+    """システムメトリクス収集とパフォーマンス監視
+
+    カウンタと処理時間はメトリクスレジストリに記録する。処理時間は操作ごとの
+    固定バケットのヒストグラムに集計し、生データを保持せずに p50 / p95 / p99
+    を求める。 registry を省略すると、このインスタンス専用のレジストリを使う。
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.system_start_time = datetime.now()
+
+        self._messages = self.registry.counter(
+            "mindbridge_messages_received_total",
+            "Discord messages received, excluding the bot's own",
+        ).labels()
+        ai_requests = self.registry.counter(
+            "mindbridge_ai_requests_total",
+            "Messages run through the AI pipeline, by outcome",
+            ("outcome",),
+        )
+        self._ai_success = ai_requests.labels(outcome="success")
+        self._ai_failure = ai_requests.labels(outcome="error")
+        self._api_usage_minutes = self.registry.counter(
+            "mindbridge_api_usage_minutes_total", "Speech API minutes used"
+        ).labels()
+        self._files_created = self.registry.counter(
+            "mindbridge_obsidian_files_created_total", "Notes created in the vault"
+        ).labels()
+        self._errors = self.registry.counter(
+            "mindbridge_errors_total", "Errors recorded by the bot, by type", ("type",)
+        )
+        self._errors_last_hour = self.registry.gauge(
+            "mindbridge_errors_last_hour", "Errors since the last hourly reset"
+        )
+        self._warnings_last_hour = self.registry.gauge(
+            "mindbridge_warnings_last_hour", "Warnings since the last hourly reset"
+        )
+        self._errors_last_hour.set(0)
+        self._warnings_last_hour.set(0)
+        self.operation_seconds = self.registry.histogram(
+            "mindbridge_operation_seconds",
+            "Time spent in operations instrumented with timed()",
+            ("operation",),
+            buckets=LATENCY_BUCKETS,
+        )
+        self._operation_series: dict[str, BoundHistogram] = {}
+
         self.hourly_stats: dict[str, Any] = {}
-        self.error_history: list[Any] = []
-        self.performance_history: list[Any] = []
+        # 直近 100 件のエラー詳細（表示用）
+        self.error_history: deque[dict[str, Any]] = deque(maxlen=100)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """現在のカウンタ値"""
+        return {
+            "total_messages_processed": int(self._messages.value()),
+            "successful_ai_requests": int(self._ai_success.value()),
+            "failed_ai_requests": int(self._ai_failure.value()),
+            "api_usage_minutes": self._api_usage_minutes.value(),
+            "obsidian_files_created": int(self._files_created.value()),
+            "errors_last_hour": int(self._errors_last_hour.value() or 0),
+            "warnings_last_hour": int(self._warnings_last_hour.value() or 0),
+            "system_start_time": self.system_start_time,
+        }
 
     def increment_message_count(self) -> None:
         """処理メッセージ数をインクリメント"""
-        self.metrics["total_messages_processed"] += 1
+        self._messages.inc()
 
     def increment_ai_success(self) -> None:
         """AI 成功カウントをインクリメント"""
-        self.metrics["successful_ai_requests"] += 1
+        self._ai_success.inc()
 
     def increment_ai_failure(self) -> None:
         """AI 失敗カウントをインクリメント"""
-        self.metrics["failed_ai_requests"] += 1
+        self._ai_failure.inc()
 
     def add_api_usage(self, minutes: float) -> None:
         """API 使用時間を追加"""
-        self.metrics["api_usage_minutes"] += minutes
+        self._api_usage_minutes.inc(minutes)
 
     def increment_obsidian_files(self) -> None:
         """Obsidian ファイル作成数をインクリメント"""
-        self.metrics["obsidian_files_created"] += 1
+        self._files_created.inc()
 
     def add_error(self, error_info: dict[str, Any]) -> None:
         """エラー情報を追加"""
@@ -52,25 +104,17 @@ class SystemMetrics(LoggerMixin):
                 "error": error_info,
             }
         )
-        self.metrics["errors_last_hour"] += 1
-
-        # Keep only last 100 errors
-        if len(self.error_history) > 100:
-            self.error_history.pop(0)
+        self._errors.inc(type=str(error_info.get("type", "unknown")))
+        self._errors_last_hour.inc()
 
     def add_performance_data(self, operation: str, duration: float) -> None:
-        """パフォーマンスデータを追加"""
-        self.performance_history.append(
-            {
-                "timestamp": datetime.now(),
-                "operation": operation,
-                "duration": duration,
-            }
-        )
-
-        # Keep only last 1000 performance records
-        if len(self.performance_history) > 1000:
-            self.performance_history.pop(0)
+        """パフォーマンスデータを追加（秒）"""
+        series = self._operation_series.get(operation)
+        if series is None:
+            series = self._operation_series[operation] = self.operation_seconds.labels(
+                operation=operation
+            )
+        series.observe(duration)
 
     def record_message_processed(self) -> None:
         """処理メッセージ数をインクリメント"""
@@ -88,60 +132,95 @@ class SystemMetrics(LoggerMixin):
         """ファイル作成を記録"""
         self.increment_obsidian_files()
 
+    def get_operation_stats(self) -> dict[str, dict[str, float | int | None]]:
+        """操作ごとの件数・平均・最大・ p50 / p95 / p99 （秒）"""
+        return {
+            operation: summary
+            for (operation,), summary in self.operation_seconds.summaries().items()
+        }
+
     def get_system_health_status(self) -> dict[str, Any]:
         """システムヘルス状況を取得"""
+        metrics = self.metrics
         total_requests = (
-            self.metrics["successful_ai_requests"] + self.metrics["failed_ai_requests"]
+            metrics["successful_ai_requests"] + metrics["failed_ai_requests"]
         )
         ai_success_rate = (
-            self.metrics["successful_ai_requests"] / max(1, total_requests)
+            metrics["successful_ai_requests"] / max(1, total_requests)
         ) * 100
 
         return {
-            "total_messages_processed": self.metrics["total_messages_processed"],
+            "total_messages_processed": metrics["total_messages_processed"],
             "ai_success_rate": ai_success_rate,
-            "files_created": self.metrics["obsidian_files_created"],
-            "performance_score": 100.0 - (self.metrics["errors_last_hour"] * 10),
+            "files_created": metrics["obsidian_files_created"],
+            "performance_score": 100.0 - (metrics["errors_last_hour"] * 10),
             "uptime_hours": (
-                (datetime.now() - self.metrics["system_start_time"]).total_seconds()
-                / 3600
+                (datetime.now() - self.system_start_time).total_seconds() / 3600
             ),
         }
 
     def get_metrics_summary(self) -> dict[str, Any]:
         """メトリクス要約を取得"""
-        uptime = datetime.now() - self.metrics["system_start_time"]
+        metrics = self.metrics
+        uptime = datetime.now() - self.system_start_time
 
-        avg_performance = 0.0
-        if self.performance_history:
-            total_duration = sum(p["duration"] for p in self.performance_history)
-            avg_performance = total_duration / len(self.performance_history)
+        operation_count, operation_seconds = self.operation_seconds.totals()
+        avg_performance = (
+            operation_seconds / operation_count if operation_count else 0.0
+        )
 
         return {
-            **self.metrics,
+            **metrics,
             "uptime_seconds": uptime.total_seconds(),
             "uptime_formatted": str(uptime),
             "avg_operation_duration": avg_performance,
+            "operations": self.get_operation_stats(),
             "error_rate": (
-                self.metrics["failed_ai_requests"]
-                / max(1, self.metrics["total_messages_processed"])
+                metrics["failed_ai_requests"]
+                / max(1, metrics["total_messages_processed"])
             )
             * 100,
         }
 
     def reset_hourly_stats(self) -> None:
         """時間毎の統計をリセット"""
-        self.metrics["errors_last_hour"] = 0
-        self.metrics["warnings_last_hour"] = 0
+        self._errors_last_hour.set(0)
+        self._warnings_last_hour.set(0)
         self.hourly_stats = {}
 
 
 class APIUsageMonitor(LoggerMixin):
-    """API 使用量監視と制限管理"""
-
-    def __init__(self) -> None:
-        self.daily_requests: dict[str, int] = {}
-        self.hourly_requests: dict[str, int] = {}
+    """API 使用量監視と制限管理
+
+    日次・時間ごとの使用回数はメトリクスレジストリのゲージとして保持する。
+    registry を省略すると、このインスタンス専用のレジストリを使う。
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self._requests = self.registry.counter(
+            "mindbridge_api_requests_total",
+            "Requests counted against the API quotas",
+            ("api",),
+        )
+        self._rejected = self.registry.counter(
+            "mindbridge_api_requests_rejected_total",
+            "Requests refused by the API quota check, by quota window",
+            ("api", "window"),
+        )
+        self._daily_requests = self.registry.gauge(
+            "mindbridge_api_requests_today",
+            "Requests counted against the daily quota",
+            ("api",),
+        )
+        self._hourly_requests = self.registry.gauge(
+            "mindbridge_api_requests_this_hour",
+            "Requests counted against the hourly quota",
+            ("api",),
+        )
+        for api_name in TRACKED_APIS:
+            self._daily_requests.set(0, api=api_name)
+            self._hourly_requests.set(0, api=api_name)
         self.last_reset_day = datetime.now().day
         self.last_reset_hour = datetime.now().hour
 
@@ -161,40 +240,50 @@ class APIUsageMonitor(LoggerMixin):
         self._check_and_reset_counters()
 
         # Check limits before incrementing
-        if not self._check_limits(api_name):
+        exceeded = self._exceeded_window(api_name)
+        if exceeded:
+            self._rejected.inc(api=api_name, window=exceeded)
             return False
 
-        self.daily_requests[api_name] = self.daily_requests.get(api_name, 0) + 1
-        self.hourly_requests[api_name] = self.hourly_requests.get(api_name, 0) + 1
+        self._requests.inc(api=api_name)
+        self._daily_requests.inc(api=api_name)
+        self._hourly_requests.inc(api=api_name)
 
         return True
 
+    def _daily_count(self, api_name: str) -> int:
+        return int(self._daily_requests.value(api=api_name) or 0)
+
+    def _hourly_count(self, api_name: str) -> int:
+        return int(self._hourly_requests.value(api=api_name) or 0)
+
     def _check_limits(self, api_name: str) -> bool:
         """API 制限をチェック"""
-        daily_count = self.daily_requests.get(api_name, 0)
-        hourly_count = self.hourly_requests.get(api_name, 0)
+        return self._exceeded_window(api_name) is None
 
-        if daily_count >= self.daily_limits.get(api_name, 999999):
+    def _exceeded_window(self, api_name: str) -> str | None:
+        """上限に達した期間（ daily / hourly ）、未到達なら None"""
+        if self._daily_count(api_name) >= self.daily_limits.get(api_name, 999999):
             self.logger.warning(f"Daily limit exceeded for {api_name}")
-            return False
+            return "daily"
 
-        if hourly_count >= self.hourly_limits.get(api_name, 999999):
+        if self._hourly_count(api_name) >= self.hourly_limits.get(api_name, 999999):
             self.logger.warning(f"Hourly limit exceeded for {api_name}")
-            return False
+            return "hourly"
 
-        return True
+        return None
 
     def _check_and_reset_counters(self) -> None:
         """カウンタの日時リセットをチェック"""
         now = datetime.now()
 
         if now.day != self.last_reset_day:
-            self.daily_requests = {}
+            self._daily_requests.reset()
             self.last_reset_day = now.day
             self.logger.info("Daily API counters reset")
 
         if now.hour != self.last_reset_hour:
-            self.hourly_requests = {}
+            self._hourly_requests.reset()
             self.last_reset_hour = now.hour
             self.logger.info("Hourly API counters reset")
 
@@ -209,9 +298,9 @@ class APIUsageMonitor(LoggerMixin):
             "hourly_remaining": {},
         }
 
-        for api_name in ["gemini", "speech"]:
-            daily_used = self.daily_requests.get(api_name, 0)
-            hourly_used = self.hourly_requests.get(api_name, 0)
+        for api_name in TRACKED_APIS:
+            daily_used = self._daily_count(api_name)
+            hourly_used = self._hourly_count(api_name)
 
             status["daily_usage"][api_name] = daily_used
             status["hourly_usage"][api_name] = hourly_used
@@ -256,9 +345,7 @@ class APIUsageMonitor(LoggerMixin):
                 "daily": self.daily_limits,
                 "hourly": self.hourly_limits,
             },
-            "availability": {
-                api: self.is_api_available(api) for api in ["gemini", "speech"]
-            },
+            "availability": {api: self.is_api_available(api) for api in TRACKED_APIS},
         }
 
     def export_usage_report(self, format_type: str = "json") -> dict[str, Any]:
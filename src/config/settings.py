@@ -76,6 +76,12 @@ class Settings(BaseSettings):
     obsidian_backup_branch: str = "main"
     git_user_name: str = "Personal MindBridge"
     git_user_email: str = "mindbridge@personal.local"
+    obsidian_clone_strategy: str = "blobless"  # full / shallow / blobless
+    obsidian_clone_depth: int = 1
+    obsidian_sparse_folders: str | None = None  # カンマ区切りのフォルダ一覧
+    git_sync_window_seconds: float = 60.0  # 変更をまとめてコミットする間隔
+    git_sync_max_backoff_seconds: float = 900.0
+    git_sync_full_sweep_windows: int = 60  # Vault 全体をステージングする間隔（回）
 
     # AI Model Configuration
     model_name: str = "models/gemini-2.5-flash"
@@ -13,6 +13,7 @@ from src.config import get_settings
 from src.finance.expense_manager import ExpenseManager
 from src.finance.models import Budget, BudgetCategory
 from src.obsidian import ObsidianFileManager
+from src.utils.json_store import AtomicJsonWriter
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -30,6 +31,7 @@ class BudgetManager:
 
         # Ensure finance directory exists
         self.budgets_file.parent.mkdir(parents=True, exist_ok=True)
+        self._budgets_writer = AtomicJsonWriter(self.budgets_file, prefix="budgets_")
 
     async def set_budget(
         self,
@@ -255,11 +257,9 @@ class BudgetManager:
         period_end: date,
     ) -> Decimal:
         """Calculate spent amount for a category in a period."""
-        expenses = await self.expense_manager.get_expenses_by_period(
+        return await self.expense_manager.get_total_expenses(
             period_start, period_end, category
         )
-        total = sum(expense.amount for expense in expenses)
-        return total or Decimal(0)
 
     async def _load_budgets(self) -> dict[str, Budget]:
         """Load budgets from JSON file."""
@@ -286,16 +286,6 @@ class BudgetManager:
     async def _save_budgets(self, budgets: dict[str, Budget]) -> None:
         """Save budgets to JSON file."""
         try:
-            data = {}
-            for budget_id, budget in budgets.items():
-                if isinstance(budget, Budget):
-                    data[budget_id] = budget.dict()
-                else:
-                    data[budget_id] = budget
-
-            async with aiofiles.open(self.budgets_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
+            await self._budgets_writer.write(budgets)
         except Exception as e:
             logger.error("Failed to save budgets", error=str(e))
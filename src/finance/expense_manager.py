@@ -1,14 +1,14 @@
 """Expense and income management functionality."""
 
-import json
 import uuid
 from datetime import date
 from decimal import Decimal
+from typing import cast
 
-import aiofiles
 from structlog import get_logger
 
 from src.config import get_settings
+from src.finance.ledger import FinanceLedger
 from src.finance.models import (
     BudgetCategory,
     ExpenseRecord,
@@ -33,6 +33,12 @@ class ExpenseManager:
         # Ensure finance directory exists
         self.expenses_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Date-ordered ledgers with running per-month/category totals
+        self.expense_ledger = FinanceLedger(
+            self.expenses_file, ExpenseRecord, "expenses"
+        )
+        self.income_ledger = FinanceLedger(self.income_file, IncomeRecord, "incomes")
+
     async def add_expense(
         self,
         description: str,
@@ -53,9 +59,7 @@ class ExpenseManager:
             notes=notes,
         )
 
-        expenses = await self._load_expenses()
-        expenses[expense.id] = expense
-        await self._save_expenses(expenses)
+        await self.expense_ledger.add(expense)
 
         # Add to daily note
         await self._add_to_daily_note(expense, "expense")
@@ -88,9 +92,7 @@ class ExpenseManager:
             notes=notes,
         )
 
-        incomes = await self._load_incomes()
-        incomes[income.id] = income
-        await self._save_incomes(incomes)
+        await self.income_ledger.add(income)
 
         # Add to daily note
         await self._add_to_daily_note(income, "income")
@@ -114,24 +116,10 @@ class ExpenseManager:
         if start_date > end_date:
             raise ValueError("Start date must be before or equal to end date")
 
-        expenses = await self._load_expenses()
-
-        result: list[ExpenseRecord] = []
-        for expense_data in expenses.values():
-            expense = (
-                ExpenseRecord(**expense_data)
-                if isinstance(expense_data, dict)
-                else expense_data
-            )
-
-            # Enhanced filtering with proper type checking
-            date_match = start_date <= expense.date <= end_date
-            category_match = category is None or expense.category == category
-
-            if date_match and category_match:
-                result.append(expense)
-
-        return sorted(result, key=lambda x: x.date, reverse=True)
+        expenses = await self.expense_ledger.records_between(
+            start_date, end_date, category
+        )
+        return cast(list[ExpenseRecord], expenses[::-1])
 
     async def get_income_by_period(
         self,
@@ -139,20 +127,8 @@ class ExpenseManager:
         end_date: date,
     ) -> list[IncomeRecord]:
         """Get income for a specific period."""
-        incomes = await self._load_incomes()
-
-        result = []
-        for income_data in incomes.values():
-            income = (
-                IncomeRecord(**income_data)
-                if isinstance(income_data, dict)
-                else income_data
-            )
-
-            if start_date <= income.date <= end_date:
-                result.append(income)
-
-        return sorted(result, key=lambda x: x.date, reverse=True)
+        incomes = await self.income_ledger.records_between(start_date, end_date)
+        return cast(list[IncomeRecord], incomes[::-1])
 
     async def get_total_expenses_by_category(
         self,
@@ -160,15 +136,12 @@ class ExpenseManager:
         end_date: date,
     ) -> dict[BudgetCategory, Decimal]:
         """Get total expenses by category for a period."""
-        expenses = await self.get_expenses_by_period(start_date, end_date)
-
-        totals = {}
-        for expense in expenses:
-            if expense.category not in totals:
-                totals[expense.category] = Decimal(0)
-            totals[expense.category] += expense.amount
-
-        return totals
+        totals = await self.expense_ledger.totals_by_category(start_date, end_date)
+        return {
+            category: amount
+            for category, amount in totals.items()
+            if category is not None
+        }
 
     async def get_total_income(
         self,
@@ -176,17 +149,16 @@ class ExpenseManager:
         end_date: date,
     ) -> Decimal:
         """Get total income for a period."""
-        incomes = await self.get_income_by_period(start_date, end_date)
-        return sum(income.amount for income in incomes) or Decimal(0)
+        return await self.income_ledger.total(start_date, end_date)
 
     async def get_total_expenses(
         self,
         start_date: date,
         end_date: date,
+        category: BudgetCategory | None = None,
     ) -> Decimal:
-        """Get total expenses for a period."""
-        expenses = await self.get_expenses_by_period(start_date, end_date)
-        return sum(expense.amount for expense in expenses) or Decimal(0)
+        """Get total expenses for a period, optionally for one category."""
+        return await self.expense_ledger.total(start_date, end_date, category)
 
     async def get_net_balance(
         self,
@@ -198,84 +170,6 @@ class ExpenseManager:
         total_expenses = await self.get_total_expenses(start_date, end_date)
         return total_income - total_expenses
 
-    async def _load_expenses(self) -> dict[str, ExpenseRecord]:
-        """Load expenses from JSON file."""
-        if not self.expenses_file.exists():
-            return {}
-
-        try:
-            async with aiofiles.open(self.expenses_file, encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
-
-                expenses = {}
-                for expense_id, expense_data in data.items():
-                    if isinstance(expense_data, dict):
-                        expenses[expense_id] = ExpenseRecord(**expense_data)
-                    else:
-                        expenses[expense_id] = expense_data
-
-                return expenses
-        except Exception as e:
-            logger.error("Failed to load expenses", error=str(e))
-            return {}
-
-    async def _save_expenses(self, expenses: dict[str, ExpenseRecord]) -> None:
-        """Save expenses to JSON file."""
-        try:
-            data = {}
-            for expense_id, expense in expenses.items():
-                if isinstance(expense, ExpenseRecord):
-                    data[expense_id] = expense.dict()
-                else:
-                    data[expense_id] = expense
-
-            async with aiofiles.open(self.expenses_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
-        except Exception as e:
-            logger.error("Failed to save expenses", error=str(e))
-
-    async def _load_incomes(self) -> dict[str, IncomeRecord]:
-        """Load incomes from JSON file."""
-        if not self.income_file.exists():
-            return {}
-
-        try:
-            async with aiofiles.open(self.income_file, encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
-
-                incomes = {}
-                for income_id, income_data in data.items():
-                    if isinstance(income_data, dict):
-                        incomes[income_id] = IncomeRecord(**income_data)
-                    else:
-                        incomes[income_id] = income_data
-
-                return incomes
-        except Exception as e:
-            logger.error("Failed to load incomes", error=str(e))
-            return {}
-
-    async def _save_incomes(self, incomes: dict[str, IncomeRecord]) -> None:
-        """Save incomes to JSON file."""
-        try:
-            data = {}
-            for income_id, income in incomes.items():
-                if isinstance(income, IncomeRecord):
-                    data[income_id] = income.dict()
-                else:
-                    data[income_id] = income
-
-            async with aiofiles.open(self.income_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
-        except Exception as e:
-            logger.error("Failed to save incomes", error=str(e))
-
     async def _add_to_daily_note(
         self,
         record: ExpenseRecord | IncomeRecord,
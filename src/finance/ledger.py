@@ -0,0 +1,234 @@
+"""In-memory ledger with date ordering and pre-aggregated monthly totals."""
+
+import asyncio
+import json
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import aiofiles
+from structlog import get_logger
+
+from src.finance.models import BudgetCategory, ExpenseRecord, IncomeRecord
+from src.utils.json_store import AtomicJsonWriter
+
+logger = get_logger(__name__)
+
+LedgerRecord = ExpenseRecord | IncomeRecord
+
+# Month key (year, month) used for the running totals
+MonthKey = tuple[int, int]
+
+
+def _category_of(record: LedgerRecord) -> BudgetCategory | None:
+    return getattr(record, "category", None)
+
+
+def _month_bounds(month: MonthKey) -> tuple[date, date]:
+    from calendar import monthrange
+
+    year, month_number = month
+    return (
+        date(year, month_number, 1),
+        date(year, month_number, monthrange(year, month_number)[1]),
+    )
+
+
+class FinanceLedger:
+    """Records of one JSON file kept sorted by date with running totals.
+
+    Totals are maintained per month and category as ``Decimal`` so period
+    queries only scan records in partially covered months. The file is
+    re-read when its modification time or size changes.
+    """
+
+    def __init__(
+        self,
+        data_file: Path,
+        record_type: type[ExpenseRecord] | type[IncomeRecord],
+        label: str,
+    ):
+        self.data_file = data_file
+        self.record_type = record_type
+        self.label = label
+
+        self._records: dict[str, LedgerRecord] = {}
+        # (date, record_id) ordered; records are looked up in ``_records``
+        self._by_date: list[tuple[date, str]] = []
+        self._month_totals: dict[MonthKey, dict[BudgetCategory | None, Decimal]] = {}
+
+        self._signature: tuple[int, int] | None = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._writer = AtomicJsonWriter(data_file, prefix=f"{label}_")
+        # Writes in flight; memory is ahead of disk while this is non-zero
+        self._pending_writes = 0
+
+    # === Read API ===
+
+    async def records_between(
+        self,
+        start_date: date,
+        end_date: date,
+        category: BudgetCategory | None = None,
+    ) -> list[LedgerRecord]:
+        """Records dated within [start_date, end_date], oldest first."""
+        await self._ensure_fresh()
+        return self._slice(start_date, end_date, category)
+
+    async def totals_by_category(
+        self, start_date: date, end_date: date
+    ) -> dict[BudgetCategory | None, Decimal]:
+        """Sum of amounts per category within [start_date, end_date]."""
+        await self._ensure_fresh()
+
+        totals: dict[BudgetCategory | None, Decimal] = defaultdict(Decimal)
+        for month, month_totals in self._month_totals.items():
+            month_start, month_end = _month_bounds(month)
+            if month_end < start_date or month_start > end_date:
+                continue
+
+            if start_date <= month_start and month_end <= end_date:
+                for category, amount in month_totals.items():
+                    totals[category] += amount
+            else:
+                # Partially covered month: scan only the overlapping records
+                for record in self._slice(
+                    max(start_date, month_start), min(end_date, month_end)
+                ):
+                    totals[_category_of(record)] += record.amount
+
+        return {category: amount for category, amount in totals.items() if amount}
+
+    async def total(
+        self,
+        start_date: date,
+        end_date: date,
+        category: BudgetCategory | None = None,
+    ) -> Decimal:
+        """Sum of amounts within [start_date, end_date], optionally per category."""
+        totals = await self.totals_by_category(start_date, end_date)
+        if category is not None:
+            return totals.get(category, Decimal(0))
+        return sum(totals.values(), Decimal(0))
+
+    # === Write API ===
+
+    async def add(self, record: LedgerRecord) -> None:
+        """Add a record and persist the ledger."""
+        async with self._lock:
+            await self._ensure_fresh_locked()
+            self._insert(record)
+        await self._save()
+
+    # === Loading / persistence ===
+
+    def _stat_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.data_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _is_fresh(self) -> bool:
+        if not self._loaded:
+            return False
+        return self._pending_writes > 0 or self._stat_signature() == self._signature
+
+    async def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            await self._ensure_fresh_locked()
+
+    async def _ensure_fresh_locked(self) -> None:
+        if self._is_fresh():
+            return
+        signature = self._stat_signature()
+
+        self._replace_all(await self._read_records() if signature else [])
+        self._signature = signature
+        self._loaded = True
+
+    async def _read_records(self) -> list[LedgerRecord]:
+        try:
+            async with aiofiles.open(self.data_file, encoding="utf-8") as f:
+                data = json.loads(await f.read())
+        except Exception as e:
+            logger.error(f"Failed to load {self.label}", error=str(e))
+            return []
+
+        return [
+            self.record_type(**record_data)
+            for record_data in data.values()
+            if isinstance(record_data, dict)
+        ]
+
+    async def _save(self) -> None:
+        self._pending_writes += 1
+        try:
+            await self._writer.write(dict(self._records))
+        except Exception as e:
+            logger.error(f"Failed to save {self.label}", error=str(e))
+            self._loaded = False
+            return
+        finally:
+            self._pending_writes -= 1
+        if not self._pending_writes:
+            self._signature = self._stat_signature()
+
+    # === Indexes ===
+
+    def _replace_all(self, records: Iterable[LedgerRecord]) -> None:
+        self._records = {}
+        self._by_date = []
+        self._month_totals = {}
+        for record in records:
+            self._records[record.id] = record
+            self._by_date.append((record.date, record.id))
+            self._accumulate(record)
+        self._by_date.sort()
+
+    def _insert(self, record: LedgerRecord) -> None:
+        previous = self._records.get(record.id)
+        if previous is not None:
+            self._remove(previous)
+
+        self._records[record.id] = record
+        insort(self._by_date, (record.date, record.id))
+        self._accumulate(record)
+
+    def _remove(self, record: LedgerRecord) -> None:
+        entry = (record.date, record.id)
+        position = bisect_left(self._by_date, entry)
+        if position < len(self._by_date) and self._by_date[position] == entry:
+            del self._by_date[position]
+        self._accumulate(record, sign=-1)
+        del self._records[record.id]
+
+    def _accumulate(self, record: LedgerRecord, sign: int = 1) -> None:
+        month = (record.date.year, record.date.month)
+        month_totals = self._month_totals.setdefault(month, {})
+        category = _category_of(record)
+        month_totals[category] = (
+            month_totals.get(category, Decimal(0)) + sign * record.amount
+        )
+
+    def _slice(
+        self,
+        start_date: date,
+        end_date: date,
+        category: BudgetCategory | None = None,
+    ) -> list[LedgerRecord]:
+        start = bisect_left(self._by_date, start_date, key=lambda item: item[0])
+        end = bisect_right(self._by_date, end_date, key=lambda item: item[0])
+
+        records = [
+            self._records[record_id] for _, record_id in self._by_date[start:end]
+        ]
+        if category is not None:
+            records = [r for r in records if _category_of(r) == category]
+        return records
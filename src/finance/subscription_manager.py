@@ -18,6 +18,7 @@ from src.finance.models import (
     SubscriptionStatus,
 )
 from src.obsidian import ObsidianFileManager
+from src.utils.json_store import AtomicJsonWriter
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -37,6 +38,10 @@ class SubscriptionManager:
 
         # Ensure finance directory exists
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
+        self._subscriptions_writer = AtomicJsonWriter(
+            self.data_file, prefix="subscriptions_"
+        )
+        self._payments_writer = AtomicJsonWriter(self.payments_file, prefix="payments_")
 
     async def add_subscription(
         self,
@@ -303,18 +308,7 @@ class SubscriptionManager:
     async def _save_subscriptions(self, subscriptions: dict[str, Subscription]) -> None:
         """Save subscriptions to JSON file."""
         try:
-            # Convert Subscription objects to dict for JSON serialization
-            data = {}
-            for sub_id, subscription in subscriptions.items():
-                if isinstance(subscription, Subscription):
-                    data[sub_id] = subscription.dict()
-                else:
-                    data[sub_id] = subscription
-
-            async with aiofiles.open(self.data_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
+            await self._subscriptions_writer.write(subscriptions)
         except Exception as e:
             logger.error("Failed to save subscriptions", error=str(e))
 
@@ -345,19 +339,7 @@ class SubscriptionManager:
         try:
             payments = await self._load_payments()
             payments[payment.id] = payment
-
-            # Convert to dict for JSON serialization
-            data = {}
-            for payment_id, payment_obj in payments.items():
-                if isinstance(payment_obj, PaymentRecord):
-                    data[payment_id] = payment_obj.dict()
-                else:
-                    data[payment_id] = payment_obj
-
-            async with aiofiles.open(self.payments_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
+            await self._payments_writer.write(payments)
         except Exception as e:
             logger.error("Failed to save payment", error=str(e))
 
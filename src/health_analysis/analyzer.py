@@ -6,6 +6,8 @@ import uuid
 from datetime import date, timedelta
 from typing import Any
 
+import numpy as np
+
 from src.ai.processor import AIProcessor
 from src.health_analysis.models import (
     AnalysisReport,
@@ -16,6 +18,7 @@ from src.health_analysis.models import (
     TrendAnalysis,
     WeeklyHealthSummary,
 )
+from src.integrations.garmin.metrics import HealthMetricSeries
 from src.integrations.garmin.models import HealthData
 from src.utils.mixins import LoggerMixin
 
@@ -48,6 +51,7 @@ class HealthDataAnalyzer(LoggerMixin):
         health_data_list: list[HealthData],
         week_start: date,
         discord_activity_data: dict[str, Any] | None = None,
+        metric_series: HealthMetricSeries | None = None,
     ) -> AnalysisReport:
         """
         週次健康データサマリーを生成
@@ -56,6 +60,7 @@ class HealthDataAnalyzer(LoggerMixin):
             health_data_list: 健康データのリスト
             week_start: 週の開始日
             discord_activity_data: Discord活動データ（オプション）
+            metric_series: 週の日次メトリクス配列（省略時は health_data_list から構築）
 
         Returns:
             AnalysisReport: 分析レポート
@@ -74,7 +79,11 @@ class HealthDataAnalyzer(LoggerMixin):
             )
 
             # トレンド分析
-            trends = await self._analyze_trends(health_data_list, period_days=7)
+            if metric_series is None:
+                metric_series = HealthMetricSeries.from_health_data(
+                    health_data_list, week_start, week_end
+                )
+            trends = await self._analyze_trends(metric_series, period_days=7)
 
             # 重要な変化を検出
             changes = await self.detect_significant_changes(health_data_list)
@@ -250,41 +259,24 @@ class HealthDataAnalyzer(LoggerMixin):
         return float(std_dev / mean)  # 変動係数
 
     async def _analyze_trends(
-        self, health_data_list: list[HealthData], period_days: int = 7
+        self, metric_series: HealthMetricSeries, period_days: int = 7
     ) -> list[TrendAnalysis]:
         """トレンド分析を実行"""
         trends = []
-
-        # 各メトリクスのトレンド分析
-        metrics = {
-            "sleep_hours": lambda d: (
-                d.sleep.total_sleep_hours if d.sleep and d.sleep.is_valid else None
-            ),
-            "sleep_score": lambda d: (
-                d.sleep.sleep_score if d.sleep and d.sleep.is_valid else None
-            ),
-            "daily_steps": lambda d: (
-                d.steps.total_steps if d.steps and d.steps.is_valid else None
-            ),
-            "resting_hr": lambda d: (
-                d.heart_rate.resting_heart_rate
-                if d.heart_rate and d.heart_rate.is_valid
-                else None
-            ),
-        }
-
-        for metric_name, extractor in metrics.items():
-            values = []
-            dates = []
-
-            for data in health_data_list:
-                value = extractor(data)
-                if value is not None:
-                    values.append(value)
-                    dates.append(data.date)
-
-            if len(values) >= self.min_data_points:
-                trend = self._calculate_trend(metric_name, values, dates, period_days)
+        dates = metric_series.dates
+
+        # 各メトリクスのトレンド分析（欠損日 = NaN を除外）
+        for metric_name in ("sleep_hours", "sleep_score", "daily_steps", "resting_hr"):
+            column = metric_series.metric(metric_name)
+            present = np.flatnonzero(~np.isnan(column))
+
+            if len(present) >= self.min_data_points:
+                trend = self._calculate_trend(
+                    metric_name,
+                    column[present].tolist(),
+                    [dates[i] for i in present],
+                    period_days,
+                )
                 if trend:
                     trends.append(trend)
 
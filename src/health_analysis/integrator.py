@@ -4,11 +4,13 @@ Health data and Discord activity integrator
 
 import statistics
 from collections import defaultdict
-from datetime import date, datetime, timedelta
-from pathlib import Path
+from datetime import date
 from typing import Any
 
+import numpy as np
+
 from src.health_analysis.models import ActivityCorrelation
+from src.integrations.garmin.metrics import HealthMetricSeries
 from src.integrations.garmin.models import HealthData
 from src.obsidian.file_manager import ObsidianFileManager
 from src.utils.mixins import LoggerMixin
@@ -28,7 +30,11 @@ class HealthActivityIntegrator(LoggerMixin):
         self.logger.info("Health-Activity integrator initialized")
 
     async def analyze_activity_correlation(
-        self, health_data_list: list[HealthData], start_date: date, end_date: date
+        self,
+        health_data_list: list[HealthData],
+        start_date: date,
+        end_date: date,
+        metric_series: HealthMetricSeries | None = None,
     ) -> ActivityCorrelation:
         """
         健康データと Discord 活動の相関分析
@@ -37,6 +43,7 @@ class HealthActivityIntegrator(LoggerMixin):
             health_data_list: 健康データリスト
             start_date: 分析開始日
             end_date: 分析終了日
+            metric_series: 期間の日次メトリクス配列（省略時は health_data_list から構築）
 
         Returns:
             ActivityCorrelation: 相関分析結果
@@ -59,9 +66,14 @@ class HealthActivityIntegrator(LoggerMixin):
                 data.date: data for data in health_data_list if data.has_any_data
             }
 
+            if metric_series is None:
+                metric_series = HealthMetricSeries.from_health_data(
+                    health_by_date.values(), start_date, end_date
+                )
+
             # 相関分析を実行
             correlation_analysis = self._calculate_correlations(
-                health_by_date, discord_activity, start_date, end_date
+                health_by_date, metric_series, discord_activity
             )
 
             # パターン分析
@@ -113,18 +125,14 @@ class HealthActivityIntegrator(LoggerMixin):
     async def _collect_discord_activity_data(
         self, start_date: date, end_date: date
     ) -> dict[date, dict[str, Any]]:
-        """Discord 活動データを収集"""
+        """Discord 活動データを収集（日次ロールアップから期間を一括取得）"""
 
         activity_data: dict[date, dict[str, Any]] = {}
 
         try:
-            # デイリーノートから活動データを抽出
-            current_date = start_date
-            while current_date <= end_date:
-                daily_activity = await self._extract_daily_activity(current_date)
-                if daily_activity:
-                    activity_data[current_date] = daily_activity
-                current_date += timedelta(days=1)
+            activity_data = await self.file_manager.activity_rollup.get_range(
+                start_date, end_date
+            )
 
             self.logger.debug(
                 f"Collected Discord activity for {len(activity_data)} days"
@@ -135,99 +143,11 @@ class HealthActivityIntegrator(LoggerMixin):
 
         return activity_data
 
-    async def _extract_daily_activity(self, target_date: date) -> dict[str, Any] | None:
-        """指定日の Discord 活動を抽出"""
-
-        try:
-            # デイリーノートの検索
-            daily_notes = await self.file_manager.search_notes(
-                date_from=datetime.combine(
-                    target_date, datetime.min.time()
-                ).isoformat(),
-                date_to=datetime.combine(target_date, datetime.max.time()).isoformat(),
-                limit=100,
-            )
-
-            if not daily_notes:
-                return None
-
-            activity_summary: dict[str, Any] = {
-                "message_count": len(daily_notes),
-                "active_hours": set(),
-                "channel_activity": defaultdict(int),
-                "content_length_total": 0,
-                "ai_processed_count": 0,
-                "categories": defaultdict(int),
-                "tags": set(),
-            }
-
-            for note_result in daily_notes:
-                # Load the actual note object
-                note = await self.file_manager.load_note(Path(note_result["file_path"]))
-                if not note:
-                    continue
-                # メッセージ時間の抽出
-                if (
-                    hasattr(note.frontmatter, "created")
-                    and note.frontmatter.created
-                    and hasattr(note.frontmatter.created, "hour")
-                ):
-                    hour = note.frontmatter.created.hour
-                    activity_summary["active_hours"].add(hour)
-
-                # チャンネル活動
-                if hasattr(note.frontmatter, "channel_name"):
-                    channel = getattr(note.frontmatter, "channel_name", "unknown")
-                    activity_summary["channel_activity"][channel] += 1
-
-                # コンテンツ長
-                if hasattr(note.frontmatter, "character_count"):
-                    char_count = getattr(note.frontmatter, "character_count", 0)
-                    activity_summary["content_length_total"] += char_count
-
-                # AI 処理済み
-                if (
-                    hasattr(note.frontmatter, "ai_processed")
-                    and note.frontmatter.ai_processed
-                ):
-                    activity_summary["ai_processed_count"] += 1
-
-                # カテゴリとタグ
-                if (
-                    hasattr(note.frontmatter, "ai_category")
-                    and note.frontmatter.ai_category
-                ):
-                    activity_summary["categories"][note.frontmatter.ai_category] += 1
-
-                ai_tags = getattr(note.frontmatter, "ai_tags", [])
-                tags = getattr(note.frontmatter, "tags", [])
-                for tag in ai_tags + tags:
-                    activity_summary["tags"].add(tag.lstrip("#"))
-
-            # データ型を統一
-            activity_summary["active_hours"] = list(activity_summary["active_hours"])
-            activity_summary["channel_activity"] = dict(
-                activity_summary["channel_activity"]
-            )
-            activity_summary["categories"] = dict(activity_summary["categories"])
-            activity_summary["tags"] = list(activity_summary["tags"])
-
-            return activity_summary
-
-        except Exception as e:
-            self.logger.warning(
-                "Failed to extract daily activity",
-                date=target_date.isoformat(),
-                error=str(e),
-            )
-            return None
-
     def _calculate_correlations(
         self,
         health_by_date: dict[date, HealthData],
+        metric_series: HealthMetricSeries,
         discord_activity: dict[date, dict[str, Any]],
-        start_date: date,
-        end_date: date,
     ) -> dict[str, Any]:
         """相関分析を実行"""
 
@@ -246,44 +166,39 @@ class HealthActivityIntegrator(LoggerMixin):
                 self.logger.warning("Insufficient data for correlation analysis")
                 return correlations
 
-            # Discord 活動指標を抽出
+            # Discord 活動指標と健康指標を抽出
             discord_metrics = self._extract_discord_metrics(
                 discord_activity, common_dates
             )
-
-            # 健康指標を抽出
-            health_metrics = self._extract_health_metrics(health_by_date, common_dates)
+            health_metrics = self._extract_health_metrics(metric_series, common_dates)
+
+            # 全指標を 1 つの行列にまとめ、相関行列を一度に計算
+            names = list(discord_metrics) + list(health_metrics)
+            matrix = np.vstack(
+                [*discord_metrics.values(), *health_metrics.values()]
+            ).astype(float)
+            corr = _correlation_matrix(matrix)
+            index = {name: i for i, name in enumerate(names)}
+
+            def pair(first: str, second: str) -> float | None:
+                if first not in index or second not in index:
+                    return None
+                value = corr[index[first], index[second]]
+                return None if np.isnan(value) else float(round(value, 3))
 
             # Discord 活動と健康データの相関
-            for discord_metric, discord_values in discord_metrics.items():
-                for health_metric, health_values in health_metrics.items():
-                    if (
-                        len(discord_values) == len(health_values)
-                        and len(discord_values) >= 3
-                    ):
-                        correlation = self._calculate_correlation_coefficient(
-                            discord_values, health_values
-                        )
-                        if correlation is not None:
-                            correlations["discord_correlations"][
-                                f"{discord_metric}_vs_{health_metric}"
-                            ] = correlation
+            for discord_metric in discord_metrics:
+                for health_metric in health_metrics:
+                    correlation = pair(discord_metric, health_metric)
+                    if correlation is not None:
+                        correlations["discord_correlations"][
+                            f"{discord_metric}_vs_{health_metric}"
+                        ] = correlation
 
             # 健康データ内の相関
-            if "sleep_hours" in health_metrics and "daily_steps" in health_metrics:
-                correlations["sleep_steps"] = self._calculate_correlation_coefficient(
-                    health_metrics["sleep_hours"], health_metrics["daily_steps"]
-                )
-
-            if "sleep_hours" in health_metrics and "resting_hr" in health_metrics:
-                correlations["sleep_hr"] = self._calculate_correlation_coefficient(
-                    health_metrics["sleep_hours"], health_metrics["resting_hr"]
-                )
-
-            if "daily_steps" in health_metrics and "resting_hr" in health_metrics:
-                correlations["steps_hr"] = self._calculate_correlation_coefficient(
-                    health_metrics["daily_steps"], health_metrics["resting_hr"]
-                )
+            correlations["sleep_steps"] = pair("sleep_hours", "daily_steps")
+            correlations["sleep_hr"] = pair("sleep_hours", "resting_hr")
+            correlations["steps_hr"] = pair("daily_steps", "resting_hr")
 
         except Exception as e:
             self.logger.error("Error calculating correlations", error=str(e))
@@ -292,131 +207,47 @@ class HealthActivityIntegrator(LoggerMixin):
 
     def _extract_discord_metrics(
         self, discord_activity: dict[date, dict[str, Any]], common_dates: set[date]
-    ) -> dict[str, list[float]]:
+    ) -> dict[str, np.ndarray]:
         """Discord 活動指標を抽出"""
 
-        metrics: dict[str, list[float]] = {
-            "message_count": [],
-            "active_hours_count": [],
-            "content_length_avg": [],
-            "ai_processing_ratio": [],
+        ordered = [discord_activity[d] for d in sorted(common_dates)]
+        message_count = np.array([a["message_count"] for a in ordered], dtype=float)
+        content_total = np.array(
+            [a["content_length_total"] for a in ordered], dtype=float
+        )
+        ai_processed = np.array([a["ai_processed_count"] for a in ordered], dtype=float)
+
+        # メッセージ 0 件の日は平均・比率とも 0
+        safe_count = np.where(message_count > 0, message_count, 1.0)
+        has_messages = message_count > 0
+
+        return {
+            "message_count": message_count,
+            "active_hours_count": np.array(
+                [len(a["active_hours"]) for a in ordered], dtype=float
+            ),
+            "content_length_avg": np.where(
+                has_messages, content_total / safe_count, 0.0
+            ),
+            "ai_processing_ratio": np.where(
+                has_messages, ai_processed / safe_count, 0.0
+            ),
         }
 
-        for current_date in sorted(common_dates):
-            activity = discord_activity[current_date]
-
-            metrics["message_count"].append(float(activity["message_count"]))
-            metrics["active_hours_count"].append(float(len(activity["active_hours"])))
-
-            # 平均コンテンツ長
-            if activity["message_count"] > 0:
-                avg_content_length = (
-                    activity["content_length_total"] / activity["message_count"]
-                )
-                metrics["content_length_avg"].append(avg_content_length)
-            else:
-                metrics["content_length_avg"].append(0.0)
-
-            # AI 処理率
-            if activity["message_count"] > 0:
-                ai_ratio = activity["ai_processed_count"] / activity["message_count"]
-                metrics["ai_processing_ratio"].append(ai_ratio)
-            else:
-                metrics["ai_processing_ratio"].append(0.0)
-
-        return metrics
-
     def _extract_health_metrics(
-        self, health_by_date: dict[date, HealthData], common_dates: set[date]
-    ) -> dict[str, list[float]]:
-        """健康指標を抽出"""
-
-        metrics: dict[str, list[float]] = {
-            "sleep_hours": [],
-            "sleep_score": [],
-            "daily_steps": [],
-            "resting_hr": [],
-        }
-
-        for current_date in sorted(common_dates):
-            health_data = health_by_date[current_date]
-
-            # 睡眠データ
-            if health_data.sleep and health_data.sleep.is_valid:
-                if health_data.sleep.total_sleep_hours:
-                    metrics["sleep_hours"].append(health_data.sleep.total_sleep_hours)
-                else:
-                    metrics["sleep_hours"].append(0.0)
-
-                if health_data.sleep.sleep_score:
-                    metrics["sleep_score"].append(float(health_data.sleep.sleep_score))
-                else:
-                    metrics["sleep_score"].append(0.0)
-            else:
-                metrics["sleep_hours"].append(0.0)
-                metrics["sleep_score"].append(0.0)
-
-            # 歩数データ
-            if health_data.steps and health_data.steps.is_valid:
-                if health_data.steps.total_steps:
-                    metrics["daily_steps"].append(float(health_data.steps.total_steps))
-                else:
-                    metrics["daily_steps"].append(0.0)
-            else:
-                metrics["daily_steps"].append(0.0)
-
-            # 心拍数データ
-            if health_data.heart_rate and health_data.heart_rate.is_valid:
-                if health_data.heart_rate.resting_heart_rate:
-                    metrics["resting_hr"].append(
-                        float(health_data.heart_rate.resting_heart_rate)
-                    )
-                else:
-                    metrics["resting_hr"].append(0.0)
-            else:
-                metrics["resting_hr"].append(0.0)
+        self, series: HealthMetricSeries, common_dates: set[date]
+    ) -> dict[str, np.ndarray]:
+        """健康指標を抽出（欠損値は 0.0、全て 0 の指標は除外）"""
 
-        # 空のリストを削除
-        metrics = {
-            k: v for k, v in metrics.items() if v and not all(x == 0.0 for x in v)
-        }
+        ordered_dates = sorted(common_dates)
+        metrics: dict[str, np.ndarray] = {}
+        for name in ("sleep_hours", "sleep_score", "daily_steps", "resting_hr"):
+            values = np.nan_to_num(series.take(ordered_dates, name), nan=0.0)
+            if values.size and values.any():
+                metrics[name] = values
 
         return metrics
 
-    def _calculate_correlation_coefficient(
-        self, values1: list[float], values2: list[float]
-    ) -> float | None:
-        """相関係数を計算"""
-
-        if len(values1) != len(values2) or len(values1) < 3:
-            return None
-
-        try:
-            # ゼロ分散のチェック
-            if statistics.variance(values1) == 0 or statistics.variance(values2) == 0:
-                return None
-
-            # ピアソン相関係数を計算
-            n = len(values1)
-            sum_x = sum(values1)
-            sum_y = sum(values2)
-            sum_xy = sum(x * y for x, y in zip(values1, values2, strict=False))
-            sum_x2 = sum(x * x for x in values1)
-            sum_y2 = sum(y * y for y in values2)
-
-            numerator = n * sum_xy - sum_x * sum_y
-            denominator = ((n * sum_x2 - sum_x**2) * (n * sum_y2 - sum_y**2)) ** 0.5
-
-            if denominator == 0:
-                return None
-
-            correlation = numerator / denominator
-            return float(round(correlation, 3))
-
-        except Exception as e:
-            self.logger.warning(f"Error calculating correlation: {e}")
-            return None
-
     async def _analyze_activity_patterns(
         self,
         health_by_date: dict[date, HealthData],
@@ -641,3 +472,17 @@ class HealthActivityIntegrator(LoggerMixin):
             recommendations.append("推奨事項の生成中にエラーが発生しました。")
 
         return recommendations
+
+
+def _correlation_matrix(matrix: np.ndarray) -> np.ndarray:
+    """行ごとのピアソン相関行列（ゼロ分散の行を含む要素は NaN）"""
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered**2).sum(axis=1))
+    constant = np.ptp(matrix, axis=1) == 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (centered @ centered.T) / np.outer(norms, norms)
+
+    corr[constant, :] = np.nan
+    corr[:, constant] = np.nan
+    return np.clip(corr, -1.0, 1.0)
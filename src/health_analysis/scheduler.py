@@ -134,11 +134,17 @@ class HealthAnalysisScheduler:
                 self.logger.warning("No health data available for weekly analysis")
                 return
 
+            # 取得済みの週をキャッシュから日次メトリクス配列として読み込む
+            metric_series = self.garmin_client.get_health_metric_range(
+                week_start, week_end
+            )
+
             # 週次サマリーを生成
             analysis_report = await self.analyzer.generate_weekly_summary(
                 health_data_list=health_data_list,
                 week_start=week_start,
                 discord_activity_data=None,  # 将来の拡張用
+                metric_series=metric_series,
             )
 
             # 活動相関分析
@@ -146,6 +152,7 @@ class HealthAnalysisScheduler:
                 health_data_list=health_data_list,
                 start_date=week_start,
                 end_date=week_end,
+                metric_series=metric_series,
             )
 
             # 分析結果をデイリーノートに保存
@@ -180,17 +187,15 @@ class HealthAnalysisScheduler:
         health_data_list = []
 
         try:
-            current_date = start_date
-            while current_date <= end_date:
-                health_data = await self.garmin_client.get_health_data(
-                    target_date=current_date,
-                    use_cache=True,  # キャッシュを積極的に使用
-                )
-
-                if health_data and health_data.has_any_data:
-                    health_data_list.append(health_data)
-
-                current_date += timedelta(days=1)
+            # 期間一括取得（有効なキャッシュ日はスキップし、残りを並列取得）
+            week_data = await self.garmin_client.get_health_data_range(
+                start_date, end_date, use_cache=True
+            )
+            health_data_list = [
+                health_data
+                for health_data in week_data
+                if health_data and health_data.has_any_data
+            ]
 
             self.logger.debug(
                 f"Collected {len(health_data_list)} days of health data",
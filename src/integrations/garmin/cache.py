@@ -4,16 +4,41 @@ Garmin health data caching system
 
 import json
 import os
+import sqlite3
+import threading
+import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from src.integrations.garmin.metrics import (
+    HEALTH_METRICS,
+    HealthMetricSeries,
+    extract_daily_metrics,
+)
 from src.integrations.garmin.models import HealthData
 from src.utils.mixins import LoggerMixin
 
+CACHE_DB_NAME = "health_cache.sqlite3"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS health_days (
+    day TEXT PRIMARY KEY,
+    stored_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    {", ".join(f"{name} REAL" for name in HEALTH_METRICS)}
+)
+"""
+
 
 class GarminDataCache(LoggerMixin):
-    """Garmin 健康データのキャッシュシステム"""
+    """Garmin 健康データのキャッシュシステム
+
+    1 日 1 行の SQLite テーブルに、HealthData 本体（JSON）と分析用の
+    日次メトリクス列、行ごとの保存時刻（鮮度判定用）を保持する。
+    旧形式の日別 JSON ファイル（``health_data_YYYY-MM-DD.json``）は
+    初期化時に取り込んで削除する。
+    """
 
     def __init__(self, cache_dir: Path, max_age_hours: float = 24.0) -> None:
         """
@@ -36,61 +61,87 @@ class GarminDataCache(LoggerMixin):
                     cache_dir=str(self.cache_dir),
                 )
 
+        self.db_path = self.cache_dir / CACHE_DB_NAME
+        self._lock = threading.Lock()
+        self._conn = self._open_database()
+
+        migrated = self.migrate_legacy_files()
+
         self.logger.info(
             "Garmin data cache initialized",
             cache_dir=str(self.cache_dir),
             max_age_hours=max_age_hours,
+            migrated_files=migrated,
         )
 
-    def _get_cache_file_path(self, target_date: date) -> Path:
-        """指定日付のキャッシュファイルパスを取得"""
-        filename = f"health_data_{target_date.isoformat()}.json"
-        return self.cache_dir / filename
+    def _open_database(self) -> sqlite3.Connection:
+        """キャッシュ DB を開く（ファイル権限は 0o600）"""
+        if not self.db_path.exists():
+            # 作成時点から他ユーザーに読めないようにする
+            fd = os.open(self.db_path, os.O_CREAT | os.O_WRONLY, 0o600)
+            os.close(fd)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute(_SCHEMA)
+        conn.commit()
+
+        if hasattr(os, "chmod"):
+            try:
+                os.chmod(self.db_path, 0o600)
+            except OSError:
+                self.logger.warning(
+                    "Failed to tighten cache file permissions",
+                    cache_file=str(self.db_path),
+                )
+        return conn
+
+    def close(self) -> None:
+        """DB 接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    def _age_hours(self, stored_at: float) -> float:
+        return (time.time() - stored_at) / 3600
+
+    def _upsert(self, health_data: HealthData, stored_at: float) -> None:
+        metrics = extract_daily_metrics(health_data)
+        columns = ", ".join(HEALTH_METRICS)
+        placeholders = ", ".join("?" for _ in HEALTH_METRICS)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO health_days "
+                f"(day, stored_at, payload, {columns}) "
+                f"VALUES (?, ?, ?, {placeholders})",
+                (
+                    health_data.date.isoformat(),
+                    stored_at,
+                    health_data.model_dump_json(),
+                    *(metrics[name] for name in HEALTH_METRICS),
+                ),
+            )
+            self._conn.commit()
+
+    def _row_to_health_data(self, payload: str, stored_at: float) -> HealthData:
+        health_data = HealthData.model_validate_json(payload)
+        # キャッシュメタデータを更新
+        health_data.is_cached_data = True
+        health_data.cache_age_hours = self._age_hours(stored_at)
+        health_data.retrieved_at = datetime.fromtimestamp(stored_at)
+        return health_data
 
     def save_health_data(self, health_data: HealthData) -> bool:
         """健康データをキャッシュに保存"""
         try:
-            cache_file = self._get_cache_file_path(health_data.date)
-
             # キャッシュメタデータを更新
             health_data.is_cached_data = False  # 最新データとしてマーク
             health_data.cache_age_hours = 0.0
 
-            def json_serializer(obj):
-                """カスタム JSON シリアライザー"""
-                from datetime import date as date_type
-                from datetime import datetime as datetime_type
-
-                if isinstance(obj, (date_type, datetime_type)):
-                    return obj.isoformat()
-                raise TypeError(
-                    f"Object of type {type(obj).__name__} is not JSON serializable"
-                )
-
-            with open(cache_file, "w", encoding="utf-8") as f:
-                # Convert HealthData to dict for JSON serialization
-                health_data_dict = health_data.model_dump()
-                json.dump(
-                    health_data_dict,
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                    default=json_serializer,
-                )
-
-            if hasattr(os, "chmod"):
-                try:
-                    os.chmod(cache_file, 0o600)
-                except OSError:
-                    self.logger.warning(
-                        "Failed to tighten cache file permissions",
-                        cache_file=str(cache_file),
-                    )
+            self._upsert(health_data, time.time())
 
             self.logger.info(
                 "Health data cached successfully",
                 date=health_data.date.isoformat(),
-                cache_file=str(cache_file),
+                cache_file=str(self.db_path),
             )
             return True
 
@@ -107,132 +158,130 @@ class GarminDataCache(LoggerMixin):
         self, target_date: date, allow_stale: bool = True
     ) -> HealthData | None:
         """キャッシュから健康データを読み込み"""
-        try:
-            cache_file = self._get_cache_file_path(target_date)
-
-            if not cache_file.exists():
-                self.logger.debug("Cache file not found", date=target_date.isoformat())
-                return None
-
-            # ファイルの更新時刻を確認
-            file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
-            age_hours = (datetime.now() - file_mtime).total_seconds() / 3600
-
-            # 古すぎるキャッシュの処理
-            if not allow_stale and age_hours > self.max_age_hours:
-                self.logger.debug(
-                    "Cache file too old",
-                    date=target_date.isoformat(),
-                    age_hours=age_hours,
-                    max_age_hours=self.max_age_hours,
-                )
-                return None
-
-            # キャッシュデータの読み込み
-            with open(cache_file, encoding="utf-8") as f:
-                health_data_dict = json.load(f)
-
-                # 日付文字列を日付オブジェクトに復元
-                def restore_dates(obj):
-                    """再帰的に日付文字列を日付オブジェクトに復元"""
-                    if isinstance(obj, dict):
-                        result = {}
-                        for key, value in obj.items():
-                            if key == "date" and isinstance(value, str):
-                                try:
-                                    result[key] = datetime.fromisoformat(value).date()
-                                except ValueError:
-                                    result[key] = value
-                            elif key in ["bedtime", "wake_time"] and isinstance(
-                                value, str
-                            ):
-                                try:
-                                    result[key] = datetime.fromisoformat(value)
-                                except ValueError:
-                                    result[key] = value
-                            elif key == "retrieved_at" and isinstance(value, str):
-                                try:
-                                    result[key] = datetime.fromisoformat(value)
-                                except ValueError:
-                                    result[key] = value
-                            else:
-                                result[key] = restore_dates(value)
-                        return result
-                    elif isinstance(obj, list):
-                        return [restore_dates(item) for item in obj]
-                    else:
-                        return obj
-
-                health_data_dict = restore_dates(health_data_dict)
-                health_data = HealthData(**health_data_dict)
+        cached = self.load_health_data_range(
+            target_date, target_date, allow_stale=allow_stale
+        )
+        return cached.get(target_date)
 
-            # キャッシュメタデータを更新
-            health_data.is_cached_data = True
-            health_data.cache_age_hours = age_hours
-            health_data.retrieved_at = file_mtime
+    def load_health_data_range(
+        self, start_date: date, end_date: date, allow_stale: bool = True
+    ) -> dict[date, HealthData]:
+        """期間内のキャッシュ済み健康データを 1 クエリで読み込み"""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT day, stored_at, payload FROM health_days "
+                    "WHERE day BETWEEN ? AND ? ORDER BY day",
+                    (start_date.isoformat(), end_date.isoformat()),
+                ).fetchall()
+
+            result: dict[date, HealthData] = {}
+            for _day, stored_at, payload in rows:
+                # 古すぎるキャッシュの処理
+                if not allow_stale and self._age_hours(stored_at) > self.max_age_hours:
+                    continue
+                health_data = self._row_to_health_data(payload, stored_at)
+                result[health_data.date] = health_data
 
-            self.logger.info(
+            self.logger.debug(
                 "Health data loaded from cache",
-                date=target_date.isoformat(),
-                age_hours=age_hours,
-                is_stale=age_hours > self.max_age_hours,
+                start_date=start_date.isoformat(),
+                end_date=end_date.isoformat(),
+                days=len(result),
             )
-
-            return health_data
+            return result
 
         except Exception as e:
             self.logger.error(
                 "Failed to load cached health data",
-                date=target_date.isoformat(),
+                start_date=start_date.isoformat(),
+                end_date=end_date.isoformat(),
                 error=str(e),
                 exc_info=True,
             )
-            return None
+            return {}
+
+    def load_metric_range(
+        self, start_date: date, end_date: date, allow_stale: bool = True
+    ) -> HealthMetricSeries:
+        """期間内の日次メトリクス配列を読み込み（モデルは構築しない）"""
+        series = HealthMetricSeries(start_date=start_date, end_date=end_date)
+        columns = ", ".join(HEALTH_METRICS)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT day, stored_at, {columns} FROM health_days "
+                    "WHERE day BETWEEN ? AND ?",
+                    (start_date.isoformat(), end_date.isoformat()),
+                ).fetchall()
+        except Exception as e:
+            self.logger.error(
+                "Failed to load cached metrics", error=str(e), exc_info=True
+            )
+            return series
+
+        for day, stored_at, *values in rows:
+            if not allow_stale and self._age_hours(stored_at) > self.max_age_hours:
+                continue
+            series.set_day(
+                date.fromisoformat(day), dict(zip(HEALTH_METRICS, values, strict=True))
+            )
+        return series
+
+    def valid_dates(self, start_date: date, end_date: date) -> set[date]:
+        """期間内で有効（max_age_hours 以内）なキャッシュがある日付"""
+        cutoff = time.time() - self.max_age_hours * 3600
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT day FROM health_days "
+                    "WHERE day BETWEEN ? AND ? AND stored_at >= ?",
+                    (start_date.isoformat(), end_date.isoformat(), cutoff),
+                ).fetchall()
+        except Exception as e:
+            self.logger.warning("Failed to check cache validity", error=str(e))
+            return set()
+        return {date.fromisoformat(day) for (day,) in rows}
 
     def is_cache_valid(self, target_date: date) -> bool:
         """指定日付のキャッシュが有効かどうかを確認"""
-        cache_file = self._get_cache_file_path(target_date)
+        return target_date in self.valid_dates(target_date, target_date)
 
-        if not cache_file.exists():
-            return False
-
-        try:
-            file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
-            age_hours = (datetime.now() - file_mtime).total_seconds() / 3600
-            return age_hours <= self.max_age_hours
+    def migrate_legacy_files(self) -> int:
+        """旧形式の日別 JSON キャッシュを DB に取り込み、元ファイルを削除"""
+        migrated = 0
+        for cache_file in sorted(self.cache_dir.glob("health_data_*.json")):
+            try:
+                stored_at = cache_file.stat().st_mtime
+                with open(cache_file, encoding="utf-8") as f:
+                    health_data = HealthData.model_validate(json.load(f))
+                self._upsert(health_data, stored_at)
+                cache_file.unlink()
+                migrated += 1
+            except Exception as e:
+                self.logger.warning(
+                    "Failed to migrate legacy cache file",
+                    file=str(cache_file),
+                    error=str(e),
+                )
 
-        except Exception as e:
-            self.logger.warning(
-                "Failed to check cache validity",
-                date=target_date.isoformat(),
-                error=str(e),
-            )
-            return False
+        if migrated:
+            self.logger.info("Migrated legacy Garmin cache files", count=migrated)
+        return migrated
 
     def cleanup_old_cache(self, days_to_keep: int = 7) -> int:
-        """古いキャッシュファイルを削除"""
+        """古いキャッシュ行を削除"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            deleted_count = 0
-
-            for cache_file in self.cache_dir.glob("health_data_*.pkl"):
-                try:
-                    file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
-                    if file_mtime < cutoff_date:
-                        cache_file.unlink()
-                        deleted_count += 1
-
-                except Exception as e:
-                    self.logger.warning(
-                        "Failed to delete old cache file",
-                        file=str(cache_file),
-                        error=str(e),
-                    )
-                    continue
+            cutoff = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
+            with self._lock:
+                deleted_count = self._conn.execute(
+                    "DELETE FROM health_days WHERE stored_at < ?", (cutoff,)
+                ).rowcount
+                self._conn.commit()
 
             if deleted_count > 0:
                 self.logger.info(
-                    "Cleaned up old cache files",
+                    "Cleaned up old cache entries",
                     deleted_count=deleted_count,
                     days_to_keep=days_to_keep,
                 )
@@ -248,42 +297,29 @@ class GarminDataCache(LoggerMixin):
     def get_cache_stats(self) -> dict[str, Any]:
         """キャッシュの統計情報を取得"""
         try:
-            cache_files = list(self.cache_dir.glob("health_data_*.pkl"))
-            total_files = len(cache_files)
-
-            if total_files == 0:
-                return {
-                    "total_files": 0,
-                    "total_size_mb": 0.0,
-                    "oldest_cache": None,
-                    "newest_cache": None,
-                }
-
-            # ファイルサイズの計算
-            total_size = sum(f.stat().st_size for f in cache_files)
-            total_size_mb = total_size / (1024 * 1024)
-
-            # 最新・最古のキャッシュファイル
-            file_times = [
-                (f, datetime.fromtimestamp(f.stat().st_mtime)) for f in cache_files
-            ]
-            file_times.sort(key=lambda x: x[1])
-
-            oldest_cache = file_times[0][1].isoformat() if file_times else None
-            newest_cache = file_times[-1][1].isoformat() if file_times else None
+            with self._lock:
+                total_entries, oldest, newest = self._conn.execute(
+                    "SELECT COUNT(*), MIN(stored_at), MAX(stored_at) FROM health_days"
+                ).fetchone()
+
+            total_size_mb = self.db_path.stat().st_size / (1024 * 1024)
 
             return {
-                "total_files": total_files,
+                "total_entries": total_entries,
                 "total_size_mb": round(total_size_mb, 2),
-                "oldest_cache": oldest_cache,
-                "newest_cache": newest_cache,
+                "oldest_cache": (
+                    datetime.fromtimestamp(oldest).isoformat() if oldest else None
+                ),
+                "newest_cache": (
+                    datetime.fromtimestamp(newest).isoformat() if newest else None
+                ),
                 "cache_dir": str(self.cache_dir),
             }
 
         except Exception as e:
             self.logger.error("Failed to get cache stats", error=str(e), exc_info=True)
             return {
-                "total_files": 0,
+                "total_entries": 0,
                 "total_size_mb": 0.0,
                 "oldest_cache": None,
                 "newest_cache": None,
@@ -5,6 +5,8 @@ Garmin Connect client for health data retrieval
 import asyncio
 import os
 import socket
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -24,6 +26,7 @@ from tenacity import (
 
 from src.config import get_settings
 from src.integrations.garmin.cache import GarminDataCache
+from src.integrations.garmin.metrics import HealthMetricSeries
 from src.integrations.garmin.models import (
     ActivityData,
     DataError,
@@ -39,6 +42,7 @@ from src.integrations.garmin.models import (
     SleepData,
     StepsData,
 )
+from src.integrations.garmin.rate_limit import TokenBucketRateLimiter
 from src.utils.mixins import LoggerMixin
 
 # Settings loaded lazily to avoid circular imports
@@ -70,6 +74,17 @@ class GarminClient(LoggerMixin):
         self.max_consecutive_failures = 3
         self.backoff_hours = 1.0
 
+        # API 呼び出しの並列度とレート制限（専用スレッドプール + トークンバケット）
+        self.max_concurrent_requests = 4
+        self.max_concurrent_days = 3
+        self.rate_limiter = TokenBucketRateLimiter(
+            rate=2.0, capacity=self.max_concurrent_requests
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_requests,
+            thread_name_prefix="garmin-api",
+        )
+
         self.logger.info(
             "Garmin client initialized",
             has_credentials=bool(self.email and self.password),
@@ -176,9 +191,9 @@ class GarminClient(LoggerMixin):
             self.logger.info("Attempting to authenticate with Garmin Connect")
 
             # タイムアウト付きで非同期実行
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             self.client = await asyncio.wait_for(
-                loop.run_in_executor(None, self._create_client),
+                loop.run_in_executor(self._executor, self._create_client),
                 timeout=self.api_timeout,
             )
 
@@ -237,6 +252,15 @@ class GarminClient(LoggerMixin):
                 self.logger.info("Re-authenticating due to session timeout")
                 await self.authenticate()
 
+    async def _call_api[T](self, func: Callable[[], T]) -> T:
+        """レート制限を守りつつ専用スレッドプールで API を呼び出す"""
+        await self.rate_limiter.acquire()
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._executor, func),
+            timeout=self.api_timeout,
+        )
+
     async def get_health_data(
         self, target_date: date, use_cache: bool = True
     ) -> HealthData:
@@ -276,40 +300,127 @@ class GarminClient(LoggerMixin):
             GarminTimeoutError,
             GarminOfflineError,
         ) as e:
-            # 接続エラーの場合、キャッシュデータがあれば返す
-            if use_cache:
-                cached_data = self.cache.load_health_data(target_date, allow_stale=True)
-                if cached_data:
-                    self.logger.warning(
-                        "Using stale cached data due to connection error",
-                        date=target_date.isoformat(),
-                        cache_age_hours=cached_data.cache_age_hours,
-                        error=str(e),
-                    )
-                    # エラー情報を追加
-                    cached_data.detailed_errors.append(
-                        DataError(
-                            source=DataSource.SLEEP,  # 代表的なソース
-                            error_type=type(e).__name__,
-                            message=str(e),
-                            is_recoverable=True,
-                            user_message="Garminサーバーとの接続に問題があるため、キャッシュされたデータを表示しています",
-                        )
-                    )
-                    return cached_data
+            return self._fallback_health_data(target_date, e, use_cache)
 
-            # キャッシュもない場合は空のHealthDataを返す
-            health_data = HealthData(date=target_date)
-            health_data.detailed_errors.append(
-                DataError(
-                    source=DataSource.SLEEP,
-                    error_type=type(e).__name__,
-                    message=str(e),
-                    is_recoverable=True,
-                    user_message=self._get_user_friendly_error_message(e),
+    def _fallback_health_data(
+        self, target_date: date, error: Exception, use_cache: bool
+    ) -> HealthData:
+        """接続エラー時の代替データ（古いキャッシュ、なければ空データ）"""
+        # 接続エラーの場合、キャッシュデータがあれば返す
+        if use_cache:
+            cached_data = self.cache.load_health_data(target_date, allow_stale=True)
+            if cached_data:
+                self.logger.warning(
+                    "Using stale cached data due to connection error",
+                    date=target_date.isoformat(),
+                    cache_age_hours=cached_data.cache_age_hours,
+                    error=str(error),
                 )
+                # エラー情報を追加
+                cached_data.detailed_errors.append(
+                    DataError(
+                        source=DataSource.SLEEP,  # 代表的なソース
+                        error_type=type(error).__name__,
+                        message=str(error),
+                        is_recoverable=True,
+                        user_message="Garminサーバーとの接続に問題があるため、キャッシュされたデータを表示しています",
+                    )
+                )
+                return cached_data
+
+        # キャッシュもない場合は空のHealthDataを返す
+        health_data = HealthData(date=target_date)
+        health_data.detailed_errors.append(
+            DataError(
+                source=DataSource.SLEEP,
+                error_type=type(error).__name__,
+                message=str(error),
+                is_recoverable=True,
+                user_message=self._get_user_friendly_error_message(error),
             )
-            return health_data
+        )
+        return health_data
+
+    async def iter_health_data_range(
+        self, start_date: date, end_date: date, use_cache: bool = True
+    ) -> AsyncIterator[HealthData]:
+        """期間内の健康データを取得できた順に返す
+
+        有効なキャッシュがある日は API を呼ばずに先に返し、残りの日は
+        ``max_concurrent_days`` 日ずつ並列に取得する（API 呼び出し自体は
+        トークンバケットと専用スレッドプールで制限される）。
+        """
+        if start_date > end_date:
+            raise ValueError("Start date must be before or equal to end date")
+
+        fresh_cache = (
+            self.cache.load_health_data_range(start_date, end_date, allow_stale=False)
+            if use_cache
+            else {}
+        )
+
+        missing_dates = []
+        current_date = start_date
+        while current_date <= end_date:
+            cached_data = fresh_cache.get(current_date)
+            if cached_data:
+                yield cached_data
+            else:
+                missing_dates.append(current_date)
+            current_date += timedelta(days=1)
+
+        if not missing_dates:
+            return
+
+        # 認証は 1 回だけ行い、失敗した日は代替データで埋める
+        try:
+            await self.ensure_authenticated()
+        except (
+            GarminConnectionError,
+            GarminAuthenticationError,
+            GarminTimeoutError,
+            GarminOfflineError,
+        ) as e:
+            for target_date in missing_dates:
+                yield self._fallback_health_data(target_date, e, use_cache)
+            return
+
+        self.logger.info(
+            "Retrieving health data range",
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            missing_days=len(missing_dates),
+        )
+
+        day_slots = asyncio.Semaphore(self.max_concurrent_days)
+
+        async def fetch_day(target_date: date) -> HealthData:
+            async with day_slots:
+                try:
+                    return await self.get_health_data(target_date, use_cache=use_cache)
+                except Exception as e:
+                    # 1 日分の失敗で期間全体を中断しない
+                    return self._fallback_health_data(target_date, e, use_cache)
+
+        tasks = [asyncio.create_task(fetch_day(d)) for d in missing_dates]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_health_data_range(
+        self, start_date: date, end_date: date, use_cache: bool = True
+    ) -> list[HealthData]:
+        """期間内の健康データを日付順で取得"""
+        results = [
+            health_data
+            async for health_data in self.iter_health_data_range(
+                start_date, end_date, use_cache=use_cache
+            )
+        ]
+        return sorted(results, key=lambda health_data: health_data.date)
 
     async def _retrieve_fresh_health_data(self, target_date: date) -> HealthData:
         """新鮮な健康データを取得"""
@@ -320,18 +431,22 @@ class GarminClient(LoggerMixin):
         health_data = HealthData(date=target_date)
         detailed_errors = []
 
-        # 各データ取得にスリープを追加してレート制限を回避
+        # 各データソースを並列に取得（レート制限は _call_api のトークンバケットで制御）
         data_sources = [
             (DataSource.SLEEP, self._get_sleep_data_with_delay),
             (DataSource.STEPS, self._get_steps_data_with_delay),
             (DataSource.HEART_RATE, self._get_heart_rate_data_with_delay),
             (DataSource.ACTIVITIES, self._get_activities_data_with_delay),
         ]
+        results = await asyncio.gather(
+            *(get_data_func(target_date) for _, get_data_func in data_sources),
+            return_exceptions=True,
+        )
 
-        for source, get_data_func in data_sources:
+        for (source, _), data in zip(data_sources, results, strict=True):
             try:
-                await asyncio.sleep(0.5)  # レート制限対策
-                data = await get_data_func(target_date)
+                if isinstance(data, BaseException):
+                    raise data
 
                 # データの設定
                 if source == DataSource.SLEEP and isinstance(data, SleepData):
@@ -422,15 +537,9 @@ class GarminClient(LoggerMixin):
             raise GarminConnectionError("Garmin client not authenticated")
 
         try:
-            loop = asyncio.get_event_loop()
-
             # 睡眠データの取得（タイムアウト付き）
-            raw_sleep_data = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.get_sleep_data(target_date.isoformat()),  # type: ignore
-                ),
-                timeout=self.api_timeout,
+            raw_sleep_data = await self._call_api(
+                lambda: self.client.get_sleep_data(target_date.isoformat()),  # type: ignore
             )
 
             if not raw_sleep_data:
@@ -523,17 +632,11 @@ class GarminClient(LoggerMixin):
             raise GarminConnectionError("Garmin client not authenticated")
 
         try:
-            loop = asyncio.get_event_loop()
-
             # 🔧 修正: ユーザーサマリーから日次集計データを取得
             # Steps APIは15分間隔のタイムスロットデータを返すため、
             # ユーザーサマリーから日次集計値を直接取得する方が効率的
-            user_summary = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.get_user_summary(target_date.isoformat()),  # type: ignore
-                ),
-                timeout=self.api_timeout,
+            user_summary = await self._call_api(
+                lambda: self.client.get_user_summary(target_date.isoformat()),  # type: ignore
             )
 
             if not user_summary:
@@ -595,15 +698,9 @@ class GarminClient(LoggerMixin):
             raise GarminConnectionError("Garmin client not authenticated")
 
         try:
-            loop = asyncio.get_event_loop()
-
             # 心拍数データの取得（タイムアウト付き）
-            hr_data = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.get_heart_rates(target_date.isoformat()),  # type: ignore
-                ),
-                timeout=self.api_timeout,
+            hr_data = await self._call_api(
+                lambda: self.client.get_heart_rates(target_date.isoformat()),  # type: ignore
             )
 
             if not hr_data:
@@ -658,17 +755,11 @@ class GarminClient(LoggerMixin):
             raise GarminConnectionError("Garmin client not authenticated")
 
         try:
-            loop = asyncio.get_event_loop()
-
             # 活動データの取得（タイムアウト付き）
-            activities = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.get_activities_by_date(  # type: ignore
-                        target_date.isoformat(), target_date.isoformat()
-                    ),
-                ),
-                timeout=self.api_timeout,
+            activities = await self._call_api(
+                lambda: self.client.get_activities_by_date(  # type: ignore
+                    target_date.isoformat(), target_date.isoformat()
+                )
             )
 
             if not activities:
@@ -761,6 +852,12 @@ class GarminClient(LoggerMixin):
             )
             return None
 
+    def get_health_metric_range(
+        self, start_date: date, end_date: date
+    ) -> HealthMetricSeries:
+        """キャッシュ済みの日次メトリクス配列を取得（API は呼ばない）"""
+        return self.cache.load_metric_range(start_date, end_date)
+
     def get_cache_stats(self) -> dict[str, Any]:
         """キャッシュの統計情報を取得"""
         return self.cache.get_cache_stats()
@@ -769,6 +866,14 @@ class GarminClient(LoggerMixin):
         """古いキャッシュをクリーンアップ"""
         return self.cache.cleanup_old_cache(days_to_keep)
 
+    async def close(self) -> None:
+        """API 用スレッドプールとキャッシュ DB を閉じる
+
+        実行中の API 呼び出しは待たず、未着手の呼び出しは取り消す。
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
     async def test_connection(self) -> dict[str, Any]:
         """接続テスト"""
         try:
@@ -778,15 +883,10 @@ class GarminClient(LoggerMixin):
                 raise GarminConnectionError("Garmin client not authenticated")
 
             # 基本的なユーザー情報を取得してテスト（タイムアウト付き）
-            loop = asyncio.get_event_loop()
-            user_summary = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.get_user_summary(  # type: ignore
-                        datetime.now().date().isoformat()
-                    ),
-                ),
-                timeout=self.api_timeout,
+            user_summary = await self._call_api(
+                lambda: self.client.get_user_summary(  # type: ignore
+                    datetime.now().date().isoformat()
+                )
             )
 
             return {
@@ -0,0 +1,118 @@
+"""
+Daily Garmin metric arrays shared by the cache and the health analyzers
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.integrations.garmin.models import HealthData
+
+# 分析で使う日次メトリクス（キャッシュの列名と共通）
+HEALTH_METRICS = (
+    "sleep_hours",
+    "sleep_score",
+    "daily_steps",
+    "resting_hr",
+    "workout_count",
+    "workout_minutes",
+)
+
+
+def extract_daily_metrics(health_data: HealthData) -> dict[str, float | None]:
+    """HealthData から日次メトリクスを抽出（無効なデータは None）"""
+    sleep = (
+        health_data.sleep if health_data.sleep and health_data.sleep.is_valid else None
+    )
+    steps = (
+        health_data.steps if health_data.steps and health_data.steps.is_valid else None
+    )
+    heart_rate = (
+        health_data.heart_rate
+        if health_data.heart_rate and health_data.heart_rate.is_valid
+        else None
+    )
+
+    workout_minutes = sum(
+        activity.duration_minutes or 0 for activity in health_data.activities
+    )
+
+    return {
+        "sleep_hours": sleep.total_sleep_hours if sleep else None,
+        "sleep_score": _as_float(sleep.sleep_score) if sleep else None,
+        "daily_steps": _as_float(steps.total_steps) if steps else None,
+        "resting_hr": _as_float(heart_rate.resting_heart_rate) if heart_rate else None,
+        "workout_count": float(len(health_data.activities)),
+        "workout_minutes": float(workout_minutes),
+    }
+
+
+def _as_float(value: int | float | None) -> float | None:
+    return None if value is None else float(value)
+
+
+@dataclass
+class HealthMetricSeries:
+    """連続した日付範囲の日次メトリクス配列（欠損は NaN）"""
+
+    start_date: date
+    end_date: date
+    values: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for name in HEALTH_METRICS:
+            if name not in self.values:
+                self.values[name] = np.full(self.days, np.nan)
+
+    @property
+    def days(self) -> int:
+        return max(0, (self.end_date - self.start_date).days + 1)
+
+    @property
+    def dates(self) -> list[date]:
+        return [self.start_date + timedelta(days=i) for i in range(self.days)]
+
+    def metric(self, name: str) -> np.ndarray:
+        """メトリクスの日次配列"""
+        return self.values[name]
+
+    def index_of(self, target_date: date) -> int:
+        return (target_date - self.start_date).days
+
+    def set_day(self, target_date: date, metrics: dict[str, float | None]) -> None:
+        position = self.index_of(target_date)
+        if not 0 <= position < self.days:
+            return
+        for name, value in metrics.items():
+            if name in self.values:
+                self.values[name][position] = np.nan if value is None else value
+
+    def take(self, dates: Iterable[date], name: str) -> np.ndarray:
+        """指定日付の値を取り出す（範囲外は NaN）"""
+        column = self.values[name]
+        positions = np.fromiter((self.index_of(d) for d in dates), dtype=np.int64)
+        result = np.full(len(positions), np.nan)
+        inside = (positions >= 0) & (positions < self.days)
+        result[inside] = column[positions[inside]]
+        return result
+
+    @classmethod
+    def from_health_data(
+        cls,
+        health_data_list: Iterable[HealthData],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> "HealthMetricSeries":
+        """HealthData のリストから配列を構築"""
+        items = list(health_data_list)
+        if start_date is None or end_date is None:
+            dates = [data.date for data in items]
+            start_date = start_date or (min(dates) if dates else date.today())
+            end_date = end_date or (max(dates) if dates else start_date)
+
+        series = cls(start_date=start_date, end_date=end_date)
+        for data in items:
+            series.set_day(data.date, extract_daily_metrics(data))
+        return series
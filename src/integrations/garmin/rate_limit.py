@@ -0,0 +1,56 @@
+"""
+Token bucket rate limiter for Garmin Connect API calls
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+
+class TokenBucketRateLimiter:
+    """非同期トークンバケット
+
+    ``rate`` トークン/秒で補充され、最大 ``capacity`` までバーストを許容する。
+    待機中の呼び出しは到着順にトークンを受け取る。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """トークンを 1 つ取得（不足時は補充まで待機）"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @property
+    def available_tokens(self) -> float:
+        """現在利用可能なトークン数"""
+        self._refill()
+        return self._tokens
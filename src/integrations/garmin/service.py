@@ -51,14 +51,20 @@ class GarminIntegrationService(LoggerMixin):
     async def authenticate_with_client(self, cache_dir: Path | None = None) -> bool:
         """Use GarminClient to test credential-based authentication."""
         client = GarminClient(cache_dir=cache_dir)
-        return await client.authenticate()
+        try:
+            return await client.authenticate()
+        finally:
+            await client.close()
 
     async def test_connection_with_client(
         self, cache_dir: Path | None = None
     ) -> dict[str, Any]:
         """Use GarminClient to test connectivity."""
         client = GarminClient(cache_dir=cache_dir)
-        return await client.test_connection()
+        try:
+            return await client.test_connection()
+        finally:
+            await client.close()
 
     async def fetch_activities(
         self,
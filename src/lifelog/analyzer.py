@@ -5,7 +5,6 @@
 """
 
 from datetime import date, timedelta
-from typing import Any, cast
 
 import numpy as np
 import structlog
@@ -40,24 +39,22 @@ class LifelogAnalyzer:
             week_start, week_end
         )
 
-        # 基本統計
-        total_entries = len(entries)
+        # 基本統計（日次集計キューブから取得）
+        cube = self.lifelog_manager.daily_cube
+        daily_counts = cube.daily_counts(week_start, week_end)
+        total_entries = int(daily_counts.sum())
         daily_average = total_entries / 7.0
 
-        # 日別エントリー数を計算
-        daily_counts: dict[date, int] = {}
-        for entry in entries:
-            day = entry.timestamp.date()
-            daily_counts[day] = daily_counts.get(day, 0) + 1
-
         most_active_day = (
-            max(daily_counts, key=lambda x: daily_counts[x]).strftime("%A")
-            if daily_counts
+            (week_start + timedelta(days=int(np.argmax(daily_counts)))).strftime("%A")
+            if total_entries
             else None
         )
 
         # 気分・エネルギートレンド
-        mood_trend, energy_trend = self._calculate_mood_energy_trends(entries)
+        mood_trend, energy_trend = self._calculate_mood_energy_trends(
+            week_start, week_end
+        )
 
         # 習慣パフォーマンス
         habit_success_rates = await self._calculate_habit_success_rates(
@@ -68,7 +65,7 @@ class LifelogAnalyzer:
         )
 
         # カテゴリ分析
-        category_distribution = self._calculate_category_distribution(entries)
+        category_distribution = cube.category_totals(week_start, week_end)
         focus_areas, neglected_areas = self._identify_focus_areas(category_distribution)
 
         # AI 生成のハイライトと学び
@@ -110,13 +107,15 @@ class LifelogAnalyzer:
         )
 
         # 基本統計
-        total_entries = len(entries)
+        total_entries = int(
+            self.lifelog_manager.daily_cube.daily_counts(start_date, end_date).sum()
+        )
         days_in_month = (end_date - start_date).days + 1
         daily_average = total_entries / days_in_month
 
         # 長期トレンド分析
-        mood_trend_monthly = self._analyze_monthly_mood_trend(entries)
-        energy_trend_monthly = self._analyze_monthly_energy_trend(entries)
+        mood_trend_monthly = self._analyze_monthly_mood_trend(start_date, end_date)
+        energy_trend_monthly = self._analyze_monthly_energy_trend(start_date, end_date)
 
         # 習慣マスタリー分析
         consistent_habits = await self._identify_consistent_habits(month, year)
@@ -147,21 +146,25 @@ class LifelogAnalyzer:
         self, metric_name: str, start_date: date, end_date: date
     ) -> LifeTrend:
         """生活トレンドを分析"""
-        entries = await self.lifelog_manager.get_entries_by_date_range(
-            start_date, end_date
-        )
-
-        # メトリック別にデータポイントを収集
-        data_points = []
-
-        if metric_name == "mood":
-            data_points = self._extract_mood_data_points(entries)
-        elif metric_name == "energy":
-            data_points = self._extract_energy_data_points(entries)
+        # メトリック別に日次データを集計キューブから取得
+        cube = self.lifelog_manager.daily_cube
+        all_days = cube.days(start_date, end_date)
+        values = np.empty(0)
+        days: list[date] = []
+
+        if metric_name in ("mood", "energy"):
+            daily_values = cube.daily_mean(metric_name, start_date, end_date)
+            recorded = ~np.isnan(daily_values)
+            values = daily_values[recorded]
+            days = [day for day, ok in zip(all_days, recorded, strict=True) if ok]
         elif metric_name == "activity_count":
-            data_points = self._extract_activity_count_data_points(
-                entries, start_date, end_date
-            )
+            values = cube.daily_counts(start_date, end_date).astype(float)
+            days = all_days
+
+        data_points: list[dict[str, date | float]] = [
+            {"date": day, "value": float(value)}
+            for day, value in zip(days, values.tolist(), strict=True)
+        ]
 
         if not data_points:
             # データなしの場合のデフォルト
@@ -182,7 +185,6 @@ class LifelogAnalyzer:
             )
 
         # 統計計算
-        values = [point["value"] for point in data_points]
         average_value = np.mean(values)
         min_value = np.min(values)
         max_value = np.max(values)
@@ -219,82 +221,34 @@ class LifelogAnalyzer:
         self, start_date: date, end_date: date
     ) -> list[tuple[str, str, float]]:
         """メトリクス間の相関を発見"""
-        entries = await self.lifelog_manager.get_entries_by_date_range(
-            start_date, end_date
-        )
-
-        # 日別にメトリクスを集計
-        daily_metrics: dict[date, dict[str, Any]] = {}
-        for entry in entries:
-            day = entry.timestamp.date()
-            if day not in daily_metrics:
-                daily_metrics[day] = {
-                    "mood": [],
-                    "energy": [],
-                    "activity_count": 0,
-                    "categories": set(),
-                }
-
-            daily_metrics[day]["activity_count"] += 1
-            daily_metrics[day]["categories"].add(entry.category)
-
-            if entry.mood:
-                daily_metrics[day]["mood"].append(entry.mood.value)
-            if entry.energy_level:
-                daily_metrics[day]["energy"].append(entry.energy_level)
+        cube = self.lifelog_manager.daily_cube
+        daily_mood = cube.daily_mean("mood", start_date, end_date)
+        daily_energy = cube.daily_mean("energy", start_date, end_date)
 
         # 相関を計算
         correlations = []
 
-        # 気分とエネルギーの相関
-        mood_energy_data = []
-        for day_data in daily_metrics.values():
-            if day_data["mood"] and day_data["energy"]:
-                mood_values = cast(list[float], day_data["mood"])
-                energy_values = cast(list[float], day_data["energy"])
-                avg_mood = np.mean(mood_values)
-                avg_energy = np.mean(energy_values)
-                mood_energy_data.append((avg_mood, avg_energy))
-
-        if len(mood_energy_data) > 3:
-            moods, energies = zip(*mood_energy_data, strict=False)
-            correlation = np.corrcoef(moods, energies)[0, 1]
+        # 気分とエネルギーの相関（両方記録のある日のみ）
+        both_recorded = ~np.isnan(daily_mood) & ~np.isnan(daily_energy)
+        if np.count_nonzero(both_recorded) > 3:
+            correlation = np.corrcoef(
+                daily_mood[both_recorded], daily_energy[both_recorded]
+            )[0, 1]
             if not np.isnan(correlation):
-                correlations.append(("mood", "energy", correlation))
+                correlations.append(("mood", "energy", float(correlation)))
 
         return correlations
 
-    def _calculate_mood_energy_trends(self, entries) -> tuple[list[float], list[float]]:
-        """気分・エネルギーのトレンドを計算"""
-        # 日別に平均を計算
-        daily_mood: dict[date, list[float]] = {}
-        daily_energy: dict[date, list[float]] = {}
-
-        for entry in entries:
-            day = entry.timestamp.date()
-
-            if entry.mood:
-                if day not in daily_mood:
-                    daily_mood[day] = []
-                daily_mood[day].append(entry.mood.value)
-
-            if entry.energy_level:
-                if day not in daily_energy:
-                    daily_energy[day] = []
-                daily_energy[day].append(entry.energy_level)
-
-        # 平均を計算
-        mood_trend = []
-        energy_trend = []
-
-        # 過去 7 日間の順序で整列
-        sorted_days = sorted(daily_mood.keys()) if daily_mood else []
+    def _calculate_mood_energy_trends(
+        self, start_date: date, end_date: date
+    ) -> tuple[list[float], list[float]]:
+        """気分・エネルギーのトレンドを計算（記録のある日の日次平均を日付順に）"""
+        cube = self.lifelog_manager.daily_cube
+        daily_mood = cube.daily_mean("mood", start_date, end_date)
+        daily_energy = cube.daily_mean("energy", start_date, end_date)
 
-        for day in sorted_days:
-            if day in daily_mood and daily_mood[day]:
-                mood_trend.append(float(np.mean(daily_mood[day])))
-            if day in daily_energy and daily_energy[day]:
-                energy_trend.append(float(np.mean(daily_energy[day])))
+        mood_trend = daily_mood[~np.isnan(daily_mood)].tolist()
+        energy_trend = daily_energy[~np.isnan(daily_energy)].tolist()
 
         return mood_trend, energy_trend
 
@@ -344,7 +298,7 @@ class LifelogAnalyzer:
         """カテゴリ分布を計算"""
         category_counts: dict[str, int] = {}
         for entry in entries:
-            category = entry.category.value
+            category = str(getattr(entry.category, "value", entry.category))
             category_counts[category] = category_counts.get(category, 0) + 1
 
         return category_counts
@@ -492,18 +446,21 @@ class LifelogAnalyzer:
 
         return ["バランスの取れた活動を心がけましょう"]
 
-    def _analyze_monthly_mood_trend(self, entries) -> str:
+    def _analyze_monthly_mood_trend(self, start_date: date, end_date: date) -> str:
         """月間気分トレンドを分析"""
-        mood_values = [entry.mood.value for entry in entries if entry.mood]
+        daily_mood = self.lifelog_manager.daily_cube.daily_mean(
+            "mood", start_date, end_date
+        )
+        mood_values = daily_mood[~np.isnan(daily_mood)]
 
-        if not mood_values:
+        if mood_values.size == 0:
             return "stable"
 
-        if len(mood_values) < 5:
+        if mood_values.size < 5:
             return "insufficient_data"
 
         # 前半と後半で比較
-        mid_point = len(mood_values) // 2
+        mid_point = mood_values.size // 2
         first_half_avg = np.mean(mood_values[:mid_point])
         second_half_avg = np.mean(mood_values[mid_point:])
 
@@ -516,19 +473,22 @@ class LifelogAnalyzer:
         else:
             return "stable"
 
-    def _analyze_monthly_energy_trend(self, entries) -> str:
+    def _analyze_monthly_energy_trend(self, start_date: date, end_date: date) -> str:
         """月間エネルギートレンドを分析"""
-        energy_values = [entry.energy_level for entry in entries if entry.energy_level]
+        daily_energy = self.lifelog_manager.daily_cube.daily_mean(
+            "energy", start_date, end_date
+        )
+        energy_values = daily_energy[~np.isnan(daily_energy)]
 
-        if not energy_values:
+        if energy_values.size == 0:
             return "stable"
 
-        if len(energy_values) < 5:
+        if energy_values.size < 5:
             return "insufficient_data"
 
         # 線形回帰でトレンドを分析
-        x = np.array(range(len(energy_values))).reshape(-1, 1)
-        y = np.array(energy_values)
+        x = np.arange(energy_values.size).reshape(-1, 1)
+        y = energy_values
 
         try:
             model = LinearRegression().fit(x, y)
@@ -543,54 +503,6 @@ class LifelogAnalyzer:
         except Exception:
             return "stable"
 
-    def _extract_mood_data_points(self, entries) -> list[dict]:
-        """気分データポイントを抽出"""
-        mood_points = []
-        for entry in entries:
-            if entry.mood:
-                mood_points.append(
-                    {"date": entry.timestamp.date(), "value": float(entry.mood.value)}
-                )
-
-        return mood_points
-
-    def _extract_energy_data_points(self, entries) -> list[dict]:
-        """エネルギーデータポイントを抽出"""
-        energy_points = []
-        for entry in entries:
-            if entry.energy_level:
-                energy_points.append(
-                    {"date": entry.timestamp.date(), "value": float(entry.energy_level)}
-                )
-
-        return energy_points
-
-    def _extract_activity_count_data_points(
-        self, entries, start_date: date, end_date: date
-    ) -> list[dict]:
-        """活動数データポイントを抽出"""
-        # 日別にカウント
-        daily_counts = {}
-        current_date = start_date
-
-        # 全ての日を初期化
-        while current_date <= end_date:
-            daily_counts[current_date] = 0
-            current_date += timedelta(days=1)
-
-        # エントリーをカウント
-        for entry in entries:
-            day = entry.timestamp.date()
-            if day in daily_counts:
-                daily_counts[day] += 1
-
-        # データポイントに変換
-        points = []
-        for day, count in daily_counts.items():
-            points.append({"date": day, "value": float(count)})
-
-        return sorted(points, key=lambda x: x["date"])
-
     def _calculate_trend_direction(self, data_points) -> tuple[str, float]:
         """トレンドの方向と強さを計算"""
         if len(data_points) < 3:
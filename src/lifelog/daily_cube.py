@@ -0,0 +1,222 @@
+"""
+ライフログ 日次集計キューブ
+
+日付の序数（ date.toordinal ）をインデックスとする NumPy 配列で
+日次の件数・気分・エネルギー・カテゴリ別件数を保持する。
+エントリーの追加・更新・削除時に差分で更新するため、
+期間レポートや相関分析は配列スライスだけで計算できる。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+import numpy as np
+
+from .models import LifelogCategory, LifelogEntry
+
+# 初期確保日数と拡張時の最小余白
+_INITIAL_CAPACITY = 366
+_GROWTH_PADDING = 64
+
+_CATEGORY_POSITIONS: dict[str, int] = {
+    category.value: position for position, category in enumerate(LifelogCategory)
+}
+
+# (日付序数, カテゴリ位置, 気分値, エネルギー値)
+_Contribution = tuple[int, int | None, float | None, float | None]
+
+
+def _mood_value(entry: LifelogEntry) -> float | None:
+    """Enum / int どちらの気分値も数値化"""
+    if not entry.mood:
+        return None
+    return float(getattr(entry.mood, "value", entry.mood))
+
+
+def _energy_value(entry: LifelogEntry) -> float | None:
+    if not entry.energy_level:
+        return None
+    return float(entry.energy_level)
+
+
+class LifelogDailyCube:
+    """日次集計の列指向ストア"""
+
+    COLUMNS = ("count", "mood_sum", "mood_count", "energy_sum", "energy_count")
+
+    def __init__(self) -> None:
+        self._origin: int | None = None
+        self._capacity = 0
+        self._columns: dict[str, np.ndarray] = {}
+        self._category_counts = np.zeros((len(_CATEGORY_POSITIONS), 0), np.int64)
+        self._contributions: dict[str, _Contribution] = {}
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    # === 更新 ===
+
+    def clear(self) -> None:
+        """全集計を破棄"""
+        self._origin = None
+        self._contributions.clear()
+        self._columns = {}
+        self._category_counts = np.zeros((len(_CATEGORY_POSITIONS), 0), np.int64)
+        self._allocate(0, 0)
+
+    def rebuild(self, entries: Iterable[LifelogEntry]) -> None:
+        """エントリー集合から集計を再構築"""
+        self.clear()
+        contributions = {
+            entry.id: self._contribution(entry) for entry in entries if entry.id
+        }
+        if not contributions:
+            return
+
+        ordinals = np.fromiter(
+            (c[0] for c in contributions.values()), np.int64, len(contributions)
+        )
+        self._ensure_range(int(ordinals.min()), int(ordinals.max()))
+        for entry_id, contribution in contributions.items():
+            self._apply(contribution, 1)
+            self._contributions[entry_id] = contribution
+
+    def add(self, entry: LifelogEntry) -> None:
+        """エントリーを集計に反映（既存 ID の場合は差し替え）"""
+        if not entry.id:
+            return
+        self.remove(entry.id)
+
+        contribution = self._contribution(entry)
+        self._ensure_range(contribution[0], contribution[0])
+        self._apply(contribution, 1)
+        self._contributions[entry.id] = contribution
+
+    def remove(self, entry_id: str) -> None:
+        """エントリーの寄与を集計から取り除く"""
+        contribution = self._contributions.pop(entry_id, None)
+        if contribution is not None:
+            self._apply(contribution, -1)
+
+    # === 参照 ===
+
+    def column(self, name: str, start_date: date, end_date: date) -> np.ndarray:
+        """指定列の日次値を返す（範囲外の日は 0 ）"""
+        return self._slice(self._columns[name], start_date, end_date)
+
+    def daily_counts(self, start_date: date, end_date: date) -> np.ndarray:
+        """日別エントリー数"""
+        return self.column("count", start_date, end_date)
+
+    def daily_mean(self, metric: str, start_date: date, end_date: date) -> np.ndarray:
+        """日別平均（ mood / energy ）。記録のない日は NaN"""
+        sums = self.column(f"{metric}_sum", start_date, end_date)
+        counts = self.column(f"{metric}_count", start_date, end_date)
+        means = np.full(sums.shape, np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return means
+
+    def category_totals(self, start_date: date, end_date: date) -> dict[str, int]:
+        """期間内のカテゴリ別件数（ 0 件のカテゴリは含めない）"""
+        totals = self._slice(self._category_counts, start_date, end_date).sum(axis=1)
+        return {
+            category: int(totals[position])
+            for category, position in _CATEGORY_POSITIONS.items()
+            if totals[position] > 0
+        }
+
+    @staticmethod
+    def days(start_date: date, end_date: date) -> list[date]:
+        """配列インデックスに対応する日付リスト"""
+        return [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+
+    # === 内部処理 ===
+
+    @staticmethod
+    def _contribution(entry: LifelogEntry) -> _Contribution:
+        category = str(getattr(entry.category, "value", entry.category))
+        return (
+            entry.timestamp.date().toordinal(),
+            _CATEGORY_POSITIONS.get(category),
+            _mood_value(entry),
+            _energy_value(entry),
+        )
+
+    def _apply(self, contribution: _Contribution, sign: int) -> None:
+        assert self._origin is not None
+        ordinal, category_position, mood, energy = contribution
+        offset = ordinal - self._origin
+
+        self._columns["count"][offset] += sign
+        if category_position is not None:
+            self._category_counts[category_position, offset] += sign
+        if mood is not None:
+            self._columns["mood_sum"][offset] += sign * mood
+            self._columns["mood_count"][offset] += sign
+        if energy is not None:
+            self._columns["energy_sum"][offset] += sign * energy
+            self._columns["energy_count"][offset] += sign
+
+    def _allocate(self, capacity: int, shift: int) -> None:
+        """配列を確保し直し、既存データを shift 日分後ろにずらして移す"""
+        columns: dict[str, np.ndarray] = {}
+        for name in self.COLUMNS:
+            dtype = np.float64 if name.endswith("_sum") else np.int64
+            column = np.zeros(capacity, dtype)
+            previous = self._columns.get(name)
+            if previous is not None and previous.size:
+                column[shift : shift + previous.size] = previous
+            columns[name] = column
+
+        category_counts = np.zeros((len(_CATEGORY_POSITIONS), capacity), np.int64)
+        if self._category_counts.size:
+            width = self._category_counts.shape[1]
+            category_counts[:, shift : shift + width] = self._category_counts
+
+        self._columns = columns
+        self._category_counts = category_counts
+        self._capacity = capacity
+
+    def _ensure_range(self, first: int, last: int) -> None:
+        """first〜last の日付序数を格納できるよう配列を拡張"""
+        if self._origin is None:
+            self._origin = first - _GROWTH_PADDING
+            self._allocate(
+                max(_INITIAL_CAPACITY, last - first + 1 + 2 * _GROWTH_PADDING), 0
+            )
+            return
+
+        shift = 0
+        if first < self._origin:
+            shift = max(self._origin - first + _GROWTH_PADDING, self._capacity // 2)
+
+        end = self._origin + self._capacity
+        extra = 0
+        if last >= end:
+            extra = max(last - end + 1 + _GROWTH_PADDING, self._capacity // 2)
+
+        if shift or extra:
+            self._allocate(self._capacity + shift + extra, shift)
+            self._origin -= shift
+
+    def _slice(self, array: np.ndarray, start_date: date, end_date: date) -> np.ndarray:
+        """[start_date, end_date] の範囲を最終軸で切り出す（範囲外は 0 埋め）"""
+        length = max((end_date - start_date).days + 1, 0)
+        result = np.zeros(array.shape[:-1] + (length,), array.dtype)
+        if self._origin is None or length == 0:
+            return result
+
+        start_offset = start_date.toordinal() - self._origin
+        source_start = max(start_offset, 0)
+        source_end = min(start_offset + length, self._capacity)
+        if source_start < source_end:
+            result[..., source_start - start_offset : source_end - start_offset] = (
+                array[..., source_start:source_end]
+            )
+        return result
@@ -0,0 +1,147 @@
+"""
+ライフログ インメモリインデックス
+
+エントリーの全件走査を避けるための二次インデックスを提供する。
+
+- タイムスタンプ順のソート済みインデックス（日付範囲検索用）
+- カテゴリ別インデックス
+- (integration_name, external_id) のハッシュインデックス（外部連携の重複判定用）
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from .models import LifelogEntry
+
+ExternalKey = tuple[str, str]
+
+
+def _timestamp_key(timestamp: datetime) -> datetime:
+    """ソートキーとしての時刻（ローカル日付と一致させるため tzinfo を除去）"""
+    return timestamp.replace(tzinfo=None)
+
+
+def _category_key(category: Any) -> str:
+    """Enum / 文字列どちらのカテゴリも同じキーに正規化"""
+    return str(getattr(category, "value", category))
+
+
+def external_key(metadata: dict[str, Any] | None) -> ExternalKey | None:
+    """メタデータから (integration_name, external_id) キーを取り出す"""
+    if not metadata:
+        return None
+    integration_name = metadata.get("integration_name")
+    external_id = metadata.get("external_id")
+    if integration_name is None or external_id is None:
+        return None
+    return (str(integration_name), str(external_id))
+
+
+class LifelogEntryIndex:
+    """LifelogEntry の二次インデックス
+
+    エントリー本体は保持せず ID のみを管理する。エントリーが後から変更されても
+    正しく削除できるよう、登録時のキーを ID ごとに記録しておく。
+    """
+
+    def __init__(self) -> None:
+        self._by_time: list[tuple[datetime, str]] = []
+        # 挿入順を保つため値は dict を順序付き集合として使う
+        self._by_category: dict[str, dict[str, None]] = {}
+        self._by_external: dict[ExternalKey, str] = {}
+        self._keys: dict[str, tuple[datetime, str, ExternalKey | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, entry_id: object) -> bool:
+        return entry_id in self._keys
+
+    def clear(self) -> None:
+        """全インデックスを破棄"""
+        self._by_time.clear()
+        self._by_category.clear()
+        self._by_external.clear()
+        self._keys.clear()
+
+    def rebuild(self, entries: Iterable[LifelogEntry]) -> None:
+        """エントリー集合からインデックスを再構築"""
+        self.clear()
+        for entry in entries:
+            if not entry.id:
+                continue
+            time_key = _timestamp_key(entry.timestamp)
+            category_key = _category_key(entry.category)
+            ext_key = external_key(entry.metadata)
+
+            self._by_time.append((time_key, entry.id))
+            self._by_category.setdefault(category_key, {})[entry.id] = None
+            if ext_key is not None:
+                self._by_external[ext_key] = entry.id
+            self._keys[entry.id] = (time_key, category_key, ext_key)
+
+        self._by_time.sort()
+
+    def add(self, entry: LifelogEntry) -> None:
+        """エントリーを登録（既存 ID の場合は差し替え）"""
+        if not entry.id:
+            return
+        if entry.id in self._keys:
+            self.remove(entry.id)
+
+        time_key = _timestamp_key(entry.timestamp)
+        category_key = _category_key(entry.category)
+        ext_key = external_key(entry.metadata)
+
+        insort(self._by_time, (time_key, entry.id))
+        self._by_category.setdefault(category_key, {})[entry.id] = None
+        if ext_key is not None:
+            self._by_external[ext_key] = entry.id
+        self._keys[entry.id] = (time_key, category_key, ext_key)
+
+    def remove(self, entry_id: str) -> None:
+        """エントリーをインデックスから削除"""
+        keys = self._keys.pop(entry_id, None)
+        if keys is None:
+            return
+
+        time_key, category_key, ext_key = keys
+
+        position = bisect_left(self._by_time, (time_key, entry_id))
+        if position < len(self._by_time) and self._by_time[position] == (
+            time_key,
+            entry_id,
+        ):
+            del self._by_time[position]
+
+        category_ids = self._by_category.get(category_key)
+        if category_ids is not None:
+            category_ids.pop(entry_id, None)
+            if not category_ids:
+                del self._by_category[category_key]
+
+        if ext_key is not None and self._by_external.get(ext_key) == entry_id:
+            del self._by_external[ext_key]
+
+    def ids_in_date_range(self, start_date: date, end_date: date) -> list[str]:
+        """日付範囲（両端含む）のエントリー ID をタイムスタンプ昇順で返す"""
+        if end_date < start_date:
+            return []
+
+        lower = datetime.combine(start_date, time.min)
+        upper = datetime.combine(end_date + timedelta(days=1), time.min)
+        start = bisect_left(self._by_time, (lower, ""))
+        end = bisect_left(self._by_time, (upper, ""))
+        return [entry_id for _, entry_id in self._by_time[start:end]]
+
+    def ids_by_category(self, category: Any) -> list[str]:
+        """カテゴリに属するエントリー ID を登録順で返す"""
+        return list(self._by_category.get(_category_key(category), ()))
+
+    def find_external(self, integration_name: str, external_id: str) -> str | None:
+        """外部連携キーに対応するエントリー ID を返す"""
+        return self._by_external.get((str(integration_name), str(external_id)))
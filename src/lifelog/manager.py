@@ -4,6 +4,7 @@
 ライフログエントリーの作成、管理、分析を統括するメインマネージャー
 """
 
+import asyncio
 import json
 import uuid
 from datetime import date, datetime
@@ -13,6 +14,9 @@ from typing import Any, Optional
 import structlog
 
 from ..config.settings import Settings
+from ..utils.json_store import AtomicJsonWriter
+from .daily_cube import LifelogDailyCube
+from .index import LifelogEntryIndex
 from .integrations.bridge import create_default_bridge
 from .integrations.models import IntegrationData
 from .models import (
@@ -39,12 +43,20 @@ class LifelogManager:
         self.entries_file = self.data_dir / "entries.json"
         self.habits_file = self.data_dir / "habits.json"
         self.goals_file = self.data_dir / "goals.json"
+        self._entries_writer = AtomicJsonWriter(self.entries_file, prefix="entries_")
+        self._habits_writer = AtomicJsonWriter(self.habits_file, prefix="habits_")
+        self._goals_writer = AtomicJsonWriter(self.goals_file, prefix="goals_")
 
         # インメモリキャッシュ
         self._entries: dict[str, LifelogEntry] = {}
         self._habits: dict[str, HabitTracker] = {}
         self._goals: dict[str, LifeGoal] = {}
 
+        # エントリーの二次インデックス（時刻・カテゴリ・外部連携キー）
+        self._entry_index = LifelogEntryIndex()
+        # 日次集計キューブ（分析用、エントリー更新時に差分反映）
+        self.daily_cube = LifelogDailyCube()
+
         self._initialized = False
         self.integration_bridge = create_default_bridge()
 
@@ -84,6 +96,9 @@ class LifelogManager:
 
                     self._entries[entry_id] = LifelogEntry(**entry_dict)
 
+            self._entry_index.rebuild(self._entries.values())
+            self.daily_cube.rebuild(self._entries.values())
+
         # 習慣読み込み
         if self.habits_file.exists():
             with open(self.habits_file, encoding="utf-8") as f:
@@ -131,59 +146,25 @@ class LifelogManager:
                     self._goals[goal_id] = LifeGoal(**goal_dict)
 
     async def _save_data(self):
-        """データファイルに保存"""
-        # エントリー保存
-        entries_dict = {}
-        for entry_id, entry in self._entries.items():
-            entry_dict = entry.model_dump()
-            # datetime オブジェクトを文字列に変換
-            if "timestamp" in entry_dict:
-                entry_dict["timestamp"] = entry_dict["timestamp"].isoformat()
-            if "created_at" in entry_dict:
-                entry_dict["created_at"] = entry_dict["created_at"].isoformat()
-            if "updated_at" in entry_dict:
-                entry_dict["updated_at"] = entry_dict["updated_at"].isoformat()
-            entries_dict[entry_id] = entry_dict
-
-        with open(self.entries_file, "w", encoding="utf-8") as f:
-            json.dump(entries_dict, f, ensure_ascii=False, indent=2)
-
-        # 習慣保存
-        habits_dict = {}
-        for habit_id, habit in self._habits.items():
-            habit_dict = habit.model_dump()
-            # date オブジェクトを文字列に変換
-            if "start_date" in habit_dict:
-                habit_dict["start_date"] = habit_dict["start_date"].isoformat()
-            if "end_date" in habit_dict and habit_dict["end_date"]:
-                habit_dict["end_date"] = habit_dict["end_date"].isoformat()
-            if "created_at" in habit_dict:
-                habit_dict["created_at"] = habit_dict["created_at"].isoformat()
-            if "updated_at" in habit_dict:
-                habit_dict["updated_at"] = habit_dict["updated_at"].isoformat()
-            habits_dict[habit_id] = habit_dict
-
-        with open(self.habits_file, "w", encoding="utf-8") as f:
-            json.dump(habits_dict, f, ensure_ascii=False, indent=2)
-
-        # 目標保存
-        goals_dict = {}
-        for goal_id, goal in self._goals.items():
-            goal_dict = goal.model_dump()
-            # date オブジェクトを文字列に変換
-            if "target_date" in goal_dict and goal_dict["target_date"]:
-                goal_dict["target_date"] = goal_dict["target_date"].isoformat()
-            if "created_at" in goal_dict:
-                goal_dict["created_at"] = goal_dict["created_at"].isoformat()
-            if "updated_at" in goal_dict:
-                goal_dict["updated_at"] = goal_dict["updated_at"].isoformat()
-            goals_dict[goal_id] = goal_dict
-
-        with open(self.goals_file, "w", encoding="utf-8") as f:
-            json.dump(goals_dict, f, ensure_ascii=False, indent=2)
+        """データファイルに保存（アトミック書き込み、同時保存はまとめて 1 回）"""
+        await asyncio.gather(
+            self._entries_writer.write(dict(self._entries)),
+            self._habits_writer.write(dict(self._habits)),
+            self._goals_writer.write(dict(self._goals)),
+        )
 
     # === エントリー管理 ===
 
+    def _index_entry(self, entry: LifelogEntry) -> None:
+        """インデックスと日次集計にエントリーを反映"""
+        self._entry_index.add(entry)
+        self.daily_cube.add(entry)
+
+    def _unindex_entry(self, entry_id: str) -> None:
+        """インデックスと日次集計からエントリーを除去"""
+        self._entry_index.remove(entry_id)
+        self.daily_cube.remove(entry_id)
+
     async def add_entry(self, entry: LifelogEntry) -> str:
         """ライフログエントリーを追加"""
         if not entry.id:
@@ -193,6 +174,7 @@ class LifelogManager:
         entry.updated_at = datetime.now()
 
         self._entries[entry.id] = entry
+        self._index_entry(entry)
         await self._save_data()
 
         logger.info(
@@ -204,6 +186,28 @@ class LifelogManager:
 
         return entry.id
 
+    async def add_entries(self, entries: list[LifelogEntry]) -> list[str]:
+        """複数エントリーを一括追加（保存は 1 回のみ）"""
+        if not entries:
+            return []
+
+        now = datetime.now()
+        entry_ids = []
+        for entry in entries:
+            if not entry.id:
+                entry.id = str(uuid.uuid4())
+            entry.created_at = now
+            entry.updated_at = now
+
+            self._entries[entry.id] = entry
+            self._index_entry(entry)
+            entry_ids.append(entry.id)
+
+        await self._save_data()
+
+        logger.info("ライフログエントリーを一括追加", count=len(entry_ids))
+        return entry_ids
+
     async def update_entry(self, entry_id: str, updates: dict[str, Any]) -> bool:
         """エントリーを更新"""
         if entry_id not in self._entries:
@@ -216,6 +220,7 @@ class LifelogManager:
                 setattr(entry, key, value)
 
         entry.updated_at = datetime.now()
+        self._index_entry(entry)
         await self._save_data()
 
         logger.info("ライフログエントリーを更新", entry_id=entry_id)
@@ -229,25 +234,28 @@ class LifelogManager:
         self, start_date: date, end_date: date, category: LifelogCategory | None = None
     ) -> list[LifelogEntry]:
         """日付範囲でエントリーを取得"""
-        entries = []
-        for entry in self._entries.values():
-            entry_date = entry.timestamp.date()
-            if start_date <= entry_date <= end_date:
-                if category is None or entry.category == category:
-                    entries.append(entry)
+        entry_ids = self._entry_index.ids_in_date_range(start_date, end_date)
+        if category is not None:
+            category_ids = set(self._entry_index.ids_by_category(category))
+            entry_ids = [entry_id for entry_id in entry_ids if entry_id in category_ids]
 
-        return sorted(entries, key=lambda x: x.timestamp, reverse=True)
+        # インデックスは昇順のため逆順で新しい順にする
+        return [self._entries[entry_id] for entry_id in reversed(entry_ids)]
 
     async def get_entries_by_category(
         self, category: LifelogCategory
     ) -> list[LifelogEntry]:
         """カテゴリでエントリーを取得"""
-        return [entry for entry in self._entries.values() if entry.category == category]
+        return [
+            self._entries[entry_id]
+            for entry_id in self._entry_index.ids_by_category(category)
+        ]
 
     async def delete_entry(self, entry_id: str) -> bool:
         """エントリーを削除"""
         if entry_id in self._entries:
             del self._entries[entry_id]
+            self._unindex_entry(entry_id)
             await self._save_data()
             logger.info("ライフログエントリーを削除", entry_id=entry_id)
             return True
@@ -526,15 +534,19 @@ class LifelogManager:
             return 0
 
         integrated_count = 0
+        new_entries: list[LifelogEntry] = []
+        # 同一バッチ内の重複も O(1) で判定する
+        batch_keys: set[tuple[str, str]] = set()
 
         try:
             for data in integration_data:
                 # 重複チェック（ external_id + integration_name でユニーク性を保証）
+                batch_key = (str(data.integration_type), str(data.source_id))
                 duplicate_entry = await self._find_duplicate_entry(
                     data.source_id, data.integration_type
                 )
 
-                if duplicate_entry:
+                if duplicate_entry or batch_key in batch_keys:
                     logger.debug(
                         "重複データをスキップ",
                         external_id=data.source_id,
@@ -546,14 +558,15 @@ class LifelogManager:
                 lifelog_entry = await self._convert_integration_data_to_entry(data)
 
                 if lifelog_entry:
-                    await self.add_entry(lifelog_entry)
+                    new_entries.append(lifelog_entry)
+                    batch_keys.add(batch_key)
                     integrated_count += 1
 
                     logger.debug(
                         "外部連携データを統合",
                         external_id=data.source_id,
                         integration_name=data.integration_type,
-                        category=lifelog_entry.category.value,
+                        category=lifelog_entry.category,
                         title=lifelog_entry.title,
                     )
                 else:
@@ -564,6 +577,9 @@ class LifelogManager:
                         data_type=data.metadata.get("data_type", "unknown"),
                     )
 
+            # バッチ全体を 1 回の保存で永続化
+            await self.add_entries(new_entries)
+
             if integrated_count > 0:
                 logger.info(
                     "外部連携データの統合完了",
@@ -576,20 +592,16 @@ class LifelogManager:
 
         except Exception as e:
             logger.error("外部連携データ統合でエラー", error=str(e))
-            return integrated_count
+            return 0
 
     async def _find_duplicate_entry(
         self, external_id: str, integration_name: str
     ) -> Optional["LifelogEntry"]:
         """重複エントリーを検索"""
-        for entry in self._entries.values():
-            if (
-                entry.metadata
-                and entry.metadata.get("external_id") == external_id
-                and entry.metadata.get("integration_name") == integration_name
-            ):
-                return entry
-        return None
+        entry_id = self._entry_index.find_external(integration_name, external_id)
+        if entry_id is None:
+            return None
+        return self._entries.get(entry_id)
 
     async def _convert_integration_data_to_entry(
         self, data: "IntegrationData"
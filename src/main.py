@@ -3,18 +3,29 @@ Main entry point for MindBridge
 """
 
 import asyncio
+import contextlib
 import sys
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from src import __version__
 from src.config import get_secure_settings, get_settings
+from src.monitoring.startup import (
+    COMPONENT_WARMUP_STEP,
+    DISCORD_CONNECT_STEP,
+    HEALTH_SCHEDULER_STEP,
+    INDEX_WARMUP_STEP,
+    VAULT_SYNC_STEP,
+    get_startup_tracker,
+)
 from src.security.access_logger import (
     SecurityEventType,
+    flush_access_logger,
     get_access_logger,
     log_security_event,
 )
 from src.utils import get_logger, setup_logging
+from src.utils.json_store import flush_all_writers
 
 if TYPE_CHECKING:
     from structlog.stdlib import BoundLogger
@@ -24,7 +35,21 @@ if TYPE_CHECKING:
     from src.config.settings import Settings
     from src.health_analysis.scheduler import HealthAnalysisScheduler
     from src.monitoring.health_server import HealthServer
+    from src.obsidian.daily_integration import DailyNoteIntegration
+    from src.obsidian.file_manager import ObsidianFileManager
     from src.obsidian.github_sync import GitHubObsidianSync
+    from src.obsidian.sync_scheduler import GitSyncScheduler
+    from src.utils.lazy_loader import LazyComponentManager
+
+
+# Components the bot receives as lazy proxies; they are imported and built on
+# first use, or by the component warm-up once the bot has connected
+LAZY_BOT_COMPONENTS = (
+    "ai_processor",
+    "note_analyzer",
+    "template_engine",
+    "speech_processor",
+)
 
 
 @dataclass
@@ -33,10 +58,16 @@ class RuntimeContext:
 
     settings: "Settings"
     secure_settings: "SecureSettingsManager"
-    github_sync: "GitHubObsidianSync | None"
     bot: "DiscordBot"
-    health_scheduler: "HealthAnalysisScheduler"
+    file_manager: "ObsidianFileManager"
+    daily_integration: "DailyNoteIntegration"
+    component_manager: "LazyComponentManager"
+    github_sync: "GitHubObsidianSync | None" = None
+    sync_scheduler: "GitSyncScheduler | None" = None
+    health_scheduler: "HealthAnalysisScheduler | None" = None
     health_server: "HealthServer | None" = None
+    scheduler_task: "asyncio.Task[None] | None" = None
+    startup_task: "asyncio.Task[None] | None" = None
 
 
 async def initialize_security(
@@ -131,91 +162,191 @@ async def setup_github_sync(
     return github_sync
 
 
-async def build_runtime_context(
-    settings: "Settings",
-    secure_settings: "SecureSettingsManager",
-    github_sync: "GitHubObsidianSync | None",
-    logger: "BoundLogger",
-) -> RuntimeContext:
-    """Construct the runtime components for the application."""
-    logger.info("Initializing health analysis scheduler...")
+def start_sync_scheduler(
+    context: RuntimeContext, logger: "BoundLogger"
+) -> "GitSyncScheduler | None":
+    """Commit vault changes in coalesced batches instead of once per note."""
+    github_sync = context.github_sync
+    if github_sync is None or not github_sync.is_configured:
+        return None
+
+    from src.obsidian.change_feed import get_change_feed
+    from src.obsidian.sync_scheduler import GitSyncScheduler
+
+    settings = context.settings
+    scheduler = GitSyncScheduler(
+        github_sync,
+        get_change_feed(settings.obsidian_vault_path),
+        window_seconds=settings.git_sync_window_seconds,
+        max_backoff_seconds=settings.git_sync_max_backoff_seconds,
+        full_sweep_every=settings.git_sync_full_sweep_windows,
+    )
+    scheduler.start()
+    return scheduler
 
+
+def register_components(
+    settings: "Settings", file_manager: "ObsidianFileManager"
+) -> "LazyComponentManager":
+    """Register the heavy components; nothing is imported until first use."""
     from src.utils.lazy_loader import get_component_manager
 
+    tracker = get_startup_tracker()
     component_manager = get_component_manager()
 
     def create_ai_processor():
-        from src.ai.processor import AIProcessor
-
-        return AIProcessor()
+        return tracker.import_module("src.ai.processor").AIProcessor()
 
     def create_garmin_client():
-        from src.integrations.garmin.client import GarminClient
-
-        return GarminClient()
-
-    component_manager.register_component(
-        "ai_processor", create_ai_processor, cache_duration=3600.0
-    )
-    component_manager.register_component(
-        "garmin_client", create_garmin_client, cache_duration=1800.0
-    )
-
-    garmin_client = component_manager.get_component("garmin_client")
-    ai_processor = component_manager.get_component("ai_processor")
-
-    from src.health_analysis.analyzer import HealthDataAnalyzer
-    from src.health_analysis.integrator import HealthActivityIntegrator
-    from src.health_analysis.scheduler import HealthAnalysisScheduler
-    from src.obsidian.daily_integration import DailyNoteIntegration
-    from src.obsidian.file_manager import ObsidianFileManager
+        return tracker.import_module("src.integrations.garmin.client").GarminClient()
 
-    analyzer = HealthDataAnalyzer(ai_processor=ai_processor)
-    file_manager = ObsidianFileManager()
-    integrator = HealthActivityIntegrator(file_manager=file_manager)
-    daily_integration = DailyNoteIntegration(file_manager=file_manager)
+    def create_note_analyzer():
+        module = tracker.import_module("src.ai.note_analyzer")
+        return module.AdvancedNoteAnalyzer(
+            obsidian_file_manager=file_manager,
+            ai_processor=component_manager.get_component("ai_processor"),
+        )
 
-    health_scheduler = HealthAnalysisScheduler(
-        garmin_client=garmin_client,
-        analyzer=analyzer,
-        integrator=integrator,
-        daily_integration=daily_integration,
-    )
+    def create_template_engine():
+        module = tracker.import_module("src.obsidian.template_system")
+        return module.TemplateEngine(vault_path=settings.obsidian_vault_path)
+
+    def create_speech_processor():
+        return tracker.import_module("src.audio").SpeechProcessor()
+
+    # Proxied components are never reloaded: handlers keep them for the
+    # lifetime of the bot
+    component_manager.register_component("ai_processor", create_ai_processor)
+    component_manager.register_component("garmin_client", create_garmin_client)
+    component_manager.register_component("note_analyzer", create_note_analyzer)
+    component_manager.register_component("template_engine", create_template_engine)
+    if not settings.is_mock_mode:
+        component_manager.register_component(
+            "speech_processor", create_speech_processor
+        )
+    return component_manager
 
-    logger.info("Health analysis scheduler initialized successfully")
 
-    from src.ai.note_analyzer import AdvancedNoteAnalyzer
-    from src.audio import SpeechProcessor
-    from src.bot import DiscordBot
-    from src.obsidian.template_system import TemplateEngine
+async def build_runtime_context(
+    settings: "Settings",
+    secure_settings: "SecureSettingsManager",
+    logger: "BoundLogger",
+) -> RuntimeContext:
+    """Construct the components needed to connect to Discord.
+
+    Heavy components reach the bot as lazy proxies; the health scheduler is
+    built in the background once the bot has connected.
+    """
+    tracker = get_startup_tracker()
+    file_manager = tracker.import_module(
+        "src.obsidian.file_manager"
+    ).ObsidianFileManager()
+    daily_integration = tracker.import_module(
+        "src.obsidian.daily_integration"
+    ).DailyNoteIntegration(file_manager=file_manager)
+    component_manager = register_components(settings, file_manager)
 
-    template_engine = TemplateEngine(vault_path=settings.obsidian_vault_path)
-    note_analyzer = AdvancedNoteAnalyzer(
-        obsidian_file_manager=file_manager, ai_processor=ai_processor
-    )
-    speech_processor = SpeechProcessor() if not settings.is_mock_mode else None
     note_template = "# {title}\n\n{content}\n\n---\nCreated: {timestamp}"
-
-    bot = DiscordBot(
-        ai_processor=ai_processor,
+    bot = tracker.import_module("src.bot").DiscordBot(
+        ai_processor=component_manager.get_proxy("ai_processor"),
         vault_manager=file_manager,
         note_template=note_template,
         daily_integration=daily_integration,
-        template_engine=template_engine,
-        note_analyzer=note_analyzer,
-        speech_processor=speech_processor,
+        template_engine=component_manager.get_proxy("template_engine"),
+        note_analyzer=component_manager.get_proxy("note_analyzer"),
+        speech_processor=(
+            None
+            if settings.is_mock_mode
+            else component_manager.get_proxy("speech_processor")
+        ),
     )
+    logger.info("Runtime context built; heavy components load on first use")
 
     return RuntimeContext(
         settings=settings,
         secure_settings=secure_settings,
-        github_sync=github_sync,
         bot=bot,
-        health_scheduler=health_scheduler,
+        file_manager=file_manager,
+        daily_integration=daily_integration,
+        component_manager=component_manager,
     )
 
 
-def start_health_server(
+def build_health_scheduler(context: RuntimeContext) -> "HealthAnalysisScheduler":
+    """Build the health analysis scheduler (blocking; runs off the event loop)."""
+    tracker = get_startup_tracker()
+    analyzer_module = tracker.import_module("src.health_analysis.analyzer")
+    integrator_module = tracker.import_module("src.health_analysis.integrator")
+    scheduler_module = tracker.import_module("src.health_analysis.scheduler")
+
+    component_manager = context.component_manager
+    return scheduler_module.HealthAnalysisScheduler(
+        garmin_client=component_manager.get_component("garmin_client"),
+        analyzer=analyzer_module.HealthDataAnalyzer(
+            ai_processor=component_manager.get_proxy("ai_processor")
+        ),
+        integrator=integrator_module.HealthActivityIntegrator(
+            file_manager=context.file_manager
+        ),
+        daily_integration=context.daily_integration,
+    )
+
+
+async def warm_up_indexes(file_manager: "ObsidianFileManager") -> None:
+    """Load (or build) the vault indexes so the first note save is fast."""
+    await file_manager.activity_rollup.note_entries()
+    await asyncio.to_thread(file_manager.keyword_index.ensure_ready)
+
+
+async def run_background_startup(
+    context: RuntimeContext, logger: "BoundLogger"
+) -> None:
+    """Startup steps that run after the bot has started connecting."""
+    tracker = get_startup_tracker()
+
+    async def wait_for_discord() -> None:
+        # discord.py only allows wait_until_ready() after login, which happens
+        # inside run_async(); poll the flag set by on_ready instead
+        with tracker.step(DISCORD_CONNECT_STEP):
+            while not context.bot.is_ready:
+                await asyncio.sleep(0.1)
+
+    connect_task = asyncio.create_task(wait_for_discord())
+    try:
+        with contextlib.suppress(Exception), tracker.step(VAULT_SYNC_STEP):
+            context.github_sync = await setup_github_sync(context.settings, logger)
+            context.sync_scheduler = start_sync_scheduler(context, logger)
+
+        # The pull may have replaced notes, so the indexes are loaded after it
+        with contextlib.suppress(Exception), tracker.step(INDEX_WARMUP_STEP):
+            await warm_up_indexes(context.file_manager)
+
+        with contextlib.suppress(Exception), tracker.step(HEALTH_SCHEDULER_STEP):
+            context.health_scheduler = await asyncio.to_thread(
+                build_health_scheduler, context
+            )
+            context.scheduler_task = asyncio.create_task(
+                context.health_scheduler.start_scheduler()
+            )
+            logger.info("Health analysis scheduler started in background")
+
+        with tracker.step(COMPONENT_WARMUP_STEP):
+            await context.component_manager.warm_up(
+                [
+                    name
+                    for name in LAZY_BOT_COMPONENTS
+                    if context.component_manager.has_component(name)
+                ]
+            )
+
+        await connect_task
+    finally:
+        connect_task.cancel()
+
+    logger.info("Startup completed", report=tracker.report()["steps"])
+
+
+async def start_health_server(
     bot: "DiscordBot", logger: "BoundLogger"
 ) -> "HealthServer | None":
     """Start the health check server, handling port conflicts."""
@@ -223,7 +354,7 @@ def start_health_server(
 
     try:
         health_server = HealthServer(bot_instance=bot, port=8080)
-        health_server.start()
+        await health_server.start()
         logger.info(f"Health server started on port {health_server.port}")
         return health_server
     except RuntimeError as exc:
@@ -240,14 +371,25 @@ def start_health_server(
     return None
 
 
-async def shutdown_runtime(
-    context: RuntimeContext,
-    scheduler_task: asyncio.Task[None],
-    logger: "BoundLogger",
-) -> None:
+async def shutdown_runtime(context: RuntimeContext, logger: "BoundLogger") -> None:
     """Shutdown services and perform any final synchronization."""
     logger.info("Shutting down services...")
 
+    if context.startup_task and not context.startup_task.done():
+        context.startup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await context.startup_task
+
+    # Persist pending JSON store writes before the final sync picks up the vault
+    await flush_all_writers()
+    await flush_access_logger()
+
+    if context.sync_scheduler:
+        try:
+            await context.sync_scheduler.stop()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.error(f"Error while flushing coalesced git sync: {exc}")
+
     if (
         context.github_sync
         and context.github_sync.is_configured
@@ -265,48 +407,54 @@ async def shutdown_runtime(
         except Exception as exc:  # pragma: no cover - defensive
             logger.error(f"Error during shutdown sync: {exc}")
 
-    context.health_scheduler.stop_scheduler()
-    scheduler_task.cancel()
-    try:
-        await scheduler_task
-    except asyncio.CancelledError:
-        pass
+    if context.health_scheduler:
+        context.health_scheduler.stop_scheduler()
+    if context.scheduler_task:
+        context.scheduler_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await context.scheduler_task
 
     if context.health_server:
-        context.health_server.stop()
+        await context.health_server.stop()
+    # Only close lazy components if something actually loaded them
+    for component in ("note_analyzer", "garmin_client"):
+        if context.component_manager.is_loaded(component):
+            await context.component_manager.get_component(component).close()
     logger.info("All services stopped")
 
 
 async def run_application(context: RuntimeContext, logger: "BoundLogger") -> None:
-    """Run the Discord bot and supporting services."""
-    context.health_server = start_health_server(context.bot, logger)
+    """Connect to Discord first, then run the remaining startup in the background."""
+    context.health_server = await start_health_server(context.bot, logger)
 
-    logger.info("Starting Discord bot and health scheduler...")
-    health_scheduler_task = asyncio.create_task(
-        context.health_scheduler.start_scheduler()
+    tracker = get_startup_tracker()
+    tracker.expect(VAULT_SYNC_STEP, INDEX_WARMUP_STEP)
+    context.startup_task = asyncio.create_task(
+        run_background_startup(context, logger), name="startup:background"
     )
-    logger.info("Health analysis scheduler started in background")
 
+    logger.info("Starting Discord bot; vault sync and warm-up run in background")
     try:
         await context.bot.run_async()
     finally:
-        await shutdown_runtime(context, health_scheduler_task, logger)
+        await shutdown_runtime(context, logger)
 
 
 async def main() -> None:
     """Main application entry point."""
+    tracker = get_startup_tracker()
     setup_logging()
     logger = get_logger("main")
 
     logger.info("Starting MindBridge", version=__version__)
 
     try:
-        secure_settings, settings = await initialize_security(logger)
-        await validate_required_credentials(settings, secure_settings, logger)
-        github_sync = await setup_github_sync(settings, logger)
-        context = await build_runtime_context(
-            settings, secure_settings, github_sync, logger
-        )
+        with tracker.step("security"):
+            secure_settings, settings = await initialize_security(logger)
+        with tracker.step("credentials"):
+            await validate_required_credentials(settings, secure_settings, logger)
+        with tracker.step("runtime-context"):
+            context = await build_runtime_context(settings, secure_settings, logger)
         await run_application(context, logger)
     except Exception as exc:  # pragma: no cover - defensive
         logger.error("Failed to start bot", error=str(exc), exc_info=True)
@@ -3,5 +3,14 @@ Monitoring and health check functionality
 """
 
 from src.monitoring.health_server import HealthCheckHandler, HealthServer
+from src.monitoring.metrics import MetricsRegistry, get_metrics_registry
+from src.monitoring.startup import StartupTracker, get_startup_tracker
 
-__all__ = ["HealthServer", "HealthCheckHandler"]
+__all__ = [
+    "HealthServer",
+    "HealthCheckHandler",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "StartupTracker",
+    "get_startup_tracker",
+]
@@ -4,21 +4,32 @@ Health check server for container/on-prem deployments
 
 import base64
 import binascii
+import hmac
 import json
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from threading import Thread
 from typing import Any
 
+from aiohttp import web
 from cryptography.fernet import Fernet
 from pydantic import SecretStr
 
 from src import __version__
 from src.config import get_settings
 from src.config.secure_settings import get_secure_settings
+from src.monitoring.metrics import CONTENT_TYPE, get_metrics_registry
+from src.monitoring.startup import get_startup_tracker
 from src.utils import get_logger
 
+_registry = get_metrics_registry()
+BOT_CONNECTED = _registry.gauge(
+    "mindbridge_bot_connected", "1 while the bot is connected to Discord"
+)
+BOT_GUILDS = _registry.gauge("mindbridge_bot_guilds", "Discord guilds the bot is in")
+BOT_UPTIME_SECONDS = _registry.gauge(
+    "mindbridge_bot_uptime_seconds", "Seconds since the bot connected to Discord"
+)
+
 
 class OAuthCodeVault:
     """Secure storage helper for OAuth authorization codes."""
@@ -104,35 +115,43 @@ class OAuthCodeVault:
         raise ValueError("Encryption key must be 32 bytes or valid base64")
 
 
-class HealthCheckHandler(BaseHTTPRequestHandler):
-    """HTTP handler for health check endpoints"""
+class HealthCheckHandler:
+    """HTTP handlers for health check endpoints"""
 
-    def __init__(self, *args: Any, bot_instance: Any = None, **kwargs: Any) -> None:
+    def __init__(self, bot_instance: Any = None) -> None:
         self.bot_instance = bot_instance
         self.logger = get_logger("health_server")
         self.settings = get_settings()
-        self.oauth_vault = OAuthCodeVault()
-        super().__init__(*args, **kwargs)
-
-    def do_GET(self) -> None:
-        """Handle GET requests"""
-        if self.path == "/health":
-            self._handle_health()
-        elif self.path == "/ready":
-            self._handle_ready()
-        elif self.path == "/metrics":
-            self._handle_metrics()
-        elif self.path in {"/probe", "/healthz", "/_ah/health"}:
-            self._handle_probe()
-        elif self.path.startswith("/callback"):
-            self._handle_callback()
-        else:
-            self._send_response(404, {"error": "Not Found"})
-
-    def _handle_health(self) -> None:
+        self._oauth_vault: OAuthCodeVault | None = None
+
+    @property
+    def oauth_vault(self) -> OAuthCodeVault:
+        # Created on the first callback so probes never touch the secret store
+        if self._oauth_vault is None:
+            self._oauth_vault = OAuthCodeVault()
+        return self._oauth_vault
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application serving every endpoint"""
+        app = web.Application()
+        app.router.add_get("/health", self._handle_health)
+        app.router.add_get("/ready", self._handle_ready)
+        app.router.add_get("/metrics", self._handle_metrics)
+        app.router.add_get("/metrics.json", self._handle_metrics_json)
+        app.router.add_get("/startup", self._handle_startup)
+        for path in ("/probe", "/healthz", "/_ah/health"):
+            app.router.add_get(path, self._handle_probe)
+        app.router.add_get("/callback", self._handle_callback)
+        app.router.add_get("/{tail:.*}", self._handle_not_found)
+        return app
+
+    async def _handle_not_found(self, request: web.Request) -> web.Response:
+        return self._send_response(404, {"error": "Not Found"})
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
         """Basic health check - always returns healthy if server is running"""
-        if not self._authorize_request("health"):
-            return
+        if denied := self._authorize_request(request, "health"):
+            return denied
 
         health_data = {
             "status": "healthy",
@@ -140,66 +159,73 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             "service": "mindbridge",
             "version": __version__,
         }
-        self._send_response(200, health_data)
+        return self._send_response(200, health_data)
 
-    def _handle_ready(self) -> None:
+    async def _handle_ready(self, request: web.Request) -> web.Response:
         """Readiness check - checks if bot is connected and operational"""
-        if not self._authorize_request("ready"):
-            return
+        if denied := self._authorize_request(request, "ready"):
+            return denied
 
         if not self.bot_instance:
-            self._send_response(
+            return self._send_response(
                 503, {"status": "not_ready", "reason": "bot_not_initialized"}
             )
-            return
 
         if not self.bot_instance.is_ready:
-            self._send_response(
+            return self._send_response(
                 503, {"status": "not_ready", "reason": "bot_not_connected"}
             )
-            return
 
-        # Check guild connection using the bot's Discord client
-        guild_connected = False
-        if hasattr(self.bot_instance, "bot") and self.bot_instance.bot:
-            guild_connected = len(self.bot_instance.bot.guilds) > 0
+        # Vault sync and index warm-up run after the bot connects
+        startup = get_startup_tracker()
+        if not startup.is_ready:
+            return self._send_response(
+                503,
+                {
+                    "status": "not_ready",
+                    "reason": "startup_in_progress",
+                    "pending_steps": startup.pending_steps(),
+                },
+            )
 
         ready_data = {
             "status": "ready",
             "timestamp": datetime.now().isoformat(),
             "bot_connected": True,
-            "guild_connected": guild_connected,
+            "guild_connected": self._guild_count() > 0,
             "uptime_seconds": (
                 datetime.now() - self.bot_instance.start_time
             ).total_seconds(),
         }
-        self._send_response(200, ready_data)
+        return self._send_response(200, ready_data)
 
-    def _handle_probe(self) -> None:
+    async def _handle_probe(self, request: web.Request) -> web.Response:
         """Unauthenticated probe endpoint for basic liveness checks."""
         probe_data = {
             "status": "ok",
             "timestamp": datetime.now().isoformat(),
             "service": "mindbridge",
         }
-        self._send_response(200, probe_data)
+        return self._send_response(200, probe_data)
 
-    def _handle_metrics(self) -> None:
-        """Expose basic metrics for monitoring"""
-        if not self._authorize_request("metrics"):
-            return
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        """Expose metrics in the Prometheus text format"""
+        if denied := self._authorize_request(request, "metrics"):
+            return denied
 
-        if not self.bot_instance:
-            self._send_response(503, {"error": "bot_not_available"})
-            return
+        self._update_bot_gauges()
+        return web.Response(
+            body=get_metrics_registry().render().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE, "Cache-Control": "no-cache"},
+        )
 
-        # Build metrics based on actual bot attributes
-        guild_count = 0
-        if hasattr(self.bot_instance, "bot") and self.bot_instance.bot:
-            try:
-                guild_count = len(self.bot_instance.bot.guilds)  # type: ignore[attr-defined]
-            except Exception:
-                guild_count = 0
+    async def _handle_metrics_json(self, request: web.Request) -> web.Response:
+        """Expose the JSON status summary (API quotas, vault sync)"""
+        if denied := self._authorize_request(request, "metrics"):
+            return denied
+
+        if not self.bot_instance:
+            return self._send_response(503, {"error": "bot_not_available"})
 
         start_time = getattr(self.bot_instance, "start_time", None)
 
@@ -210,7 +236,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             ),
             "bot_status": {
                 "connected": self.bot_instance.is_ready,
-                "guild_count": guild_count,
+                "guild_count": self._guild_count(),
             },
         }
 
@@ -226,28 +252,67 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 self.bot_instance.api_usage_monitor.get_usage_dashboard()
             )
 
-        self._send_response(200, metrics)
+        # Coalesced git sync: lag and git process counts
+        from src.obsidian.sync_scheduler import get_sync_scheduler
+
+        sync_scheduler = get_sync_scheduler()
+        if sync_scheduler is not None:
+            metrics["vault_sync"] = sync_scheduler.get_stats()
+
+        return self._send_response(200, metrics)
 
-    def _send_response(self, status_code: int, data: dict[str, Any]) -> None:
-        """Send JSON response"""
-        self.send_response(status_code)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Cache-Control", "no-cache")
-        self.end_headers()
+    async def _handle_startup(self, request: web.Request) -> web.Response:
+        """Expose the startup timing report (steps, imports, lazy components)"""
+        if denied := self._authorize_request(request, "startup"):
+            return denied
 
-        response_body = json.dumps(data, ensure_ascii=False, indent=2)
-        self.wfile.write(response_body.encode("utf-8"))
+        return self._send_response(200, get_startup_tracker().report())
 
-    def _send_html(self, status_code: int, html: str) -> None:
-        """Send HTML response"""
-        self.send_response(status_code)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Cache-Control", "no-cache")
-        self.end_headers()
-        self.wfile.write(html.encode("utf-8"))
+    def _guild_count(self) -> int:
+        bot = getattr(self.bot_instance, "bot", None)
+        if not bot:
+            return 0
+        try:
+            return len(bot.guilds)
+        except Exception:
+            return 0
 
-    def _authorize_request(self, scope: str) -> bool:
-        """Ensure sensitive endpoints require an authorization token."""
+    def _update_bot_gauges(self) -> None:
+        """Refresh the bot status gauges right before a scrape"""
+        connected = bool(self.bot_instance and self.bot_instance.is_ready)
+        start_time = getattr(self.bot_instance, "start_time", None)
+        BOT_CONNECTED.set(1 if connected else 0)
+        BOT_GUILDS.set(self._guild_count() if self.bot_instance else 0)
+        BOT_UPTIME_SECONDS.set(
+            (datetime.now() - start_time).total_seconds() if start_time else 0
+        )
+
+    def _send_response(self, status_code: int, data: dict[str, Any]) -> web.Response:
+        """Build a JSON response"""
+        return web.json_response(
+            data,
+            status=status_code,
+            headers={"Cache-Control": "no-cache"},
+            dumps=_dump_json,
+        )
+
+    def _send_html(self, status_code: int, html: str) -> web.Response:
+        """Build an HTML response"""
+        return web.Response(
+            status=status_code,
+            text=html,
+            content_type="text/html",
+            charset="utf-8",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    def _authorize_request(
+        self, request: web.Request, scope: str
+    ) -> web.Response | None:
+        """Ensure sensitive endpoints require an authorization token.
+
+        Returns the error response to send, or ``None`` when authorized.
+        """
 
         token_secret = self._expected_endpoint_token()
         if not token_secret:
@@ -255,27 +320,27 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 "Health endpoint token missing; rejecting request",
                 scope=scope,
             )
-            self._send_response(503, {"error": "health_token_not_configured"})
-            return False
+            return self._send_response(503, {"error": "health_token_not_configured"})
 
-        provided_token = self._extract_token_from_headers()
-        if provided_token != token_secret:
+        provided_token = self._extract_token_from_headers(request)
+        if provided_token is None or not hmac.compare_digest(
+            provided_token.encode("utf-8"), token_secret.encode("utf-8")
+        ):
             self.logger.warning(
                 "Unauthorized health endpoint access attempt",
                 scope=scope,
-                client=self.client_address[0] if self.client_address else "unknown",
+                client=request.remote or "unknown",
             )
-            self._send_response(401, {"error": "unauthorized"})
-            return False
+            return self._send_response(401, {"error": "unauthorized"})
 
-        return True
+        return None
 
-    def _extract_token_from_headers(self) -> str | None:
-        header_token = self.headers.get("X-Health-Token")
+    def _extract_token_from_headers(self, request: web.Request) -> str | None:
+        header_token = request.headers.get("X-Health-Token")
         if header_token:
             return header_token.strip()
 
-        auth_header = self.headers.get("Authorization")
+        auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.lower().startswith("bearer "):
             return auth_header.split(" ", 1)[1].strip()
 
@@ -310,25 +375,21 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
 
         return True, None
 
-    def _handle_callback(self) -> None:
+    async def _handle_callback(self, request: web.Request) -> web.Response:
         """Handle OAuth callback to capture 'code' and show a friendly page"""
         try:
-            from urllib.parse import parse_qs, urlparse
-
-            parsed = urlparse(self.path)
-            params = parse_qs(parsed.query)
-            code = params.get("code", [None])[0]
-            state = params.get("state", [None])[0]
+            code = request.query.get("code")
+            state = request.query.get("state")
 
             state_valid, state_issue = self._validate_callback_state(state)
             if not state_valid:
                 self.logger.warning(
                     "OAuth callback rejected",
                     reason=state_issue,
-                    client=self.client_address[0] if self.client_address else "unknown",
+                    client=request.remote or "unknown",
                 )
                 status_code = 503 if state_issue == "state_not_configured" else 403
-                self._send_html(
+                return self._send_html(
                     status_code,
                     """
                     <html><body>
@@ -337,10 +398,9 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                     </body></html>
                     """,
                 )
-                return
 
             if not code:
-                self._send_html(
+                return self._send_html(
                     400,
                     """
                     <html><body>
@@ -349,7 +409,6 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                     </body></html>
                     """,
                 )
-                return
 
             storage_path = self.oauth_vault.store_code(code)
             persisted_message = (
@@ -364,7 +423,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 state_valid=True,
             )
 
-            self._send_html(
+            return self._send_html(
                 200,
                 f"""
                 <html><body>
@@ -378,7 +437,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             )
         except Exception as e:
             self.logger.error(f"Failed to handle OAuth callback: {e}")
-            self._send_html(
+            return self._send_html(
                 500,
                 """
                 <html><body>
@@ -388,13 +447,17 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 """,
             )
 
-    def log_message(self, format: str, *args: Any) -> None:
-        """Override to use our logger instead of stderr"""
-        self.logger.debug(f"Health server: {format % args}")
+
+def _dump_json(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=2)
 
 
 class HealthServer:
-    """Health check server for container/on-prem deployment"""
+    """Health check server for container/on-prem deployment
+
+    Runs on the bot's event loop (aiohttp), so a slow client or scrape never
+    holds up the other probes.
+    """
 
     def __init__(self, bot_instance: Any = None, port: int = 8080) -> None:
         self.bot_instance = bot_instance
@@ -403,8 +466,7 @@ class HealthServer:
 
         cloud_run_port = int(os.environ.get("PORT", port))
         self.port = self._find_available_port(cloud_run_port)
-        self.server: HTTPServer | None = None
-        self.thread: Thread | None = None
+        self.runner: web.AppRunner | None = None
         self.logger = get_logger("health_server")
 
     def _find_available_port(self, start_port: int) -> int:
@@ -422,31 +484,38 @@ class HealthServer:
             f"No available ports found in range {start_port}-{start_port + 9}"
         )
 
-    def start(self) -> None:
-        """Start the health check server"""
+    async def start(self) -> None:
+        """Start the health check server on the running event loop"""
 
         self._validate_security_requirements()
 
-        def handler(*args: Any, **kwargs: Any) -> HealthCheckHandler:
-            return HealthCheckHandler(*args, bot_instance=self.bot_instance, **kwargs)
-
+        app = HealthCheckHandler(bot_instance=self.bot_instance).create_app()
+        runner = web.AppRunner(app, access_log=None)
         try:
-            self.server = HTTPServer(("0.0.0.0", self.port), handler)  # nosec: B104
-            self.thread = Thread(target=self.server.serve_forever, daemon=True)
-            self.thread.start()
+            await runner.setup()
+            site = web.TCPSite(runner, "0.0.0.0", self.port)  # nosec: B104
+            await site.start()
+            self.runner = runner
 
             self.logger.info(f"Health check server started on port {self.port}")
             self.logger.info("Available endpoints:")
             self.logger.info("  - GET /health  - Basic health check")
             self.logger.info("  - GET /ready   - Readiness probe")
             self.logger.info(
-                "  - GET /metrics - Application metrics (requires X-Health-Token)"
+                "  - GET /metrics - Prometheus metrics (requires X-Health-Token)"
+            )
+            self.logger.info(
+                "  - GET /metrics.json - Status summary (requires X-Health-Token)"
+            )
+            self.logger.info(
+                "  - GET /startup - Startup timing report (requires X-Health-Token)"
             )
             self.logger.info(
                 "  - GET /callback - OAuth redirect (requires configured state token)"
             )
 
         except Exception as e:
+            await runner.cleanup()
             self.logger.error(f"Failed to start health server: {e}")
             raise
 
@@ -506,14 +575,11 @@ class HealthServer:
         normalized = value.strip()
         return normalized or None
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """Stop the health check server"""
-        if self.server:
+        if self.runner:
             self.logger.info("Stopping health check server")
-            self.server.shutdown()
-            self.server.server_close()
-
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5.0)
+            await self.runner.cleanup()
+            self.runner = None
 
         self.logger.info("Health check server stopped")
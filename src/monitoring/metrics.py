@@ -0,0 +1,668 @@
+"""
+Process-wide metrics registry with Prometheus text exposition
+
+Counters, gauges and histograms are updated in place on the hot path and
+only formatted when ``/metrics`` is scraped. Histograms keep preallocated
+bucket counts instead of samples and estimate percentiles from them. Gauges
+can also be backed by a function (queue depths, cache hit ratios) that is
+evaluated at scrape time.
+"""
+
+import bisect
+import inspect
+import itertools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from functools import partial, wraps
+from typing import Any, TypeVar, cast
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache hits (ms) up to slow AI / transcription calls (1 min)
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> tuple[float, ...]:
+    """``count`` bucket bounds from ``start``, each ``factor`` times the last."""
+    if start <= 0 or factor <= 1 or count < 1:
+        raise ValueError("Exponential buckets need start > 0, factor > 1, count >= 1")
+    return tuple(start * factor**index for index in range(count))
+
+
+# Seconds; 100 us to about 90 s, four buckets per doubling, for the
+# per-operation percentiles
+LATENCY_BUCKETS = exponential_buckets(0.0001, 2**0.25, 80)
+
+LabelValues = tuple[str, ...]
+Summary = dict[str, float | int | None]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Metric(ABC):
+    """A named metric family with a fixed set of label names."""
+
+    type_name = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, "
+                f"got {sorted(labels)}"
+            )
+        try:
+            return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError as e:
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, "
+                f"got {sorted(labels)}"
+            ) from e
+
+    @abstractmethod
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        """(suffix, formatted labels, value) for every series."""
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = self._key(labels)
+        self._lock.acquire()
+        try:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        finally:
+            self._lock.release()
+
+    def labels(self, **labels: str) -> "BoundCounter":
+        """Bind a label set once, for hot paths that increment it repeatedly."""
+        key = self._key(labels)
+        with self._lock:
+            self._values.setdefault(key, 0.0)
+        return BoundCounter(self, key)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class BoundCounter:
+    """A counter series with its labels resolved up front."""
+
+    __slots__ = ("_key", "_lock", "_values")
+
+    def __init__(self, counter: Counter, key: LabelValues) -> None:
+        self._key = key
+        self._lock = counter._lock
+        self._values = counter._values
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        lock = self._lock
+        lock.acquire()
+        try:
+            self._values[self._key] += amount
+        finally:
+            lock.release()
+
+    def value(self) -> float:
+        return self._values[self._key]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, set directly or read from a function."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float | None]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        self._lock.acquire()
+        try:
+            self._values[key] = value
+        finally:
+            self._lock.release()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._lock.acquire()
+        try:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        finally:
+            self._lock.release()
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float | None], **labels: str) -> None:
+        """Read the value from ``function`` at scrape time (``None`` skips it).
+
+        Registering again for the same labels replaces the previous function.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+            self._values.pop(key, None)
+
+    def reset(self) -> None:
+        """Set every directly set series back to zero."""
+        with self._lock:
+            for key in self._values:
+                self._values[key] = 0.0
+
+    def has_function(self, **labels: str) -> bool:
+        return self._key(labels) in self._functions
+
+    def value(self, **labels: str) -> float | None:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        if function is not None:
+            return _call(self.name, function)
+        return self._values.get(key, 0.0)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+            functions = list(self._functions.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+        for key, function in functions:
+            result = _call(self.name, function)
+            if result is not None:
+                yield "", _format_labels(self.labelnames, key), result
+
+
+class _HistogramSeries:
+    """Bucket counts of one label set, preallocated when the set is first seen."""
+
+    __slots__ = ("counts", "count", "sum", "max", "summary")
+
+    def __init__(self, size: int) -> None:
+        # The last slot counts observations above the highest bound (+Inf)
+        self.counts = array("Q", bytes(8 * size))
+        self.count = 0
+        self.sum = 0.0
+        self.max = -math.inf
+        # Last summary, reused while no observation has been added since
+        self.summary: Summary | None = None
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets per label set.
+
+    Only bucket counts, the sum and the maximum are kept, so memory per label
+    set is fixed and quantiles are estimated by interpolating within the
+    bucket that holds the requested rank (as Prometheus'
+    ``histogram_quantile`` does). With ``LATENCY_BUCKETS`` the estimate is
+    within one bucket, about 19%, of the true value.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        if "le" in labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        self._observe(self._get_series(self._key(labels)), value)
+
+    def labels(self, **labels: str) -> "BoundHistogram":
+        """Bind a label set once, for hot paths that observe it repeatedly."""
+        return BoundHistogram(self, self._get_series(self._key(labels)))
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def quantile(self, q: float, **labels: str) -> float | None:
+        """Estimated ``q`` quantile (0-1), or ``None`` with no observations."""
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return None
+        with self._lock:
+            cumulative = list(itertools.accumulate(series.counts))
+            highest = series.max
+        return self._quantiles(cumulative, highest, (q,))[0]
+
+    def summary(self, **labels: str) -> Summary:
+        """Count, average, maximum and p50/p95/p99 of one label set."""
+        series = self._series.get(self._key(labels))
+        if series is None or not series.count:
+            return {
+                "count": 0,
+                "avg": None,
+                "max": None,
+                "p50": None,
+                "p95": None,
+                "p99": None,
+            }
+        return self._summary(series)
+
+    def summaries(self) -> dict[LabelValues, Summary]:
+        """``summary`` of every label set with observations, by label values."""
+        with self._lock:
+            items = list(self._series.items())
+        return {key: self._summary(series) for key, series in items if series.count}
+
+    def label_sets(self) -> list[dict[str, str]]:
+        """Label sets that have observations."""
+        with self._lock:
+            keys = list(self._series)
+        return [dict(zip(self.labelnames, key, strict=True)) for key in keys]
+
+    def totals(self) -> tuple[int, float]:
+        """Observation count and sum over every label set."""
+        with self._lock:
+            series = list(self._series.values())
+            return sum(s.count for s in series), sum(s.sum for s in series)
+
+    def _summary(self, series: _HistogramSeries) -> Summary:
+        cached = series.summary
+        if cached is not None and cached["count"] == series.count:
+            return dict(cached)
+        with self._lock:
+            cumulative = list(itertools.accumulate(series.counts))
+            count = series.count
+            total = series.sum
+            highest = series.max
+        p50, p95, p99 = self._quantiles(cumulative, highest, (0.5, 0.95, 0.99))
+        summary: Summary = {
+            "count": count,
+            "avg": total / count,
+            "max": highest,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+        series.summary = summary
+        return dict(summary)
+
+    def _get_series(self, key: LabelValues) -> _HistogramSeries:
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(
+                    key, _HistogramSeries(len(self.buckets) + 1)
+                )
+        return series
+
+    def _observe(self, series: _HistogramSeries, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        lock = self._lock
+        lock.acquire()
+        try:
+            series.counts[index] += 1
+            series.count += 1
+            series.sum += value
+            if value > series.max:
+                series.max = value
+        finally:
+            lock.release()
+
+    def _quantiles(
+        self, cumulative: list[int], highest: float, qs: Sequence[float]
+    ) -> list[float | None]:
+        """Estimates for quantiles ``qs``, located by bisecting cumulative counts."""
+        total = cumulative[-1]
+        if not total:
+            return [None] * len(qs)
+        estimates: list[float | None] = []
+        for q in qs:
+            rank = q * total
+            # First bucket whose cumulative count reaches the rank (and is not
+            # empty when the rank is zero)
+            index = (
+                bisect.bisect_left(cumulative, rank)
+                if rank > 0
+                else bisect.bisect_right(cumulative, 0)
+            )
+            if index >= len(self.buckets):
+                estimates.append(highest)
+                continue
+            below = cumulative[index - 1] if index else 0
+            lower = self.buckets[index - 1] if index else 0.0
+            upper = self.buckets[index]
+            fraction = (rank - below) / (cumulative[index] - below)
+            estimates.append(min(lower + (upper - lower) * fraction, highest))
+        return estimates
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            items = [
+                (key, series.counts.tolist(), series.sum)
+                for key, series in self._series.items()
+            ]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                yield (
+                    "_bucket",
+                    _format_labels(self.labelnames, key, ("le", bound)),
+                    cumulative,
+                )
+            labels = _format_labels(self.labelnames, key)
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+class BoundHistogram:
+    """A histogram series with its labels resolved up front."""
+
+    __slots__ = ("_histogram", "_series")
+
+    def __init__(self, histogram: Histogram, series: _HistogramSeries) -> None:
+        self._histogram = histogram
+        self._series = series
+
+    def observe(self, value: float) -> None:
+        self._histogram._observe(self._series, value)
+
+
+class MetricsRegistry:
+    """Named metrics, rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(
+        self,
+        cls: type[MetricT],
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        **kwargs: Any,
+    ) -> MetricT:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, documentation, labelnames, **kwargs
+                )
+            elif not isinstance(metric, cls):
+                raise ValueError(
+                    f"Metric {name} is already registered as a "
+                    f"{metric.type_name} with labels {list(metric.labelnames)}"
+                )
+            elif metric.labelnames != tuple(labelnames):
+                raise ValueError(
+                    f"Metric {name} is already registered with labels "
+                    f"{list(metric.labelnames)}"
+                )
+            return metric
+
+
+def _call(name: str, function: Callable[[], float | None]) -> float | None:
+    try:
+        return function()
+    except Exception as e:
+        logger.debug("Metric function failed", metric=name, error=str(e))
+        return None
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(
+    names: tuple[str, ...], values: LabelValues, *extra: tuple[str, str]
+) -> str:
+    pairs = [*zip(names, values, strict=True), *extra]
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs)
+        + "}"
+    )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry (exported at ``/metrics``)."""
+    return _registry
+
+
+# Metrics shared across the bot
+
+MESSAGE_PIPELINE_SECONDS = _registry.histogram(
+    "mindbridge_message_pipeline_seconds",
+    "Time a Discord message spends in each pipeline stage",
+    ("stage",),
+)
+MESSAGES_TOTAL = _registry.counter(
+    "mindbridge_messages_total",
+    "Discord messages handled, by outcome",
+    ("outcome",),
+)
+MESSAGES_IN_PROGRESS = _registry.gauge(
+    "mindbridge_messages_in_progress",
+    "Discord messages being processed or waiting for the startup vault sync",
+)
+EXTERNAL_CALLS_TOTAL = _registry.counter(
+    "mindbridge_external_calls_total",
+    "Calls to Gemini, Speech-to-Text and GitHub, by outcome",
+    ("service", "outcome"),
+)
+EXTERNAL_CALL_SECONDS = _registry.histogram(
+    "mindbridge_external_call_seconds",
+    "Latency of calls to external services",
+    ("service",),
+)
+CACHE_LOOKUPS_TOTAL = _registry.counter(
+    "mindbridge_cache_lookups_total",
+    "Cache lookups, by cache and result",
+    ("cache", "result"),
+)
+CACHE_HIT_RATIO = _registry.gauge(
+    "mindbridge_cache_hit_ratio",
+    "Share of cache lookups that were hits since startup",
+    ("cache",),
+)
+QUEUE_DEPTH = _registry.gauge(
+    "mindbridge_queue_depth",
+    "Items waiting in in-process queues",
+    ("queue",),
+)
+
+
+OPERATION_SECONDS = _registry.histogram(
+    "mindbridge_operation_seconds",
+    "Time spent in operations instrumented with timed()",
+    ("operation",),
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class timed:
+    """Time a block or a function into ``mindbridge_operation_seconds``.
+
+    Works as a context manager (one instance per block) and as a decorator
+    for sync and async functions::
+
+        with timed("vault.rebuild_index"):
+            ...
+
+        @timed("ai.process_text")
+        async def process_text(...): ...
+
+    The label set is resolved when ``timed`` is created, so each timed call
+    costs two clock reads and one bucket increment.
+    """
+
+    __slots__ = ("operation", "_series", "_started")
+
+    def __init__(self, operation: str, histogram: Histogram | None = None) -> None:
+        self.operation = operation
+        self._series = (histogram or OPERATION_SECONDS).labels(operation=operation)
+        self._started = 0.0
+
+    def __enter__(self) -> "timed":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._series.observe(time.perf_counter() - self._started)
+
+    def __call__(self, function: F) -> F:
+        series = self._series
+
+        if inspect.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    series.observe(time.perf_counter() - started)
+
+            return cast(F, async_wrapper)
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                series.observe(time.perf_counter() - started)
+
+        return cast(F, wrapper)
+
+
+def record_external_call(service: str, success: bool, seconds: float) -> None:
+    """Count one call to an external service and its latency."""
+    EXTERNAL_CALLS_TOTAL.inc(service=service, outcome="success" if success else "error")
+    EXTERNAL_CALL_SECONDS.observe(seconds, service=service)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup; the hit ratio is derived at scrape time."""
+    CACHE_LOOKUPS_TOTAL.inc(cache=cache, result="hit" if hit else "miss")
+    if not CACHE_HIT_RATIO.has_function(cache=cache):
+        CACHE_HIT_RATIO.set_function(partial(_cache_hit_ratio, cache), cache=cache)
+
+
+def _cache_hit_ratio(cache: str) -> float | None:
+    hits = CACHE_LOOKUPS_TOTAL.value(cache=cache, result="hit")
+    total = hits + CACHE_LOOKUPS_TOTAL.value(cache=cache, result="miss")
+    return hits / total if total else None
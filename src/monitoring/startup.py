@@ -0,0 +1,205 @@
+"""
+Staged startup tracking: per-step timings, import times and readiness
+"""
+
+import asyncio
+import importlib
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Any
+
+from src.utils import get_logger
+
+# Steps run after the bot has connected. /ready reports not ready until the
+# required ones have finished (successfully or not)
+VAULT_SYNC_STEP = "vault-sync"
+INDEX_WARMUP_STEP = "index-warmup"
+DISCORD_CONNECT_STEP = "discord-connect"
+HEALTH_SCHEDULER_STEP = "health-scheduler"
+COMPONENT_WARMUP_STEP = "component-warmup"
+
+_FINISHED = ("done", "failed")
+
+
+@dataclass
+class StartupStep:
+    """Timing of one startup step, relative to the start of the process."""
+
+    name: str
+    required: bool = False
+    status: str = "pending"
+    started_ms: float | None = None
+    duration_ms: float | None = None
+    modules_imported: int = 0
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "required": self.required,
+            "status": self.status,
+            "started_ms": _round(self.started_ms),
+            "duration_ms": _round(self.duration_ms),
+            "modules_imported": self.modules_imported,
+            "error": self.error,
+        }
+
+
+class StartupTracker:
+    """Records startup steps and gates readiness on the required ones.
+
+    Steps may finish on any thread; coroutines waiting in ``wait_for`` are
+    woken on their own event loop.
+    """
+
+    def __init__(self) -> None:
+        self.logger = get_logger("startup")
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._steps: dict[str, StartupStep] = {}
+        self._imports: dict[str, float] = {}
+        self._waiters: dict[str, list[asyncio.Future[None]]] = {}
+        self._ready_ms: float | None = None
+        self._lock = threading.Lock()
+
+    def expect(self, *names: str, required: bool = True) -> None:
+        """Declare steps that will run later, so readiness waits for them."""
+        with self._lock:
+            for name in names:
+                self._steps.setdefault(name, StartupStep(name, required=required))
+
+    @contextmanager
+    def step(self, name: str, required: bool = False) -> Iterator[StartupStep]:
+        """Time a step; usable around both blocking and ``await``-ing code."""
+        with self._lock:
+            step = self._steps.setdefault(name, StartupStep(name, required=required))
+            step.required = step.required or required
+            step.status = "running"
+            step.started_ms = self._elapsed_ms()
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield step
+        except BaseException as exc:
+            self._finish(step, start, modules_before, "failed", str(exc) or repr(exc))
+            raise
+        self._finish(step, start, modules_before, "done", None)
+
+    def import_module(self, name: str) -> ModuleType:
+        """Import a module, recording how long its first import took."""
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        with self._lock:
+            self._imports.setdefault(name, (time.perf_counter() - start) * 1000)
+        return module
+
+    @property
+    def is_ready(self) -> bool:
+        return not self.pending_steps()
+
+    def pending_steps(self) -> list[str]:
+        """Required steps that have not finished yet."""
+        with self._lock:
+            return [
+                step.name
+                for step in self._steps.values()
+                if step.required and not step.finished
+            ]
+
+    async def wait_for(self, *names: str) -> None:
+        """Wait until the given steps have finished (unknown steps do not block)."""
+        loop = asyncio.get_running_loop()
+        for name in names:
+            with self._lock:
+                step = self._steps.get(name)
+                if step is None or step.finished:
+                    continue
+                future: asyncio.Future[None] = loop.create_future()
+                self._waiters.setdefault(name, []).append(future)
+            await future
+
+    def report(self) -> dict[str, Any]:
+        """Startup timing report (served by the health server at /startup)."""
+        with self._lock:
+            steps = [step.to_dict() for step in self._steps.values()]
+            imports = sorted(self._imports.items(), key=lambda item: -item[1])
+            ready_ms = self._ready_ms
+        pending = self.pending_steps()
+
+        from src.utils.lazy_loader import get_component_manager
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "uptime_ms": _round(self._elapsed_ms()),
+            "ready": not pending,
+            "ready_after_ms": _round(ready_ms),
+            "pending_steps": pending,
+            "steps": steps,
+            "imports_ms": {name: _round(ms) for name, ms in imports},
+            "components": get_component_manager().get_all_stats(),
+        }
+
+    def _finish(
+        self,
+        step: StartupStep,
+        start: float,
+        modules_before: int,
+        status: str,
+        error: str | None,
+    ) -> None:
+        with self._lock:
+            step.duration_ms = (time.perf_counter() - start) * 1000
+            step.modules_imported = max(0, len(sys.modules) - modules_before)
+            step.status = status
+            step.error = error
+            waiters = self._waiters.pop(step.name, [])
+            if self._ready_ms is None and not any(
+                s.required and not s.finished for s in self._steps.values()
+            ):
+                self._ready_ms = self._elapsed_ms()
+
+        log = self.logger.info if status == "done" else self.logger.warning
+        log(
+            "Startup step finished",
+            step=step.name,
+            status=status,
+            duration_ms=_round(step.duration_ms),
+            error=error,
+        )
+        for future in waiters:
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+_tracker: StartupTracker | None = None
+
+
+def get_startup_tracker() -> StartupTracker:
+    """Process-wide startup tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = StartupTracker()
+    return _tracker
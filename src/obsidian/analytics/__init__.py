@@ -1,6 +1,12 @@
 """Analytics and statistics for Obsidian vault."""
 
+from src.obsidian.analytics.activity_rollup import DailyActivityRollup
 from src.obsidian.analytics.stats_models import CategoryStats, VaultStats
 from src.obsidian.analytics.vault_statistics import VaultStatistics
 
-__all__ = ["VaultStatistics", "VaultStats", "CategoryStats"]
+__all__ = [
+    "DailyActivityRollup",
+    "VaultStatistics",
+    "VaultStats",
+    "CategoryStats",
+]
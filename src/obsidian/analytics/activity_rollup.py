@@ -0,0 +1,450 @@
+"""Per-day activity rollup maintained incrementally as notes are saved."""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.obsidian.core.frontmatter import (
+    frontmatter_model,
+    split_frontmatter,
+    strip_title,
+)
+from src.obsidian.models import (
+    DERIVED_DATA_FOLDER,
+    EXCLUDED_FOLDERS,
+    NoteFrontmatter,
+    ObsidianNote,
+)
+from src.utils.json_store import AtomicJsonWriter
+
+logger = structlog.get_logger(__name__)
+
+ROLLUP_FILE = Path(DERIVED_DATA_FOLDER) / "activity_rollup.json"
+# Bump when NoteActivity gains fields so older files are rebuilt
+ROLLUP_VERSION = 5
+# Saves within this many seconds share one rewrite of the rollup file
+PERSIST_DELAY_SECONDS = 2.0
+# Folders never scanned for notes (git objects are never notes)
+SKIPPED_FOLDERS = frozenset({*EXCLUDED_FOLDERS, ".git"})
+
+# (size, mtime_ns) of a note file when its contribution was derived
+FileStamp = tuple[int, int]
+
+
+@dataclass
+class NoteActivity:
+    """Activity contribution of a single note, keyed by its vault path."""
+
+    day: str
+    hour: int | None = None
+    channel: str | None = None
+    content_length: int = 0
+    ai_processed: bool = False
+    ai_processing_time: int = 0
+    category: str | None = None
+    status: str = "active"
+    ai_tags: list[str] = field(default_factory=list)
+    manual_tags: list[str] = field(default_factory=list)
+    size: int = 0
+    mtime_ns: int = 0
+
+    @property
+    def tags(self) -> list[str]:
+        return sorted({*self.ai_tags, *self.manual_tags})
+
+    @classmethod
+    def from_note(cls, note: ObsidianNote) -> "NoteActivity | None":
+        return cls.from_frontmatter(note.frontmatter, len(note.content))
+
+    @classmethod
+    def from_frontmatter(
+        cls, frontmatter: NoteFrontmatter, content_length: int
+    ) -> "NoteActivity | None":
+        created = frontmatter.created
+        try:
+            created_at = datetime.fromisoformat(str(created))
+        except ValueError:
+            return None
+
+        has_time = len(str(created)) > 10
+        return cls(
+            day=created_at.date().isoformat(),
+            hour=created_at.hour if has_time else None,
+            channel=frontmatter.discord_channel,
+            content_length=content_length,
+            ai_processed=frontmatter.ai_processed,
+            ai_processing_time=int(frontmatter.ai_processing_time or 0)
+            if frontmatter.ai_processed
+            else 0,
+            category=frontmatter.ai_category,
+            status=frontmatter.status.value,
+            ai_tags=sorted({tag.lstrip("#") for tag in frontmatter.ai_tags}),
+            manual_tags=sorted({tag.lstrip("#") for tag in frontmatter.tags}),
+        )
+
+
+@dataclass
+class DayActivity:
+    """Aggregated activity for one day."""
+
+    message_count: int = 0
+    content_length_total: int = 0
+    ai_processed_count: int = 0
+    ai_processing_time_total: int = 0
+    hours: Counter[int] = field(default_factory=Counter)
+    channels: Counter[str] = field(default_factory=Counter)
+    categories: Counter[str] = field(default_factory=Counter)
+    tags: Counter[str] = field(default_factory=Counter)
+
+    def apply(self, activity: NoteActivity, sign: int) -> None:
+        self.message_count += sign
+        self.content_length_total += sign * activity.content_length
+        self.ai_processed_count += sign * int(activity.ai_processed)
+        self.ai_processing_time_total += sign * activity.ai_processing_time
+        if activity.hour is not None:
+            self.hours[activity.hour] += sign
+        if activity.channel:
+            self.channels[activity.channel] += sign
+        if activity.category:
+            self.categories[activity.category] += sign
+        for tag in activity.tags:
+            self.tags[tag] += sign
+        # Drop zeroed keys so removals leave no residue
+        for counter in (self.hours, self.channels, self.categories, self.tags):
+            for key in [k for k, v in counter.items() if v <= 0]:
+                del counter[key]
+
+    def to_summary(self) -> dict[str, Any]:
+        """Summary in the shape used by the health/activity integrator."""
+        return {
+            "message_count": self.message_count,
+            "active_hours": sorted(self.hours),
+            "channel_activity": dict(self.channels),
+            "content_length_total": self.content_length_total,
+            "ai_processed_count": self.ai_processed_count,
+            "categories": dict(self.categories),
+            "tags": sorted(self.tags),
+        }
+
+    def to_daily_stats(self) -> dict[str, Any]:
+        """Statistics in the shape used when filling in daily notes."""
+        return {
+            "total_messages": self.message_count,
+            "processed_messages": self.ai_processed_count,
+            "ai_processing_time_total": self.ai_processing_time_total,
+            "categories": dict(self.categories),
+            "tags": dict(self.tags.most_common()),
+        }
+
+
+class DailyActivityRollup:
+    """Vault-wide daily activity counters.
+
+    Each note's contribution is stored by path, so saving a note again
+    replaces its previous contribution and deleting it subtracts it. The
+    rollup is persisted under ``.mindbridge/`` in the vault (ignored by git
+    sync) at most once per ``PERSIST_DELAY_SECONDS``.
+
+    Each contribution remembers the size and mtime of the file it was
+    derived from. On first use the vault is scanned in a worker thread and
+    notes that were added or changed outside the app (git pull, delta sync,
+    Obsidian) are re-derived, and missing ones dropped; when the file is
+    missing the same scan rebuilds the rollup from scratch.
+    """
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = vault_path
+        self.store_path = vault_path / ROLLUP_FILE
+        self._writer = AtomicJsonWriter(
+            self.store_path,
+            prefix="activity_rollup_",
+            coalesce_window=PERSIST_DELAY_SECONDS,
+            indent=None,
+        )
+
+        self._notes: dict[str, NoteActivity] = {}
+        self._days: dict[str, DayActivity] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    # === Read API ===
+
+    async def get_range(
+        self, start_date: date, end_date: date
+    ) -> dict[date, dict[str, Any]]:
+        """Summaries for days with activity within [start_date, end_date]."""
+        await self._ensure_loaded()
+        start_key, end_key = start_date.isoformat(), end_date.isoformat()
+        return {
+            date.fromisoformat(day): activity.to_summary()
+            for day, activity in sorted(self._days.items())
+            if start_key <= day <= end_key and activity.message_count > 0
+        }
+
+    @property
+    def is_available(self) -> bool:
+        """True when the rollup can be read without a full vault scan."""
+        return self._loaded or self.store_path.exists()
+
+    async def note_activities(self) -> list[NoteActivity]:
+        """Per-note contributions, in vault path order."""
+        return [activity for _key, activity in await self.note_entries()]
+
+    async def note_entries(self) -> list[tuple[str, NoteActivity]]:
+        """(vault-relative path, contribution) pairs, in vault path order."""
+        await self._ensure_loaded()
+        return sorted(self._notes.items())
+
+    async def get_day(self, day: date) -> DayActivity:
+        """Aggregated activity for a single day (empty when nothing was saved)."""
+        await self._ensure_loaded()
+        return self._days.get(day.isoformat()) or DayActivity()
+
+    # === Write API ===
+
+    async def record_note(self, file_path: Path, note: ObsidianNote) -> None:
+        """Add or replace the contribution of a saved note."""
+        await self._ensure_loaded()
+        key = self._key(file_path)
+        self._remove(key)
+        activity = NoteActivity.from_note(note)
+        if activity is not None:
+            activity.size, activity.mtime_ns = self._stamp(file_path)
+            self._add(key, activity)
+        self._persist()
+
+    async def record_metadata(
+        self, updates: list[tuple[Path, NoteFrontmatter]]
+    ) -> None:
+        """Re-derive notes whose frontmatter changed but body did not."""
+        await self._ensure_loaded()
+        for file_path, frontmatter in updates:
+            key = self._key(file_path)
+            previous = self._notes.get(key)
+            self._remove(key)
+            activity = NoteActivity.from_frontmatter(
+                frontmatter, previous.content_length if previous else 0
+            )
+            if activity is not None:
+                activity.size, activity.mtime_ns = self._stamp(file_path)
+                self._add(key, activity)
+        self._persist()
+
+    async def move_notes(
+        self, moves: list[tuple[Path, Path, NoteFrontmatter | None]]
+    ) -> None:
+        """Re-key moved notes, re-deriving those whose frontmatter was rewritten."""
+        await self._ensure_loaded()
+        for source, target, frontmatter in moves:
+            previous = self._notes.get(self._key(source))
+            self._remove(self._key(source))
+            activity = previous
+            if frontmatter is not None:
+                activity = NoteActivity.from_frontmatter(
+                    frontmatter, previous.content_length if previous else 0
+                )
+                if activity is not None:
+                    activity.size, activity.mtime_ns = self._stamp(target)
+            if activity is not None:
+                self._add(self._key(target), activity)
+        self._persist()
+
+    async def remove_note(self, file_path: Path) -> None:
+        """Subtract the contribution of a deleted note."""
+        await self._ensure_loaded()
+        if self._remove(self._key(file_path)):
+            self._persist()
+
+    async def reconcile(self) -> None:
+        """Pick up notes added, changed or removed outside the app.
+
+        Only files whose size or mtime changed are read again, so callers
+        that plan from the rollup can run this before every plan.
+        """
+        async with self._lock:
+            if not self._loaded:
+                await self._load_locked()
+                return
+            changed = await self._reconcile_locked()
+        if changed:
+            self._persist()
+
+    async def rebuild(self) -> int:
+        """Rebuild the rollup from a full vault scan."""
+        async with self._lock:
+            self._notes.clear()
+            self._days.clear()
+            await self._reconcile_locked()
+            logger.info("Activity rollup rebuilt", notes=len(self._notes))
+            self._loaded = True
+        self._persist()
+        await self._writer.flush()
+        return len(self._notes)
+
+    # === Internals ===
+
+    def _key(self, file_path: Path) -> str:
+        path = file_path if file_path.is_absolute() else self.vault_path / file_path
+        try:
+            return path.relative_to(self.vault_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _add(self, key: str, activity: NoteActivity) -> None:
+        self._notes[key] = activity
+        self._days.setdefault(activity.day, DayActivity()).apply(activity, 1)
+
+    def _remove(self, key: str) -> bool:
+        activity = self._notes.pop(key, None)
+        if activity is None:
+            return False
+        day = self._days.get(activity.day)
+        if day is not None:
+            day.apply(activity, -1)
+            if day.message_count <= 0:
+                del self._days[activity.day]
+        return True
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self._load_locked()
+
+    async def _load_locked(self) -> None:
+        stored = await asyncio.to_thread(self._read_store)
+        changed = await self._reconcile_locked()
+        if not stored:
+            logger.info("Activity rollup rebuilt", notes=len(self._notes))
+        if changed or not stored:
+            self._persist()
+        self._loaded = True
+
+    def _read_store(self) -> bool:
+        if not self.store_path.exists():
+            return False
+        try:
+            data = json.loads(self.store_path.read_text(encoding="utf-8"))
+            if data.get("version") != ROLLUP_VERSION:
+                logger.info("Activity rollup format changed, rebuilding")
+                return False
+            for key, item in data.get("notes", {}).items():
+                self._add(key, NoteActivity(**item))
+        except Exception as e:
+            logger.warning("Failed to read activity rollup", error=str(e))
+            self._notes.clear()
+            self._days.clear()
+            return False
+        return True
+
+    async def _reconcile_locked(self) -> bool:
+        """Bring the contributions in line with the files; True when any changed."""
+        known = {
+            key: (activity.size, activity.mtime_ns)
+            for key, activity in self._notes.items()
+        }
+        changed, removed = await asyncio.to_thread(self._scan, known)
+        for key in removed:
+            if self._stamp_of(key) == known[key]:
+                self._remove(key)
+        for key, activity in changed.items():
+            if self._stamp_of(key) != known.get(key):
+                continue  # Saved again while the scan ran
+            self._remove(key)
+            if activity is not None:
+                self._add(key, activity)
+        if changed or removed:
+            logger.info(
+                "Activity rollup reconciled", changed=len(changed), removed=len(removed)
+            )
+        return bool(changed or removed)
+
+    def _scan(
+        self, known: dict[str, FileStamp]
+    ) -> tuple[dict[str, NoteActivity | None], list[str]]:
+        """Re-derive new or changed notes and list missing ones (worker thread)."""
+        changed: dict[str, NoteActivity | None] = {}
+        seen: set[str] = set()
+        for key, path, stamp in self._walk_notes():
+            seen.add(key)
+            if known.get(key) == stamp:
+                continue
+            activity = self._derive(path, stamp)
+            if activity is not None or key in known:
+                changed[key] = activity
+        return changed, [key for key in known if key not in seen]
+
+    def _walk_notes(self) -> list[tuple[str, Path, FileStamp]]:
+        notes: list[tuple[str, Path, FileStamp]] = []
+        pending = [(self.vault_path, "")]
+        while pending:
+            folder, prefix = pending.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIPPED_FOLDERS:
+                                pending.append(
+                                    (Path(entry.path), f"{prefix}{entry.name}/")
+                                )
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            stat = entry.stat()
+                            notes.append(
+                                (
+                                    prefix + entry.name,
+                                    Path(entry.path),
+                                    (stat.st_size, stat.st_mtime_ns),
+                                )
+                            )
+            except OSError as e:
+                logger.warning(
+                    "Failed to scan vault folder", folder=str(folder), error=str(e)
+                )
+        return notes
+
+    def _derive(self, path: Path, stamp: FileStamp) -> NoteActivity | None:
+        """Contribution of a note file, parsed the way notes are loaded."""
+        try:
+            data = path.read_bytes()
+            block = split_frontmatter(data)
+            body = data[block.body_offset :].decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Failed to read note", path=str(path), error=str(e))
+            return None
+        frontmatter = frontmatter_model(
+            block.fields(), path.relative_to(self.vault_path)
+        )
+        if frontmatter is None:
+            return None
+        activity = NoteActivity.from_frontmatter(frontmatter, len(strip_title(body)))
+        if activity is not None:
+            activity.size, activity.mtime_ns = stamp
+        return activity
+
+    def _stamp_of(self, key: str) -> FileStamp | None:
+        activity = self._notes.get(key)
+        return None if activity is None else (activity.size, activity.mtime_ns)
+
+    def _stamp(self, file_path: Path) -> FileStamp:
+        path = file_path if file_path.is_absolute() else self.vault_path / file_path
+        try:
+            stat = path.stat()
+        except OSError:
+            return (0, 0)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _persist(self) -> None:
+        self._writer.schedule(self._snapshot)
+
+    def _snapshot(self) -> dict[str, Any]:
+        # NoteActivity entries are replaced, never mutated, so a shallow copy
+        # is safe to serialize in the writer thread
+        return {"version": ROLLUP_VERSION, "notes": dict(self._notes)}
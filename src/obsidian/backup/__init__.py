@@ -1,6 +1,33 @@
 """Backup functionality for Obsidian vault."""
 
+from src.obsidian.backup.backup_executor import (
+    BackupCancelledError,
+    run_backup_task,
+    run_in_backup_executor,
+)
 from src.obsidian.backup.backup_manager import BackupManager
-from src.obsidian.backup.backup_models import BackupConfig, BackupResult
+from src.obsidian.backup.backup_models import (
+    BackupConfig,
+    BackupProgress,
+    BackupResult,
+    SnapshotStats,
+)
+from src.obsidian.backup.content_store import (
+    ContentStore,
+    Manifest,
+    get_content_store,
+)
 
-__all__ = ["BackupManager", "BackupConfig", "BackupResult"]
+__all__ = [
+    "BackupCancelledError",
+    "BackupManager",
+    "BackupConfig",
+    "BackupProgress",
+    "BackupResult",
+    "ContentStore",
+    "Manifest",
+    "SnapshotStats",
+    "get_content_store",
+    "run_backup_task",
+    "run_in_backup_executor",
+]
@@ -0,0 +1,191 @@
+"""Dedicated executor, progress reporting and cancellation for backup work."""
+
+import asyncio
+import contextlib
+import functools
+import os
+import shutil
+import threading
+import time
+import zipfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.obsidian.backup.backup_models import BackupProgress
+
+logger = structlog.get_logger(__name__)
+
+ProgressCallback = Callable[[BackupProgress], None]
+
+# Backups and restores are long and mostly I/O; two at a time keeps them from
+# starving each other without filling the default executor used elsewhere
+BACKUP_EXECUTOR_WORKERS = 2
+# Minimum interval between two progress events of one operation
+PROGRESS_INTERVAL = 0.2
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class BackupCancelledError(Exception):
+    """A backup, snapshot or restore was cancelled before it completed."""
+
+
+def get_backup_executor() -> ThreadPoolExecutor:
+    """Executor shared by all backup, snapshot and restore work."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BACKUP_EXECUTOR_WORKERS, thread_name_prefix="backup"
+            )
+        return _executor
+
+
+class ProgressReporter:
+    """Throttled progress events and cancellation checks for one operation.
+
+    Used from worker threads: ``advance`` may be called from several
+    threads at once, and raises ``BackupCancelledError`` once ``cancel`` is set.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        name: str,
+        callback: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ):
+        self.progress = BackupProgress(operation=operation, name=name)
+        self._callback = callback
+        self._cancel = cancel
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel is not None and self._cancel.is_set()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise BackupCancelledError(
+                f"{self.progress.operation} {self.progress.name} cancelled"
+            )
+
+    def start(self, files_total: int, bytes_total: int) -> None:
+        with self._lock:
+            self.progress.files_total = files_total
+            self.progress.bytes_total = bytes_total
+        self._emit(force=True)
+
+    def advance(self, files: int = 1, nbytes: int = 0) -> None:
+        self.check()
+        with self._lock:
+            self.progress.files_done += files
+            self.progress.bytes_done += nbytes
+        self._emit()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.progress.finished = True
+        self._emit(force=True)
+
+    def _emit(self, force: bool = False) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_emit < PROGRESS_INTERVAL:
+                return
+            self._last_emit = now
+            event = BackupProgress(**vars(self.progress))
+        try:
+            self._callback(event)
+        except Exception as e:
+            logger.warning("Backup progress callback failed", error=str(e))
+
+
+async def run_backup_task[T](
+    func: Callable[..., T],
+    *args: Any,
+    progress: ProgressCallback | None = None,
+    cancel: threading.Event | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run blocking backup work on the backup executor.
+
+    ``func`` receives ``progress`` and ``cancel`` keyword arguments. Progress
+    events are delivered to ``progress`` on the calling event loop. Setting
+    ``cancel`` or cancelling the awaiting task stops the work at the next
+    file; the task is only cancelled once the work has stopped, so nothing
+    is left half-written.
+    """
+    loop = asyncio.get_running_loop()
+    cancel = cancel or threading.Event()
+
+    def deliver(event: BackupProgress) -> None:
+        if progress is not None:
+            loop.call_soon_threadsafe(progress, event)
+
+    future = loop.run_in_executor(
+        get_backup_executor(),
+        functools.partial(func, *args, progress=deliver, cancel=cancel, **kwargs),
+    )
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel.set()
+        with contextlib.suppress(Exception):
+            await future
+        raise
+
+
+def extract_zip(
+    archive: Path,
+    target: Path,
+    progress: ProgressCallback | None = None,
+    cancel: threading.Event | None = None,
+) -> int:
+    """Extract a zip archive member by member, refusing paths outside ``target``."""
+    with zipfile.ZipFile(archive, "r") as zip_file:
+        members = [m for m in zip_file.infolist() if not m.is_dir()]
+        reporter = ProgressReporter("extract", archive.name, progress, cancel)
+        reporter.start(len(members), sum(m.file_size for m in members))
+        for member in members:
+            if os.path.isabs(member.filename) or ".." in Path(member.filename).parts:
+                raise ValueError(f"Unsafe path in archive: {member.filename}")
+            zip_file.extract(member, target)
+            reporter.advance(1, member.file_size)
+    reporter.finish()
+    return len(members)
+
+
+def copy_tree(
+    source: Path,
+    target: Path,
+    progress: ProgressCallback | None = None,
+    cancel: threading.Event | None = None,
+) -> int:
+    """``shutil.copytree`` with progress events and cancellation."""
+    files = [path for path in source.rglob("*") if path.is_file()]
+    reporter = ProgressReporter("copy", source.name, progress, cancel)
+    reporter.start(len(files), sum(path.stat().st_size for path in files))
+    for path in files:
+        destination = target / path.relative_to(source)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, destination)
+        reporter.advance(1, destination.stat().st_size)
+    reporter.finish()
+    return len(files)
+
+
+async def run_in_backup_executor[T](func: Callable[..., T], *args: Any) -> T:
+    """Run a short blocking helper (moves, deletes, retention) on the executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_backup_executor(), functools.partial(func, *args)
+    )
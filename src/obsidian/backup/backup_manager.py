@@ -1,18 +1,32 @@
 """Backup manager for Obsidian vault."""
 
+import fnmatch
 import shutil
+import threading
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import structlog
 
+from src.obsidian.backup.backup_executor import (
+    BackupCancelledError,
+    ProgressCallback,
+    ProgressReporter,
+    copy_tree,
+    extract_zip,
+    run_backup_task,
+    run_in_backup_executor,
+)
 from src.obsidian.backup.backup_models import BackupConfig, BackupResult
+from src.obsidian.backup.content_store import get_content_store
 
 logger = structlog.get_logger(__name__)
 
+# Manifest kind of compressed vault backups in the content store
+STORE_KIND = "vault"
+
 
 class BackupManager:
     """Manages vault backup operations."""
@@ -20,9 +34,21 @@ class BackupManager:
     def __init__(self, vault_path: Path, config: BackupConfig):
         self.vault_path = vault_path
         self.config = config
-
-    async def create_backup(self, description: str | None = None) -> BackupResult:
-        """Create a full backup of the vault."""
+        # Compressed backups are manifests over a shared, deduplicated store
+        self.store = get_content_store(config.backup_directory / "store")
+
+    async def create_backup(
+        self,
+        description: str | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> BackupResult:
+        """Create a full backup of the vault.
+
+        The backup runs on the backup executor; ``progress`` receives events
+        on the event loop and setting ``cancel`` stops it without keeping a
+        partial backup.
+        """
         start_time = time.time()
         timestamp = datetime.now()
 
@@ -32,10 +58,35 @@ class BackupManager:
 
             # Generate backup filename
             backup_name = self._generate_backup_name(timestamp, description)
-            backup_path = self.config.backup_directory / backup_name
+            snapshot = None
 
             # Create backup
-            files_backed_up, total_size = await self._create_backup_archive(backup_path)
+            if self.config.compress:
+                _manifest, snapshot = await run_backup_task(
+                    self.store.snapshot,
+                    backup_name,
+                    STORE_KIND,
+                    [("", self.vault_path)],
+                    exclude=self._is_excluded,
+                    progress=progress,
+                    cancel=cancel,
+                )
+                backup_path = self.store.manifest_path(backup_name, STORE_KIND)
+                files_backed_up, total_size = snapshot.files, snapshot.total_bytes
+            else:
+                backup_path = self.config.backup_directory / backup_name
+                try:
+                    files_backed_up, total_size = await run_backup_task(
+                        self._create_backup_copy,
+                        backup_path,
+                        progress=progress,
+                        cancel=cancel,
+                    )
+                except BackupCancelledError:
+                    await run_in_backup_executor(
+                        self._remove_tree, backup_path, self.config.backup_directory
+                    )
+                    raise
 
             # Clean up old backups
             await self._cleanup_old_backups()
@@ -47,6 +98,7 @@ class BackupManager:
                 backup_path=str(backup_path),
                 files_backed_up=files_backed_up,
                 total_size=total_size,
+                dedup_ratio=round(snapshot.dedup_ratio, 3) if snapshot else None,
                 duration=duration,
             )
 
@@ -57,13 +109,17 @@ class BackupManager:
                 total_size=total_size,
                 duration=duration,
                 timestamp=timestamp,
+                snapshot=snapshot,
             )
 
         except Exception as e:
             duration = time.time() - start_time
             error_msg = str(e)
 
-            logger.error("Backup failed", error=error_msg, duration=duration)
+            if isinstance(e, BackupCancelledError):
+                logger.info("Backup cancelled", duration=duration)
+            else:
+                logger.error("Backup failed", error=error_msg, duration=duration)
 
             return BackupResult(
                 success=False,
@@ -75,10 +131,21 @@ class BackupManager:
                 error_message=error_msg,
             )
 
-    async def restore_backup(self, backup_path: Path) -> bool:
-        """Restore vault from backup."""
+    async def restore_backup(
+        self,
+        backup_path: Path,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> bool:
+        """Restore vault from backup.
+
+        Files are extracted on the backup executor into a temporary folder;
+        the current vault is only replaced once that has completed, so a
+        cancelled restore leaves it untouched.
+        """
         try:
-            if not backup_path.exists():
+            manifest_name = self._manifest_name(backup_path)
+            if manifest_name is None and not backup_path.exists():
                 logger.error("Backup file not found", backup_path=str(backup_path))
                 return False
 
@@ -88,58 +155,47 @@ class BackupManager:
 
             try:
                 # Extract backup
-                if backup_path.suffix == ".zip":
-                    with zipfile.ZipFile(backup_path, "r") as zip_ref:
-                        zip_ref.extractall(temp_dir)
+                if manifest_name is not None:
+                    await run_backup_task(
+                        self.store.restore,
+                        manifest_name,
+                        STORE_KIND,
+                        temp_dir / "vault",
+                        progress=progress,
+                        cancel=cancel,
+                    )
+                elif backup_path.suffix == ".zip":
+                    await run_backup_task(
+                        extract_zip,
+                        backup_path,
+                        temp_dir,
+                        progress=progress,
+                        cancel=cancel,
+                    )
                 else:
                     # Handle uncompressed backup (directory copy)
-                    shutil.copytree(backup_path, temp_dir / "vault")
-
-                # Backup current vault
-                current_backup = (
-                    self.vault_path.parent / f"current_vault_backup_{int(time.time())}"
-                )
-                if self.vault_path.exists():
-                    shutil.move(str(self.vault_path), str(current_backup))
-
-                # Move restored vault to correct location
-                restored_vault = temp_dir / "vault"
-                if not restored_vault.exists():
-                    # Backup might be at root level
-                    restored_vault = temp_dir
-
-                shutil.move(str(restored_vault), str(self.vault_path))
-
-                # Clean up with security check
-                if current_backup.exists():
-                    from ...utils.logger import secure_file_operation
+                    await run_backup_task(
+                        copy_tree,
+                        backup_path,
+                        temp_dir / "vault",
+                        progress=progress,
+                        cancel=cancel,
+                    )
 
-                    if secure_file_operation(
-                        "delete", current_backup, self.vault_path.parent
-                    ):
-                        shutil.rmtree(current_backup)
-                    else:
-                        logger.warning(
-                            "Unsafe backup cleanup operation blocked",
-                            path=str(current_backup),
-                        )
+                await run_in_backup_executor(self._swap_in_restored_vault, temp_dir)
 
                 logger.info("Vault restored successfully", backup_path=str(backup_path))
                 return True
 
             finally:
                 # Clean up temp directory with security check
-                if temp_dir.exists():
-                    from ...utils.logger import secure_file_operation
+                await run_in_backup_executor(
+                    self._remove_tree, temp_dir, self.vault_path.parent
+                )
 
-                    if secure_file_operation(
-                        "delete", temp_dir, self.vault_path.parent
-                    ):
-                        shutil.rmtree(temp_dir)
-                    else:
-                        logger.warning(
-                            "Unsafe temp cleanup operation blocked", path=str(temp_dir)
-                        )
+        except BackupCancelledError:
+            logger.info("Backup restoration cancelled", backup_path=str(backup_path))
+            return False
 
         except Exception as e:
             logger.error(
@@ -153,22 +209,8 @@ class BackupManager:
             if not self.config.backup_directory.exists():
                 return []
 
-            backups = []
-            for backup_file in self.config.backup_directory.iterdir():
-                if backup_file.is_file() and (
-                    backup_file.suffix == ".zip"
-                    or backup_file.name.startswith("vault_backup_")
-                ):
-                    stat = backup_file.stat()
-                    backups.append(
-                        {
-                            "name": backup_file.name,
-                            "path": str(backup_file),
-                            "size": stat.st_size,
-                            "created": datetime.fromtimestamp(stat.st_ctime),
-                            "modified": datetime.fromtimestamp(stat.st_mtime),
-                        }
-                    )
+            backups = await run_in_backup_executor(self._list_snapshots)
+            backups.extend(self._list_legacy_backups())
 
             # Sort by creation time descending
             backups.sort(key=lambda x: x["created"], reverse=True)  # type: ignore[arg-type,return-value]
@@ -178,9 +220,54 @@ class BackupManager:
             logger.error("Failed to list backups", error=str(e))
             return []
 
+    def _list_snapshots(self) -> list[dict[str, Any]]:
+        """Backups stored as manifests in the content store."""
+        backups = []
+        for manifest in self.store.list_manifests(STORE_KIND):
+            created = datetime.fromisoformat(manifest.created_at)
+            backups.append(
+                {
+                    "name": manifest.name,
+                    "path": str(self.store.manifest_path(manifest.name, STORE_KIND)),
+                    "size": manifest.stats.get("total_bytes", 0),
+                    "stored_size": manifest.stats.get("stored_bytes", 0),
+                    "files": len(manifest.files),
+                    "created": created,
+                    "modified": created,
+                }
+            )
+        return backups
+
+    def _list_legacy_backups(self) -> list[dict[str, Any]]:
+        """Backup archives and copies written next to the content store."""
+        backups = []
+        for backup_file in self.config.backup_directory.iterdir():
+            if backup_file.is_file() and (
+                backup_file.suffix == ".zip"
+                or backup_file.name.startswith("vault_backup_")
+            ):
+                stat = backup_file.stat()
+                backups.append(
+                    {
+                        "name": backup_file.name,
+                        "path": str(backup_file),
+                        "size": stat.st_size,
+                        "created": datetime.fromtimestamp(stat.st_ctime),
+                        "modified": datetime.fromtimestamp(stat.st_mtime),
+                    }
+                )
+        return backups
+
     async def delete_backup(self, backup_name: str) -> bool:
         """Delete a specific backup."""
         try:
+            manifest_name = self._manifest_name(Path(backup_name))
+            if manifest_name is not None:
+                self.store.delete_manifest(manifest_name, STORE_KIND)
+                await run_in_backup_executor(self.store.collect_garbage)
+                logger.info("Backup deleted", backup_name=backup_name)
+                return True
+
             backup_path = self.config.backup_directory / backup_name
             if backup_path.exists():
                 if backup_path.is_file():
@@ -210,67 +297,111 @@ class BackupManager:
             )
             return False
 
-    async def _create_backup_archive(self, backup_path: Path) -> tuple[int, int]:
-        """Create backup archive and return file count and size."""
+    def _create_backup_copy(
+        self,
+        backup_path: Path,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> tuple[int, int]:
+        """Create an uncompressed directory copy and return file count and size."""
         files_backed_up = 0
         total_size = 0
 
-        if self.config.compress:
-            # Create ZIP archive
-            with zipfile.ZipFile(
-                backup_path.with_suffix(".zip"), "w", zipfile.ZIP_DEFLATED
-            ) as zipf:
-                for file_path in self._get_files_to_backup():
-                    archive_path = file_path.relative_to(self.vault_path)
-                    zipf.write(file_path, archive_path)
-                    files_backed_up += 1
-                    total_size += file_path.stat().st_size
+        files = self._get_files_to_backup()
+        reporter = ProgressReporter("copy", backup_path.name, progress, cancel)
+        reporter.start(len(files), sum(path.stat().st_size for path in files))
+
+        backup_path.mkdir(exist_ok=True)
+        for file_path in files:
+            relative_path = file_path.relative_to(self.vault_path)
+            dest_path = backup_path / relative_path
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(file_path, dest_path)
+            files_backed_up += 1
+            total_size += dest_path.stat().st_size
+            reporter.advance(1, dest_path.stat().st_size)
+
+        reporter.finish()
+        return files_backed_up, total_size
+
+    def _swap_in_restored_vault(self, temp_dir: Path) -> None:
+        """Replace the vault with the extracted one, removing the old copy."""
+        # Backup current vault
+        current_backup = (
+            self.vault_path.parent / f"current_vault_backup_{int(time.time())}"
+        )
+        if self.vault_path.exists():
+            shutil.move(str(self.vault_path), str(current_backup))
+
+        # Move restored vault to correct location
+        restored_vault = temp_dir / "vault"
+        if not restored_vault.exists():
+            # Backup might be at root level
+            restored_vault = temp_dir
+
+        shutil.move(str(restored_vault), str(self.vault_path))
+
+        # Clean up with security check
+        self._remove_tree(current_backup, self.vault_path.parent)
+
+    def _remove_tree(self, path: Path, allowed_root: Path) -> None:
+        """Delete a backup or temp folder after the security check."""
+        if not path.exists():
+            return
+
+        from ...utils.logger import secure_file_operation
+
+        if secure_file_operation("delete", path, allowed_root):
+            shutil.rmtree(path)
         else:
-            # Create directory copy
-            backup_path.mkdir(exist_ok=True)
-            for file_path in self._get_files_to_backup():
-                relative_path = file_path.relative_to(self.vault_path)
-                dest_path = backup_path / relative_path
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(file_path, dest_path)
-                files_backed_up += 1
-                total_size += file_path.stat().st_size
+            logger.warning("Unsafe backup cleanup operation blocked", path=str(path))
 
-        return files_backed_up, total_size
+    def _manifest_name(self, backup_path: Path) -> str | None:
+        """Name of the store manifest ``backup_path`` refers to, if any."""
+        name = backup_path.stem if backup_path.suffix == ".json" else backup_path.name
+        try:
+            manifest_path = self.store.manifest_path(name, STORE_KIND)
+        except ValueError:
+            return None
+        return name if manifest_path.exists() else None
 
     def _get_files_to_backup(self) -> list[Path]:
         """Get list of files to backup based on configuration."""
         files_to_backup = []
 
         for path in self.vault_path.rglob("*"):
-            if path.is_file():
-                # Check exclusion patterns
-                if self._should_exclude_file(path):
-                    continue
-
-                # Check attachment inclusion
-                if not self.config.include_attachments and self._is_attachment(path):
-                    continue
-
+            if path.is_file() and not self._is_excluded(
+                path.relative_to(self.vault_path).as_posix()
+            ):
                 files_to_backup.append(path)
 
         return files_to_backup
 
+    def _is_excluded(self, relative_path: str) -> bool:
+        """Check exclusion patterns and attachment inclusion for a vault path."""
+        if self._matches_exclude_pattern(relative_path):
+            return True
+        return not self.config.include_attachments and self._is_attachment(
+            Path(relative_path)
+        )
+
     def _should_exclude_file(self, file_path: Path) -> bool:
         """Check if file should be excluded from backup."""
+        return self._matches_exclude_pattern(
+            file_path.relative_to(self.vault_path).as_posix()
+        )
+
+    def _matches_exclude_pattern(self, relative_path: str) -> bool:
         if not self.config.exclude_patterns:
             return False
 
-        relative_path = str(file_path.relative_to(self.vault_path))
-
+        parts = relative_path.split("/")
         for pattern in self.config.exclude_patterns:
-            import fnmatch
-
             if fnmatch.fnmatch(relative_path, pattern):
                 return True
 
             # Also check individual path components
-            for part in file_path.parts:
+            for part in parts:
                 if fnmatch.fnmatch(part, pattern):
                     return True
 
@@ -312,19 +443,20 @@ class BackupManager:
         else:
             base_name = f"vault_backup_{timestamp_str}"
 
-        if self.config.compress:
-            return f"{base_name}.zip"
-        else:
-            return base_name
+        return base_name
 
     async def _cleanup_old_backups(self) -> None:
         """Remove old backups to maintain max_backups limit."""
         try:
-            backups = await self.list_backups()
+            await run_in_backup_executor(
+                self.store.apply_retention, {STORE_KIND: self.config.max_backups}
+            )
+
+            backups = self._list_legacy_backups()
 
             if len(backups) > self.config.max_backups:
                 # Sort by creation time and remove oldest
-                backups.sort(key=lambda x: x["created"])
+                backups.sort(key=lambda x: x["created"], reverse=True)  # type: ignore[arg-type,return-value]
 
                 for backup in backups[self.config.max_backups :]:
                     backup_path = Path(backup["path"])
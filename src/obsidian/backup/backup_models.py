@@ -23,6 +23,74 @@ class BackupConfig:
             self.exclude_patterns = [".obsidian", ".trash", "*.tmp"]
 
 
+@dataclass
+class SnapshotStats:
+    """Statistics of one content-store snapshot."""
+
+    files: int = 0
+    total_bytes: int = 0  # size of all files in the snapshot
+    reused_bytes: int = 0  # bytes whose content was already stored
+    unchanged_files: int = 0  # files skipped by size/mtime
+    new_objects: int = 0
+    stored_bytes: int = 0  # compressed bytes written by this snapshot
+    errors: int = 0
+    duration: float = 0.0  # in seconds
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of the snapshot's bytes that did not have to be stored again."""
+        return self.reused_bytes / self.total_bytes if self.total_bytes else 1.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "files": self.files,
+            "total_bytes": self.total_bytes,
+            "reused_bytes": self.reused_bytes,
+            "unchanged_files": self.unchanged_files,
+            "new_objects": self.new_objects,
+            "stored_bytes": self.stored_bytes,
+            "errors": self.errors,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+            "duration": round(self.duration, 3),
+        }
+
+
+@dataclass
+class BackupProgress:
+    """Progress of a running backup, snapshot or restore."""
+
+    operation: str  # "snapshot", "restore", "extract" or "copy"
+    name: str
+    files_done: int = 0
+    files_total: int = 0
+    bytes_done: int = 0
+    bytes_total: int = 0
+    finished: bool = False
+
+    @property
+    def fraction(self) -> float:
+        """Completed share by bytes (by files when there are no bytes)."""
+        if self.bytes_total:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total:
+            return min(1.0, self.files_done / self.files_total)
+        return 1.0 if self.finished else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "operation": self.operation,
+            "name": self.name,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "percent": round(self.fraction * 100, 1),
+            "finished": self.finished,
+        }
+
+
 @dataclass
 class BackupResult:
     """Result of a backup operation."""
@@ -34,6 +102,7 @@ class BackupResult:
     duration: float  # in seconds
     timestamp: datetime
     error_message: str | None = None
+    snapshot: SnapshotStats | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
@@ -45,4 +114,5 @@ class BackupResult:
             "duration": self.duration,
             "timestamp": self.timestamp.isoformat(),
             "error_message": self.error_message,
+            "snapshot": self.snapshot.to_dict() if self.snapshot else None,
         }
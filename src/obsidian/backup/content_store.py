@@ -0,0 +1,563 @@
+"""Content-addressed, deduplicating store for vault backups and snapshots."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.obsidian.backup.backup_executor import ProgressCallback, ProgressReporter
+from src.obsidian.backup.backup_models import SnapshotStats
+from src.utils.json_store import dump_json, write_bytes_atomic
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+MANIFEST_VERSION = 1
+OBJECTS_DIR = "objects"
+MANIFESTS_DIR = "manifests"
+# Files hashed and compressed in parallel within one snapshot or restore
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Object payloads start with a one-byte codec marker. Objects are stored raw
+# when compressing does not make them smaller (images, archives, ...)
+_RAW = b"r"
+_ENCODERS: dict[str, tuple[bytes, Callable[[bytes], bytes]]] = {
+    "zlib": (b"z", lambda data: zlib.compress(data, 6)),
+}
+_DECODERS: dict[bytes, Callable[[bytes], bytes]] = {
+    _RAW: bytes,
+    b"z": zlib.decompress,
+}
+if zstandard is not None:
+    _ENCODERS["zstd"] = (
+        b"s",
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+    )
+    _DECODERS[b"s"] = lambda data: zstandard.ZstdDecompressor().decompress(data)
+DEFAULT_CODEC = "zlib"
+
+_SAFE_NAME = re.compile(r"^\w[\w.-]*$")
+
+# Called with the posix path of a file relative to its source
+ExcludeFilter = Callable[[str], bool]
+
+
+@dataclass
+class ManifestEntry:
+    """One file of a snapshot."""
+
+    path: str
+    digest: str
+    size: int
+    mtime_ns: int
+    mode: int = 0o644
+
+
+@dataclass
+class Manifest:
+    """A snapshot: the list of files and the objects holding their content."""
+
+    name: str
+    kind: str
+    created_at: str
+    files: list[ManifestEntry] = field(default_factory=list)
+    stats: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Manifest":
+        files = [ManifestEntry(**entry) for entry in data.get("files", [])]
+        return cls(
+            name=data["name"],
+            kind=data["kind"],
+            created_at=data["created_at"],
+            files=files,
+            stats=data.get("stats", {}),
+            metadata=data.get("metadata", {}),
+            version=data.get("version", MANIFEST_VERSION),
+        )
+
+    @property
+    def digests(self) -> set[str]:
+        return {entry.digest for entry in self.files}
+
+
+class ContentStore:
+    """Stores each distinct file content once, compressed once.
+
+    Objects live under ``objects/`` named by the SHA-256 of the content, and
+    every backup or snapshot is only a manifest under ``manifests/<kind>/``.
+    Files whose size and mtime match the previous manifest of the same kind
+    are not read again; the others are hashed and compressed on ``workers``
+    threads. Retention removes old manifests and then every object no
+    manifest refers to.
+
+    All methods block; call them through ``run_backup_task``.
+    """
+
+    def __init__(
+        self, root: Path, codec: str = DEFAULT_CODEC, workers: int = DEFAULT_WORKERS
+    ):
+        if codec not in _ENCODERS:
+            raise ValueError(f"Unsupported backup codec: {codec}")
+        self.root = Path(root)
+        self.objects_dir = self.root / OBJECTS_DIR
+        self.manifests_dir = self.root / MANIFESTS_DIR
+        self.codec = codec
+        self.workers = max(1, workers)
+        self._lock = threading.RLock()
+        # Digests of the objects on disk, listed once per snapshot
+        self._present: set[str] = set()
+        self._present_lock = threading.Lock()
+
+    # === Snapshots ===
+
+    def snapshot(
+        self,
+        name: str,
+        kind: str,
+        sources: Iterable[tuple[str, Path]],
+        exclude: ExcludeFilter | None = None,
+        metadata: dict[str, Any] | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> tuple[Manifest, SnapshotStats]:
+        """Store the files under ``sources`` and write a manifest for them.
+
+        ``sources`` are ``(prefix, path)`` pairs; files are recorded as
+        ``prefix/relative/path`` (or just the relative path when the prefix
+        is empty). ``path`` may also be a single file. When ``cancel`` is set
+        the snapshot stops with ``BackupCancelledError`` and no manifest is
+        written; objects already stored go on the next garbage collection.
+        """
+        _check_name(name)
+        _check_name(kind)
+        start = time.perf_counter()
+        stats = SnapshotStats()
+        reporter = ProgressReporter("snapshot", name, progress, cancel)
+
+        with self._lock:
+            previous = self.latest_manifest(kind)
+            known = {entry.path: entry for entry in previous.files} if previous else {}
+            files = list(self._iter_files(sources, exclude))
+            reporter.start(len(files), sum(stat.st_size for _, _, stat in files))
+
+            manifest = Manifest(
+                name=name,
+                kind=kind,
+                created_at=datetime.now().isoformat(),
+                metadata=metadata or {},
+            )
+            self._present = self._object_digests()
+            pool = ThreadPoolExecutor(self.workers, thread_name_prefix="backup-store")
+            try:
+                pending: list[ManifestEntry | Future] = []
+                for arc_path, file_path, stat in files:
+                    stats.files += 1
+                    stats.total_bytes += stat.st_size
+                    previous_entry = known.get(arc_path)
+                    if (
+                        previous_entry is not None
+                        and _unchanged(previous_entry, stat)
+                        and previous_entry.digest in self._present
+                    ):
+                        # Unchanged since the previous snapshot: reuse without reading
+                        stats.unchanged_files += 1
+                        stats.reused_bytes += stat.st_size
+                        pending.append(previous_entry)
+                        reporter.advance(1, stat.st_size)
+                    else:
+                        pending.append(
+                            pool.submit(
+                                self._store_file, arc_path, file_path, stat, reporter
+                            )
+                        )
+                manifest.files = self._collect_entries(files, pending, stats)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+            reporter.check()
+            if stats.new_objects and hasattr(os, "sync"):
+                # Objects are written without fsync; flush them all at once
+                # before the manifest that refers to them
+                os.sync()
+            stats.duration = time.perf_counter() - start
+            manifest.stats = stats.to_dict()
+            self._write_manifest(manifest)
+
+        reporter.finish()
+        logger.info(
+            "Snapshot stored",
+            name=name,
+            kind=kind,
+            files=stats.files,
+            new_objects=stats.new_objects,
+            dedup_ratio=round(stats.dedup_ratio, 3),
+            duration=round(stats.duration, 2),
+        )
+        return manifest, stats
+
+    def restore(
+        self,
+        name: str,
+        kind: str,
+        target: Path,
+        prefix: str | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> int:
+        """Rebuild the files of a manifest under ``target``.
+
+        With ``prefix``, only files under that prefix are restored, relative
+        to it. Returns the number of files written.
+        """
+        manifest = self.read_manifest(name, kind)
+        target = Path(target)
+        selected: list[tuple[Path, ManifestEntry]] = []
+        for entry in manifest.files:
+            relative = entry.path
+            if prefix is not None:
+                if not relative.startswith(f"{prefix}/"):
+                    continue
+                relative = relative[len(prefix) + 1 :]
+            selected.append((_safe_join(target, relative), entry))
+
+        reporter = ProgressReporter("restore", name, progress, cancel)
+        reporter.start(len(selected), sum(entry.size for _, entry in selected))
+        for folder in sorted({destination.parent for destination, _ in selected}):
+            folder.mkdir(parents=True, exist_ok=True)
+
+        with ThreadPoolExecutor(
+            self.workers, thread_name_prefix="backup-restore"
+        ) as pool:
+            futures = [
+                pool.submit(self._restore_file, destination, entry, reporter)
+                for destination, entry in selected
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        reporter.finish()
+        return len(selected)
+
+    # === Manifests ===
+
+    def manifest_path(self, name: str, kind: str) -> Path:
+        _check_name(name)
+        _check_name(kind)
+        return self.manifests_dir / kind / f"{name}.json"
+
+    def read_manifest(self, name: str, kind: str) -> Manifest:
+        path = self.manifest_path(name, kind)
+        return Manifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def list_manifests(self, kind: str | None = None) -> list[Manifest]:
+        """Manifests (of one kind, or all), oldest first."""
+        folders = (
+            [self.manifests_dir / kind]
+            if kind
+            else [p for p in self.manifests_dir.glob("*") if p.is_dir()]
+        )
+        manifests = []
+        for folder in folders:
+            for path in folder.glob("*.json"):
+                try:
+                    manifests.append(
+                        Manifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+                    )
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(
+                        "Skipping unreadable manifest", path=str(path), error=str(e)
+                    )
+        manifests.sort(key=lambda m: (m.created_at, m.name))
+        return manifests
+
+    def latest_manifest(self, kind: str) -> Manifest | None:
+        """The most recently written manifest of ``kind``."""
+        paths = list((self.manifests_dir / kind).glob("*.json"))
+        if not paths:
+            return None
+        latest = max(paths, key=lambda path: path.stat().st_mtime_ns)
+        try:
+            return Manifest.from_dict(json.loads(latest.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def delete_manifest(self, name: str, kind: str) -> bool:
+        """Remove a manifest; its objects go on the next ``collect_garbage``."""
+        path = self.manifest_path(name, kind)
+        with self._lock:
+            if not path.exists():
+                return False
+            path.unlink()
+            return True
+
+    # === Retention ===
+
+    def apply_retention(self, keep: dict[str, int]) -> dict[str, int]:
+        """Keep the newest ``keep[kind]`` manifests per kind, then collect garbage."""
+        expired = 0
+        with self._lock:
+            for kind, count in keep.items():
+                manifests = self.list_manifests(kind)
+                for manifest in manifests[: max(0, len(manifests) - count)]:
+                    self.manifest_path(manifest.name, kind).unlink(missing_ok=True)
+                    expired += 1
+            result = self.collect_garbage()
+        result["manifests_removed"] = expired
+        return result
+
+    def collect_garbage(self) -> dict[str, int]:
+        """Delete objects that no manifest refers to."""
+        with self._lock:
+            referenced: set[str] = set()
+            for manifest in self.list_manifests():
+                referenced |= manifest.digests
+
+            removed = freed = 0
+            for path in self.objects_dir.glob("*/*"):
+                if path.name in referenced or path.name.startswith("tmp_"):
+                    continue
+                try:
+                    freed += path.stat().st_size
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.warning(
+                        "Failed to remove object", path=str(path), error=str(e)
+                    )
+
+        if removed:
+            logger.info("Backup objects collected", objects=removed, bytes=freed)
+        return {"objects_removed": removed, "bytes_freed": freed}
+
+    def usage(self) -> dict[str, int]:
+        """Number of objects and bytes stored on disk."""
+        objects = [p for p in self.objects_dir.glob("*/*") if p.is_file()]
+        return {
+            "objects": len(objects),
+            "stored_bytes": sum(p.stat().st_size for p in objects),
+            "manifests": len(list(self.manifests_dir.glob("*/*.json"))),
+        }
+
+    # === Objects ===
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def read_object(self, digest: str) -> bytes:
+        payload = self.object_path(digest).read_bytes()
+        decode = _DECODERS.get(payload[:1])
+        if decode is None:
+            raise ValueError(f"Backup object {digest} uses an unavailable codec")
+        data = decode(payload[1:])
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup object {digest} is corrupted")
+        return data
+
+    # === Internals ===
+
+    def _iter_files(
+        self, sources: Iterable[tuple[str, Path]], exclude: ExcludeFilter | None
+    ) -> Iterator[tuple[str, Path, os.stat_result]]:
+        for prefix, source in sources:
+            source = Path(source).resolve()
+            files: Iterable[tuple[str, Path, os.stat_result]]
+            if source.is_file():
+                files = [(source.name, source, source.stat())]
+            elif source.is_dir():
+                files = self._walk(source, "")
+            else:
+                continue
+            for relative, path, stat in files:
+                if exclude and exclude(relative):
+                    continue
+                yield (f"{prefix}/{relative}" if prefix else relative), path, stat
+
+    def _walk(
+        self, directory: Path, relative: str
+    ) -> Iterator[tuple[str, Path, os.stat_result]]:
+        """Regular files under ``directory`` in path order, skipping the store."""
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.is_symlink():
+                continue
+            entry_relative = f"{relative}{entry.name}"
+            if entry.is_dir():
+                path = Path(entry.path)
+                if path != self.root:
+                    yield from self._walk(path, f"{entry_relative}/")
+            elif entry.is_file():
+                yield entry_relative, Path(entry.path), entry.stat()
+
+    def _store_file(
+        self,
+        arc_path: str,
+        file_path: Path,
+        stat: os.stat_result,
+        reporter: ProgressReporter,
+    ) -> tuple[ManifestEntry, int | None]:
+        """Hash and (when new) store one file; runs on the snapshot pool.
+
+        Returns the entry and the stored payload size, or None when the
+        content was already in the store.
+        """
+        reporter.check()
+        data = file_path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._present_lock:
+            is_new = digest not in self._present
+            self._present.add(digest)
+
+        stored = None
+        if is_new:
+            try:
+                marker, encode = _ENCODERS[self.codec]
+                compressed = encode(data)
+                payload = (
+                    marker + compressed if len(compressed) < len(data) else _RAW + data
+                )
+                _write_object(self.object_path(digest), payload)
+            except BaseException:
+                with self._present_lock:
+                    self._present.discard(digest)
+                raise
+            stored = len(payload)
+
+        reporter.advance(1, len(data))
+        entry = ManifestEntry(
+            path=arc_path,
+            digest=digest,
+            size=len(data),
+            mtime_ns=stat.st_mtime_ns,
+            mode=stat.st_mode & 0o777,
+        )
+        return entry, stored
+
+    def _collect_entries(
+        self,
+        files: list[tuple[str, Path, os.stat_result]],
+        pending: list[ManifestEntry | Future],
+        stats: SnapshotStats,
+    ) -> list[ManifestEntry]:
+        entries = []
+        for (_arc_path, file_path, stat), item in zip(files, pending, strict=True):
+            if isinstance(item, ManifestEntry):
+                entries.append(item)
+                continue
+            try:
+                entry, stored = item.result()
+            except OSError as e:
+                logger.warning(
+                    "Failed to store file", file_path=str(file_path), error=str(e)
+                )
+                stats.errors += 1
+                stats.files -= 1
+                stats.total_bytes -= stat.st_size
+                continue
+            if stored is None:
+                stats.reused_bytes += entry.size
+            else:
+                stats.new_objects += 1
+                stats.stored_bytes += stored
+            entries.append(entry)
+
+        # An entry may have reused content whose write then failed elsewhere
+        missing = [entry for entry in entries if entry.digest not in self._present]
+        if missing:
+            stats.errors += len(missing)
+            entries = [entry for entry in entries if entry.digest in self._present]
+        return entries
+
+    def _restore_file(
+        self, destination: Path, entry: ManifestEntry, reporter: ProgressReporter
+    ) -> None:
+        reporter.check()
+        destination.write_bytes(self.read_object(entry.digest))
+        os.chmod(destination, entry.mode)
+        os.utime(destination, ns=(entry.mtime_ns, entry.mtime_ns))
+        reporter.advance(1, entry.size)
+
+    def _object_digests(self) -> set[str]:
+        digests: set[str] = set()
+        if not self.objects_dir.exists():
+            return digests
+        with os.scandir(self.objects_dir) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                with os.scandir(folder.path) as entries:
+                    digests.update(
+                        entry.name
+                        for entry in entries
+                        if not entry.name.startswith("tmp_")
+                    )
+        return digests
+
+    def _write_manifest(self, manifest: Manifest) -> None:
+        path = self.manifest_path(manifest.name, manifest.kind)
+        write_bytes_atomic(path, dump_json(asdict(manifest), indent=None), "tmp_")
+
+
+def _unchanged(previous: ManifestEntry, stat: os.stat_result) -> bool:
+    return previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns
+
+
+def _write_object(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix="tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _check_name(name: str) -> None:
+    if not _SAFE_NAME.match(name):
+        raise ValueError(f"Invalid backup name: {name!r}")
+
+
+def _safe_join(target: Path, relative: str) -> Path:
+    """Join a manifest path to the restore target, refusing to escape it."""
+    if os.path.isabs(relative) or ".." in Path(relative).parts:
+        raise ValueError(f"Unsafe path in manifest: {relative}")
+    return target / relative
+
+
+_stores: dict[Path, ContentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_content_store(root: Path | str) -> ContentStore:
+    """Shared store instance for a directory (serializes writers and GC)."""
+    resolved = Path(root).resolve()
+    with _stores_lock:
+        store = _stores.get(resolved)
+        if store is None:
+            store = _stores[resolved] = ContentStore(resolved)
+        return store
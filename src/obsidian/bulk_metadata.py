@@ -0,0 +1,350 @@
+"""
+Bulk frontmatter reads and in-place metadata rewrites
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from src.obsidian.core.frontmatter import (
+    FrontmatterBlock,
+    apply_frontmatter_updates,
+    frontmatter_diff,
+    frontmatter_model,
+    read_frontmatter,
+    replace_file_bytes,
+    split_frontmatter,
+    strip_title,
+)
+from src.obsidian.file_manager import ObsidianFileManager
+from src.obsidian.models import EXCLUDED_FOLDERS, NoteFrontmatter
+from src.utils.mixins import LoggerMixin
+
+# 同時に読み書きするノート数の上限
+DEFAULT_CONCURRENCY = 16
+
+
+@dataclass
+class NoteHeader:
+    """Frontmatter of one note, parsed without reading its body."""
+
+    path: Path
+    fields: dict[str, Any]
+
+    @property
+    def all_tags(self) -> list[str]:
+        tags = [*self.fields.get("ai_tags", []), *self.fields.get("tags", [])]
+        return [tag.lstrip("#") for tag in tags]
+
+    @property
+    def created_date(self) -> date | None:
+        try:
+            return date.fromisoformat(str(self.fields.get("created", ""))[:10])
+        except ValueError:
+            return None
+
+
+@dataclass
+class MetadataChange:
+    """Frontmatter change of one note (applied or, in dry-run mode, planned)."""
+
+    path: Path
+    diff: str
+    fields: dict[str, Any]
+    text: str
+
+
+@dataclass
+class BulkUpdateResult:
+    processed: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    dry_run: bool = False
+    changes: list[MetadataChange] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "errors": self.errors,
+            "dry_run": self.dry_run,
+            "updated_notes": [
+                {"title": change.path.stem, "path": str(change.path)}
+                for change in self.changes
+            ],
+            "changes": [
+                {"path": str(change.path), "diff": change.diff}
+                for change in self.changes
+            ],
+        }
+
+
+class BulkMetadataEngine(LoggerMixin):
+    """Concurrent frontmatter-only reads and in-place rewrites for many notes.
+
+    Reads stop at the closing ``---`` of the frontmatter, and rewrites only
+    replace the frontmatter lines: the note body is copied byte for byte.
+    """
+
+    def __init__(
+        self, file_manager: ObsidianFileManager, concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        Initialize bulk metadata engine
+
+        Args:
+            file_manager: File manager instance
+            concurrency: 同時に読み書きするノート数の上限
+        """
+        self.file_manager = file_manager
+        self.vault_path = Path(file_manager.vault_path)
+        self.concurrency = concurrency
+
+    # === Reads ===
+
+    def list_notes(self) -> list[Path]:
+        """Vault 内のノート一覧（パス順）"""
+        return sorted(
+            path
+            for path in self.vault_path.rglob("*.md")
+            if not any(part in EXCLUDED_FOLDERS for part in path.parts)
+        )
+
+    async def read_headers(self, paths: list[Path] | None = None) -> list[NoteHeader]:
+        """
+        フロントマターのみを並行して読み込む
+
+        Args:
+            paths: 対象ノート（省略時は Vault 全体）
+
+        Returns:
+            読み込めたノートのフロントマター
+        """
+        if paths is None:
+            paths = await asyncio.to_thread(self.list_notes)
+        results = await self._map(self._read_header, paths)
+        return [header for header in results if header is not None]
+
+    async def read_notes(self, paths: list[Path]) -> list[tuple[NoteHeader, str]]:
+        """フロントマターと本文（タイトル行を除く）を並行して読み込む"""
+        results = await self._map(self._read_note, paths)
+        return [item for item in results if item is not None]
+
+    def matches(self, header: NoteHeader, filters: dict[str, Any]) -> bool:
+        """フロントマターが条件に合致するか（ query 以外）"""
+        fields = header.fields
+
+        folder = filters.get("folder")
+        if folder:
+            relative = header.path.relative_to(self.vault_path).as_posix()
+            if not (
+                relative.startswith(f"{folder.rstrip('/')}/")
+                or fields.get("obsidian_folder") == folder
+            ):
+                return False
+
+        status = filters.get("status")
+        if status and fields.get("status", "active") != status:
+            return False
+
+        category = filters.get("category")
+        if category and fields.get("ai_category") != category:
+            return False
+
+        tags = filters.get("tags")
+        if tags:
+            note_tags = {tag.lower() for tag in header.all_tags}
+            if not all(tag.lstrip("#").lower() in note_tags for tag in tags):
+                return False
+
+        date_from, date_to = filters.get("date_from"), filters.get("date_to")
+        if date_from or date_to:
+            created = header.created_date
+            if created is None:
+                return False
+            if date_from and created < _as_date(date_from):
+                return False
+            if date_to and created > _as_date(date_to):
+                return False
+
+        return True
+
+    # === Updates ===
+
+    async def update(
+        self,
+        filters: dict[str, Any],
+        updates: dict[str, Any],
+        limit: int | None = None,
+        dry_run: bool = False,
+    ) -> BulkUpdateResult:
+        """
+        条件に合致するノートのフロントマターを一括更新
+
+        Args:
+            filters: 対象ノートの条件（ folder / status / category / tags /
+                date_from / date_to / query ）
+            updates: 更新内容（ NoteFrontmatter のフィールド）
+            limit: 処理上限数
+            dry_run: True の場合は書き込まずに差分のみ返す
+
+        Returns:
+            更新結果
+        """
+        result = BulkUpdateResult(dry_run=dry_run)
+        normalized = self._normalize_updates(updates)
+        if not normalized:
+            return result
+
+        targets = await self._select(filters, limit)
+        result.processed = len(targets)
+        if not dry_run:
+            normalized["modified"] = datetime.now().isoformat()
+
+        outcomes = await self._map(
+            lambda path: self._rewrite(path, normalized, dry_run), targets
+        )
+        for outcome in outcomes:
+            if outcome is None:
+                result.errors += 1
+            elif outcome is False:
+                result.unchanged += 1
+            else:
+                result.updated += 1
+                result.changes.append(outcome)
+
+        if not dry_run and result.changes:
+            await self._record_changes(result.changes)
+
+        self.logger.info(
+            "Bulk metadata update completed",
+            processed=result.processed,
+            updated=result.updated,
+            unchanged=result.unchanged,
+            errors=result.errors,
+            dry_run=dry_run,
+        )
+        return result
+
+    # === Internals ===
+
+    async def _map(self, func: Any, paths: list[Path]) -> list[Any]:
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return await asyncio.gather(
+                *(loop.run_in_executor(executor, func, path) for path in paths)
+            )
+
+    def _read_header(self, path: Path) -> NoteHeader | None:
+        try:
+            return NoteHeader(path, read_frontmatter(path).fields())
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.warning(
+                "Failed to read frontmatter", path=str(path), error=str(e)
+            )
+            return None
+
+    def _read_note(self, path: Path) -> tuple[NoteHeader, str] | None:
+        try:
+            data = path.read_bytes()
+            block = split_frontmatter(data)
+            body = data[block.body_offset :].decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.warning("Failed to read note", path=str(path), error=str(e))
+            return None
+        return NoteHeader(path, block.fields()), strip_title(body)
+
+    async def _select(self, filters: dict[str, Any], limit: int | None) -> list[Path]:
+        headers = await self.read_headers()
+        selected = [h.path for h in headers if self.matches(h, filters)]
+
+        query = filters.get("query")
+        if query:
+            hits = await self.file_manager.search_notes(query=query, limit=0)
+            hit_paths = {Path(hit["file_path"]) for hit in hits}
+            selected = [path for path in selected if path in hit_paths]
+
+        return selected[:limit] if limit else selected
+
+    def _normalize_updates(self, updates: dict[str, Any]) -> dict[str, Any]:
+        known = {}
+        for key, value in updates.items():
+            if key in NoteFrontmatter.model_fields:
+                known[key] = value
+            else:
+                self.logger.warning("Unknown frontmatter field", field=key)
+        if not known:
+            return {}
+        # モデルの検証・正規化（タグの # など）を一度だけ適用する
+        model = NoteFrontmatter.model_validate({"obsidian_folder": "_", **known})
+        return {key: getattr(model, key) for key in known}
+
+    def _rewrite(
+        self, path: Path, updates: dict[str, Any], dry_run: bool
+    ) -> MetadataChange | bool | None:
+        try:
+            block, new_lines, payload = apply_frontmatter_updates(
+                path.read_bytes(), updates
+            )
+            if _same_ignoring_modified(block, new_lines):
+                return False
+
+            if not dry_run:
+                replace_file_bytes(path, payload)
+
+            fields = FrontmatterBlock(new_lines, 0).fields()
+            return MetadataChange(
+                path=path,
+                diff=frontmatter_diff(path, block.lines, new_lines),
+                fields=fields,
+                text=payload.decode("utf-8") if not dry_run else "",
+            )
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.error(
+                "Failed to rewrite frontmatter", path=str(path), error=str(e)
+            )
+            return None
+
+    async def _record_changes(self, changes: list[MetadataChange]) -> None:
+        """Git 同期・日次集計・キーワードインデックスに反映（永続化は 1 回）"""
+        self.file_manager.change_feed.record(*(change.path for change in changes))
+        self.file_manager.statistics.invalidate_cache()
+        try:
+            metadata = []
+            for change in changes:
+                frontmatter = self.frontmatter_model(change.path, change.fields)
+                if frontmatter is not None:
+                    metadata.append((change.path, frontmatter))
+            await self.file_manager.activity_rollup.record_metadata(metadata)
+
+            keyword_index = self.file_manager.keyword_index
+            changed = [
+                keyword_index.update_note(change.path, change.text)
+                for change in changes
+            ]
+            if any(changed):
+                keyword_index.persist()
+        except Exception as e:
+            self.logger.warning("Failed to update note indexes", error=str(e))
+
+    def frontmatter_model(
+        self, path: Path, fields: dict[str, Any]
+    ) -> NoteFrontmatter | None:
+        """読み込んだフロントマターからモデルを作成（検証できない場合は None ）"""
+        return frontmatter_model(fields, path.relative_to(self.vault_path))
+
+
+def _as_date(value: str | date) -> date:
+    return datetime.fromisoformat(value).date() if isinstance(value, str) else value
+
+
+def _same_ignoring_modified(block: FrontmatterBlock, new_lines: list[str]) -> bool:
+    def strip(lines: list[str]) -> list[str]:
+        return [line for line in lines if not line.startswith("modified:")]
+
+    return block.has_frontmatter and strip(block.lines) == strip(new_lines)
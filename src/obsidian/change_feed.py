@@ -0,0 +1,143 @@
+"""
+Vault change feed: paths changed since they were last committed
+
+Writers record the notes they touched; the git sync scheduler takes the
+pending paths once per window and stages only those. Files written through
+``write_bytes_atomic`` (the JSON stores) are recorded automatically.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import structlog
+
+from src.utils.json_store import add_write_listener
+
+logger = structlog.get_logger(__name__)
+
+Listener = Callable[[], None]
+
+
+class VaultChangeFeed:
+    """Pending changed paths of one vault, with the time each first changed.
+
+    Paths are kept relative to the vault (POSIX separators) and timestamps
+    are ``time.monotonic()`` values. Safe to use from any thread; listeners
+    are called on the recording thread.
+    """
+
+    def __init__(self, vault_path: Path) -> None:
+        self.vault_path = vault_path
+        self._pending: dict[str, float] = {}
+        self._listeners: list[Listener] = []
+        self._lock = threading.Lock()
+
+    def record(self, *paths: Path | str) -> None:
+        """Mark paths (absolute or vault-relative) as changed."""
+        now = time.monotonic()
+        added = False
+        with self._lock:
+            for path in paths:
+                relative = self._relative(path)
+                if relative is None:
+                    continue
+                self._pending.setdefault(relative, now)
+                added = True
+            listeners = list(self._listeners) if added else []
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.warning("Change feed listener failed", error=str(e))
+
+    def take(self) -> dict[str, float]:
+        """Remove and return the pending paths with their first-change times."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: dict[str, float]) -> None:
+        """Put back paths taken by ``take`` that could not be committed."""
+        with self._lock:
+            for path, changed_at in pending.items():
+                current = self._pending.get(path)
+                if current is None or changed_at < current:
+                    self._pending[path] = changed_at
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Call ``listener`` whenever new paths are recorded; returns unsubscribe."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def oldest_change_at(self) -> float | None:
+        with self._lock:
+            return min(self._pending.values(), default=None)
+
+    def _relative(self, path: Path | str) -> str | None:
+        candidate = Path(path)
+        if candidate.is_absolute():
+            try:
+                candidate = candidate.relative_to(self.vault_path)
+            except ValueError:
+                try:
+                    candidate = candidate.resolve().relative_to(self.vault_path)
+                except ValueError:
+                    logger.debug("Ignoring change outside vault", path=str(path))
+                    return None
+        relative = candidate.as_posix()
+        if relative in ("", ".") or relative.startswith("../"):
+            return None
+        return relative
+
+
+_feeds: dict[Path, VaultChangeFeed] = {}
+_feeds_lock = threading.Lock()
+
+
+def get_change_feed(vault_path: Path | str) -> VaultChangeFeed:
+    """Shared change feed for a vault."""
+    resolved = Path(vault_path).resolve()
+    with _feeds_lock:
+        feed = _feeds.get(resolved)
+        if feed is None:
+            feed = _feeds[resolved] = VaultChangeFeed(resolved)
+        return feed
+
+
+def record_vault_write(path: Path) -> None:
+    """Record a file written inside a known vault.
+
+    Hidden folders (derived caches, sync manifests, backups) stay local.
+    """
+    absolute = Path(os.path.abspath(path))
+    with _feeds_lock:
+        feeds = list(_feeds.values())
+    for feed in feeds:
+        try:
+            relative = absolute.relative_to(feed.vault_path)
+        except ValueError:
+            try:
+                relative = absolute.resolve().relative_to(feed.vault_path)
+            except ValueError:
+                continue
+        if relative.parts and not any(part.startswith(".") for part in relative.parts):
+            feed.record(relative)
+
+
+add_write_listener(record_vault_write)
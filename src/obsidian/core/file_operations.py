@@ -8,6 +8,7 @@ from typing import Any
 import aiofiles
 import structlog
 
+from src.obsidian.core.frontmatter import FrontmatterBlock
 from src.obsidian.models import ObsidianNote
 
 logger = structlog.get_logger(__name__)
@@ -307,7 +308,7 @@ class FileOperations:
         lines = content.split("\n")
 
         # Extract frontmatter and content
-        frontmatter_data: dict[str, Any] = {}
+        frontmatter_lines: list[str] = []
         content_start = 0
 
         if lines and lines[0].strip() == "---":
@@ -316,50 +317,8 @@ class FileOperations:
                 if line.strip() == "---":
                     content_start = i + 1
                     break
-                elif ":" in line:
-                    key, value = line.split(":", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Parse different types of values
-                    if key == "discord_message_id":
-                        frontmatter_data[key] = int(value) if value.isdigit() else None
-                    elif key == "discord_author_id":
-                        frontmatter_data[key] = int(value) if value.isdigit() else None
-                    elif key == "ai_processed":
-                        frontmatter_data[key] = value.lower() in ("true", "yes", "1")
-                    elif key == "ai_processing_time":
-                        frontmatter_data[key] = int(value) if value.isdigit() else None
-                    elif key == "ai_confidence":
-                        try:
-                            frontmatter_data[key] = float(value)
-                        except ValueError:
-                            frontmatter_data[key] = None
-                    elif key == "tags":
-                        # Parse tags list
-                        if value.startswith("[") and value.endswith("]"):
-                            tags_str = value.strip("[]")
-                            frontmatter_data[key] = [
-                                tag.strip().strip("\"'")
-                                for tag in tags_str.split(",")
-                                if tag.strip()
-                            ]
-                        else:
-                            frontmatter_data[key] = []
-                    elif key in ("ai_tags", "aliases"):
-                        # Parse list fields
-                        if value.startswith("[") and value.endswith("]"):
-                            tags_str = value.strip("[]")
-                            frontmatter_data[key] = [
-                                tag.strip().strip("\"'")
-                                for tag in tags_str.split(",")
-                                if tag.strip()
-                            ]
-                        else:
-                            frontmatter_data[key] = []
-                    else:
-                        # String values
-                        frontmatter_data[key] = value
+                frontmatter_lines.append(line)
+        frontmatter_data = FrontmatterBlock(frontmatter_lines, 0).fields()
 
         # Extract title from first h1 if present, otherwise use filename
         title = file_path.stem
@@ -0,0 +1,268 @@
+"""Frontmatter parsing and in-place rewriting for vault notes."""
+
+import difflib
+import os
+import tempfile
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from src.obsidian.models import NoteFrontmatter, VaultFolder
+
+FRONTMATTER_DELIMITER = "---"
+LIST_FIELDS = ("tags", "ai_tags", "aliases")
+INT_FIELDS = ("discord_message_id", "discord_author_id", "ai_processing_time")
+
+
+def parse_frontmatter_value(key: str, value: str) -> Any:
+    """Parse one ``key: value`` frontmatter line the way notes are written."""
+    if key in INT_FIELDS:
+        return int(value) if value.isdigit() else None
+    if key == "ai_processed":
+        return value.lower() in ("true", "yes", "1")
+    if key == "ai_confidence":
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    if key in LIST_FIELDS:
+        if value.startswith("[") and value.endswith("]"):
+            return [
+                item.strip().strip("\"'")
+                for item in value.strip("[]").split(",")
+                if item.strip()
+            ]
+        return []
+    return value
+
+
+def format_frontmatter_value(value: Any) -> str | None:
+    """Format a value for a ``key: value`` line; None when it should be omitted."""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, list):
+        return f"[{', '.join(str(v) for v in value)}]" if value else None
+    if isinstance(value, str):
+        return value if value.strip() else None
+    if isinstance(value, int | float | bool):
+        return str(value)
+    return None
+
+
+@dataclass
+class FrontmatterBlock:
+    """The frontmatter lines of a note and where its body starts.
+
+    ``body_offset`` is a byte offset into the file, so rewrites can copy
+    the body bytes unchanged.
+    """
+
+    lines: list[str]
+    body_offset: int
+    has_frontmatter: bool = True
+
+    def entries(self) -> list[tuple[str | None, list[str]]]:
+        """Group the lines per key.
+
+        Indented and ``- `` lines continue the preceding key, so block lists
+        (``tags:`` followed by ``- x`` lines, as ``yaml.dump`` and Obsidian
+        write them) and block scalars stay with their key.
+        """
+        entries: list[tuple[str | None, list[str]]] = []
+        for line in self.lines:
+            entry = entries[-1] if entries else None
+            if (
+                entry is not None
+                and entry[0] is not None
+                and (_continues_entry(line) or (not line.strip() and len(entry[1]) > 1))
+            ):
+                entry[1].append(line)
+            elif ":" in line and not line[:1].isspace():
+                entries.append((line.split(":", 1)[0].strip(), [line]))
+            else:
+                entries.append((None, [line]))
+        return entries
+
+    def fields(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for key, lines in self.entries():
+            if key is None:
+                continue
+            value = lines[0].split(":", 1)[1].strip()
+            if len(lines) > 1 and (not value or value[0] in "|>"):
+                data[key] = _parse_block_value(key, lines)
+            else:
+                data[key] = parse_frontmatter_value(key, value)
+        return data
+
+    def with_updates(self, updates: dict[str, Any]) -> list[str]:
+        """Frontmatter lines with ``updates`` applied, other lines untouched.
+
+        A replaced key drops its continuation lines along with the key line.
+        """
+        pending = dict(updates)
+        lines: list[str] = []
+        for key, entry_lines in self.entries():
+            if key is not None and key in pending:
+                formatted = format_frontmatter_value(pending.pop(key))
+                if formatted is not None:
+                    lines.append(f"{key}: {formatted}")
+            else:
+                lines.extend(entry_lines)
+        for key, value in pending.items():
+            formatted = format_frontmatter_value(value)
+            if formatted is not None:
+                lines.append(f"{key}: {formatted}")
+        return lines
+
+
+def _continues_entry(line: str) -> bool:
+    stripped = line.lstrip()
+    return bool(stripped) and (
+        line[:1].isspace() or stripped == "-" or stripped.startswith("- ")
+    )
+
+
+def _parse_block_value(key: str, lines: list[str]) -> Any:
+    """Value of a key written over several lines."""
+    if key in LIST_FIELDS:
+        items = [
+            line.strip()[1:].strip()
+            for line in lines[1:]
+            if line.strip().startswith("-")
+        ]
+        return [item.strip("\"'") for item in items if item and item.strip("\"'")]
+
+    import yaml
+
+    try:
+        loaded = yaml.safe_load("\n".join(lines))
+    except yaml.YAMLError:
+        return None
+    return loaded.get(key) if isinstance(loaded, dict) else None
+
+
+def frontmatter_model(
+    fields: dict[str, Any], relative_path: Path
+) -> NoteFrontmatter | None:
+    """Model for parsed frontmatter fields, None when they do not validate.
+
+    ``obsidian_folder`` defaults to the note's top-level folder, the way
+    notes are loaded.
+    """
+    data = {key: value for key, value in fields.items() if value is not None}
+    if not data.get("obsidian_folder"):
+        parts = relative_path.parts
+        data["obsidian_folder"] = (
+            parts[0] if len(parts) > 1 else VaultFolder.INBOX.value
+        )
+    try:
+        return NoteFrontmatter.model_validate(data)
+    except ValidationError:
+        return None
+
+
+def strip_title(body: str) -> str:
+    """Note body without its first heading line, as stored in ``note.content``."""
+    lines = body.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("# "):
+            lines = lines[i + 1 :]
+            break
+    return "\n".join(lines).strip()
+
+
+def split_frontmatter(data: bytes) -> FrontmatterBlock:
+    """Locate the frontmatter block at the start of a note's bytes."""
+    if not _opens_block(data):
+        return FrontmatterBlock([], 0, has_frontmatter=False)
+
+    lines: list[str] = []
+    offset = data.find(b"\n") + 1
+    if offset == 0:
+        return FrontmatterBlock([], 0, has_frontmatter=False)
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        next_offset = len(data) if end == -1 else end + 1
+        line = data[offset:next_offset].decode("utf-8").rstrip("\r\n")
+        if line.strip() == FRONTMATTER_DELIMITER:
+            return FrontmatterBlock(lines, next_offset)
+        lines.append(line)
+        offset = next_offset
+
+    # Unterminated frontmatter: treat the whole file as body
+    return FrontmatterBlock([], 0, has_frontmatter=False)
+
+
+def read_frontmatter(path: Path, chunk_size: int = 4096) -> FrontmatterBlock:
+    """Read only as much of a note as needed to parse its frontmatter."""
+    with path.open("rb") as f:
+        data = f.read(chunk_size)
+        while True:
+            block = split_frontmatter(data)
+            first_line_read = b"\n" in data
+            if block.has_frontmatter or (first_line_read and not _opens_block(data)):
+                return block
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return block
+            data += chunk
+
+
+def _opens_block(data: bytes) -> bool:
+    first_line = data.split(b"\n", 1)[0]
+    return first_line.strip() == FRONTMATTER_DELIMITER.encode()
+
+
+def render_frontmatter(lines: list[str]) -> bytes:
+    text = "\n".join([FRONTMATTER_DELIMITER, *lines, FRONTMATTER_DELIMITER]) + "\n"
+    return text.encode("utf-8")
+
+
+def apply_frontmatter_updates(
+    data: bytes, updates: dict[str, Any]
+) -> tuple[FrontmatterBlock, list[str], bytes]:
+    """Note bytes with ``updates`` applied and the body bytes copied as is.
+
+    Returns the original block, the new frontmatter lines and the new bytes.
+    """
+    block = split_frontmatter(data)
+    new_lines = block.with_updates(updates)
+    header = render_frontmatter(new_lines)
+    if not block.has_frontmatter:
+        header += b"\n"
+    return block, new_lines, header + data[block.body_offset :]
+
+
+def frontmatter_diff(path: Path, before: list[str], after: list[str]) -> str:
+    """Unified diff of two versions of a note's frontmatter."""
+    return "".join(
+        difflib.unified_diff(
+            [line + "\n" for line in before],
+            [line + "\n" for line in after],
+            fromfile=f"a/{path.name}",
+            tofile=f"b/{path.name}",
+            lineterm="\n",
+        )
+    )
+
+
+def replace_file_bytes(path: Path, payload: bytes) -> None:
+    """Replace a note through a temp file in the same folder.
+
+    Unlike ``write_bytes_atomic`` this does not fsync: bulk rewrites touch
+    thousands of notes and rely on the vault's own sync/backup for
+    durability, like regular note saves.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".md.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.chmod(temp_path, path.stat().st_mode & 0o777)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
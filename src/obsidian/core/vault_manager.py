@@ -4,6 +4,8 @@ from pathlib import Path
 
 import structlog
 
+from src.obsidian.change_feed import get_change_feed
+
 logger = structlog.get_logger(__name__)
 
 
@@ -96,6 +98,7 @@ class VaultManager:
             template_path = template_dir / filename
             if not template_path.exists():
                 template_path.write_text(content, encoding="utf-8")
+                get_change_feed(self.vault_path).record(template_path)
                 logger.debug("Created template", template=filename)
 
     def _get_daily_note_template(self) -> str:
@@ -4,8 +4,14 @@ Daily note integration for Discord messages and health data
 
 import re
 from datetime import date, datetime
+from pathlib import Path
 from typing import Any
 
+from src.obsidian.daily_note_store import (
+    DailyNoteHandle,
+    DailyNoteSections,
+    DailyNoteStore,
+)
 from src.obsidian.file_manager import ObsidianFileManager
 from src.obsidian.models import ObsidianNote, VaultFolder
 from src.utils.mixins import LoggerMixin
@@ -30,6 +36,8 @@ class DailyNoteIntegration(LoggerMixin):
 
         self.template_engine = TemplateEngine(file_manager.vault_path)
         self._templates_initialized = False
+        # 日付ごとのノートをメモリに保持し、更新を直列化して書き込む
+        self._daily_notes = DailyNoteStore(self._write_daily_note)
         self.logger.info("Daily integration initialized")
 
     async def add_activity_log_entry(
@@ -60,8 +68,8 @@ class DailyNoteIntegration(LoggerMixin):
                 return False
 
             # デイリーノートの取得または作成
-            daily_note = await self._get_or_create_daily_note(date)
-            if not daily_note:
+            handle = await self._get_daily_note_handle(date)
+            if not handle:
                 return False
 
             # Activity Log セクションにエントリを追加
@@ -74,17 +82,9 @@ class DailyNoteIntegration(LoggerMixin):
 
             activity_entry = f"- **{time_str}** {raw_content}"
 
-            # ノート内容を更新
-            updated_content = self._add_to_section(
-                daily_note.content, "## 📋 Activity Log", activity_entry
-            )
-
-            daily_note.content = updated_content
-            daily_note.modified_at = datetime.now()
-
-            # ノートを保存
-            success = await self.file_manager.update_note(
-                daily_note.file_path, daily_note
+            # ノート内容を更新して保存
+            success = await handle.apply(
+                lambda sections: sections.update("## 📋 Activity Log", activity_entry)
             )
 
             if success:
@@ -132,8 +132,8 @@ class DailyNoteIntegration(LoggerMixin):
                 return False
 
             # デイリーノートの取得または作成
-            daily_note = await self._get_or_create_daily_note(date)
-            if not daily_note:
+            handle = await self._get_daily_note_handle(date)
+            if not handle:
                 return False
 
             # タスクの解析とチェックボックス形式に変換
@@ -143,19 +143,11 @@ class DailyNoteIntegration(LoggerMixin):
                 task_entries = [f"- [ ] {raw_content}"]
 
             # Daily Tasks セクションにエントリを追加
-            updated_content = daily_note.content
-            for task_entry in task_entries:
-                updated_content = self._add_to_section(
-                    updated_content, "## ✅ Daily Tasks", task_entry
-                )
-
-            daily_note.content = updated_content
-            daily_note.modified_at = datetime.now()
+            def add_tasks(sections: DailyNoteSections) -> None:
+                for task_entry in task_entries:
+                    sections.update("## ✅ Daily Tasks", task_entry)
 
-            # ノートを保存
-            success = await self.file_manager.update_note(
-                daily_note.file_path, daily_note
-            )
+            success = await handle.apply(add_tasks)
 
             if success:
                 self.logger.info(
@@ -177,6 +169,21 @@ class DailyNoteIntegration(LoggerMixin):
 
     async def _get_or_create_daily_note(self, date: datetime) -> ObsidianNote | None:
         """デイリーノートを取得または作成"""
+        handle = await self._get_daily_note_handle(date)
+        return handle.note if handle else None
+
+    async def _get_daily_note_handle(self, date: datetime) -> DailyNoteHandle | None:
+        """デイリーノートのハンドルを取得（初回のみ読み込み/作成）"""
+        return await self._daily_notes.get_or_open(
+            date.strftime("%Y-%m-%d"), lambda: self._load_or_create_daily_note(date)
+        )
+
+    async def _write_daily_note(self, file_path: Path, note: ObsidianNote) -> bool:
+        """ハンドルからの書き込み"""
+        return await self.file_manager.update_note(file_path, note)
+
+    async def _load_or_create_daily_note(self, date: datetime) -> ObsidianNote | None:
+        """デイリーノートを読み込み、存在しなければテンプレートから作成"""
         try:
             # Ensure templates are created first
             if not self._templates_initialized:
@@ -207,9 +214,7 @@ class DailyNoteIntegration(LoggerMixin):
                 return None
 
             # Convert dict result to ObsidianNote
-            from pathlib import Path
-
-            from src.obsidian.models import NoteFrontmatter, ObsidianNote
+            from src.obsidian.models import NoteFrontmatter
 
             # Handle GeneratedNote object
             if hasattr(new_note_dict, "filename"):
@@ -293,90 +298,9 @@ class DailyNoteIntegration(LoggerMixin):
         Returns:
             更新されたコンテンツ
         """
-        lines = content.split("\n")
-        section_start = None
-        section_end = len(lines)
-
-        # セクションヘッダーの形式を統一
-        if not section_identifier.startswith("## "):
-            # セクション名のみの場合、## プレフィックスを追加して検索
-            search_patterns = [
-                f"## {section_identifier}",
-                f"## 📊 {section_identifier}",
-                f"## 🔍 {section_identifier}",
-            ]
-        else:
-            # 完全なヘッダーの場合
-            search_patterns = [section_identifier]
-
-        # セクションを検索
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped.startswith("## "):
-                for pattern in search_patterns:
-                    if pattern in line or line_stripped == pattern:
-                        section_start = i
-                        # 次のセクションを探す
-                        for j in range(i + 1, len(lines)):
-                            if lines[j].strip().startswith("## "):
-                                section_end = j
-                                break
-                        break
-                if section_start is not None:
-                    break
-
-        if section_start is not None:
-            if replace_content:
-                # セクション内容を完全に置換（ヘッダーは保持）
-                header_line = lines[section_start]
-                new_body_lines = new_content.split("\n")
-
-                new_lines = (
-                    lines[:section_start]
-                    + [header_line]
-                    + [""]
-                    + new_body_lines
-                    + [""]
-                    + lines[section_end:]
-                )
-            else:
-                # セクション内の適切な位置に追加
-                # 空行をスキップして最初の内容行を見つける
-                content_start = None
-                for k in range(section_start + 1, section_end):
-                    if lines[k].strip():
-                        content_start = k
-                        break
-
-                if content_start is None:
-                    # セクションが空の場合
-                    lines.insert(section_start + 1, "")
-                    lines.insert(section_start + 2, new_content)
-                else:
-                    # 既存の内容の後に追加
-                    lines.insert(section_end, new_content)
-
-                new_lines = lines
-        else:
-            # セクションが存在しない場合は末尾に追加
-            if replace_content:
-                # セクションヘッダーと内容を新規作成
-                section_header = (
-                    search_patterns[0]
-                    if search_patterns
-                    else f"## {section_identifier}"
-                )
-                new_lines = lines + ["", section_header] + new_content.split("\n")
-            else:
-                # 従来の動作（セクションヘッダーと内容を追加）
-                section_header = (
-                    section_identifier
-                    if section_identifier.startswith("## ")
-                    else f"## {section_identifier}"
-                )
-                new_lines = lines + ["", section_header, "", new_content]
-
-        return "\n".join(new_lines)
+        sections = DailyNoteSections.parse(content)
+        sections.update(section_identifier, new_content, replace_content)
+        return sections.render()
 
     def _parse_tasks(self, content: str) -> list[str]:
         """メッセージ内容からタスクを解析"""
@@ -438,37 +362,28 @@ class DailyNoteIntegration(LoggerMixin):
             )
 
             # デイリーノートを取得または作成
-            daily_note = await self._get_or_create_daily_note(
+            handle = await self._get_daily_note_handle(
                 datetime.combine(target_date, datetime.min.time())
             )
-            if not daily_note:
+            if not handle:
                 self.logger.error(
                     "Failed to get or create daily note for health data update"
                 )
                 return False
 
-            # 既存のコンテンツを読み込み
-            content = daily_note.content
-
-            # Health Data セクションを更新
-            content = self._update_health_data_section(content, health_data_markdown)
-
-            # ノートを更新
-            updated_note = ObsidianNote(
-                filename=daily_note.filename,
-                file_path=daily_note.file_path,
-                frontmatter=daily_note.frontmatter,
-                content=content,
+            # Health Data セクションを更新して保存
+            success = await handle.apply(
+                lambda sections: sections.update(
+                    "Health Data", health_data_markdown, replace_content=True
+                )
             )
 
-            success = await self.file_manager.save_note(updated_note, overwrite=True)
-
             if success:
                 self.logger.info(
                     "Successfully updated health data in daily note",
                     date=target_date.isoformat(),
                     file_path=str(
-                        daily_note.file_path.relative_to(self.file_manager.vault_path)
+                        handle.file_path.relative_to(self.file_manager.vault_path)
                     ),
                 )
                 return True
@@ -484,14 +399,6 @@ class DailyNoteIntegration(LoggerMixin):
             )
             return False
 
-    def _update_health_data_section(
-        self, content: str, health_data_markdown: str
-    ) -> str:
-        """Health Data セクションを更新"""
-        return self._update_section(
-            content, "Health Data", health_data_markdown, replace_content=True
-        )
-
     async def update_health_analysis_in_daily_note(
         self, target_date: date, analysis_markdown: str
     ) -> bool:
@@ -511,37 +418,28 @@ class DailyNoteIntegration(LoggerMixin):
             )
 
             # デイリーノートを取得または作成
-            daily_note = await self._get_or_create_daily_note(
+            handle = await self._get_daily_note_handle(
                 datetime.combine(target_date, datetime.min.time())
             )
-            if not daily_note:
+            if not handle:
                 self.logger.error(
                     "Failed to get or create daily note for health analysis update"
                 )
                 return False
 
-            # 既存のコンテンツを読み込み
-            content = daily_note.content
-
-            # Health Analysis セクションを更新
-            content = self._update_health_analysis_section(content, analysis_markdown)
-
-            # ノートを更新
-            updated_note = ObsidianNote(
-                filename=daily_note.filename,
-                file_path=daily_note.file_path,
-                frontmatter=daily_note.frontmatter,
-                content=content,
+            # Health Analysis セクションを更新して保存
+            success = await handle.apply(
+                lambda sections: sections.update(
+                    "Health Analysis", analysis_markdown, replace_content=True
+                )
             )
 
-            success = await self.file_manager.save_note(updated_note, overwrite=True)
-
             if success:
                 self.logger.info(
                     "Successfully updated health analysis in daily note",
                     date=target_date.isoformat(),
                     file_path=str(
-                        daily_note.file_path.relative_to(self.file_manager.vault_path)
+                        handle.file_path.relative_to(self.file_manager.vault_path)
                     ),
                 )
                 return True
@@ -557,14 +455,6 @@ class DailyNoteIntegration(LoggerMixin):
             )
             return False
 
-    def _update_health_analysis_section(
-        self, content: str, analysis_markdown: str
-    ) -> str:
-        """Health Analysis セクションを更新"""
-        return self._update_section(
-            content, "Health Analysis", analysis_markdown, replace_content=True
-        )
-
     async def get_health_data_for_date(self, target_date: date) -> str | None:
         """
         指定日のデイリーノートから Health Data セクションを抽出
@@ -576,32 +466,14 @@ class DailyNoteIntegration(LoggerMixin):
             Health Data セクションの内容（存在しない場合は None ）
         """
         try:
-            daily_note = await self._get_or_create_daily_note(
+            handle = await self._get_daily_note_handle(
                 datetime.combine(target_date, datetime.min.time())
             )
-            if not daily_note:
+            if not handle:
                 return None
 
-            lines = daily_note.content.split("\n")
-            health_section_start = None
-            health_section_end = len(lines)
-
             # Health Data セクションを検索
-            for i, line in enumerate(lines):
-                if line.strip().startswith("## ") and "Health Data" in line:
-                    health_section_start = i
-                    # 次のセクションを探す
-                    for j in range(i + 1, len(lines)):
-                        if lines[j].strip().startswith("## "):
-                            health_section_end = j
-                            break
-                    break
-
-            if health_section_start is not None:
-                health_section_lines = lines[health_section_start:health_section_end]
-                return "\n".join(health_section_lines).strip()
-
-            return None
+            return handle.sections.section_text("Health Data")
 
         except Exception as e:
             self.logger.error(
@@ -614,55 +486,9 @@ class DailyNoteIntegration(LoggerMixin):
     async def _collect_daily_stats(self, date: datetime) -> dict[str, Any]:
         """指定日の統計情報を収集"""
         try:
-            from datetime import timedelta
-
-            start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = start_date + timedelta(days=1)
-
-            # その日のノートを検索
-            daily_notes = await self.file_manager.search_notes(
-                date_from=start_date.isoformat(),
-                date_to=end_date.isoformat(),
-                limit=1000,
-            )
-
-            stats = {
-                "total_messages": len(daily_notes),
-                "processed_messages": 0,
-                "ai_processing_time_total": 0,
-                "categories": {},
-                "tags": {},
-            }
-
-            for note_dict in daily_notes:
-                # AI 処理済みノートの統計
-                ai_processed = note_dict.get("ai_processed", False)
-                if ai_processed:
-                    if isinstance(stats["processed_messages"], int):
-                        stats["processed_messages"] += 1
-
-                    ai_processing_time = note_dict.get("ai_processing_time")
-                    if ai_processing_time and isinstance(
-                        stats["ai_processing_time_total"], int
-                    ):
-                        stats["ai_processing_time_total"] += int(ai_processing_time)
-
-                # カテゴリ統計
-                ai_category = note_dict.get("ai_category")
-                if ai_category:
-                    category = str(ai_category)
-                    if isinstance(stats["categories"], dict):
-                        stats["categories"][category] = (
-                            stats["categories"].get(category, 0) + 1
-                        )
-
-                # タグ統計
-                ai_tags = note_dict.get("ai_tags", []) or []
-                tags = note_dict.get("tags", []) or []
-                for tag in ai_tags + tags:
-                    clean_tag = str(tag).lstrip("#")
-                    if isinstance(stats["tags"], dict):
-                        stats["tags"][clean_tag] = stats["tags"].get(clean_tag, 0) + 1
+            # 保存時に更新される日次集計から 1 日分を取得
+            day = await self.file_manager.activity_rollup.get_day(date.date())
+            stats = day.to_daily_stats()
 
             return stats
 
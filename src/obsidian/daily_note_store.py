@@ -0,0 +1,272 @@
+"""
+In-memory daily note handles with serialized, debounced write-back
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from src.obsidian.models import ObsidianNote
+from src.utils.mixins import LoggerMixin
+
+# 書き込み中に届いた更新をまとめて書き込むまでの待ち時間（秒）
+WRITE_DEBOUNCE_SECONDS = 0.05
+# メモリに保持するデイリーノートの最大数（書き込み待ちのものは除く）
+MAX_OPEN_DAILY_NOTES = 8
+
+NoteWriter = Callable[[Path, ObsidianNote], Awaitable[bool]]
+
+
+def _is_header(line: str) -> bool:
+    return line.strip().startswith("## ")
+
+
+@dataclass
+class _Section:
+    header: str
+    body: list[str] = field(default_factory=list)
+
+
+class DailyNoteSections:
+    """デイリーノート本文の ``## `` セクション構造
+
+    本文を先頭部分（最初の見出しより前）と見出しごとの行リストに分けて
+    保持する。``render()`` は元の行をそのまま連結するため、解析して
+    そのまま出力すると元の本文に一致する。
+    """
+
+    def __init__(self, preamble: list[str], sections: list[_Section]):
+        self.preamble = preamble
+        self.sections = sections
+
+    @classmethod
+    def parse(cls, content: str) -> "DailyNoteSections":
+        preamble: list[str] = []
+        sections: list[_Section] = []
+        for line in content.split("\n"):
+            if _is_header(line):
+                sections.append(_Section(line))
+            elif sections:
+                sections[-1].body.append(line)
+            else:
+                preamble.append(line)
+        return cls(preamble, sections)
+
+    def render(self) -> str:
+        lines = list(self.preamble)
+        for section in self.sections:
+            lines.append(section.header)
+            lines.extend(section.body)
+        return "\n".join(lines)
+
+    def find(self, section_identifier: str) -> _Section | None:
+        """
+        セクションを検索
+
+        ``## `` で始まらない識別子はセクション名として扱い、絵文字付きの
+        見出し（📊 / 🔍）にも一致させる。
+        """
+        if section_identifier.startswith("## "):
+            patterns = [section_identifier]
+        else:
+            patterns = [
+                f"## {section_identifier}",
+                f"## 📊 {section_identifier}",
+                f"## 🔍 {section_identifier}",
+            ]
+
+        for section in self.sections:
+            stripped = section.header.strip()
+            if any(p in section.header or stripped == p for p in patterns):
+                return section
+        return None
+
+    def section_text(self, name: str) -> str | None:
+        """見出しに ``name`` を含む最初のセクション（見出し込み）"""
+        for section in self.sections:
+            if name in section.header:
+                return "\n".join([section.header, *section.body]).strip()
+        return None
+
+    def update(
+        self, section_identifier: str, new_content: str, replace_content: bool = False
+    ) -> None:
+        """
+        セクションを更新
+
+        Args:
+            section_identifier: セクション識別子（ヘッダー文字列またはセクション名）
+            new_content: 追加/置換するコンテンツ
+            replace_content: True=セクション内容を置換、 False=セクションに追加
+        """
+        new_lines = new_content.split("\n")
+        section = self.find(section_identifier)
+
+        if section is not None:
+            if replace_content:
+                section.body = ["", *new_lines, ""]
+            elif not any(line.strip() for line in section.body):
+                # セクションが空の場合は見出しの直後に追加
+                section.body[:0] = ["", *new_lines]
+            else:
+                # 既存の内容の後に追加
+                section.body.extend(new_lines)
+        else:
+            # セクションが存在しない場合は末尾に追加
+            header = (
+                section_identifier
+                if section_identifier.startswith("## ")
+                else f"## {section_identifier}"
+            )
+            last = self.sections[-1].body if self.sections else self.preamble
+            last.append("")
+            body = new_lines if replace_content else ["", *new_lines]
+            self.sections.append(_Section(header, body))
+
+        # 追加した内容に見出しが含まれる場合は構造を作り直す
+        if any(_is_header(line) for line in new_lines):
+            reparsed = self.parse(self.render())
+            self.preamble, self.sections = reparsed.preamble, reparsed.sections
+
+
+class DailyNoteHandle(LoggerMixin):
+    """1 日分のデイリーノートのハンドル
+
+    ノートとセクション構造をメモリに保持し、更新はロックで直列化する。
+    書き込み中に届いた更新は、短い待ち時間の後の次の書き込みにまとめる。
+    各更新は自分の変更がディスクに書き込まれた時点で完了する。書き込みに
+    失敗した場合は、最後に書き込んだ内容に戻す（失敗した更新は残らない）。
+    """
+
+    def __init__(
+        self,
+        note: ObsidianNote,
+        writer: NoteWriter,
+        debounce: float = WRITE_DEBOUNCE_SECONDS,
+    ):
+        self.note = note
+        self.sections = DailyNoteSections.parse(note.content)
+        # ディスク上の本文（書き込み失敗時の戻し先）
+        self._saved_content = note.content
+        self.lock = asyncio.Lock()
+        self.debounce = debounce
+        self._writer = writer
+        self._mtime_ns = self._stat_mtime()
+        self._pending: asyncio.Future[bool] | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+
+        self.updates = 0
+        self.writes = 0
+
+    @property
+    def file_path(self) -> Path:
+        return self.note.file_path
+
+    @property
+    def has_pending_write(self) -> bool:
+        return self._pending is not None or self.lock.locked()
+
+    def is_stale(self) -> bool:
+        """ディスク上のファイルがこのハンドル以外で変更（削除）されたか"""
+        return not self.has_pending_write and self._stat_mtime() != self._mtime_ns
+
+    async def apply(self, mutate: Callable[[DailyNoteSections], None]) -> bool:
+        """セクション構造を更新し、書き込み完了まで待つ"""
+        async with self.lock:
+            mutate(self.sections)
+            self.note.content = self.sections.render()
+            self.note.modified_at = datetime.now()
+            self.updates += 1
+            waiter = self._schedule_write()
+        return await asyncio.shield(waiter)
+
+    def _schedule_write(self) -> "asyncio.Future[bool]":
+        if self._pending is None:
+            self._pending = asyncio.get_running_loop().create_future()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        return self._pending
+
+    async def _flush_loop(self) -> None:
+        # 最初の書き込みはすぐに行い（同じタイミングの更新のみ待つ）、
+        # 書き込み中に届いた更新は待ち時間の後にまとめて書き込む
+        delay = 0.0
+        while self._pending is not None:
+            await asyncio.sleep(delay)
+            delay = self.debounce
+            async with self.lock:
+                waiter, self._pending = self._pending, None
+                try:
+                    success = await self._writer(self.file_path, self.note)
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to write daily note",
+                        file_path=str(self.file_path),
+                        error=str(e),
+                    )
+                    success = False
+                if success:
+                    self._saved_content = self.note.content
+                else:
+                    # 失敗した更新を破棄し、次の書き込みで再び書き込まない
+                    self.note.content = self._saved_content
+                    self.sections = DailyNoteSections.parse(self._saved_content)
+                self._mtime_ns = self._stat_mtime()
+                self.writes += 1
+            if waiter is not None and not waiter.done():
+                waiter.set_result(success)
+
+    def _stat_mtime(self) -> int | None:
+        try:
+            return self.file_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+
+class DailyNoteStore:
+    """日付ごとのデイリーノートハンドルを管理"""
+
+    def __init__(self, writer: NoteWriter, max_open: int = MAX_OPEN_DAILY_NOTES):
+        self._writer = writer
+        self._max_open = max_open
+        self._handles: OrderedDict[str, DailyNoteHandle] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def get_cached(self, key: str) -> DailyNoteHandle | None:
+        """キャッシュ済みのハンドル（外部で変更されたものは破棄）"""
+        handle = self._handles.get(key)
+        if handle is None:
+            return None
+        if handle.is_stale():
+            del self._handles[key]
+            return None
+        self._handles.move_to_end(key)
+        return handle
+
+    async def get_or_open(
+        self, key: str, open_note: Callable[[], Awaitable[ObsidianNote | None]]
+    ) -> DailyNoteHandle | None:
+        """ハンドルを取得し、なければ ``open_note`` でノートを読み込む/作成する"""
+        handle = self.get_cached(key)
+        if handle is not None:
+            return handle
+
+        async with self._lock:
+            handle = self.get_cached(key)
+            if handle is not None:
+                return handle
+            note = await open_note()
+            if note is None:
+                return None
+            handle = DailyNoteHandle(note, self._writer)
+            self._handles[key] = handle
+            self._evict()
+            return handle
+
+    def _evict(self) -> None:
+        idle = [k for k, h in self._handles.items() if not h.has_pending_write]
+        for key in idle[: max(0, len(self._handles) - self._max_open)]:
+            del self._handles[key]
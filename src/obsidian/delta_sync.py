@@ -0,0 +1,496 @@
+"""
+Manifest-based delta sync between the vault and a remote folder
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.utils.json_store import dump_json, write_bytes_atomic
+from src.utils.mixins import LoggerMixin
+
+MANIFEST_VERSION = 1
+# リモート側の manifest を置くフォルダ（同期対象から除外される）
+REMOTE_MANIFEST_DIR = ".mindbridge_sync"
+# 同時に実行するコピーの上限
+DEFAULT_SYNC_CONCURRENCY = 8
+
+# Called with the posix path of a file relative to its side
+SyncFilter = Callable[[str], bool]
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+
+
+@dataclass(frozen=True)
+class FileState:
+    """One file of a side as of the last sync."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+@dataclass
+class SideChanges:
+    """Changes of one side since the last sync."""
+
+    changed: dict[str, FileState] = field(default_factory=dict)
+    deleted: set[str] = field(default_factory=set)
+    renamed: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SyncReport:
+    """Result of one sync run."""
+
+    direction: str
+    files_uploaded: int = 0
+    files_downloaded: int = 0
+    bytes_uploaded: int = 0
+    bytes_downloaded: int = 0
+    deleted_remote: int = 0
+    deleted_local: int = 0
+    renamed_remote: int = 0
+    renamed_local: int = 0
+    unchanged: int = 0
+    conflicts: list[dict[str, str]] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    # ローカル側で変わったパス（インデックスの更新対象）
+    local_updated: list[str] = field(default_factory=list)
+    local_removed: list[str] = field(default_factory=list)
+
+    @property
+    def files_transferred(self) -> int:
+        return self.files_uploaded + self.files_downloaded
+
+    @property
+    def bytes_transferred(self) -> int:
+        return self.bytes_uploaded + self.bytes_downloaded
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "direction": self.direction,
+            "files_synced": self.files_transferred,
+            "bytes_synced": self.bytes_transferred,
+            "files_uploaded": self.files_uploaded,
+            "files_downloaded": self.files_downloaded,
+            "bytes_uploaded": self.bytes_uploaded,
+            "bytes_downloaded": self.bytes_downloaded,
+            "deleted_remote": self.deleted_remote,
+            "deleted_local": self.deleted_local,
+            "renamed_remote": self.renamed_remote,
+            "renamed_local": self.renamed_local,
+            "unchanged": self.unchanged,
+            "conflicts": self.conflicts,
+            "errors": self.errors,
+        }
+
+
+class DeltaSyncEngine(LoggerMixin):
+    """Two-way sync that only transfers what changed since the last run.
+
+    Each side keeps a manifest of its files (size, mtime, SHA-256) as of the
+    last sync: the vault side under ``.local_data/sync`` and the remote side
+    under ``.mindbridge_sync`` in the remote folder, one per peer. A file is
+    only hashed when its size or mtime differs from its manifest entry.
+    Changes on one side are applied to the other; a file changed on both
+    sides is reported as a conflict and left untouched on both.
+    """
+
+    def __init__(
+        self,
+        local_root: Path,
+        remote_root: Path,
+        local_manifest: Path,
+        include: SyncFilter,
+        concurrency: int = DEFAULT_SYNC_CONCURRENCY,
+    ):
+        """
+        Initialize delta sync engine
+
+        Args:
+            local_root: Vault のパス
+            remote_root: リモート同期先
+            local_manifest: Vault 側の manifest ファイル
+            include: 同期対象のファイルか（ Vault からの相対パスで判定）
+            concurrency: 同時に実行するハッシュ計算・コピーの上限
+        """
+        self.local_root = Path(local_root)
+        self.remote_root = Path(remote_root)
+        self.local_manifest = Path(local_manifest)
+        peer = hashlib.sha256(str(self.local_root.resolve()).encode()).hexdigest()
+        self.remote_manifest = (
+            self.remote_root / REMOTE_MANIFEST_DIR / f"{peer[:16]}.json"
+        )
+        self.include = include
+        self.concurrency = concurrency
+
+    def sync(self, direction: str = "both") -> SyncReport:
+        """
+        差分のみを同期（ブロッキング処理）
+
+        Args:
+            direction: 同期方向（"upload", "download", "both"）
+
+        Returns:
+            転送したファイル数・バイト数と競合の一覧
+        """
+        report = SyncReport(direction=direction)
+        allowed = {
+            "upload": {UPLOAD},
+            "download": {DOWNLOAD},
+            "both": {UPLOAD, DOWNLOAD},
+        }[direction]
+        self.remote_root.mkdir(parents=True, exist_ok=True)
+
+        local_base = _load_manifest(self.local_manifest)
+        remote_base = _load_manifest(self.remote_manifest)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            local = self._scan(self.local_root, local_base, pool)
+            remote = self._scan(self.remote_root, remote_base, pool)
+            local_changes = _diff(local_base, local)
+            remote_changes = _diff(remote_base, remote)
+
+            # 次回の基準：現在の状態から始め、適用しなかった変更は元に戻す
+            new_local = dict(local)
+            new_remote = dict(remote)
+
+            def keep_base(path: str) -> None:
+                _restore_entry(new_local, local_base, path)
+                _restore_entry(new_remote, remote_base, path)
+
+            handled = self._apply_renames(
+                local_changes, remote_changes, allowed, new_local, new_remote, report
+            )
+
+            copies: list[tuple[str, str]] = []
+            paths = (
+                set(local_changes.changed)
+                | local_changes.deleted
+                | set(remote_changes.changed)
+                | remote_changes.deleted
+            ) - handled
+            for path in sorted(paths):
+                action = _plan_path(path, local_changes, remote_changes)
+                if action == "unchanged":
+                    report.unchanged += 1
+                elif action.startswith("conflict"):
+                    report.conflicts.append(
+                        {"path": path, "reason": action.split(":", 1)[1]}
+                    )
+                    keep_base(path)
+                elif action == "upload" and UPLOAD in allowed:
+                    copies.append((UPLOAD, path))
+                elif action == "download" and DOWNLOAD in allowed:
+                    copies.append((DOWNLOAD, path))
+                elif action == "delete_remote" and UPLOAD in allowed:
+                    if self._delete(self.remote_root, path, report):
+                        new_remote.pop(path, None)
+                        report.deleted_remote += 1
+                    else:
+                        keep_base(path)
+                elif action == "delete_local" and DOWNLOAD in allowed:
+                    if self._delete(self.local_root, path, report):
+                        new_local.pop(path, None)
+                        report.deleted_local += 1
+                        report.local_removed.append(path)
+                    else:
+                        keep_base(path)
+                else:
+                    keep_base(path)
+
+            results = list(
+                zip(
+                    copies,
+                    pool.map(lambda item: self._copy(item[0], item[1], report), copies),
+                    strict=True,
+                )
+            )
+
+        for (kind, path), states in results:
+            if states is None:
+                keep_base(path)
+                continue
+            source_state, target_state = states
+            if kind == UPLOAD:
+                new_local[path], new_remote[path] = source_state, target_state
+                report.files_uploaded += 1
+                report.bytes_uploaded += target_state.size
+            else:
+                new_remote[path], new_local[path] = source_state, target_state
+                report.files_downloaded += 1
+                report.bytes_downloaded += target_state.size
+                report.local_updated.append(path)
+
+        _save_manifest(self.local_manifest, new_local)
+        _save_manifest(self.remote_manifest, new_remote)
+
+        self.logger.info(
+            "Delta sync completed",
+            direction=direction,
+            files_transferred=report.files_transferred,
+            bytes_transferred=report.bytes_transferred,
+            deleted=report.deleted_local + report.deleted_remote,
+            renamed=report.renamed_local + report.renamed_remote,
+            conflicts=len(report.conflicts),
+            errors=len(report.errors),
+        )
+        return report
+
+    # === Internals ===
+
+    def _scan(
+        self,
+        root: Path,
+        base: dict[str, FileState],
+        pool: ThreadPoolExecutor,
+    ) -> dict[str, FileState]:
+        """ファイル一覧を取得し、サイズか mtime が変わったファイルのみハッシュ計算"""
+        states: dict[str, FileState] = {}
+        to_hash: list[tuple[str, Path, os.stat_result]] = []
+        for relative, path, stat in _walk(root, ""):
+            if not self.include(relative):
+                continue
+            previous = base.get(relative)
+            if (
+                previous is not None
+                and previous.size == stat.st_size
+                and previous.mtime_ns == stat.st_mtime_ns
+            ):
+                states[relative] = previous
+            else:
+                to_hash.append((relative, path, stat))
+
+        def hash_file(item: tuple[str, Path, os.stat_result]) -> FileState | None:
+            _relative, path, stat = item
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError as e:
+                self.logger.warning("Failed to hash file", path=str(path), error=str(e))
+                return None
+            return FileState(stat.st_size, stat.st_mtime_ns, digest)
+
+        for (relative, _path, _stat), state in zip(
+            to_hash, pool.map(hash_file, to_hash), strict=True
+        ):
+            if state is not None:
+                states[relative] = state
+        return states
+
+    def _apply_renames(
+        self,
+        local_changes: SideChanges,
+        remote_changes: SideChanges,
+        allowed: set[str],
+        new_local: dict[str, FileState],
+        new_remote: dict[str, FileState],
+        report: SyncReport,
+    ) -> set[str]:
+        """片側のみで名前が変わったファイルを、もう一方でも移動（転送なし）"""
+        handled: set[str] = set()
+        sides = [
+            (UPLOAD, local_changes, remote_changes, self.remote_root, new_remote),
+            (DOWNLOAD, remote_changes, local_changes, self.local_root, new_local),
+        ]
+        for kind, source, target, target_root, target_manifest in sides:
+            if kind not in allowed:
+                continue
+            for old, new in source.renamed.items():
+                untouched = not (
+                    {old, new} & (set(target.changed) | target.deleted | handled)
+                )
+                if not untouched or old not in target_manifest:
+                    continue
+                try:
+                    destination = target_root / new
+                    if destination.exists():
+                        continue
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(target_root / old, destination)
+                    _prune_empty_dirs(target_root, (target_root / old).parent)
+                except OSError as e:
+                    report.errors.append(f"Failed to rename {old} to {new}: {e}")
+                    continue
+
+                target_manifest[new] = _current_state(
+                    destination, target_manifest.pop(old).digest
+                )
+                # 名前の変更元の manifest は現在の状態をそのまま使う
+                source.changed.pop(new, None)
+                source.deleted.discard(old)
+                handled.update((old, new))
+                if kind == UPLOAD:
+                    report.renamed_remote += 1
+                else:
+                    report.renamed_local += 1
+                    report.local_removed.append(old)
+                    report.local_updated.append(new)
+        return handled
+
+    def _copy(
+        self, kind: str, path: str, report: SyncReport
+    ) -> tuple[FileState, FileState] | None:
+        """1 ファイルを転送（一時ファイル経由で置き換え）し、両側の状態を返す"""
+        source_root, target_root = (
+            (self.local_root, self.remote_root)
+            if kind == UPLOAD
+            else (self.remote_root, self.local_root)
+        )
+        source = source_root / path
+        target = target_root / path
+        try:
+            with open(source, "rb") as f:
+                stat = os.fstat(f.fileno())
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=".sync_tmp_")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                os.replace(temp_path, target)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except OSError as e:
+            report.errors.append(f"Failed to sync {path}: {e}")
+            self.logger.warning("Failed to sync file", path=path, error=str(e))
+            return None
+
+        return (
+            FileState(len(data), stat.st_mtime_ns, digest),
+            _current_state(target, digest),
+        )
+
+    def _delete(self, root: Path, path: str, report: SyncReport) -> bool:
+        try:
+            (root / path).unlink(missing_ok=True)
+            _prune_empty_dirs(root, (root / path).parent)
+            return True
+        except OSError as e:
+            report.errors.append(f"Failed to delete {path}: {e}")
+            return False
+
+
+def _walk(directory: Path, relative: str) -> Iterator[tuple[str, Path, os.stat_result]]:
+    """Regular files under ``directory``, skipping hidden files and folders."""
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.name.startswith(".") or entry.is_symlink():
+            continue
+        entry_relative = f"{relative}{entry.name}"
+        if entry.is_dir():
+            yield from _walk(Path(entry.path), f"{entry_relative}/")
+        elif entry.is_file():
+            yield entry_relative, Path(entry.path), entry.stat()
+
+
+def _diff(base: dict[str, FileState], current: dict[str, FileState]) -> SideChanges:
+    """前回の同期からの変更（追加・変更・削除と、内容が同じ追加・削除の組の名前変更）"""
+    changes = SideChanges(
+        changed={
+            path: state
+            for path, state in current.items()
+            if path not in base or base[path].digest != state.digest
+        },
+        deleted=set(base) - set(current),
+    )
+
+    added_by_digest: dict[str, list[str]] = {}
+    for path in sorted(changes.changed):
+        if path not in base:
+            added_by_digest.setdefault(changes.changed[path].digest, []).append(path)
+    for old in sorted(changes.deleted):
+        candidates = added_by_digest.get(base[old].digest)
+        if candidates:
+            changes.renamed[old] = candidates.pop(0)
+    return changes
+
+
+def _plan_path(path: str, local: SideChanges, remote: SideChanges) -> str:
+    local_state = local.changed.get(path)
+    remote_state = remote.changed.get(path)
+    local_changed = local_state is not None or path in local.deleted
+    remote_changed = remote_state is not None or path in remote.deleted
+
+    if local_changed and not remote_changed:
+        return "upload" if local_state is not None else "delete_remote"
+    if remote_changed and not local_changed:
+        return "download" if remote_state is not None else "delete_local"
+    if local_state is None and remote_state is None:
+        return "unchanged"
+    if (
+        local_state is not None
+        and remote_state is not None
+        and local_state.digest == remote_state.digest
+    ):
+        return "unchanged"
+    if local_state is None:
+        return "conflict:deleted locally, modified remotely"
+    if remote_state is None:
+        return "conflict:modified locally, deleted remotely"
+    return "conflict:modified on both sides"
+
+
+def _restore_entry(
+    manifest: dict[str, FileState], base: dict[str, FileState], path: str
+) -> None:
+    if path in base:
+        manifest[path] = base[path]
+    else:
+        manifest.pop(path, None)
+
+
+def _current_state(path: Path, digest: str) -> FileState:
+    stat = path.stat()
+    return FileState(stat.st_size, stat.st_mtime_ns, digest)
+
+
+def _prune_empty_dirs(root: Path, directory: Path) -> None:
+    """Remove folders left empty by a delete or rename, up to ``root``."""
+    while directory != root and root in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+
+def _load_manifest(path: Path) -> dict[str, FileState]:
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return {
+        relative: FileState(size, mtime_ns, digest)
+        for relative, (size, mtime_ns, digest) in data.get("files", {}).items()
+    }
+
+
+def _save_manifest(path: Path, states: dict[str, FileState]) -> None:
+    payload = {
+        "version": MANIFEST_VERSION,
+        "synced_at": datetime.now().isoformat(),
+        "files": {
+            relative: [state.size, state.mtime_ns, state.digest]
+            for relative, state in sorted(states.items())
+        },
+    }
+    write_bytes_atomic(path, dump_json(payload, indent=None), ".tmp_")
@@ -9,11 +9,13 @@ import aiofiles
 import structlog
 
 from src.config import get_settings
-from src.obsidian.analytics import VaultStatistics
+from src.monitoring.metrics import timed
+from src.obsidian.analytics import DailyActivityRollup, VaultStatistics
 from src.obsidian.backup import BackupConfig, BackupManager
+from src.obsidian.change_feed import get_change_feed
 from src.obsidian.core import FileOperations, VaultManager
-from src.obsidian.models import FileOperation, ObsidianNote
-from src.obsidian.search import NoteSearch, SearchCriteria
+from src.obsidian.models import FileOperation, NoteFrontmatter, ObsidianNote
+from src.obsidian.search import NoteSearch, SearchCriteria, get_keyword_index
 from src.utils.mixins import LoggerMixin
 
 logger = structlog.get_logger(__name__)
@@ -66,6 +68,10 @@ class ObsidianFileManager(LoggerMixin):
         self.vault_manager = VaultManager(self.vault_path)
         self.note_search = NoteSearch(self.vault_path)
         self.statistics = VaultStatistics(self.vault_path)
+        self.activity_rollup = DailyActivityRollup(self.vault_path)
+        self.keyword_index = get_keyword_index(self.vault_path)
+        # Changed paths for the coalesced git sync
+        self.change_feed = get_change_feed(self.vault_path)
 
         # Initialize backup manager with default config
         backup_config = BackupConfig(
@@ -108,6 +114,7 @@ class ObsidianFileManager(LoggerMixin):
         return await self.vault_manager.initialize_vault()
 
     # File Operations
+    @timed("vault.save_note")
     async def save_note(
         self, note: ObsidianNote, subfolder: str | None = None, overwrite: bool = False
     ) -> Path | None:
@@ -119,6 +126,8 @@ class ObsidianFileManager(LoggerMixin):
                     target_path.parent.mkdir(parents=True, exist_ok=True)
                     if await self.file_operations.update_note(target_path, note):
                         self.statistics.invalidate_cache()
+                        self.change_feed.record(target_path)
+                        await self._record_activity(target_path, note)
                         return target_path
                     return None
                 self.logger.warning(
@@ -129,6 +138,9 @@ class ObsidianFileManager(LoggerMixin):
             saved_path = await self.file_operations.save_note(note, subfolder)
             # Invalidate stats cache when adding new notes
             self.statistics.invalidate_cache()
+            if saved_path:
+                self.change_feed.record(saved_path)
+                await self._record_activity(saved_path, note)
             return saved_path
         except Exception:
             return None
@@ -142,6 +154,8 @@ class ObsidianFileManager(LoggerMixin):
         success = await self.file_operations.update_note(file_path, note)
         if success:
             self.statistics.invalidate_cache()
+            self.change_feed.record(file_path)
+            await self._record_activity(file_path, note)
         return success
 
     async def append_to_note(
@@ -156,6 +170,8 @@ class ObsidianFileManager(LoggerMixin):
         )
         if success:
             self.statistics.invalidate_cache()
+            self.change_feed.record(file_path)
+            await self._record_activity(file_path)
         return success
 
     async def delete_note(self, file_path: Path, backup: bool = True) -> bool:
@@ -163,8 +179,54 @@ class ObsidianFileManager(LoggerMixin):
         success = await self.file_operations.delete_note(file_path, backup)
         if success:
             self.statistics.invalidate_cache()
+            self.change_feed.record(file_path)
+            try:
+                await self.activity_rollup.remove_note(file_path)
+                if self.keyword_index.remove_note(file_path):
+                    self.keyword_index.persist()
+            except Exception as e:
+                self.logger.warning("Failed to update note indexes", error=str(e))
         return success
 
+    async def record_moves(
+        self, moves: list[tuple[Path, Path, NoteFrontmatter | None]]
+    ) -> None:
+        """Reflect a batch of moved notes in the indexes with one write each.
+
+        Each move is ``(source, target, frontmatter)``; ``frontmatter`` is the
+        rewritten frontmatter, or None when the file was only renamed.
+        """
+        if not moves:
+            return
+        self.statistics.invalidate_cache()
+        self.change_feed.record(
+            *(path for source, target, _fm in moves for path in (source, target))
+        )
+        try:
+            await self.activity_rollup.move_notes(moves)
+            renames = [(source, target) for source, target, _fm in moves]
+            if self.keyword_index.rename_notes(renames):
+                self.keyword_index.persist()
+        except Exception as e:
+            self.logger.warning("Failed to update note indexes", error=str(e))
+
+    async def _record_activity(
+        self, file_path: Path, note: ObsidianNote | None = None
+    ) -> None:
+        """Reflect a saved note in the activity rollup and keyword index.
+
+        Never raises: index maintenance must not fail the save itself.
+        """
+        try:
+            if note is None:
+                note = await self.file_operations.load_note(file_path)
+            if note is not None:
+                await self.activity_rollup.record_note(file_path, note)
+                if self.keyword_index.update_note(file_path, note.to_markdown()):
+                    self.keyword_index.persist()
+        except Exception as e:
+            self.logger.warning("Failed to update note indexes", error=str(e))
+
     # Daily Note Integration (preserved for compatibility)
     async def save_or_append_daily_note(
         self,
@@ -201,13 +263,18 @@ class ObsidianFileManager(LoggerMixin):
 
             daily_note = ObsidianNote(
                 filename=f"daily-{daily_date}.md",
-                file_path=Path(f"Daily Notes/daily-{daily_date}.md"),
+                file_path=daily_folder / f"daily-{daily_date}.md",
                 frontmatter=daily_frontmatter,
                 content=f"## {note.title}\n\n{note.content}",
             )
-            return await self.file_operations.save_note(daily_note, "Daily Notes")
+            # 通常の保存と同じく Git 同期とインデックスに反映する
+            saved_path = await self.save_note(daily_note, "Daily Notes")
+            if saved_path is None:
+                raise OSError(f"Failed to save daily note: {daily_date}")
+            return saved_path
 
     # Search Operations
+    @timed("vault.search_notes")
     async def search_notes(
         self,
         query: str | None = None,
@@ -453,6 +520,7 @@ class ObsidianFileManager(LoggerMixin):
         if not message_template_path.exists():
             async with aiofiles.open(message_template_path, "w", encoding="utf-8") as f:
                 await f.write(message_template_content)
+            self.change_feed.record(message_template_path)
 
         # 日次ノートテンプレート
         daily_template_content = """# Daily Note - {{date}}
@@ -486,6 +554,7 @@ class ObsidianFileManager(LoggerMixin):
         if not daily_template_path.exists():
             async with aiofiles.open(daily_template_path, "w", encoding="utf-8") as f:
                 await f.write(daily_template_content)
+            self.change_feed.record(daily_template_path)
 
     def search_notes_fast(
         self,
@@ -5,13 +5,65 @@ GitHub-based Obsidian vault synchronization system
 import asyncio
 import os
 import subprocess  # nosec: B404 - subprocess used safely for git operations with validation
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
 
 from src.config import get_settings
+from src.monitoring.metrics import get_metrics_registry, record_external_call
+from src.obsidian.models import DERIVED_DATA_FOLDER
 from src.utils.mixins import LoggerMixin
 
+# full: 全履歴 / shallow: 直近 depth 件のコミットのみ / blobless: 履歴は取得し、
+# 過去のファイル内容はチェックアウト時に必要な分だけ取得する（partial clone）
+CLONE_STRATEGIES = ("full", "shallow", "blobless")
+DEFAULT_CLONE_STRATEGY = "blobless"
+
+# 起動した git サブプロセスの時刻（メトリクス用、直近 1 時間分を保持）
+_GIT_SUBPROCESS_WINDOW_SECONDS = 3600.0
+_git_subprocess_times: deque[float] = deque()
+_git_subprocess_total = 0
+_git_subprocess_lock = threading.Lock()
+_git_subprocess_counter = get_metrics_registry().counter(
+    "mindbridge_git_subprocesses_total", "git processes started for the vault sync"
+)
+
+# GitHub と通信するサブコマンド（外部呼び出しとして計測）
+_REMOTE_GIT_COMMANDS = frozenset({"clone", "fetch", "pull", "push", "ls-remote"})
+
+# 既存の .gitignore にも不足分を追記する行（ノートから再構築できるキャッシュ）
+REQUIRED_GITIGNORE_ENTRIES = (f"{DERIVED_DATA_FOLDER}/",)
+
+
+def _count_git_subprocess() -> None:
+    global _git_subprocess_total
+    now = time.monotonic()
+    with _git_subprocess_lock:
+        _git_subprocess_total += 1
+        _git_subprocess_times.append(now)
+        _prune_git_subprocess_times(now)
+    _git_subprocess_counter.inc()
+
+
+def _prune_git_subprocess_times(now: float) -> None:
+    cutoff = now - _GIT_SUBPROCESS_WINDOW_SECONDS
+    while _git_subprocess_times and _git_subprocess_times[0] < cutoff:
+        _git_subprocess_times.popleft()
+
+
+def git_subprocess_stats() -> dict[str, int]:
+    """このプロセスで起動した git サブプロセス数（累計・直近 1 時間）"""
+    with _git_subprocess_lock:
+        _prune_git_subprocess_times(time.monotonic())
+        return {
+            "total": _git_subprocess_total,
+            "last_hour": len(_git_subprocess_times),
+        }
+
 
 class GitHubSyncError(Exception):
     """GitHub 同期エラー"""
@@ -50,8 +102,48 @@ class GitHubObsidianSync(LoggerMixin):
             "GIT_USER_EMAIL", "bot@example.com"
         )
 
+        # 取得方法の設定
+        self.clone_strategy = self._resolve_clone_strategy()
+        clone_depth = getattr(self.settings, "obsidian_clone_depth", None)
+        self.clone_depth = max(
+            1, int(clone_depth or os.getenv("OBSIDIAN_CLONE_DEPTH") or 1)
+        )
+        sparse_raw = str(
+            getattr(self.settings, "obsidian_sparse_folders", None)
+            or os.getenv("OBSIDIAN_SPARSE_FOLDERS")
+            or ""
+        )
+        self.sparse_folders = [
+            folder.strip().strip("/")
+            for folder in sparse_raw.split(",")
+            if folder.strip().strip("/")
+        ]
+        self.last_fetch: dict[str, Any] | None = None
+
+        # push 先ブランチに切り替え済みか（毎回の branch 確認を省く）
+        self._branch_ready = False
+        # コミット済みで未 push の変更があるか
+        self._unpushed_commits = False
+
         self._validate_configuration()
 
+    def _resolve_clone_strategy(self) -> str:
+        """取得方法（full / shallow / blobless）を解決する。"""
+        strategy = cast(
+            str,
+            getattr(self.settings, "obsidian_clone_strategy", None)
+            or os.getenv("OBSIDIAN_CLONE_STRATEGY")
+            or DEFAULT_CLONE_STRATEGY,
+        ).lower()
+        if strategy not in CLONE_STRATEGIES:
+            self.logger.warning(
+                "Unknown clone strategy, falling back to default",
+                strategy=strategy,
+                default=DEFAULT_CLONE_STRATEGY,
+            )
+            return DEFAULT_CLONE_STRATEGY
+        return strategy
+
     def _resolve_git_token(self) -> str | None:
         """プロバイダに応じたトークンを解決する。
 
@@ -108,6 +200,11 @@ class GitHubObsidianSync(LoggerMixin):
         """GitHub 同期が設定されているかチェック"""
         return bool(self.github_token and self.github_repo_url)
 
+    @property
+    def has_unpushed_commits(self) -> bool:
+        """前回の push に失敗したコミットが残っているか"""
+        return self._unpushed_commits
+
     async def setup_git_repository(self) -> bool:
         """Git リポジトリの初期化"""
         if not self.is_configured:
@@ -218,7 +315,11 @@ class GitHubObsidianSync(LoggerMixin):
         )
 
     async def _setup_gitignore(self) -> None:
-        """.gitignore の設定"""
+        """.gitignore の設定
+
+        導出キャッシュ（`.mindbridge/`）は既存の .gitignore にも追記し、
+        以前にコミットされていれば追跡対象から外す。
+        """
         gitignore_path = self.vault_path / ".gitignore"
         if not gitignore_path.exists():
             gitignore_content = """
@@ -239,6 +340,35 @@ Thumbs.db
             gitignore_path.write_text(gitignore_content, encoding="utf-8")
             self.logger.info("Created .gitignore file")
 
+        text = gitignore_path.read_text(encoding="utf-8")
+        lines = text.splitlines()
+        missing = [entry for entry in REQUIRED_GITIGNORE_ENTRIES if entry not in lines]
+        if not missing:
+            return
+
+        with gitignore_path.open("a", encoding="utf-8") as gitignore:
+            if text and not text.endswith("\n"):
+                gitignore.write("\n")
+            gitignore.write("\n# Caches derived from notes (rebuilt locally)\n")
+            gitignore.write("".join(f"{entry}\n" for entry in missing))
+        await self._run_git_command(
+            [
+                "rm",
+                "-r",
+                "--cached",
+                "--quiet",
+                "--ignore-unmatch",
+                "--",
+                DERIVED_DATA_FOLDER,
+            ],
+            capture_output=True,
+            check=False,
+        )
+        await self._run_git_command(
+            ["add", "--", ".gitignore"], capture_output=True, check=False
+        )
+        self.logger.info(f"Added {', '.join(missing)} to .gitignore")
+
     def _get_authenticated_repo_url(self) -> str:
         """Return repository URL without embedding secrets.
 
@@ -256,27 +386,43 @@ Thumbs.db
             self.logger.debug("Using repository URL without embedding token")
         return self.github_repo_url
 
-    async def sync_to_github(self, commit_message: str | None = None) -> bool:
-        """Obsidian vault を GitHub に同期"""
+    async def sync_to_github(
+        self,
+        commit_message: str | None = None,
+        paths: Iterable[str] | None = None,
+    ) -> bool:
+        """Obsidian vault を GitHub に同期
+
+        paths（vault 相対パス）を渡した場合はそのパスだけをステージングする。
+        前回 push に失敗したコミットが残っていれば、変更がなくても push する。
+        """
         if not self.is_configured:
             self.logger.warning("GitHub sync not configured, skipping sync")
             return False
 
         try:
-            # 変更があるかチェック
-            if not await self._has_changes():
+            if paths is None:
+                # 変更があるかチェック
+                has_changes = await self._has_changes()
+                if has_changes:
+                    # ステージング（sparse checkout 時は範囲外に追加されたノートも含める）
+                    await self._run_git_command(["add", *self._sparse_args(), "."])
+            else:
+                has_changes = await self._stage_paths(paths)
+
+            if not has_changes and not self._unpushed_commits:
                 self.logger.debug("No changes to sync")
                 return True
 
-            # ステージング
-            await self._run_git_command(["add", "."])
-
-            # コミット
-            message = commit_message or f"Auto-sync: {datetime.now().isoformat()}"
-            await self._run_git_command(["commit", "-m", message])
+            if has_changes:
+                # コミット
+                message = commit_message or f"Auto-sync: {datetime.now().isoformat()}"
+                await self._run_git_command(["commit", "-m", message])
+                self._unpushed_commits = True
 
             # プッシュ（初回プッシュに対応）
             await self._push_with_retry()
+            self._unpushed_commits = False
 
             self.logger.info("Successfully synced vault to GitHub")
             return True
@@ -285,45 +431,57 @@ Thumbs.db
             self.logger.error(f"Failed to sync to GitHub: {e}")
             return False
 
-    async def _push_with_retry(self) -> None:
-        """初回プッシュに対応したプッシュ処理"""
-        try:
-            # 設定されたブランチを強制的に使用（現在のブランチに依存しない）
-            target_branch = self.github_branch  # 常に設定されたブランチ（ main ）を使用
+    def _sparse_args(self) -> list[str]:
+        """sparse checkout 時に add / rm へ付けるオプション"""
+        return ["--sparse"] if self.sparse_folders else []
+
+    async def _stage_paths(self, paths: Iterable[str]) -> bool:
+        """指定パスだけをステージングし、コミットする変更があれば True を返す"""
+        existing: list[str] = []
+        missing: list[str] = []
+        for path in sorted(set(paths)):
+            (existing if (self.vault_path / path).exists() else missing).append(path)
+        if not existing and not missing:
+            return False
 
-            # 現在のブランチを確認（デバッグ用）
-            branch_result = await self._run_git_command(
-                ["branch", "--show-current"], capture_output=True, check=False
+        if existing:
+            result = await self._run_git_command(
+                ["add", *self._sparse_args(), "--", *existing],
+                capture_output=True,
+                check=False,
             )
-            current_branch = (
-                branch_result.stdout.strip()
-                if branch_result.returncode == 0
-                else "none"
+            # .gitignore 対象のパスは報告されるだけで、他のパスは追加される
+            if result.returncode != 0 and "ignored by" not in result.stderr:
+                raise GitHubSyncError(f"Git add failed: {result.stderr}")
+        if missing:
+            # 削除されたノート（未追跡のまま消えたものは無視）
+            await self._run_git_command(
+                [
+                    "rm",
+                    "--cached",
+                    "--quiet",
+                    "--ignore-unmatch",
+                    *self._sparse_args(),
+                    "--",
+                    *missing,
+                ],
+                capture_output=True,
             )
 
-            self.logger.info(
-                f"Current branch: {current_branch}, Target branch: {target_branch}"
-            )
+        staged = await self._run_git_command(
+            ["diff", "--cached", "--quiet"], check=False
+        )
+        return staged.returncode != 0
 
-            # 目標ブランチが現在のブランチと異なる場合は切り替え
-            if current_branch != target_branch:
-                # ブランチが存在するかチェック
-                branch_exists = await self._run_git_command(
-                    ["branch", "--list", target_branch],
-                    capture_output=True,
-                    check=False,
-                )
+    async def _push_with_retry(self) -> None:
+        """初回プッシュに対応したプッシュ処理"""
+        try:
+            # 設定されたブランチを強制的に使用（現在のブランチに依存しない）
+            target_branch = self.github_branch  # 常に設定されたブランチ（ main ）を使用
 
-                if branch_exists.stdout.strip():
-                    # ブランチが存在する場合は切り替え
-                    await self._run_git_command(["checkout", target_branch])
-                    self.logger.info(f"Switched to existing branch: {target_branch}")
-                else:
-                    # ブランチが存在しない場合は作成して切り替え
-                    await self._run_git_command(["checkout", "-b", target_branch])
-                    self.logger.info(
-                        f"Created and switched to new branch: {target_branch}"
-                    )
+            if not self._branch_ready:
+                await self._checkout_target_branch(target_branch)
+                self._branch_ready = True
 
             # 最初に通常のプッシュを試行
             push_result = await self._run_git_command(
@@ -392,9 +550,42 @@ Thumbs.db
             )
 
         except Exception as e:
+            self._branch_ready = False
             self.logger.error(f"Push failed: {e}")
             raise
 
+    async def _checkout_target_branch(self, target_branch: str) -> None:
+        """push 先のブランチに切り替える（存在しなければ作成）"""
+        # 現在のブランチを確認（デバッグ用）
+        branch_result = await self._run_git_command(
+            ["branch", "--show-current"], capture_output=True, check=False
+        )
+        current_branch = (
+            branch_result.stdout.strip() if branch_result.returncode == 0 else "none"
+        )
+
+        self.logger.info(
+            f"Current branch: {current_branch}, Target branch: {target_branch}"
+        )
+
+        # 目標ブランチが現在のブランチと異なる場合は切り替え
+        if current_branch != target_branch:
+            # ブランチが存在するかチェック
+            branch_exists = await self._run_git_command(
+                ["branch", "--list", target_branch],
+                capture_output=True,
+                check=False,
+            )
+
+            if branch_exists.stdout.strip():
+                # ブランチが存在する場合は切り替え
+                await self._run_git_command(["checkout", target_branch])
+                self.logger.info(f"Switched to existing branch: {target_branch}")
+            else:
+                # ブランチが存在しない場合は作成して切り替え
+                await self._run_git_command(["checkout", "-b", target_branch])
+                self.logger.info(f"Created and switched to new branch: {target_branch}")
+
     async def sync_from_github(self) -> bool:
         """GitHub から Obsidian vault を同期"""
         if not self.is_configured:
@@ -407,12 +598,30 @@ Thumbs.db
                 # 初回クローン
                 return await self._clone_repository()
 
-            # 既存リポジトリの場合はプル
-            await self._run_git_command(["fetch", "origin"])
-            await self._run_git_command(
-                ["reset", "--hard", f"origin/{self.github_branch}"]
+            # 既存リポジトリの場合は差分だけ取得して早送り
+            started = time.perf_counter()
+            objects_before = await asyncio.to_thread(self._objects_size)
+            initial = await self._fetch_from_remote()
+            await self._apply_sparse_checkout()
+
+            merge_result = await self._run_git_command(
+                ["merge", "--ff-only", f"origin/{self.github_branch}"],
+                capture_output=True,
+                check=False,
             )
+            fast_forward = merge_result.returncode == 0
+            if not fast_forward:
+                # 分岐やローカル変更で早送りできない場合は従来通りリモートに合わせる
+                await self._run_git_command(
+                    ["reset", "--hard", f"origin/{self.github_branch}"]
+                )
 
+            await self._record_fetch(
+                "initial" if initial else "incremental",
+                started,
+                objects_before,
+                fast_forward=fast_forward,
+            )
             self.logger.info("Successfully synced vault from GitHub")
             return True
 
@@ -438,11 +647,16 @@ Thumbs.db
             # 親ディレクトリを作成
             self.vault_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # クローン
+            # クローン（取得方法に応じて履歴・ファイル内容・チェックアウト範囲を絞る）
             repo_url = self._get_authenticated_repo_url()
+            clone_args = ["clone", *self._strategy_args()]
+            if self.sparse_folders:
+                clone_args.append("--sparse")
+            started = time.perf_counter()
+            _count_git_subprocess()
             process = await asyncio.create_subprocess_exec(
                 "git",
-                "clone",
+                *clone_args,
                 repo_url,
                 str(self.vault_path),
                 stdout=asyncio.subprocess.PIPE,
@@ -451,10 +665,16 @@ Thumbs.db
             )
 
             stdout, stderr = await process.communicate()
+            record_external_call(
+                "github", process.returncode == 0, time.perf_counter() - started
+            )
 
             if process.returncode != 0:
                 raise GitHubSyncError(f"Clone failed: {stderr.decode()}")
 
+            if self.sparse_folders:
+                await self._apply_sparse_checkout()
+            await self._record_fetch("clone", started, 0)
             self.logger.info("Repository cloned successfully")
             return True
 
@@ -462,6 +682,86 @@ Thumbs.db
             self.logger.error(f"Failed to clone repository: {e}")
             return False
 
+    def _strategy_args(self) -> list[str]:
+        """clone / 初回 fetch に付ける取得方法のオプション"""
+        if self.clone_strategy == "shallow":
+            return [f"--depth={self.clone_depth}"]
+        if self.clone_strategy == "blobless":
+            return ["--filter=blob:none"]
+        return []
+
+    async def _fetch_from_remote(self) -> bool:
+        """設定ブランチを取得する。初回の取得であれば True を返す。
+
+        --depth / --filter は初回だけ付ける。以降は shallow の境界や
+        partial clone のフィルタ設定を git が引き継ぐため、新しいコミットだけが
+        転送される（--depth を付け直すと既存の履歴と繋がらず早送りできない）。
+        """
+        branch = self.github_branch
+        tracking_ref = f"refs/remotes/origin/{branch}"
+        known = await self._run_git_command(
+            ["rev-parse", "--verify", "--quiet", tracking_ref],
+            capture_output=True,
+            check=False,
+        )
+        initial = known.returncode != 0
+
+        args = ["fetch"]
+        if initial:
+            args += self._strategy_args()
+        args += ["origin", f"+refs/heads/{branch}:{tracking_ref}"]
+        await self._run_git_command(args, capture_output=True)
+        return initial
+
+    async def _apply_sparse_checkout(self) -> None:
+        """設定されたフォルダだけをチェックアウトする（未設定なら全体に戻す）"""
+        if self.sparse_folders:
+            await self._run_git_command(
+                ["sparse-checkout", "set", "--cone", *self.sparse_folders],
+                capture_output=True,
+            )
+            return
+
+        enabled = await self._run_git_command(
+            ["config", "--bool", "core.sparseCheckout"],
+            capture_output=True,
+            check=False,
+        )
+        if enabled.stdout.strip() == "true":
+            await self._run_git_command(
+                ["sparse-checkout", "disable"], capture_output=True
+            )
+
+    def _objects_size(self) -> int:
+        """.git/objects の合計サイズ（取得量の計測用）"""
+        total = 0
+        for root, _dirs, files in os.walk(self.vault_path / ".git" / "objects"):
+            for name in files:
+                try:
+                    total += os.stat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    async def _record_fetch(
+        self,
+        mode: str,
+        started: float,
+        objects_before: int,
+        fast_forward: bool | None = None,
+    ) -> None:
+        """直近の取得結果（方法・転送量・所要時間）を記録"""
+        objects_after = await asyncio.to_thread(self._objects_size)
+        self.last_fetch = {
+            "mode": mode,
+            "strategy": self.clone_strategy,
+            "bytes": max(0, objects_after - objects_before),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "fast_forward": fast_forward,
+            "at": datetime.now().isoformat(),
+        }
+        self.logger.info("Fetched vault from remote", **self.last_fetch)
+
     async def _has_changes(self) -> bool:
         """変更があるかチェック"""
         try:
@@ -495,6 +795,9 @@ Thumbs.db
             env[self.token_env_var] = self.github_token
             env.setdefault("GIT_TERMINAL_PROMPT", "0")
 
+        _count_git_subprocess()
+        started = time.perf_counter()
+        succeeded = False
         try:
             if capture_output:
                 process = await asyncio.create_subprocess_exec(
@@ -534,6 +837,7 @@ Thumbs.db
                     f"Git command failed: {' '.join(cmd[:3])}...\n{safe_stderr}"
                 )
 
+            succeeded = result.returncode == 0
             return result
 
         except Exception as e:
@@ -542,6 +846,10 @@ Thumbs.db
             self.logger.error(f"Git command failed: {' '.join(safe_cmd)}, error: {e}")
             raise
 
+        finally:
+            if args and args[0] in _REMOTE_GIT_COMMANDS:
+                record_external_call("github", succeeded, time.perf_counter() - started)
+
     async def get_sync_status(self) -> dict[str, Any]:
         """同期ステータスを取得"""
         if not self.is_configured:
@@ -569,6 +877,13 @@ Thumbs.db
                 "last_commit_date": commit_info[2],
                 "repository_url": self.github_repo_url,
                 "branch": self.github_branch,
+                "clone_strategy": self.clone_strategy,
+                "clone_depth": (
+                    self.clone_depth if self.clone_strategy == "shallow" else None
+                ),
+                "sparse_folders": self.sparse_folders,
+                "shallow": (self.vault_path / ".git" / "shallow").exists(),
+                "last_fetch": self.last_fetch,
             }
 
         except Exception as e:
@@ -4,10 +4,12 @@
 """
 
 import asyncio
+import hashlib
 import json
 import os
 import shutil
 import tarfile
+import threading
 import zipfile
 from datetime import datetime
 from pathlib import Path
@@ -15,9 +17,30 @@ from typing import Any
 
 import aiofiles
 
+from src.obsidian.backup import (
+    BackupCancelledError,
+    get_content_store,
+    run_backup_task,
+    run_in_backup_executor,
+)
+from src.obsidian.backup.backup_executor import ProgressCallback, ProgressReporter
+from src.obsidian.change_feed import get_change_feed
+from src.obsidian.delta_sync import DeltaSyncEngine, SyncReport
 from src.obsidian.models import LocalDataIndex
 from src.utils.mixins import LoggerMixin
 
+# スナップショットの manifest の種類と、スナップショットから除外するパス
+SNAPSHOT_KIND = "snapshots"
+SNAPSHOT_EXCLUDES = (
+    "backups/",
+    ".local_data/",
+    "__pycache__/",
+    ".git/",
+    ".DS_Store",
+    "Thumbs.db",
+    ".tmp",
+)
+
 
 class LocalDataManager(LoggerMixin):
     """ローカルデータ管理システム"""
@@ -38,10 +61,15 @@ class LocalDataManager(LoggerMixin):
         self.local_data_dir = vault_path / ".local_data"
         self.snapshots_dir = self.local_data_dir / "snapshots"
         self.exports_dir = self.local_data_dir / "exports"
+        # スナップショットは重複を除いて保存するコンテンツストアの manifest
+        self.store = get_content_store(self.local_data_dir / "store")
 
         # 設定ファイル
         self.config_file = self.local_data_dir / "config.json"
         self.sync_log_file = self.local_data_dir / "sync_log.json"
+        # リモートごとの差分同期の manifest
+        self.sync_dir = self.local_data_dir / "sync"
+        self.last_sync_report: SyncReport | None = None
 
         self._ensure_directories()
 
@@ -119,49 +147,12 @@ class LocalDataManager(LoggerMixin):
             for md_file in self.vault_path.rglob("*.md"):
                 # システムファイルとテンプレートを除外
                 relative_path = md_file.relative_to(self.vault_path)
-                if any(part.startswith(".") for part in relative_path.parts):
-                    continue
-                if "templates" in str(relative_path).lower():
+                if not self._is_indexed(relative_path):
                     continue
 
                 # ノートを読み込み、インデックスに追加
                 try:
-                    # 簡易的なノート情報を抽出
-                    stat = md_file.stat()
-                    async with aiofiles.open(md_file, encoding="utf-8") as f:
-                        content = await f.read()
-
-                    # フロントマターとコンテンツを分離
-                    frontmatter, main_content = self._parse_frontmatter(content)
-
-                    # インデックスに追加
-                    file_key = str(relative_path)
-                    self.data_index.notes_index[file_key] = {
-                        "title": frontmatter.get("title", md_file.stem),
-                        "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        "modified_at": datetime.fromtimestamp(
-                            stat.st_mtime
-                        ).isoformat(),
-                        "status": frontmatter.get("status", "active"),
-                        "category": frontmatter.get("ai_category"),
-                        "file_size": len(content.encode()),
-                        "word_count": len(main_content.split()),
-                        "ai_processed": frontmatter.get("ai_processed", False),
-                        "ai_summary": frontmatter.get("ai_summary"),
-                    }
-
-                    # タグインデックス
-                    tags = frontmatter.get("ai_tags", []) + frontmatter.get("tags", [])
-                    for tag in tags:
-                        clean_tag = tag.lstrip("#")
-                        if clean_tag not in self.data_index.tags_index:
-                            self.data_index.tags_index[clean_tag] = set()
-                        self.data_index.tags_index[clean_tag].add(file_key)
-
-                    # コンテンツインデックス
-                    words = main_content.lower().split()
-                    self.data_index.content_index[file_key] = list(set(words))
-
+                    await self._index_file(md_file, relative_path)
                     processed_count += 1
 
                 except Exception as e:
@@ -190,6 +181,70 @@ class LocalDataManager(LoggerMixin):
             )
             return False
 
+    def _is_indexed(self, relative_path: Path) -> bool:
+        """インデックスの対象か（システムファイルとテンプレートを除く）"""
+        if any(part.startswith(".") for part in relative_path.parts):
+            return False
+        return "templates" not in str(relative_path).lower()
+
+    async def _index_file(self, md_file: Path, relative_path: Path) -> None:
+        """1 ノートをインデックスに追加"""
+        # 簡易的なノート情報を抽出
+        stat = md_file.stat()
+        async with aiofiles.open(md_file, encoding="utf-8") as f:
+            content = await f.read()
+
+        # フロントマターとコンテンツを分離
+        frontmatter, main_content = self._parse_frontmatter(content)
+
+        # インデックスに追加
+        file_key = str(relative_path)
+        self.data_index.notes_index[file_key] = {
+            "title": frontmatter.get("title", md_file.stem),
+            "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "status": frontmatter.get("status", "active"),
+            "category": frontmatter.get("ai_category"),
+            "file_size": len(content.encode()),
+            "word_count": len(main_content.split()),
+            "ai_processed": frontmatter.get("ai_processed", False),
+            "ai_summary": frontmatter.get("ai_summary"),
+        }
+
+        # タグインデックス
+        tags = frontmatter.get("ai_tags", []) + frontmatter.get("tags", [])
+        for tag in tags:
+            clean_tag = tag.lstrip("#")
+            if clean_tag not in self.data_index.tags_index:
+                self.data_index.tags_index[clean_tag] = set()
+            self.data_index.tags_index[clean_tag].add(file_key)
+
+        # コンテンツインデックス
+        words = main_content.lower().split()
+        self.data_index.content_index[file_key] = list(set(words))
+
+    async def _update_index(self, updated: list[str], removed: list[str]) -> bool:
+        """同期で変わったノートのみインデックスを更新"""
+        for relative in [*removed, *updated]:
+            self.data_index.remove_note(self.vault_path / relative)
+
+        for relative in updated:
+            relative_path = Path(relative)
+            if relative_path.suffix != ".md" or not self._is_indexed(relative_path):
+                continue
+            try:
+                await self._index_file(self.vault_path / relative_path, relative_path)
+            except Exception as e:
+                self.logger.warning(
+                    "Failed to process file for indexing",
+                    file_path=relative,
+                    error=str(e),
+                )
+
+        if not updated and not removed:
+            return True
+        return self.data_index.save_indexes()
+
     def _parse_frontmatter(self, content: str) -> tuple[dict, str]:
         """フロントマターとコンテンツを分離"""
         import yaml
@@ -209,55 +264,52 @@ class LocalDataManager(LoggerMixin):
 
         return {}, content
 
-    async def create_snapshot(self, name: str | None = None) -> Path | None:
+    async def create_snapshot(
+        self,
+        name: str | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Path | None:
         """
         Vault の現在の状態のスナップショットを作成
 
         Args:
             name: スナップショット名（省略時は自動生成）
+            progress: 進捗イベントの受け取り先（イベントループ上で呼ばれる）
+            cancel: セットすると作成を中断（ manifest は作成されない）
 
         Returns:
-            作成されたスナップショットファイルのパス
+            作成されたスナップショット（ manifest ）のパス
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             snapshot_name = name or f"snapshot_{timestamp}"
-            snapshot_file = self.snapshots_dir / f"{snapshot_name}.tar.gz"
-
-            # スナップショット作成
-            with tarfile.open(snapshot_file, "w:gz") as tar:
-                # Vault ディレクトリを追加（隠しファイルも含む）
-                tar.add(
-                    self.vault_path,
-                    arcname="vault",
-                    filter=self._tar_filter,
-                )
 
-                # インデックスファイルも追加
-                if self.data_index.index_file.exists():
-                    tar.add(
-                        self.data_index.index_file,
-                        arcname="vault/.obsidian_local_index.json",
-                    )
-
-            # メタデータを記録
-            metadata = {
-                "name": snapshot_name,
-                "created_at": datetime.now().isoformat(),
-                "vault_path": str(self.vault_path),
-                "file_size": snapshot_file.stat().st_size,
-                "notes_count": len(self.data_index.notes_index),
-            }
-
-            metadata_file = self.snapshots_dir / f"{snapshot_name}.meta.json"
-            async with aiofiles.open(metadata_file, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(metadata, ensure_ascii=False, indent=2))
+            # 変更のないファイルは前回の内容を参照し、新しい内容だけを圧縮して保存
+            # （インデックスファイルも Vault 内にあるため含まれる）
+            _manifest, stats = await run_backup_task(
+                self.store.snapshot,
+                snapshot_name,
+                SNAPSHOT_KIND,
+                [("vault", self.vault_path)],
+                exclude=self._is_snapshot_excluded,
+                metadata={
+                    "vault_path": str(self.vault_path),
+                    "notes_count": len(self.data_index.notes_index),
+                },
+                progress=progress,
+                cancel=cancel,
+            )
+            snapshot_file = self.store.manifest_path(snapshot_name, SNAPSHOT_KIND)
 
             self.logger.info(
                 "Snapshot created",
                 snapshot_name=snapshot_name,
-                file_size_mb=snapshot_file.stat().st_size / (1024 * 1024),
-                notes_count=metadata["notes_count"],
+                files=stats.files,
+                stored_size_mb=stats.stored_bytes / (1024 * 1024),
+                dedup_ratio=round(stats.dedup_ratio, 3),
+                duration=round(stats.duration, 2),
+                notes_count=len(self.data_index.notes_index),
             )
 
             # 古いスナップショットの削除
@@ -265,6 +317,10 @@ class LocalDataManager(LoggerMixin):
 
             return snapshot_file
 
+        except BackupCancelledError:
+            self.logger.info("Snapshot cancelled", name=name)
+            return None
+
         except Exception as e:
             self.logger.error(
                 "Failed to create snapshot",
@@ -274,26 +330,66 @@ class LocalDataManager(LoggerMixin):
             )
             return None
 
-    def _tar_filter(self, tarinfo):
-        """tar ファイル作成時のフィルター"""
-        # バックアップディレクトリと一時ファイルを除外
-        if any(
-            exclude in tarinfo.name
-            for exclude in [
-                "backups/",
-                ".local_data/",
-                "__pycache__/",
-                ".git/",
-                ".DS_Store",
-                "Thumbs.db",
-                ".tmp",
-            ]
-        ):
-            return None
-        return tarinfo
+    def _is_snapshot_excluded(self, relative_path: str) -> bool:
+        """スナップショットから除外するファイル（バックアップと一時ファイル）"""
+        name = f"vault/{relative_path}"
+        return any(exclude in name for exclude in SNAPSHOT_EXCLUDES)
+
+    def _extract_tar_snapshot(
+        self,
+        snapshot_file: Path,
+        target_dir: Path,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """旧形式（ tar.gz ）のスナップショットを安全に展開（メンバーごとに進捗を通知）"""
+        with tarfile.open(snapshot_file, "r:gz") as tar:
+            # セキュリティ: 安全なメンバーのみ展開
+            def safe_extract(tarinfo):
+                """Safe extraction that prevents path traversal attacks"""
+                if tarinfo.isfile() or tarinfo.isdir():
+                    # パス検証: 相対パスまたは '..' が含まれる場合は拒否
+                    if os.path.isabs(tarinfo.name) or ".." in tarinfo.name:
+                        return None
+                    return tarinfo
+                return None
+
+            safe_members = [safe_extract(member) for member in tar.getmembers()]
+            safe_members = [m for m in safe_members if m is not None]
+
+            reporter = ProgressReporter("extract", snapshot_file.name, progress, cancel)
+            reporter.start(len(safe_members), sum(m.size for m in safe_members))
+            for member in safe_members:
+                tar.extract(member, target_dir)  # nosec: B202
+                reporter.advance(1, member.size)
+            reporter.finish()
+
+    def _swap_in_snapshot(
+        self, target_path: Path, extracted_vault: Path, timestamp: str
+    ) -> None:
+        """展開した Vault を復元先に移動（既存の Vault は退避）"""
+        # 既存の Vault をバックアップ
+        temp_backup = None
+        if target_path.exists():
+            temp_backup = target_path.parent / f"{target_path.name}_backup_{timestamp}"
+            shutil.move(str(target_path), str(temp_backup))
+
+        # vault ディレクトリをリネーム
+        shutil.move(str(extracted_vault), str(target_path))
+
+        # スナップショットの管理データは復元後の Vault に引き継ぐ
+        if temp_backup is not None:
+            previous_local_data = temp_backup / self.local_data_dir.name
+            restored_local_data = target_path / self.local_data_dir.name
+            if previous_local_data.exists() and not restored_local_data.exists():
+                shutil.move(str(previous_local_data), str(restored_local_data))
 
     async def restore_snapshot(
-        self, snapshot_file: Path, restore_path: Path | None = None
+        self,
+        snapshot_file: Path,
+        restore_path: Path | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
     ) -> bool:
         """
         スナップショットから Vault を復元
@@ -301,48 +397,52 @@ class LocalDataManager(LoggerMixin):
         Args:
             snapshot_file: 復元するスナップショットファイル
             restore_path: 復元先パス（省略時は元の vault_path ）
+            progress: 進捗イベントの受け取り先（イベントループ上で呼ばれる）
+            cancel: セットすると展開を中断（既存の Vault はそのまま）
 
         Returns:
             復元の成功可否
         """
         try:
             target_path = restore_path or self.vault_path
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
             # バックアップを作成
-            backup_name = f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            backup_name = f"pre_restore_{timestamp}"
             backup_snapshot = await self.create_snapshot(backup_name)
 
-            # 既存の Vault をバックアップ
-            if target_path.exists():
-                temp_backup = (
-                    target_path.parent
-                    / f"{target_path.name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # 既存の Vault を移動する前に、一時ディレクトリへ展開する
+            # （スナップショットのデータは Vault 内の .local_data にあるため）
+            staging_dir = (
+                target_path.parent / f".{target_path.name}_restore_{timestamp}"
+            )
+            extracted_vault = staging_dir / "vault"
+            extracted_vault.mkdir(parents=True, exist_ok=True)
+            try:
+                if snapshot_file.suffix == ".json":
+                    await run_backup_task(
+                        self.store.restore,
+                        snapshot_file.stem,
+                        SNAPSHOT_KIND,
+                        extracted_vault,
+                        "vault",
+                        progress=progress,
+                        cancel=cancel,
+                    )
+                else:
+                    await run_backup_task(
+                        self._extract_tar_snapshot,
+                        snapshot_file,
+                        staging_dir,
+                        progress=progress,
+                        cancel=cancel,
+                    )
+
+                await run_in_backup_executor(
+                    self._swap_in_snapshot, target_path, extracted_vault, timestamp
                 )
-                shutil.move(str(target_path), str(temp_backup))
-
-            # スナップショットを安全に展開
-            with tarfile.open(snapshot_file, "r:gz") as tar:
-                # セキュリティ: 安全なメンバーのみ展開
-                def safe_extract(tarinfo, path):
-                    """Safe extraction that prevents path traversal attacks"""
-                    if tarinfo.isfile() or tarinfo.isdir():
-                        # パス検証: 相対パスまたは '..' が含まれる場合は拒否
-                        if os.path.isabs(tarinfo.name) or ".." in tarinfo.name:
-                            return None
-                        return tarinfo
-                    return None
-
-                safe_members = [
-                    safe_extract(member, target_path.parent)
-                    for member in tar.getmembers()
-                ]
-                safe_members = [m for m in safe_members if m is not None]
-                tar.extractall(target_path.parent, members=safe_members)  # nosec: B202
-
-                # vault ディレクトリをリネーム
-                extracted_vault = target_path.parent / "vault"
-                if extracted_vault.exists():
-                    shutil.move(str(extracted_vault), str(target_path))
+            finally:
+                await run_in_backup_executor(shutil.rmtree, staging_dir, True)
 
             # インデックスを再構築
             await self.rebuild_index()
@@ -356,6 +456,12 @@ class LocalDataManager(LoggerMixin):
 
             return True
 
+        except BackupCancelledError:
+            self.logger.info(
+                "Snapshot restore cancelled", snapshot_file=str(snapshot_file)
+            )
+            return False
+
         except Exception as e:
             self.logger.error(
                 "Failed to restore snapshot",
@@ -438,7 +544,10 @@ class LocalDataManager(LoggerMixin):
         self, remote_path: Path, direction: str = "both"
     ) -> bool:
         """
-        リモートロケーションとの同期
+        リモートロケーションとの差分同期
+
+        前回の同期から変わったファイルのみを転送し、削除と名前の変更も反映する。
+        両側で変更されたファイルは上書きせず競合として記録する。
 
         Args:
             remote_path: リモート同期先
@@ -452,36 +561,51 @@ class LocalDataManager(LoggerMixin):
                 "started_at": datetime.now().isoformat(),
                 "direction": direction,
                 "remote_path": str(remote_path),
-                "files_synced": 0,
-                "errors": [],
             }
 
-            if direction in ["upload", "both"]:
-                # アップロード: ローカル → リモート
-                await self._sync_to_remote(remote_path, sync_log)
+            remote_key = hashlib.sha256(
+                str(Path(remote_path).resolve()).encode()
+            ).hexdigest()[:16]
+            engine = DeltaSyncEngine(
+                self.vault_path,
+                Path(remote_path),
+                self.sync_dir / f"{remote_key}.json",
+                self._is_synced,
+            )
+            report = await asyncio.to_thread(engine.sync, direction)
+            self.last_sync_report = report
 
-            if direction in ["download", "both"]:
-                # ダウンロード: リモート → ローカル
-                await self._sync_from_remote(remote_path, sync_log)
+            # ダウンロード・削除したファイルを Git 同期の対象に
+            get_change_feed(self.vault_path).record(
+                *report.local_updated, *report.local_removed
+            )
 
-            # 同期後にインデックスを再構築
-            await self.rebuild_index()
+            # 同期で変わったノートのみインデックスに反映
+            await self._update_index(report.local_updated, report.local_removed)
 
             # 同期ログを保存
+            sync_log.update(report.to_dict())
             sync_log["completed_at"] = datetime.now().isoformat()
-            sync_log["success"] = len(sync_log.get("errors", [])) == 0
+            sync_log["success"] = not report.errors
 
             async with aiofiles.open(self.sync_log_file, "a", encoding="utf-8") as f:
                 await f.write(json.dumps(sync_log, ensure_ascii=False) + "\n")
 
+            if report.conflicts:
+                self.logger.warning(
+                    "Sync conflicts detected",
+                    conflicts=[conflict["path"] for conflict in report.conflicts],
+                )
             self.logger.info(
                 "Sync completed",
                 direction=direction,
-                files_synced=sync_log.get("files_synced", 0),
-                errors_count=len(sync_log.get("errors", [])),
+                files_synced=report.files_transferred,
+                bytes_synced=report.bytes_transferred,
+                conflicts_count=len(report.conflicts),
+                errors_count=len(report.errors),
             )
 
-            return bool(sync_log.get("success", False))
+            return bool(sync_log["success"])
 
         except Exception as e:
             self.logger.error(
@@ -493,52 +617,11 @@ class LocalDataManager(LoggerMixin):
             )
             return False
 
-    async def _sync_to_remote(self, remote_path: Path, sync_log: dict) -> None:
-        """ローカルからリモートへの同期"""
-        remote_path.mkdir(parents=True, exist_ok=True)
-
-        for md_file in self.vault_path.rglob("*.md"):
-            try:
-                relative_path = md_file.relative_to(self.vault_path)
-                remote_file = remote_path / relative_path
-
-                # ディレクトリを作成
-                remote_file.parent.mkdir(parents=True, exist_ok=True)
-
-                # ファイルをコピー
-                await asyncio.to_thread(shutil.copy2, md_file, remote_file)
-                sync_log["files_synced"] += 1
-
-            except Exception as e:
-                error_msg = f"Failed to sync {md_file}: {str(e)}"
-                sync_log["errors"].append(error_msg)
-                self.logger.warning(error_msg)
-
-    async def _sync_from_remote(self, remote_path: Path, sync_log: dict) -> None:
-        """リモートからローカルへの同期"""
-        if not remote_path.exists():
-            return
-
-        for remote_file in remote_path.rglob("*.md"):
-            try:
-                relative_path = remote_file.relative_to(remote_path)
-                local_file = self.vault_path / relative_path
-
-                # ディレクトリを作成
-                local_file.parent.mkdir(parents=True, exist_ok=True)
-
-                # ファイルをコピー（新しいもののみ）
-                if (
-                    not local_file.exists()
-                    or remote_file.stat().st_mtime > local_file.stat().st_mtime
-                ):
-                    await asyncio.to_thread(shutil.copy2, remote_file, local_file)
-                    sync_log["files_synced"] += 1
-
-            except Exception as e:
-                error_msg = f"Failed to sync {remote_file}: {str(e)}"
-                sync_log["errors"].append(error_msg)
-                self.logger.warning(error_msg)
+    def _is_synced(self, relative_path: str) -> bool:
+        """リモートと同期するファイル（ Markdown ノートのみ、バックアップを除く）"""
+        return relative_path.endswith(".md") and not self._is_snapshot_excluded(
+            relative_path
+        )
 
     async def _cleanup_old_snapshots(self) -> None:
         """古いスナップショットを削除"""
@@ -566,6 +649,11 @@ class LocalDataManager(LoggerMixin):
 
                 self.logger.debug("Old snapshot deleted", file=str(file))
 
+            # manifest の削除と、参照されなくなったデータの回収
+            await run_in_backup_executor(
+                self.store.apply_retention, {SNAPSHOT_KIND: retention_count}
+            )
+
         except Exception as e:
             self.logger.warning("Failed to cleanup old snapshots", error=str(e))
 
@@ -585,9 +673,13 @@ class LocalDataManager(LoggerMixin):
     async def get_local_stats(self) -> dict:
         """ローカルデータ管理の統計情報を取得"""
         try:
-            # スナップショット情報
+            # スナップショット情報（旧形式の tar.gz と manifest ）
             snapshots = list(self.snapshots_dir.glob("*.tar.gz"))
-            total_snapshot_size = sum(f.stat().st_size for f in snapshots)
+            manifests = list((self.store.manifests_dir / SNAPSHOT_KIND).glob("*.json"))
+            store_usage = await run_in_backup_executor(self.store.usage)
+            total_snapshot_size = (
+                sum(f.stat().st_size for f in snapshots) + store_usage["stored_bytes"]
+            )
 
             # エクスポート情報
             exports = list(self.exports_dir.glob("*"))
@@ -599,9 +691,13 @@ class LocalDataManager(LoggerMixin):
             return {
                 "local_data_directory": str(self.local_data_dir),
                 "snapshots": {
-                    "count": len(snapshots),
+                    "count": len(snapshots) + len(manifests),
                     "total_size_mb": total_snapshot_size / (1024 * 1024),
-                    "latest": max((f.stat().st_mtime for f in snapshots), default=0),
+                    "stored_objects": store_usage["objects"],
+                    "latest": max(
+                        (f.stat().st_mtime for f in [*snapshots, *manifests]),
+                        default=0,
+                    ),
                 },
                 "exports": {
                     "count": len(exports),
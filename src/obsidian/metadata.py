@@ -2,10 +2,11 @@
 Obsidian metadata management
 """
 
+import asyncio
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
+from src.obsidian.bulk_metadata import BulkMetadataEngine, NoteHeader
 from src.obsidian.file_manager import ObsidianFileManager
 from src.obsidian.models import ObsidianNote
 from src.utils.mixins import LoggerMixin
@@ -22,6 +23,7 @@ class MetadataManager(LoggerMixin):
             file_manager: File manager instance
         """
         self.file_manager = file_manager
+        self.bulk_engine = BulkMetadataEngine(file_manager)
         self.logger.info("Metadata manager initialized")
 
     async def update_note_metadata(
@@ -75,15 +77,22 @@ class MetadataManager(LoggerMixin):
             return False
 
     async def bulk_update_metadata(
-        self, filters: dict[str, Any], updates: dict[str, Any], limit: int = 100
+        self,
+        filters: dict[str, Any],
+        updates: dict[str, Any],
+        limit: int = 100,
+        dry_run: bool = False,
     ) -> dict[str, Any]:
         """
         条件に合致するノートのメタデータを一括更新
 
+        フロントマターの行のみを書き換え、本文はバイト単位でそのまま残す。
+
         Args:
             filters: 対象ノートの条件
             updates: 更新内容
             limit: 処理上限数
+            dry_run: True の場合は書き込まずに差分のみ返す
 
         Returns:
             更新結果
@@ -94,70 +103,13 @@ class MetadataManager(LoggerMixin):
                 filters=filters,
                 updates=list(updates.keys()),
                 limit=limit,
+                dry_run=dry_run,
             )
 
-            results: dict[str, Any] = {
-                "processed": 0,
-                "updated": 0,
-                "errors": 0,
-                "updated_notes": [],
-            }
-
-            # 条件に合致するノートを検索
-            notes = await self.file_manager.search_notes(
-                query=filters.get("query"),
-                folder=filters.get("folder"),
-                status=filters.get("status"),
-                tags=filters.get("tags"),
-                date_from=filters.get("date_from"),
-                date_to=filters.get("date_to"),
-                limit=limit,
-            )
-
-            for note_dict in notes:
-                results["processed"] += 1
-
-                try:
-                    # Load the actual note object for metadata update
-                    from pathlib import Path
-
-                    note_path = Path(note_dict["file_path"])
-                    note = await self.file_manager.load_note(note_path)
-
-                    if note is None:
-                        results["errors"] += 1
-                        continue
-
-                    success = await self.update_note_metadata(note, updates)
-
-                    if success:
-                        results["updated"] += 1
-                        results["updated_notes"].append(
-                            {
-                                "title": note_dict["title"],
-                                "path": str(note_path),
-                            }
-                        )
-                    else:
-                        results["errors"] += 1
-
-                except Exception as e:
-                    results["errors"] += 1
-                    self.logger.error(
-                        "Error in bulk update",
-                        note_path=note_dict.get("file_path", "unknown"),
-                        error=str(e),
-                        exc_info=True,
-                    )
-
-            self.logger.info(
-                "Bulk metadata update completed",
-                processed=results["processed"],
-                updated=results["updated"],
-                errors=results["errors"],
+            result = await self.bulk_engine.update(
+                filters, updates, limit=limit, dry_run=dry_run
             )
-
-            return results
+            return result.to_dict()
 
         except Exception as e:
             self.logger.error(
@@ -169,6 +121,9 @@ class MetadataManager(LoggerMixin):
         """
         タグ使用状況を分析
 
+        日次集計インデックスがある場合はそこからタグを取得し、ない場合は
+        各ノートのフロントマターのみを読み込む。
+
         Args:
             limit: 分析対象ノート数
 
@@ -178,105 +133,30 @@ class MetadataManager(LoggerMixin):
         try:
             self.logger.info("Starting tag usage analysis", limit=limit)
 
-            # ノートを取得
-            notes = await self.file_manager.search_notes(limit=limit)
-
-            analysis: dict[str, Any] = {
-                "total_notes": len(notes),
-                "notes_with_tags": 0,
-                "total_tags": 0,
-                "unique_tags": set(),
-                "tag_frequency": {},
-                "ai_tags_frequency": {},
-                "manual_tags_frequency": {},
-                "co_occurrence": {},
-                "orphaned_tags": set(),
-                "most_popular_tags": [],
-                "tag_trends": {},
-            }
-
-            for note_dict in notes:
-                # タグを持つノートの数
-                ai_tags = note_dict.get("tags", []) if "tags" in note_dict else []
-                manual_tags = (
-                    note_dict.get("tags", [])
-                    if isinstance(note_dict.get("tags"), list)
-                    else []
-                )
-                all_tags = ai_tags + manual_tags
-                if all_tags:
-                    analysis["notes_with_tags"] += 1
-
-                # AI タグの分析
-                for tag in ai_tags:
-                    clean_tag = tag.lstrip("#")
-                    analysis["unique_tags"].add(clean_tag)
-                    analysis["tag_frequency"][clean_tag] = (
-                        analysis["tag_frequency"].get(clean_tag, 0) + 1
-                    )
-                    analysis["ai_tags_frequency"][clean_tag] = (
-                        analysis["ai_tags_frequency"].get(clean_tag, 0) + 1
-                    )
-                    analysis["total_tags"] += 1
-
-                # 手動タグの分析
-                for tag in manual_tags:
-                    clean_tag = tag.lstrip("#")
-                    analysis["unique_tags"].add(clean_tag)
-                    analysis["tag_frequency"][clean_tag] = (
-                        analysis["tag_frequency"].get(clean_tag, 0) + 1
-                    )
-                    analysis["manual_tags_frequency"][clean_tag] = (
-                        analysis["manual_tags_frequency"].get(clean_tag, 0) + 1
-                    )
-                    analysis["total_tags"] += 1
-
-                # タグ共起分析
-                if len(all_tags) > 1:
-                    clean_tags = [tag.lstrip("#") for tag in all_tags]
-                    for i, tag1 in enumerate(clean_tags):
-                        for tag2 in clean_tags[i + 1 :]:
-                            pair = tuple(sorted([tag1, tag2]))
-                            analysis["co_occurrence"][pair] = (
-                                analysis["co_occurrence"].get(pair, 0) + 1
-                            )
-
-            # 人気タグの抽出（上位 20 個）
-            sorted_tags = sorted(
-                analysis["tag_frequency"].items(), key=lambda x: x[1], reverse=True
-            )[:20]
-            analysis["most_popular_tags"] = [
-                {
-                    "tag": tag,
-                    "count": count,
-                    "percentage": (count / analysis["total_tags"]) * 100,
-                }
-                for tag, count in sorted_tags
-            ]
-
-            # 孤立タグの特定（使用回数が 1 回のみ）
-            analysis["orphaned_tags"] = {
-                tag for tag, count in analysis["tag_frequency"].items() if count == 1
-            }
-
-            # 統計の計算
-            analysis["unique_tag_count"] = len(analysis["unique_tags"])
-            analysis["average_tags_per_note"] = analysis["total_tags"] / max(
-                analysis["total_notes"], 1
-            )
-            analysis["tag_coverage"] = (
-                analysis["notes_with_tags"] / max(analysis["total_notes"], 1)
-            ) * 100
+            rollup = self.file_manager.activity_rollup
+            if rollup.is_available:
+                source = "index"
+                note_tags = [
+                    (activity.ai_tags, activity.manual_tags)
+                    for activity in await rollup.note_activities()
+                ]
+            else:
+                source = "frontmatter"
+                paths = await asyncio.to_thread(self.bulk_engine.list_notes)
+                note_tags = [
+                    (header.fields.get("ai_tags", []), header.fields.get("tags", []))
+                    for header in await self.bulk_engine.read_headers(paths[:limit])
+                ]
 
-            # セットをリストに変換（ JSON 化のため）
-            analysis["unique_tags"] = list(analysis["unique_tags"])
-            analysis["orphaned_tags"] = list(analysis["orphaned_tags"])
+            analysis = self._aggregate_tags(note_tags[:limit])
+            analysis["source"] = source
 
             self.logger.info(
                 "Tag usage analysis completed",
                 total_notes=analysis["total_notes"],
                 unique_tags=analysis["unique_tag_count"],
                 tag_coverage=f"{analysis['tag_coverage']:.1f}%",
+                source=source,
             )
 
             return analysis
@@ -292,6 +172,87 @@ class MetadataManager(LoggerMixin):
                 "error": str(e),
             }
 
+    def _aggregate_tags(
+        self, note_tags: list[tuple[list[str], list[str]]]
+    ) -> dict[str, Any]:
+        """ノートごとの（ AI タグ, 手動タグ）からタグ分析結果を集計"""
+        analysis: dict[str, Any] = {
+            "total_notes": len(note_tags),
+            "notes_with_tags": 0,
+            "total_tags": 0,
+            "unique_tags": set(),
+            "tag_frequency": {},
+            "ai_tags_frequency": {},
+            "manual_tags_frequency": {},
+            "co_occurrence": {},
+            "orphaned_tags": set(),
+            "most_popular_tags": [],
+            "tag_trends": {},
+        }
+
+        for ai_tags, manual_tags in note_tags:
+            # タグを持つノートの数
+            all_tags = ai_tags + manual_tags
+            if all_tags:
+                analysis["notes_with_tags"] += 1
+
+            for tags, frequency_key in (
+                (ai_tags, "ai_tags_frequency"),
+                (manual_tags, "manual_tags_frequency"),
+            ):
+                for tag in tags:
+                    clean_tag = tag.lstrip("#")
+                    analysis["unique_tags"].add(clean_tag)
+                    analysis["tag_frequency"][clean_tag] = (
+                        analysis["tag_frequency"].get(clean_tag, 0) + 1
+                    )
+                    analysis[frequency_key][clean_tag] = (
+                        analysis[frequency_key].get(clean_tag, 0) + 1
+                    )
+                    analysis["total_tags"] += 1
+
+            # タグ共起分析
+            if len(all_tags) > 1:
+                clean_tags = [tag.lstrip("#") for tag in all_tags]
+                for i, tag1 in enumerate(clean_tags):
+                    for tag2 in clean_tags[i + 1 :]:
+                        pair = tuple(sorted([tag1, tag2]))
+                        analysis["co_occurrence"][pair] = (
+                            analysis["co_occurrence"].get(pair, 0) + 1
+                        )
+
+        # 人気タグの抽出（上位 20 個）
+        sorted_tags = sorted(
+            analysis["tag_frequency"].items(), key=lambda x: x[1], reverse=True
+        )[:20]
+        analysis["most_popular_tags"] = [
+            {
+                "tag": tag,
+                "count": count,
+                "percentage": (count / analysis["total_tags"]) * 100,
+            }
+            for tag, count in sorted_tags
+        ]
+
+        # 孤立タグの特定（使用回数が 1 回のみ）
+        analysis["orphaned_tags"] = {
+            tag for tag, count in analysis["tag_frequency"].items() if count == 1
+        }
+
+        # 統計の計算
+        analysis["unique_tag_count"] = len(analysis["unique_tags"])
+        analysis["average_tags_per_note"] = analysis["total_tags"] / max(
+            analysis["total_notes"], 1
+        )
+        analysis["tag_coverage"] = (
+            analysis["notes_with_tags"] / max(analysis["total_notes"], 1)
+        ) * 100
+
+        # セットをリストに変換（ JSON 化のため）
+        analysis["unique_tags"] = list(analysis["unique_tags"])
+        analysis["orphaned_tags"] = list(analysis["orphaned_tags"])
+        return analysis
+
     async def analyze_content_patterns(self, limit: int = 500) -> dict[str, Any]:
         """
         コンテンツパターンを分析
@@ -305,10 +266,11 @@ class MetadataManager(LoggerMixin):
         try:
             self.logger.info("Starting content pattern analysis", limit=limit)
 
-            search_results = await self.file_manager.search_notes(limit=limit)
+            paths = await asyncio.to_thread(self.bulk_engine.list_notes)
+            notes = await self.bulk_engine.read_notes(paths[:limit])
 
             analysis: dict[str, Any] = {
-                "total_notes": len(search_results),
+                "total_notes": len(notes),
                 "content_length_stats": {
                     "min": float("inf"),
                     "max": 0,
@@ -331,13 +293,10 @@ class MetadataManager(LoggerMixin):
             content_lengths = []
             processing_times = []
 
-            for result in search_results:
-                # Load the actual note object
-                note = await self.file_manager.load_note(Path(result["file_path"]))
-                if not note:
-                    continue
+            for header, content in notes:
+                fields = header.fields
                 # コンテンツ長統計
-                content_length = len(note.content)
+                content_length = len(content)
                 content_lengths.append(content_length)
 
                 analysis["content_length_stats"]["min"] = min(
@@ -348,35 +307,36 @@ class MetadataManager(LoggerMixin):
                 )
 
                 # AI 処理統計
-                if note.frontmatter.ai_processed:
+                if fields.get("ai_processed"):
                     analysis["ai_processing_stats"]["processed_notes"] += 1
 
-                    if note.frontmatter.ai_processing_time:
-                        processing_times.append(note.frontmatter.ai_processing_time)
+                    processing_time = fields.get("ai_processing_time")
+                    if processing_time:
+                        processing_times.append(processing_time)
                         analysis["ai_processing_stats"]["total_processing_time"] += (
-                            note.frontmatter.ai_processing_time
+                            processing_time
                         )
 
                 # カテゴリ分布
-                category = note.frontmatter.ai_category or "未分類"
+                category = fields.get("ai_category") or "未分類"
                 analysis["category_distribution"][category] = (
                     analysis["category_distribution"].get(category, 0) + 1
                 )
 
                 # ソースタイプ分布
-                source_type = note.frontmatter.source_type
+                source_type = fields.get("source_type", "discord_message")
                 analysis["source_type_distribution"][source_type] = (
                     analysis["source_type_distribution"].get(source_type, 0) + 1
                 )
 
                 # ステータス分布
-                status = note.frontmatter.status.value
+                status = fields.get("status", "active")
                 analysis["status_distribution"][status] = (
                     analysis["status_distribution"].get(status, 0) + 1
                 )
 
-                # 作成時間パターン
-                created_at = note.created_at
+                # 作成時間パターン（フロントマターの作成日時、なければ更新日時）
+                created_at = self._created_at(header)
                 hour = created_at.hour
                 day = created_at.strftime("%A")
                 month = created_at.strftime("%B")
@@ -392,7 +352,7 @@ class MetadataManager(LoggerMixin):
                 )
 
                 # 単語頻度分析（簡易版）
-                words = note.content.lower().split()
+                words = content.lower().split()
                 for word in words:
                     if len(word) > 3:  # 3 文字以上の単語のみ
                         clean_word = "".join(c for c in word if c.isalnum())
@@ -444,6 +404,12 @@ class MetadataManager(LoggerMixin):
             )
             return {"total_notes": 0, "error": str(e)}
 
+    def _created_at(self, header: NoteHeader) -> datetime:
+        try:
+            return datetime.fromisoformat(str(header.fields.get("created", "")))
+        except ValueError:
+            return datetime.fromtimestamp(header.path.stat().st_mtime)
+
     async def generate_metadata_report(self) -> dict[str, Any]:
         """
         包括的なメタデータレポートを生成
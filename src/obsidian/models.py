@@ -117,6 +117,13 @@ class VaultFolder(Enum):
     HEALTH_ANALYTICS = "21_Health/analytics"  # 健康分析
 
 
+# ノートから導出したキャッシュ（キーワードインデックス・日次ロールアップ）の置き場。
+# git 同期の対象外で、`rebuild_indexes` で再構築できる
+DERIVED_DATA_FOLDER = ".mindbridge"
+# Vault を走査してノートを集めるときに除外するフォルダ
+EXCLUDED_FOLDERS = (".trash", ".obsidian", DERIVED_DATA_FOLDER)
+
+
 class NoteFrontmatter(BaseModel):
     """Obsidian ノートのフロントマター"""
 
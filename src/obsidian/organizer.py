@@ -7,12 +7,8 @@ from pathlib import Path
 from typing import Any
 
 from src.obsidian.file_manager import ObsidianFileManager
-from src.obsidian.models import (
-    FolderMapping,
-    NoteStatus,
-    ObsidianNote,
-    VaultFolder,
-)
+from src.obsidian.models import ObsidianNote, VaultFolder
+from src.obsidian.organizer_planner import OrganizerPlanner
 from src.utils.mixins import LoggerMixin
 
 # 旧テンプレートシステムは削除済み
@@ -36,12 +32,16 @@ class VaultOrganizer(LoggerMixin):
 
         self.template_engine = TemplateEngine(file_manager.vault_path)
         self.daily_integration = DailyNoteIntegration(file_manager)
+        self.planner = OrganizerPlanner(file_manager)
         self.logger.info("Organize manager initialized")
 
     async def organize_notes_by_category(self, dry_run: bool = False) -> dict[str, Any]:
         """
         カテゴリに基づいてノートを整理（改善版：階層構造対応）
 
+        移動対象はノートのインデックスから選び、全体の移動計画を作成してから
+        まとめて実行する。
+
         Args:
             dry_run: 実際の移動を行わずに計画のみ表示
 
@@ -53,139 +53,27 @@ class VaultOrganizer(LoggerMixin):
                 "Starting enhanced note organization by category", dry_run=dry_run
             )
 
+            plan = await self.planner.plan_category_moves()
             results: dict[str, Any] = {
-                "processed": 0,
+                "processed": plan.processed,
                 "moved": 0,
-                "errors": 0,
-                "movements": [],
-                "hierarchical_moves": 0,
+                "errors": len(plan.conflicts),
+                "movements": [move.info for move in plan.moves],
+                "hierarchical_moves": sum(
+                    1 for move in plan.moves if move.info["subcategory"]
+                ),
+                "renames_only": plan.renames_only,
+                "conflicts": plan.conflicts,
+                "renames": [],
             }
 
-            # 受信箱及び未処理フォルダのノートを取得
-            folders_to_process = [
-                VaultFolder.INBOX,
-                VaultFolder.INBOX_UNPROCESSED,
-                VaultFolder.INBOX_PENDING,
-                VaultFolder.INBOX_STAGED,
-            ]
-
-            for folder in folders_to_process:
-                try:
-                    folder_notes = await self.file_manager.search_notes(
-                        folder=folder.value, limit=1000
-                    )
-                except Exception as e:
-                    # フォルダが存在しない場合はスキップ
-                    self.logger.debug(
-                        "Failed to process folder", folder=folder, error=str(e)
-                    )
-                    continue
-
-                for note_result in folder_notes:
-                    results["processed"] += 1
-
-                    try:
-                        # Load the actual note object
-                        note = await self.file_manager.load_note(
-                            Path(note_result["file_path"])
-                        )
-                        if not note:
-                            continue
-                        # AI 分類結果に基づいて移動先を決定（改善版）
-                        target_folder = None
-                        subcategory = None
-
-                        if note.frontmatter.ai_category:
-                            # AI 分類結果からフォルダを決定
-                            from src.ai.models import ProcessingCategory
-
-                            try:
-                                category = ProcessingCategory(
-                                    note.frontmatter.ai_category
-                                )
-
-                                # サブカテゴリがある場合は優先
-                                if (
-                                    hasattr(note.frontmatter, "ai_subcategory")
-                                    and note.frontmatter.ai_subcategory
-                                ):
-                                    subcategory = note.frontmatter.ai_subcategory
-
-                                # 階層構造対応の分類
-                                target_folder = FolderMapping.get_folder_for_category(
-                                    category.value, subcategory
-                                )
-
-                                if subcategory:
-                                    results["hierarchical_moves"] += 1
-
-                            except ValueError:
-                                self.logger.warning(
-                                    "Unknown AI category",
-                                    category=note.frontmatter.ai_category,
-                                    note_path=str(note.file_path),
-                                )
-
-                        # タグベースの分類も考慮
-                        if (
-                            not target_folder
-                            and hasattr(note.frontmatter, "ai_tags")
-                            and note.frontmatter.ai_tags
-                        ):
-                            tags = note.frontmatter.ai_tags
-                            if isinstance(tags, list) and tags:
-                                # 最初のタグを使用してフォルダを決定
-                                first_tag = tags[0].lstrip("#")
-                                target_folder = FolderMapping.get_folder_for_category(
-                                    first_tag
-                                )
-
-                        # 移動先が決定された場合
-                        if target_folder and target_folder != VaultFolder.INBOX:
-                            new_path = (
-                                self.file_manager.vault_path
-                                / target_folder.value
-                                / note.filename
-                            )
-
-                            movement_info = {
-                                "note_title": note.title,
-                                "from_path": str(
-                                    note.file_path.relative_to(
-                                        self.file_manager.vault_path
-                                    )
-                                ),
-                                "to_path": str(
-                                    new_path.relative_to(self.file_manager.vault_path)
-                                ),
-                                "category": note.frontmatter.ai_category,
-                                "subcategory": subcategory,
-                                "confidence": note.frontmatter.ai_confidence,
-                                "tags": getattr(note.frontmatter, "ai_tags", []),
-                            }
-
-                            results["movements"].append(movement_info)
-
-                            if not dry_run:
-                                # 実際の移動実行
-                                success = await self._move_note_enhanced(
-                                    note, new_path, target_folder
-                                )
-                                if success:
-                                    results["moved"] += 1
-                                else:
-                                    results["errors"] += 1
-                            else:
-                                results["moved"] += 1
-
-                    except Exception as e:
-                        results["errors"] += 1
-                        self.logger.error(
-                            "Error processing note for organization",
-                            note_path=str(note.file_path) if note else "Unknown",
-                            error=str(e),
-                            exc_info=True,
-                        )
+            if dry_run:
+                results["moved"] = len(plan.moves)
+            else:
+                batch = await self.planner.execute(plan)
+                results["moved"] = len(batch.moved)
+                results["errors"] = batch.errors
+                results["renames"] = batch.renames()
 
             self.logger.info(
                 "Enhanced note organization completed",
@@ -322,6 +210,9 @@ class VaultOrganizer(LoggerMixin):
         """
         古いノートをアーカイブ
 
+        ステータスを archived に変更し、元のフォルダ構成のまま
+        アーカイブフォルダへ移動する。
+
         Args:
             days_old: アーカイブ対象の日数
             dry_run: 実際のアーカイブを行わずに計画のみ表示
@@ -338,76 +229,31 @@ class VaultOrganizer(LoggerMixin):
                 dry_run=dry_run,
             )
 
+            plan = await self.planner.plan_archive(cutoff_date.date())
             results: dict[str, Any] = {
-                "processed": 0,
+                "processed": plan.processed,
                 "archived": 0,
-                "errors": 0,
-                "archived_notes": [],
+                "errors": len(plan.conflicts),
+                "archived_notes": [
+                    {
+                        "title": move.info["title"],
+                        "path": move.info["from_path"],
+                        "archive_path": move.info["to_path"],
+                        "created_date": move.info["created_date"],
+                        "category": move.info["category"],
+                    }
+                    for move in plan.moves
+                ],
+                "renames": [],
             }
 
-            # 全ノートを検索（アーカイブフォルダ以外）
-            for folder in [
-                VaultFolder.INBOX,
-                VaultFolder.PROJECTS,
-                VaultFolder.DAILY_NOTES,
-                VaultFolder.IDEAS,
-                VaultFolder.FINANCE,
-                VaultFolder.TASKS,
-                VaultFolder.HEALTH,
-            ]:
-                notes = await self.file_manager.search_notes(
-                    folder=folder.value, date_to=cutoff_date.isoformat(), limit=1000
-                )
-
-                for note_result in notes:
-                    results["processed"] += 1
-
-                    try:
-                        # Load the actual note object
-                        note = await self.file_manager.load_note(
-                            Path(note_result["file_path"])
-                        )
-                        if not note:
-                            continue
-                        # アクティブなノートのみアーカイブ対象
-                        if note.frontmatter.status == NoteStatus.ACTIVE:
-                            archive_info = {
-                                "title": note.title,
-                                "path": str(
-                                    note.file_path.relative_to(
-                                        self.file_manager.vault_path
-                                    )
-                                ),
-                                "created_date": note.created_at.strftime("%Y-%m-%d"),
-                                "category": note.frontmatter.ai_category,
-                            }
-
-                            results["archived_notes"].append(archive_info)
-
-                            if not dry_run:
-                                # ステータスをアーカイブに変更
-                                note.frontmatter.status = NoteStatus.ARCHIVED
-
-                                # アーカイブフォルダに移動
-                                success = await self.file_manager.delete_note(
-                                    note.file_path, backup=True
-                                )
-
-                                if success:
-                                    results["archived"] += 1
-                                else:
-                                    results["errors"] += 1
-                            else:
-                                results["archived"] += 1
-
-                    except Exception as e:
-                        results["errors"] += 1
-                        self.logger.error(
-                            "Error processing note for archival",
-                            note_path=str(note.file_path) if note else "Unknown",
-                            error=str(e),
-                            exc_info=True,
-                        )
+            if dry_run:
+                results["archived"] = len(plan.moves)
+            else:
+                batch = await self.planner.execute(plan)
+                results["archived"] = len(batch.moved)
+                results["errors"] = batch.errors
+                results["renames"] = batch.renames()
 
             self.logger.info(
                 "Old notes archival completed",
@@ -700,124 +546,18 @@ class VaultOrganizer(LoggerMixin):
             )
             return False
 
-    async def _move_note_enhanced(
-        self, note: ObsidianNote, new_path: Path, target_folder: VaultFolder
-    ) -> bool:
-        """ノートを移動（階層構造対応版）"""
-        try:
-            # 移動先ディレクトリの作成（階層構造も含む）
-            new_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # ファイル移動
-            note.file_path.rename(new_path)
-
-            # ノートオブジェクトのパス更新
-            note.file_path = new_path
-            note.frontmatter.obsidian_folder = str(
-                new_path.parent.relative_to(self.file_manager.vault_path)
-            )
-            note.frontmatter.modified = datetime.now().isoformat()
-
-            # 階層構造メタデータの追加
-            note.frontmatter.vault_hierarchy = target_folder.value
-            if (
-                hasattr(note.frontmatter, "ai_subcategory")
-                and note.frontmatter.ai_subcategory
-            ):
-                note.frontmatter.organization_level = "subcategory"
-            else:
-                note.frontmatter.organization_level = "category"
-
-            # フロントマターの更新
-            await self.file_manager.update_note(note.file_path, note)
-
-            self.logger.debug(
-                "Note moved successfully with enhanced structure",
-                old_path=str(note.file_path),
-                new_path=str(new_path),
-                hierarchy=target_folder.value,
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(
-                "Failed to move note with enhanced structure",
-                note_path=str(note.file_path),
-                new_path=str(new_path),
-                error=str(e),
-                exc_info=True,
-            )
-            return False
-
     async def _collect_daily_stats(self, date: datetime) -> dict[str, Any]:
         """指定日の統計情報を収集"""
         try:
-            start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = start_date + timedelta(days=1)
-
-            # その日のノートを検索
-            daily_notes = await self.file_manager.search_notes(
-                date_from=start_date.isoformat(),
-                date_to=end_date.isoformat(),
-                limit=1000,
-            )
-
-            stats = {
-                "total_messages": len(daily_notes),
-                "processed_messages": 0,
-                "ai_processing_time_total": 0,
-                "categories": {},
-                "tags": {},
-                "attachments": [],
-            }
-
-            for note_result in daily_notes:
-                # Load the actual note object
-                note = await self.file_manager.load_note(Path(note_result["file_path"]))
-                if not note:
-                    continue
-                # AI 処理済みノートの統計
-                if (
-                    hasattr(note.frontmatter, "ai_processed")
-                    and note.frontmatter.ai_processed
-                ):
-                    if isinstance(stats["processed_messages"], int):
-                        stats["processed_messages"] += 1
-
-                    if (
-                        hasattr(note.frontmatter, "ai_processing_time")
-                        and note.frontmatter.ai_processing_time
-                        and isinstance(stats["ai_processing_time_total"], int)
-                    ):
-                        stats["ai_processing_time_total"] += int(
-                            note.frontmatter.ai_processing_time
-                        )
-
-                # カテゴリ統計
-                if (
-                    hasattr(note.frontmatter, "ai_category")
-                    and note.frontmatter.ai_category
-                ):
-                    category = str(note.frontmatter.ai_category)
-                    if isinstance(stats["categories"], dict):
-                        stats["categories"][category] = (
-                            stats["categories"].get(category, 0) + 1
-                        )
-
-                # タグ統計
-                ai_tags = getattr(note.frontmatter, "ai_tags", []) or []
-                tags = getattr(note.frontmatter, "tags", []) or []
-                for tag in ai_tags + tags:
-                    clean_tag = str(tag).lstrip("#")
-                    if isinstance(stats["tags"], dict):
-                        stats["tags"][clean_tag] = stats["tags"].get(clean_tag, 0) + 1
+            # 保存時に更新される日次集計から 1 日分を取得
+            day = await self.file_manager.activity_rollup.get_day(date.date())
+            stats = day.to_daily_stats()
+            stats["attachments"] = []
 
             # タグを頻度順にソート
-            if isinstance(stats["tags"], dict):
-                sorted_tags = sorted(
-                    stats["tags"].items(), key=lambda x: x[1], reverse=True
-                )[:10]
-                stats["tags"] = [f"{tag}({count})" for tag, count in sorted_tags]
+            stats["tags"] = [
+                f"{tag}({count})" for tag, count in day.tags.most_common(10)
+            ]
 
             return stats
 
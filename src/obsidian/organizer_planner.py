@@ -0,0 +1,358 @@
+"""
+Index-driven move planning and batched execution for vault organization
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Literal
+
+from src.obsidian.analytics.activity_rollup import NoteActivity
+from src.obsidian.bulk_metadata import BulkMetadataEngine, NoteHeader
+from src.obsidian.core.frontmatter import (
+    FrontmatterBlock,
+    apply_frontmatter_updates,
+    replace_file_bytes,
+)
+from src.obsidian.file_manager import ObsidianFileManager
+from src.obsidian.models import (
+    FolderMapping,
+    NoteFrontmatter,
+    NoteStatus,
+    VaultFolder,
+)
+from src.utils.mixins import LoggerMixin
+
+# 同時に実行する移動の上限
+DEFAULT_MOVE_CONCURRENCY = 16
+
+# カテゴリ整理の対象フォルダ
+ORGANIZE_SOURCE_FOLDERS = (
+    VaultFolder.INBOX,
+    VaultFolder.INBOX_UNPROCESSED,
+    VaultFolder.INBOX_PENDING,
+    VaultFolder.INBOX_STAGED,
+)
+
+# アーカイブの対象フォルダ
+ARCHIVE_SOURCE_FOLDERS = (
+    VaultFolder.INBOX,
+    VaultFolder.PROJECTS,
+    VaultFolder.DAILY_NOTES,
+    VaultFolder.IDEAS,
+    VaultFolder.FINANCE,
+    VaultFolder.TASKS,
+    VaultFolder.HEALTH,
+)
+
+
+@dataclass
+class PlannedMove:
+    """One note move; ``updates`` is empty when only the path changes."""
+
+    source: Path
+    target: Path
+    updates: dict[str, Any]
+    info: dict[str, Any]
+
+
+@dataclass
+class MovePlan:
+    """All moves of one organization run, computed before any file is touched."""
+
+    processed: int = 0
+    moves: list[PlannedMove] = field(default_factory=list)
+    conflicts: list[dict[str, str]] = field(default_factory=list)
+    _targets: set[Path] = field(default_factory=set, repr=False)
+
+    @property
+    def renames_only(self) -> int:
+        return sum(1 for move in self.moves if not move.updates)
+
+
+@dataclass
+class MoveBatch:
+    """Result of executing a plan: the rename set passed on to the indexes."""
+
+    moved: list[PlannedMove] = field(default_factory=list)
+    errors: int = 0
+
+    def renames(self) -> list[dict[str, str]]:
+        return [
+            {"from": str(move.source), "to": str(move.target)} for move in self.moved
+        ]
+
+
+class OrganizerPlanner(LoggerMixin):
+    """Plans vault reorganizations from the note index and executes them in bulk.
+
+    Candidates come from the activity rollup kept up to date on every note
+    save, and only their frontmatter is read to confirm the plan. Notes whose
+    frontmatter does not change are moved with a plain ``os.replace``.
+    """
+
+    def __init__(
+        self,
+        file_manager: ObsidianFileManager,
+        concurrency: int = DEFAULT_MOVE_CONCURRENCY,
+    ):
+        """
+        Initialize organizer planner
+
+        Args:
+            file_manager: File manager instance
+            concurrency: 同時に実行する移動の上限
+        """
+        self.file_manager = file_manager
+        self.vault_path = Path(file_manager.vault_path)
+        self.concurrency = concurrency
+        self.metadata_reader = BulkMetadataEngine(file_manager, concurrency)
+
+    # === Planning ===
+
+    async def plan_category_moves(self) -> MovePlan:
+        """受信箱のノートを AI 分類結果に基づくフォルダへ移動する計画を作成"""
+        entries = await self._index_entries(ORGANIZE_SOURCE_FOLDERS)
+        plan = MovePlan(processed=len(entries))
+
+        candidates = [
+            self.vault_path / key
+            for key, activity in entries
+            if activity.category or activity.ai_tags
+        ]
+        for header in await self.metadata_reader.read_headers(candidates):
+            target_folder, subcategory = self._target_folder(header)
+            if target_folder is None or target_folder == VaultFolder.INBOX:
+                continue
+
+            fields = header.fields
+            updates = {
+                "obsidian_folder": target_folder.value,
+                "vault_hierarchy": target_folder.value,
+                "organization_level": "subcategory" if subcategory else "category",
+            }
+            self._add_move(
+                plan,
+                header,
+                self.vault_path / target_folder.value / header.path.name,
+                updates,
+                {
+                    "note_title": _note_title(header.path),
+                    "category": fields.get("ai_category"),
+                    "subcategory": subcategory,
+                    "confidence": fields.get("ai_confidence"),
+                    "tags": fields.get("ai_tags", []),
+                },
+            )
+        return plan
+
+    async def plan_archive(self, cutoff: date) -> MovePlan:
+        """作成日が ``cutoff`` 以前のアクティブなノートをアーカイブする計画を作成"""
+        cutoff_key = cutoff.isoformat()
+        entries = await self._index_entries(ARCHIVE_SOURCE_FOLDERS)
+        plan = MovePlan(processed=len(entries))
+
+        candidates = [
+            self.vault_path / key
+            for key, activity in entries
+            if activity.day <= cutoff_key and activity.status == NoteStatus.ACTIVE.value
+        ]
+        for header in await self.metadata_reader.read_headers(candidates):
+            fields = header.fields
+            # インデックスの更新後に外部で変更されたノートは除く
+            if fields.get("status", NoteStatus.ACTIVE.value) != NoteStatus.ACTIVE.value:
+                continue
+            created = header.created_date
+            if created is None or created > cutoff:
+                continue
+
+            relative = header.path.relative_to(self.vault_path)
+            target = self.vault_path / VaultFolder.ARCHIVE.value / relative
+            self._add_move(
+                plan,
+                header,
+                target,
+                {
+                    "status": NoteStatus.ARCHIVED.value,
+                    "obsidian_folder": target.parent.relative_to(
+                        self.vault_path
+                    ).as_posix(),
+                },
+                {
+                    "title": _note_title(header.path),
+                    "created_date": created.isoformat(),
+                    "category": fields.get("ai_category"),
+                },
+            )
+        return plan
+
+    # === Execution ===
+
+    async def execute(self, plan: MovePlan) -> MoveBatch:
+        """
+        計画した移動を並行して実行し、移動の一覧をまとめてインデックスに反映
+
+        Args:
+            plan: plan_category_moves / plan_archive の結果
+
+        Returns:
+            実行結果（移動したノートとエラー数）
+        """
+        batch = MoveBatch(errors=len(plan.conflicts))
+        if not plan.moves:
+            return batch
+
+        # 移動先フォルダは並行実行の前にまとめて作成する
+        for folder in sorted({move.target.parent for move in plan.moves}):
+            folder.mkdir(parents=True, exist_ok=True)
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, self._execute_move, move)
+                    for move in plan.moves
+                )
+            )
+
+        indexed: list[tuple[Path, Path, NoteFrontmatter | None]] = []
+        for move, outcome in zip(plan.moves, outcomes, strict=True):
+            if outcome is False:
+                batch.errors += 1
+                continue
+            batch.moved.append(move)
+            indexed.append((move.source, move.target, outcome))
+
+        await self.file_manager.record_moves(indexed)
+        self.logger.info(
+            "Note moves executed",
+            moved=len(batch.moved),
+            renames_only=sum(1 for move in batch.moved if not move.updates),
+            errors=batch.errors,
+        )
+        return batch
+
+    # === Internals ===
+
+    async def _index_entries(
+        self, folders: tuple[VaultFolder, ...]
+    ) -> list[tuple[str, NoteActivity]]:
+        prefixes = tuple(f"{folder.value}/" for folder in folders)
+        # git pull や Obsidian で変更されたノートを計画前に反映する
+        rollup = self.file_manager.activity_rollup
+        await rollup.reconcile()
+        entries = await rollup.note_entries()
+        return [
+            (key, activity) for key, activity in entries if key.startswith(prefixes)
+        ]
+
+    def _target_folder(
+        self, header: NoteHeader
+    ) -> tuple[VaultFolder | None, str | None]:
+        from src.ai.models import ProcessingCategory
+
+        fields = header.fields
+        target_folder = None
+        subcategory = None
+
+        if fields.get("ai_category"):
+            # AI 分類結果からフォルダを決定（サブカテゴリがある場合は優先）
+            try:
+                category = ProcessingCategory(fields["ai_category"])
+                subcategory = fields.get("ai_subcategory") or None
+                target_folder = FolderMapping.get_folder_for_category(
+                    category.value, subcategory
+                )
+            except ValueError:
+                self.logger.warning(
+                    "Unknown AI category",
+                    category=fields["ai_category"],
+                    note_path=str(header.path),
+                )
+
+        # タグベースの分類も考慮（最初のタグを使用）
+        ai_tags = fields.get("ai_tags", [])
+        if not target_folder and ai_tags:
+            target_folder = FolderMapping.get_folder_for_category(
+                ai_tags[0].lstrip("#")
+            )
+
+        return target_folder, subcategory
+
+    def _add_move(
+        self,
+        plan: MovePlan,
+        header: NoteHeader,
+        target: Path,
+        updates: dict[str, Any],
+        info: dict[str, Any],
+    ) -> None:
+        source = header.path
+        if target == source:
+            return
+
+        relative_target = target.relative_to(self.vault_path)
+        info = {
+            **info,
+            "from_path": str(source.relative_to(self.vault_path)),
+            "to_path": str(relative_target),
+        }
+        if target.exists() or target in plan._targets:
+            self.logger.warning(
+                "Move target already exists", source=str(source), target=str(target)
+            )
+            plan.conflicts.append(
+                {"from_path": info["from_path"], "to_path": info["to_path"]}
+            )
+            return
+
+        changed = {
+            key: value
+            for key, value in updates.items()
+            if str(header.fields.get(key, "")) != str(value)
+        }
+        plan.moves.append(PlannedMove(source, target, changed, info))
+        plan._targets.add(target)
+
+    def _execute_move(
+        self, move: PlannedMove
+    ) -> NoteFrontmatter | None | Literal[False]:
+        """1 件の移動（フロントマターの書き換えが必要な場合は先に書き換える）
+
+        成功時は書き換え後のフロントマター（書き換えなしは None）、失敗時は False。
+        """
+        try:
+            frontmatter = None
+            if move.updates:
+                _block, new_lines, payload = apply_frontmatter_updates(
+                    move.source.read_bytes(), move.updates
+                )
+                replace_file_bytes(move.source, payload)
+                frontmatter = self.metadata_reader.frontmatter_model(
+                    move.target, FrontmatterBlock(new_lines, 0).fields()
+                )
+            if move.target.exists():
+                raise FileExistsError(str(move.target))
+            os.replace(move.source, move.target)
+            return frontmatter
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.error(
+                "Failed to move note",
+                note_path=str(move.source),
+                new_path=str(move.target),
+                error=str(e),
+            )
+            return False
+
+
+def _note_title(path: Path) -> str:
+    """ファイル名からタイトルを抽出（ ObsidianNote.title と同じ規則）"""
+    parts = path.stem.split("_", 2)
+    if len(parts) >= 3:
+        return parts[2]
+    if len(parts) == 2:
+        return parts[1]
+    return path.stem
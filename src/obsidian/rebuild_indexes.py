@@ -0,0 +1,57 @@
+"""
+Rebuild the vault-side indexes maintained by the note-save path
+
+    uv run python -m src.obsidian.rebuild_indexes [--vault PATH]
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from src.obsidian.file_manager import ObsidianFileManager
+from src.utils.json_store import flush_all_writers
+
+
+async def rebuild_indexes(vault_path: Path) -> dict[str, Any]:
+    """
+    日次集計とキーワードインデックスを Vault 全体の走査から再構築
+
+    保存時の差分更新が取りこぼされた場合（外部での編集や異常終了）の
+    修復用。
+
+    Args:
+        vault_path: Vault のパス
+
+    Returns:
+        再構築したノート数
+    """
+    file_manager = ObsidianFileManager(vault_path)
+    activity_notes = await file_manager.activity_rollup.rebuild()
+    keyword_notes = await asyncio.to_thread(file_manager.keyword_index.build)
+    await flush_all_writers()
+    return {"activity_rollup": activity_notes, "keyword_index": keyword_notes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vault インデックスの再構築")
+    parser.add_argument(
+        "--vault", type=Path, default=None, help="Vault のパス（省略時は設定値）"
+    )
+    args = parser.parse_args()
+
+    vault_path = args.vault
+    if vault_path is None:
+        from src.config import get_settings
+
+        vault_path = get_settings().obsidian_vault_path
+
+    result = asyncio.run(rebuild_indexes(vault_path))
+    print(
+        f"activity_rollup: {result['activity_rollup']} notes, "
+        f"keyword_index: {result['keyword_index']} notes"
+    )
+
+
+if __name__ == "__main__":
+    main()
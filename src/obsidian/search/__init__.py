@@ -1,6 +1,13 @@
 """Search functionality for Obsidian vault."""
 
+from src.obsidian.search.keyword_index import KeywordIndex, get_keyword_index
 from src.obsidian.search.note_search import NoteSearch
 from src.obsidian.search.search_models import SearchCriteria, SearchResult
 
-__all__ = ["NoteSearch", "SearchCriteria", "SearchResult"]
+__all__ = [
+    "KeywordIndex",
+    "NoteSearch",
+    "SearchCriteria",
+    "SearchResult",
+    "get_keyword_index",
+]
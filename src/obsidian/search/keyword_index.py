@@ -0,0 +1,451 @@
+"""Persistent keyword → notes inverted index for related-note lookup."""
+
+import asyncio
+import json
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.obsidian.models import DERIVED_DATA_FOLDER, EXCLUDED_FOLDERS
+from src.utils.json_store import AtomicJsonWriter, dump_json, write_bytes_atomic
+
+logger = structlog.get_logger(__name__)
+
+INDEX_FILE = Path(DERIVED_DATA_FOLDER) / "keyword_index.json"
+# 索引語の形式を変えたら上げる（古いファイルは再構築される）
+INDEX_VERSION = 2
+# この秒数内の更新は 1 回の書き込みにまとめる
+PERSIST_DELAY_SECONDS = 2.0
+
+# (size, mtime_ns) of a note file when its terms were read
+FileStamp = tuple[int, int]
+
+_ENGLISH_WORD = re.compile(r"\b[a-zA-Z]+\b")
+_JAPANESE_WORD = re.compile(r"[ぁ-んァ-ヶー一-龯]+")
+
+STOPWORDS = frozenset(
+    {
+        "the",
+        "is",
+        "at",
+        "which",
+        "on",
+        "and",
+        "or",
+        "but",
+        "if",
+        "then",
+        "with",
+        "for",
+        "from",
+        "about",
+        "が",
+        "の",
+        "を",
+        "に",
+        "は",
+        "で",
+        "と",
+        "から",
+        "まで",
+        "より",
+        "です",
+        "である",
+        "します",
+        "して",
+        "した",
+        "する",
+        "ます",
+        "ました",
+        "について",
+    }
+)
+
+
+def tokenize_keywords(content: str, min_length: int = 3) -> list[str]:
+    """Split content into keyword tokens (lower-cased English, Japanese runs)."""
+    english_words = _ENGLISH_WORD.findall(content.lower())
+    japanese_words = _JAPANESE_WORD.findall(content)
+    return [
+        word
+        for word in [*english_words, *japanese_words]
+        if len(word) >= min_length and word not in STOPWORDS
+    ]
+
+
+def index_terms(content: str) -> set[str]:
+    """Terms stored in the index: English keywords and Japanese character bigrams.
+
+    Japanese has no word boundaries, so a keyword run such as
+    ``プロジェクト会議の資料を準備`` rarely equals a run in another note;
+    bigrams let lookups find notes that contain it as a substring.
+    """
+    terms: set[str] = set()
+    for word in tokenize_keywords(content):
+        if _JAPANESE_WORD.fullmatch(word):
+            terms.update(word[i : i + 2] for i in range(len(word) - 1))
+        else:
+            terms.add(word)
+    return terms
+
+
+def top_keywords(content: str, limit: int = 10, min_length: int = 3) -> list[str]:
+    """Most frequent keyword tokens of the content."""
+    word_freq = Counter(tokenize_keywords(content, min_length))
+    return [word for word, _count in word_freq.most_common(limit)]
+
+
+class KeywordIndex:
+    """Inverted index of keyword tokens for every note in a vault.
+
+    The index is kept in memory and persisted under ``.mindbridge/`` in the
+    vault (ignored by git sync). Notes are added incrementally as they are
+    saved and the file is rewritten at most once per
+    ``PERSIST_DELAY_SECONDS``, serialized off the event loop.
+
+    Postings only pick candidate notes; a note matches a keyword when it
+    contains the keyword as a substring, as in a plain vault search.
+
+    Each note's terms are stored with the size and mtime of its file. The
+    first lookup loads the persisted index and then updates it from a vault
+    scan that re-reads only new or changed notes and drops missing ones, so
+    edits from git pull or Obsidian are picked up. On an event loop the scan
+    runs in a worker thread and lookups meanwhile use the persisted index
+    (or return nothing when there is none yet); without a running loop it is
+    synchronous.
+    """
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = Path(vault_path)
+        self.index_path = self.vault_path / INDEX_FILE
+        self._writer = AtomicJsonWriter(
+            self.index_path,
+            prefix="keyword_index_",
+            coalesce_window=PERSIST_DELAY_SECONDS,
+            indent=None,
+        )
+
+        self._notes: dict[str, set[str]] = {}
+        self._stamps: dict[str, FileStamp] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        # 変更のたびに増える（書き込み後の再書き込み判定に使う）
+        self._generation = 0
+        self._ready = False
+        self._loaded = False
+        self._synced = False
+        self._building = False
+        self._pending: dict[str, tuple[set[str], FileStamp] | None] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    @property
+    def note_count(self) -> int:
+        return len(self._notes)
+
+    # === Lookup ===
+
+    def find_related(
+        self, keywords: list[str], min_matches: int = 2, limit: int = 5
+    ) -> list[str]:
+        """Note names containing at least ``min_matches`` keywords, best first."""
+        self.ensure_ready()
+        if not self._ready or not keywords:
+            return []
+
+        candidates: dict[str, list[str]] = {}
+        with self._lock:
+            for keyword in {keyword.lower() for keyword in keywords}:
+                for key in self._candidates(keyword):
+                    candidates.setdefault(key, []).append(keyword)
+
+        scores: dict[str, int] = {}
+        for key, matched in candidates.items():
+            if len(matched) >= min_matches:
+                count = self._count_contained(key, matched)
+                if count >= min_matches:
+                    scores[key] = count
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [Path(key).stem for key, _count in ranked[:limit]]
+
+    def ensure_ready(self) -> None:
+        """Load the persisted index and update it from the vault (off the loop)."""
+        if self._synced or self._building:
+            return
+        self._load_persisted()
+
+        if not self.vault_path.exists():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.build()
+            return
+
+        logger.info("Updating keyword index in background", vault=str(self.vault_path))
+        self._building = True
+        loop.run_in_executor(None, self.build)
+
+    # === Updates ===
+
+    def update_note(self, file_path: Path, content: str) -> bool:
+        """Index (or re-index) a note. Returns True if the index changed."""
+        self._load_persisted()
+        terms = index_terms(content)
+        key = self._key(file_path)
+        stamp = self._stamp(file_path)
+        with self._lock:
+            if self._building:
+                self._pending[key] = (terms, stamp)
+                return False
+            if not self._ready:
+                return False
+            self._set_terms(key, terms, stamp)
+        return True
+
+    def remove_note(self, file_path: Path) -> bool:
+        """Drop a note from the index. Returns True if the index changed."""
+        self._load_persisted()
+        key = self._key(file_path)
+        with self._lock:
+            if self._building:
+                self._pending[key] = None
+                return False
+            if not self._ready or key not in self._notes:
+                return False
+            self._set_terms(key, None)
+        return True
+
+    def rename_notes(self, renames: list[tuple[Path, Path]]) -> bool:
+        """Move indexed terms to new paths. Returns True if the index changed."""
+        self._load_persisted()
+        changed = False
+        with self._lock:
+            for source, target in renames:
+                source_key, target_key = self._key(source), self._key(target)
+                if self._building:
+                    # 構築中は移動後のファイルから読み直し、構築完了時に反映する
+                    self._pending[source_key] = None
+                    self._pending[target_key] = self._read_entry(target)
+                    continue
+                terms = self._notes.get(source_key)
+                if not self._ready or terms is None:
+                    continue
+                # 名前の変更ではサイズと更新時刻は変わらない
+                stamp = self._stamps.get(source_key, (0, 0))
+                self._set_terms(source_key, None)
+                self._set_terms(target_key, terms, stamp)
+                changed = True
+        return changed
+
+    def persist(self) -> None:
+        """Schedule a write of the current index (coalesced, returns at once)."""
+        if not self._ready:
+            return
+        self._writer.schedule(self._snapshot)
+
+    def build(self, paths: list[Path] | None = None) -> int:
+        """Update the index from a full vault scan (blocking).
+
+        Notes whose size and mtime match the index keep their terms; new and
+        changed notes are read again and missing ones are dropped.
+        """
+        self._building = True
+        try:
+            with self._lock:
+                known = {
+                    key: (self._stamps.get(key), terms)
+                    for key, terms in self._notes.items()
+                }
+            notes: dict[str, tuple[set[str], FileStamp]] = {}
+            reread = 0
+            for path in paths if paths is not None else self._list_notes():
+                key = self._key(path)
+                try:
+                    stamp = _file_stamp(path)
+                except OSError:
+                    continue
+                previous_stamp, previous_terms = known.get(key, (None, set()))
+                if previous_stamp == stamp:
+                    notes[key] = (previous_terms, stamp)
+                    continue
+                entry = self._read_entry(path)
+                if entry is not None:
+                    notes[key] = entry
+                    reread += 1
+
+            with self._lock:
+                self._notes, self._postings, self._stamps = {}, {}, {}
+                for key, (terms, stamp) in notes.items():
+                    self._set_terms(key, terms, stamp)
+                for key, pending in self._pending.items():
+                    if pending is None:
+                        self._set_terms(key, None)
+                    else:
+                        self._set_terms(key, *pending)
+                self._pending.clear()
+                self._ready = True
+                self._synced = True
+                self._building = False
+
+            self._write_current()
+            logger.info("Keyword index built", notes=len(notes), reread=reread)
+            return len(notes)
+        except Exception as e:
+            logger.warning("Failed to build keyword index", error=str(e))
+            return 0
+        finally:
+            self._building = False
+
+    # === Internals ===
+
+    def _candidates(self, keyword: str) -> set[str]:
+        """Notes holding every index term of ``keyword`` (call with the lock held)."""
+        candidates: set[str] | None = None
+        for term in index_terms(keyword):
+            postings = self._postings.get(term, set())
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _count_contained(self, key: str, keywords: list[str]) -> int:
+        try:
+            content = (self.vault_path / key).read_text(encoding="utf-8").lower()
+        except (OSError, UnicodeDecodeError):
+            return 0
+        return sum(1 for keyword in keywords if keyword in content)
+
+    def _set_terms(
+        self, key: str, terms: set[str] | None, stamp: FileStamp = (0, 0)
+    ) -> None:
+        self._generation += 1
+        self._stamps.pop(key, None)
+        for term in self._notes.pop(key, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[term]
+        if terms is None:
+            return
+        self._notes[key] = terms
+        self._stamps[key] = stamp
+        for term in terms:
+            self._postings.setdefault(term, set()).add(key)
+
+    @staticmethod
+    def _read_entry(path: Path) -> tuple[set[str], FileStamp] | None:
+        try:
+            stamp = _file_stamp(path)
+            return index_terms(path.read_text(encoding="utf-8")), stamp
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _stamp(self, file_path: Path) -> FileStamp:
+        path = file_path if file_path.is_absolute() else self.vault_path / file_path
+        try:
+            return _file_stamp(path)
+        except OSError:
+            return (0, 0)
+
+    def _write_current(self) -> None:
+        """Write the index without holding the lock during the (fsync'd) write.
+
+        Written again when the index changed meanwhile, so a coalesced write
+        of a later update that finished first is not left overwritten.
+        """
+        while True:
+            with self._lock:
+                generation = self._generation
+                snapshot = self._snapshot_locked()
+            write_bytes_atomic(self.index_path, dump_json(snapshot, indent=None))
+            with self._lock:
+                if self._generation == generation:
+                    return
+
+    def _snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self) -> dict[str, Any]:
+        # Term sets and stamps are replaced, never mutated, so the shallow
+        # copies can be serialized in the writer thread
+        return {
+            "version": INDEX_VERSION,
+            "notes": dict(self._notes),
+            "stamps": dict(self._stamps),
+        }
+
+    def _load_persisted(self) -> bool:
+        """Load the on-disk index once; True when it is usable."""
+        if not self._loaded:
+            self._loaded = True
+            self._read_index()
+        return self._ready
+
+    def _read_index(self) -> bool:
+        if not self.index_path.exists():
+            return False
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                logger.info("Keyword index format changed, rebuilding")
+                return False
+            stamps = data.get("stamps", {})
+            with self._lock:
+                for key, terms in data.get("notes", {}).items():
+                    size, mtime_ns = stamps.get(key, (0, 0))
+                    self._set_terms(key, set(terms), (size, mtime_ns))
+                self._ready = True
+        except Exception as e:
+            logger.warning("Failed to read keyword index", error=str(e))
+            with self._lock:
+                self._notes, self._postings, self._stamps = {}, {}, {}
+            return False
+        return True
+
+    def _key(self, file_path: Path) -> str:
+        path = file_path if file_path.is_absolute() else self.vault_path / file_path
+        try:
+            return path.relative_to(self.vault_path).as_posix()
+        except ValueError:
+            pass
+        try:
+            return path.resolve().relative_to(self.vault_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _list_notes(self) -> list[Path]:
+        return [
+            path
+            for path in self.vault_path.rglob("*.md")
+            if not any(part in EXCLUDED_FOLDERS for part in path.parts)
+        ]
+
+
+def _file_stamp(path: Path) -> FileStamp:
+    stat = path.stat()
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+_indexes: dict[Path, KeywordIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_keyword_index(vault_path: Path | str) -> KeywordIndex:
+    """Shared index instance for a vault."""
+    resolved = Path(vault_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(resolved)
+        if index is None:
+            index = _indexes[resolved] = KeywordIndex(resolved)
+        return index
@@ -0,0 +1,225 @@
+"""
+Coalesced git sync: one commit per window for the paths in the change feed
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from src.monitoring.metrics import QUEUE_DEPTH
+from src.obsidian.change_feed import VaultChangeFeed
+from src.obsidian.github_sync import GitHubObsidianSync, git_subprocess_stats
+from src.utils.mixins import LoggerMixin
+
+
+class GitSyncScheduler(LoggerMixin):
+    """Commits and pushes vault changes at most once per window.
+
+    The first change recorded after an idle period opens a window; every
+    change recorded before it closes goes into the same commit, and only the
+    changed paths are staged. After a failed sync the paths stay pending and
+    the wait doubles on each consecutive failure, up to ``max_backoff_seconds``.
+
+    Files written by code that does not record them in the feed would never
+    be staged, so once after ``start`` and then every ``full_sweep_every``
+    windows (even when idle) a sync stages the whole vault instead.
+    """
+
+    def __init__(
+        self,
+        github_sync: GitHubObsidianSync,
+        change_feed: VaultChangeFeed,
+        window_seconds: float = 60.0,
+        max_backoff_seconds: float = 900.0,
+        full_sweep_every: int = 60,
+    ) -> None:
+        self.github_sync = github_sync
+        self.change_feed = change_feed
+        self.window_seconds = window_seconds
+        self.max_backoff_seconds = max(max_backoff_seconds, window_seconds)
+        self.full_sweep_every = full_sweep_every
+
+        self.commits = 0
+        self.full_sweeps = 0
+        self.failed_syncs = 0
+        self.consecutive_failures = 0
+        self.last_sync_at: datetime | None = None
+        self.last_lag_seconds: float | None = None
+        self.max_lag_seconds = 0.0
+
+        self._sweep_due = False
+        self._last_sweep_at = time.monotonic()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def next_delay_seconds(self) -> float:
+        """Wait before the next sync: the window, or the backoff after failures."""
+        if not self.consecutive_failures:
+            return self.window_seconds
+        return min(
+            self.max_backoff_seconds,
+            self.window_seconds * 2**self.consecutive_failures,
+        )
+
+    @property
+    def full_sweep_interval_seconds(self) -> float:
+        return self.window_seconds * self.full_sweep_every
+
+    def start(self) -> None:
+        """Start watching the change feed (must be called on the event loop)."""
+        global _active_scheduler
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._unsubscribe = self.change_feed.subscribe(self._on_change)
+        self._task = asyncio.create_task(self._run(), name="git-sync-scheduler")
+        # 停止中に記録されずに書き込まれたファイルを拾う
+        self._sweep_due = True
+        self._wake.set()
+        _active_scheduler = self
+        QUEUE_DEPTH.set_function(
+            lambda: self.change_feed.pending_count, queue="vault_changes"
+        )
+        self.logger.info(
+            "Git sync scheduler started",
+            window_seconds=self.window_seconds,
+            max_backoff_seconds=self.max_backoff_seconds,
+        )
+
+    async def stop(self, flush: bool = True) -> None:
+        """Stop the scheduler, committing pending changes first by default."""
+        global _active_scheduler
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if _active_scheduler is self:
+            _active_scheduler = None
+        if flush:
+            await self.flush("Auto-sync: Bot shutdown")
+
+    async def flush(self, commit_message: str | None = None) -> bool:
+        """Commit and push the pending paths now."""
+        async with self._flush_lock:
+            pending = self.change_feed.take()
+            sweep = self._sweep_due or (
+                time.monotonic() - self._last_sweep_at
+                >= self.full_sweep_interval_seconds
+            )
+            if not pending and not sweep and not self.github_sync.has_unpushed_commits:
+                return True
+
+            message = commit_message or (
+                f"Auto-sync: {len(pending)} files ({datetime.now().isoformat()})"
+            )
+            success = await self.github_sync.sync_to_github(
+                message, paths=None if sweep else pending
+            )
+            if not success:
+                self.change_feed.restore(pending)
+                self.failed_syncs += 1
+                self.consecutive_failures += 1
+                self.logger.warning(
+                    "Git sync failed, retrying later",
+                    pending_paths=len(pending),
+                    consecutive_failures=self.consecutive_failures,
+                    retry_in_seconds=self.next_delay_seconds,
+                )
+                return False
+
+            self.consecutive_failures = 0
+            self.commits += 1
+            if sweep:
+                self._sweep_due = False
+                self._last_sweep_at = time.monotonic()
+                self.full_sweeps += 1
+            self.last_sync_at = datetime.now()
+            if pending:
+                lag = time.monotonic() - min(pending.values())
+                self.last_lag_seconds = lag
+                self.max_lag_seconds = max(self.max_lag_seconds, lag)
+            self.logger.info(
+                "Vault changes synced",
+                paths=len(pending),
+                full_sweep=sweep,
+                lag_seconds=_round(self.last_lag_seconds),
+            )
+            return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """Sync lag and git process counts (exported by the health server)."""
+        oldest = self.change_feed.oldest_change_at
+        return {
+            "running": self.is_running,
+            "window_seconds": self.window_seconds,
+            "pending_paths": self.change_feed.pending_count,
+            "current_lag_seconds": (
+                _round(time.monotonic() - oldest) if oldest is not None else None
+            ),
+            "last_lag_seconds": _round(self.last_lag_seconds),
+            "max_lag_seconds": _round(self.max_lag_seconds),
+            "last_sync_at": (
+                self.last_sync_at.isoformat() if self.last_sync_at else None
+            ),
+            "commits": self.commits,
+            "full_sweeps": self.full_sweeps,
+            "failed_syncs": self.failed_syncs,
+            "consecutive_failures": self.consecutive_failures,
+            "next_delay_seconds": self.next_delay_seconds,
+            "git_subprocesses": git_subprocess_stats(),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            next_sweep_in = (
+                self._last_sweep_at
+                + self.full_sweep_interval_seconds
+                - time.monotonic()
+            )
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(next_sweep_in, 0.0))
+            except TimeoutError:
+                # 変更がなくても定期的に Vault 全体をステージングする
+                self._sweep_due = True
+            await asyncio.sleep(self.next_delay_seconds)
+            # Changes recorded while syncing open the next window
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:  # pragma: no cover - defensive
+                self.logger.error("Git sync scheduler error", error=str(e))
+            if self.consecutive_failures:
+                self._wake.set()
+
+    def _on_change(self) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
+_active_scheduler: GitSyncScheduler | None = None
+
+
+def get_sync_scheduler() -> GitSyncScheduler | None:
+    """The running scheduler, if the bot started one."""
+    return _active_scheduler
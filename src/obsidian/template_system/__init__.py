@@ -1,6 +1,7 @@
 """Template system for Obsidian notes"""
 
 from .base import GeneratedNote, ITemplateProcessor
+from .compiler import CompiledTemplate, TemplateCompiler
 from .engine import TemplateEngine
 from .generator import NoteGenerator
 from .loader import TemplateLoader
@@ -9,8 +10,10 @@ from .validator import TemplateValidator
 from .yaml_generator import YAMLFrontmatterGenerator
 
 __all__ = [
+    "CompiledTemplate",
     "GeneratedNote",
     "ITemplateProcessor",
+    "TemplateCompiler",
     "TemplateEngine",
     "NoteGenerator",
     "TemplateLoader",
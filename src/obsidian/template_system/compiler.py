@@ -0,0 +1,408 @@
+"""Template compiler producing reusable render trees"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from .processor import TemplateProcessor
+
+# テンプレートタグ（最初の }} まで）
+_TAG = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+_FRONTMATTER = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
+_BLANK_LINES = re.compile(r"\n\s*\n\s*\n\s*\n+")
+
+_FILTER = re.compile(r"\s*(\w+)\s*(\|[^}]+?)\s*")
+_FILTER_CHAIN = re.compile(r'\|\s*(\w+)(?:\s*:\s*"([^"]*)")?')
+_FUNCTION = re.compile(r"\s*(\w+)\((.*?)\)\s*")
+_INCLUDE = re.compile(r"\s*include\s+['\"](.+?)['\"]\s*")
+_EACH_HANDLEBARS = re.compile(r"\s*#each\s+(\w+)\s*")
+_EACH_IN = re.compile(r"\s*each\s+(\w+)\s+in\s+(\w+)\s*")
+_BLOCK_IF = re.compile(r"\s*#if\s+(.+?)\s*")
+_BLOCK_ELIF = re.compile(r"\s*#elif\s+(.+?)\s*")
+_BLOCK_ELSE = re.compile(r"\s*#else\s*")
+_SIMPLE_IF = re.compile(r"\s*if\s+(.+?)\s*")
+_INHERITANCE = re.compile(r"\s*(?:extends|block)\b.*|\s*/block\s*")
+# 旧パイプラインのクリーンアップで除去される閉じタグ類
+_STRAY_TAGS = {"else", "/else", "endif", "/endif"}
+_CLOSERS = {"/each": "each", "endeach": "each_in", "endif": "if", "/if": "block_if"}
+
+# 遅延評価（変数・関数）の位置を示すマーカー（空白扱いされない文字）
+_MARK = "\x00"
+
+_SCALAR = str | int | float | bool
+
+
+class UnsupportedTemplateError(Exception):
+    """コンパイラが扱えない構文（旧パイプラインで処理する）"""
+
+
+@dataclass
+class _RenderState:
+    context: dict[str, Any]
+    processor: "TemplateProcessor"
+    out: list[str] = field(default_factory=list)
+    deferred: list["_Deferred"] = field(default_factory=list)
+    local: dict[str, Any] | None = None
+
+    def defer(self, node: "_Deferred") -> None:
+        self.out.append(_MARK)
+        self.deferred.append(node)
+
+
+class _Node(ABC):
+    @abstractmethod
+    def render(self, state: _RenderState) -> None: ...
+
+
+class _Deferred(_Node):
+    """クリーンアップ後にグローバルコンテキストで解決されるノード"""
+
+    @abstractmethod
+    def resolve(
+        self, context: dict[str, Any], processor: "TemplateProcessor"
+    ) -> str: ...
+
+
+@dataclass
+class _Text(_Node):
+    text: str
+
+    def render(self, state: _RenderState) -> None:
+        state.out.append(self.text)
+
+
+@dataclass
+class _Variable(_Deferred):
+    name: str
+    raw: str
+
+    def render(self, state: _RenderState) -> None:
+        # each ブロック内ではループ変数を含むコンテキストで即時置換
+        if state.local is not None:
+            if self.name in state.local:
+                value = state.local[self.name]
+            else:
+                value = state.context.get(self.name)
+            if isinstance(value, _SCALAR):
+                state.out.append(str(value))
+                return
+        state.defer(self)
+
+    def resolve(self, context: dict[str, Any], processor: "TemplateProcessor") -> str:
+        value = context.get(self.name)
+        return str(value) if isinstance(value, _SCALAR) else self.raw
+
+
+@dataclass
+class _Function(_Deferred):
+    name: str
+    args: str
+    raw: str
+
+    def render(self, state: _RenderState) -> None:
+        state.defer(self)
+
+    def resolve(self, context: dict[str, Any], processor: "TemplateProcessor") -> str:
+        return processor._call_custom_function(self.name, self.args, context, self.raw)
+
+
+@dataclass
+class _Filtered(_Node):
+    name: str
+    filters: list[tuple[str, str]]
+
+    def render(self, state: _RenderState) -> None:
+        # フィルタは each 展開前に評価されるため常にグローバルコンテキストを使う
+        value = state.context.get(self.name)
+        for filter_name, filter_value in self.filters:
+            value = state.processor._apply_filter(value, filter_name, filter_value)
+        state.out.append(str(value) if value is not None else "")
+
+
+@dataclass
+class _Each(_Node):
+    list_name: str
+    var_name: str | None  # None は {{#each items}} 形式
+    body: list[_Node] = field(default_factory=list)
+
+    def render(self, state: _RenderState) -> None:
+        items = state.context.get(self.list_name)
+        if not isinstance(items, list):
+            return
+
+        outer_out = state.out
+        copies: list[str] = []
+        for index, item in enumerate(items):
+            if self.var_name is not None:
+                local: dict[str, Any] = {self.var_name: item}
+            elif isinstance(item, dict):
+                local = {**item, "@index": index}
+            else:
+                local = {"@item": item, "@index": index}
+
+            state.out, state.local = [], local
+            _render_nodes(self.body, state)
+            copies.append("".join(state.out))
+
+        state.out, state.local = outer_out, None
+        outer_out.append("\n".join(copies))
+
+
+@dataclass
+class _SimpleIf(_Node):
+    condition: str
+    body: list[_Node] = field(default_factory=list)
+
+    def render(self, state: _RenderState) -> None:
+        # 旧パイプライン同様、真の場合は {{ else }} 以降も含めて本体全体を出力する
+        if state.processor._evaluate_condition(self.condition, "1", state.context):
+            _render_nodes(self.body, state)
+
+
+@dataclass
+class _BlockIf(_Node):
+    conditions: list[str] = field(default_factory=list)
+    branches: list[list[_Node]] = field(default_factory=list)
+    _current: list[_Node] = field(default_factory=list)
+
+    def add_branch(self, condition: str) -> None:
+        # 空のブランチは旧実装と同じく詰めて扱う
+        if self._current:
+            self.branches.append(self._current)
+            self._current = []
+        self.conditions.append(condition)
+
+    def close(self) -> None:
+        if self._current:
+            self.branches.append(self._current)
+            self._current = []
+
+    def render(self, state: _RenderState) -> None:
+        for i, condition in enumerate(self.conditions):
+            if i >= len(self.branches):
+                continue
+            try:
+                matched = condition == "true" or (
+                    state.processor._evaluate_complex_condition(
+                        condition, state.context
+                    )
+                )
+            except Exception:
+                continue
+            if matched:
+                outer_out = state.out
+                state.out = []
+                _render_nodes(self.branches[i], state)
+                outer_out.append("".join(state.out).strip())
+                state.out = outer_out
+                return
+
+
+def _render_nodes(nodes: list[_Node], state: _RenderState) -> None:
+    for node in nodes:
+        node.render(state)
+
+
+@dataclass
+class CompiledSegment:
+    """フロントマターまたは本文のコンパイル結果
+
+    ``nodes`` が None の場合はコンパイラが扱えない構文（extends/block や
+    ネストしたブロックなど）を含み、旧パイプラインで処理する。
+    """
+
+    source: str
+    nodes: list[_Node] | None
+
+    @property
+    def supported(self) -> bool:
+        return self.nodes is not None
+
+    def render(
+        self, context: dict[str, Any], processor: "TemplateProcessor"
+    ) -> str | None:
+        """1 パスでレンダリング（非対応構文・マーカー衝突時は None）"""
+        if self.nodes is None:
+            return None
+
+        state = _RenderState(context=context, processor=processor)
+        _render_nodes(self.nodes, state)
+
+        text = "".join(state.out)
+        if text.count(_MARK) != len(state.deferred):
+            return None
+
+        # 旧パイプラインの条件分岐後クリーンアップと同じ整形
+        text = _BLANK_LINES.sub("\n\n", text).strip()
+        if not state.deferred:
+            return text
+
+        pieces = text.split(_MARK)
+        result = [pieces[0]]
+        for node, piece in zip(state.deferred, pieces[1:], strict=True):
+            result.append(node.resolve(context, processor))
+            result.append(piece)
+        return "".join(result)
+
+
+@dataclass
+class CompiledTemplate:
+    """コンパイル済みテンプレート（フロントマターと本文を個別に保持）"""
+
+    source: str
+    body: CompiledSegment
+    frontmatter: CompiledSegment | None = None
+
+    @property
+    def supported(self) -> bool:
+        return self.body.supported and (
+            self.frontmatter is None or self.frontmatter.supported
+        )
+
+
+class TemplateCompiler:
+    """テンプレート文字列をレンダリングツリーへ変換"""
+
+    def compile(self, source: str) -> CompiledTemplate:
+        match = _FRONTMATTER.match(source)
+        if match:
+            return CompiledTemplate(
+                source=source,
+                frontmatter=self.compile_segment(match.group(1)),
+                body=self.compile_segment(match.group(2)),
+            )
+        return CompiledTemplate(source=source, body=self.compile_segment(source))
+
+    def compile_segment(self, template: str) -> CompiledSegment:
+        try:
+            return CompiledSegment(template, self._parse(template))
+        except UnsupportedTemplateError:
+            return CompiledSegment(template, None)
+
+    def _parse(self, template: str) -> list[_Node]:
+        root: list[_Node] = []
+        # (種類, 追加先リスト, ノード)
+        stack: list[tuple[str, list[_Node], _Node | None]] = [("root", root, None)]
+
+        position = 0
+        for match in _TAG.finditer(template):
+            text = template[position : match.start()]
+            position = match.end()
+            kind, target, _block = stack[-1]
+            if text or kind == "block_if":
+                self._append_text(kind, target, text)
+
+            raw, inner = match.group(0), match.group(1)
+            if "\n" in inner or "{" in inner or "}" in inner:
+                raise UnsupportedTemplateError(raw)
+            if _INHERITANCE.fullmatch(inner):
+                raise UnsupportedTemplateError(raw)
+
+            stripped = inner.strip()
+            if kind == "block_if":
+                self._block_if_tag(stack, inner, stripped, raw)
+                continue
+
+            if filtered := _FILTER.fullmatch(inner):
+                target.append(
+                    _Filtered(
+                        filtered.group(1), _FILTER_CHAIN.findall(filtered.group(2))
+                    )
+                )
+            elif each := _EACH_HANDLEBARS.fullmatch(inner):
+                self._open(stack, "each", _Each(each.group(1), None))
+            elif each := _EACH_IN.fullmatch(inner):
+                self._open(stack, "each_in", _Each(each.group(2), each.group(1)))
+            elif condition := _BLOCK_IF.fullmatch(inner):
+                if kind != "root":
+                    raise UnsupportedTemplateError(raw)
+                block_if = _BlockIf()
+                block_if.add_branch(condition.group(1))
+                target.append(block_if)
+                stack.append(("block_if", block_if._current, block_if))
+            elif condition := _SIMPLE_IF.fullmatch(inner):
+                if any(frame[0] == "if" for frame in stack):
+                    raise UnsupportedTemplateError(raw)
+                self._open(stack, "if", _SimpleIf(condition.group(1)))
+            elif stripped in _CLOSERS:
+                self._close(stack, _CLOSERS[stripped])
+            elif stripped in _STRAY_TAGS:
+                continue
+            else:
+                target.append(self._leaf(inner, stripped, raw))
+
+        if len(stack) != 1:
+            raise UnsupportedTemplateError("unclosed block")
+        tail = template[position:]
+        if tail:
+            root.append(_Text(tail))
+        return root
+
+    def _append_text(self, kind: str, target: list[_Node], text: str) -> None:
+        # if-elif-else ブロック内の空白のみのトークンは旧実装同様に捨てる
+        # （隣接タグ間の空トークンは空でないブランチとして数えられる）
+        if kind == "block_if" and text and not text.strip():
+            return
+        target.append(_Text(text))
+
+    def _leaf(self, inner: str, stripped: str, raw: str) -> _Node:
+        if include := _INCLUDE.fullmatch(inner):
+            return _Text(f"<!-- Include: {include.group(1)} -->")
+        if function := _FUNCTION.fullmatch(inner):
+            return _Function(function.group(1), function.group(2), raw)
+        return _Variable(stripped, raw)
+
+    def _open(
+        self,
+        stack: list[tuple[str, list[_Node], _Node | None]],
+        kind: str,
+        node: _Each | _SimpleIf,
+    ) -> None:
+        if kind in ("each", "each_in") and any(
+            frame[0] in ("each", "each_in") for frame in stack
+        ):
+            raise UnsupportedTemplateError("nested each")
+        stack[-1][1].append(node)
+        stack.append((kind, node.body, node))
+
+    def _close(
+        self, stack: list[tuple[str, list[_Node], _Node | None]], kind: str
+    ) -> None:
+        if stack[-1][0] == kind:
+            stack.pop()
+        elif any(frame[0] == kind for frame in stack):
+            raise UnsupportedTemplateError(f"mismatched {kind}")
+        # 対応する開始タグがない閉じタグはクリーンアップで除去される
+
+    def _block_if_tag(
+        self,
+        stack: list[tuple[str, list[_Node], _Node | None]],
+        inner: str,
+        stripped: str,
+        raw: str,
+    ) -> None:
+        block_if = cast(_BlockIf, stack[-1][2])
+
+        if condition := _BLOCK_ELIF.fullmatch(inner):
+            block_if.add_branch(condition.group(1))
+        elif _BLOCK_ELSE.fullmatch(inner):
+            block_if.add_branch("true")
+        elif stripped == "/if":
+            block_if.close()
+            stack.pop()
+            return
+        else:
+            # 変数・関数・インクルード以外はブランチの strip 順序が変わるため非対応
+            if (
+                _FILTER.fullmatch(inner)
+                or stripped in _CLOSERS
+                or stripped in _STRAY_TAGS
+                or re.match(r"\s*(#each|each\s|#if|if\s)", inner)
+            ):
+                raise UnsupportedTemplateError(raw)
+            block_if._current.append(self._leaf(inner, stripped, raw))
+            return
+
+        stack[-1] = ("block_if", block_if._current, block_if)
@@ -16,8 +16,10 @@ class TemplateEngine:
 
     def __init__(self, vault_path: str | Path):
         self.vault_path = Path(vault_path)
-        self.template_loader = TemplateLoader(self.vault_path)
         self.template_processor = TemplateProcessor()
+        self.template_loader = TemplateLoader(
+            self.vault_path, self.template_processor.compiler
+        )
         self.note_generator = NoteGenerator(self.template_processor)
         self.validator = TemplateValidator()
 
@@ -52,7 +54,7 @@ class TemplateEngine:
             if isinstance(base_context.get("timestamp"), datetime):
                 base_context["timestamp"] = base_context["timestamp"].isoformat()
 
-        template = await self.template_loader.load_template(template_name)
+        template = await self.template_loader.load_compiled_template(template_name)
         return await self.note_generator.generate_message_note(
             template, content, author, channel, timestamp, base_context
         )
@@ -67,7 +69,7 @@ class TemplateEngine:
         if date is None:
             date = datetime.now()
 
-        template = await self.template_loader.load_template(template_name)
+        template = await self.template_loader.load_compiled_template(template_name)
         return await self.note_generator.generate_daily_note(template, date, tasks)
 
     async def create_template_context(
@@ -152,7 +154,7 @@ tags: [memo, fallback]
             )
         else:
             # Template name - load from file
-            template = await self.template_loader.load_template(
+            template = await self.template_loader.load_compiled_template(
                 template_name_or_content
             )
             return await self.template_processor.render_template(template, context)
@@ -507,9 +509,11 @@ tags: [review_required, {{ category | default:"general" }}]
         self, template_name: str, context: dict[str, Any]
     ) -> GeneratedNote:
         """テンプレートからノートを生成"""
-        template = await self.template_loader.load_template(template_name)
+        template = await self.template_loader.load_compiled_template(template_name)
 
-        is_valid, errors = await self.validator.validate_template(template, context)
+        is_valid, errors = await self.validator.validate_template(
+            template.source, context
+        )
         if not is_valid:
             timestamp = datetime.now()
             fallback_content = context.get("content", "エラーのためフォールバック")
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any
 
 from .base import GeneratedNote
+from .compiler import CompiledTemplate
 from .processor import TemplateProcessor
 from .validator import TemplateValidator
 
@@ -17,7 +18,7 @@ class NoteGenerator:
 
     async def generate_message_note(
         self,
-        template: str,
+        template: str | CompiledTemplate,
         content: str,
         author: str,
         channel: str,
@@ -29,7 +30,8 @@ class NoteGenerator:
             content, author, channel, timestamp, additional_context
         )
 
-        is_valid, errors = await self.validator.validate_template(template, context)
+        source = template.source if isinstance(template, CompiledTemplate) else template
+        is_valid, errors = await self.validator.validate_template(source, context)
         if not is_valid:
             raise ValueError(f"Template validation failed: {errors}")
 
@@ -43,7 +45,10 @@ class NoteGenerator:
         )
 
     async def generate_daily_note(
-        self, template: str, date: datetime, tasks: list[Any] | None = None
+        self,
+        template: str | CompiledTemplate,
+        date: datetime,
+        tasks: list[Any] | None = None,
     ) -> GeneratedNote:
         """デイリーノートを生成"""
         context = {
@@ -63,7 +68,8 @@ class NoteGenerator:
             "task_count": len(tasks) if tasks else 0,
         }
 
-        is_valid, errors = await self.validator.validate_template(template, context)
+        source = template.source if isinstance(template, CompiledTemplate) else template
+        is_valid, errors = await self.validator.validate_template(source, context)
         if not is_valid:
             raise ValueError(f"Template validation failed: {errors}")
 
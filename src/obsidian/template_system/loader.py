@@ -7,23 +7,42 @@ import aiofiles
 
 from src.utils.logger import logger
 
+from .compiler import CompiledTemplate, TemplateCompiler
+
 
 class TemplateLoader:
-    """テンプレートの読み込みと管理を担当"""
+    """テンプレートの読み込みと管理を担当
+
+    読み込んだテンプレートとそのコンパイル結果はテンプレート名と
+    ファイルの mtime で管理し、ファイルが更新された場合のみ再読み込みする。
+    """
 
-    def __init__(self, vault_path: Path):
+    def __init__(self, vault_path: Path, compiler: TemplateCompiler | None = None):
         self.vault_path = Path(vault_path)
         self.template_path = self.vault_path / "90_Meta" / "Templates"
+        self.compiler = compiler or TemplateCompiler()
         self.cached_templates: dict[str, str] = {}
         self.template_inheritance_cache: dict[str, str] = {}
+        self._template_mtimes: dict[str, int] = {}
+        self._compiled_templates: dict[str, tuple[int, CompiledTemplate]] = {}
+
+    def _template_mtime(self, template_name: str) -> int | None:
+        try:
+            return (self.template_path / f"{template_name}.md").stat().st_mtime_ns
+        except OSError:
+            return None
 
     async def load_template(self, template_name: str) -> str:
         """テンプレートファイルを読み込む"""
-        if template_name in self.cached_templates:
+        mtime = self._template_mtime(template_name)
+        # 手動で登録されたキャッシュ（mtime 記録なし）はそのまま使う
+        if template_name in self.cached_templates and (
+            mtime is None or self._template_mtimes.get(template_name, mtime) == mtime
+        ):
             return self.cached_templates[template_name]
 
         template_file = self.template_path / f"{template_name}.md"
-        if not template_file.exists():
+        if mtime is None:
             raise FileNotFoundError(f"Template not found: {template_name}")
 
         async with aiofiles.open(template_file, encoding="utf-8") as f:
@@ -31,9 +50,27 @@ class TemplateLoader:
 
         processed_content = await self._process_template_inheritance(content)
         self.cached_templates[template_name] = processed_content
+        self._template_mtimes[template_name] = mtime
         logger.debug(f"Loaded and cached template: {template_name}")
         return processed_content
 
+    async def load_compiled_template(self, template_name: str) -> CompiledTemplate:
+        """コンパイル済みテンプレートを取得（名前と mtime でキャッシュ）"""
+        source = await self.load_template(template_name)
+        mtime = self._template_mtimes.get(template_name, 0)
+
+        cached = self._compiled_templates.get(template_name)
+        if cached is not None and cached[0] == mtime and cached[1].source == source:
+            return cached[1]
+
+        compiled = self.compiler.compile(source)
+        self._compiled_templates[template_name] = (mtime, compiled)
+        if not compiled.supported:
+            logger.debug(
+                f"Template uses syntax handled by the legacy pipeline: {template_name}"
+            )
+        return compiled
+
     async def _process_template_inheritance(self, content: str) -> str:
         """テンプレート継承を処理"""
         if content in self.template_inheritance_cache:
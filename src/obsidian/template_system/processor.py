@@ -7,29 +7,50 @@ from typing import Any
 
 from src.utils.mixins import LoggerMixin
 
+from .compiler import CompiledSegment, CompiledTemplate, TemplateCompiler
+
+# インラインテンプレート（名前なし）のコンパイル結果を保持する上限
+INLINE_TEMPLATE_CACHE_SIZE = 128
+
 
 class TemplateProcessor(LoggerMixin):
-    """テンプレート変数置換とレンダリング処理"""
+    """テンプレート変数置換とレンダリング処理
+
+    テンプレートは一度だけ :class:`TemplateCompiler` でレンダリングツリーに
+    変換され、以降はコンテキストを 1 パスで適用する。コンパイラが扱えない
+    構文（extends/block やネストしたブロック）を含むテンプレートは従来の
+    正規表現パイプライン（``_compile_template_legacy``）で処理する。
+    """
+
+    def __init__(self) -> None:
+        self.compiler = TemplateCompiler()
+        self._inline_cache: dict[str, CompiledTemplate] = {}
+
+    def compile(self, template: str) -> CompiledTemplate:
+        """テンプレート文字列をコンパイル（同一文字列は再利用）"""
+        compiled = self._inline_cache.get(template)
+        if compiled is None:
+            compiled = self.compiler.compile(template)
+            if len(self._inline_cache) >= INLINE_TEMPLATE_CACHE_SIZE:
+                self._inline_cache.pop(next(iter(self._inline_cache)))
+            self._inline_cache[template] = compiled
+        return compiled
 
     async def render_template(
-        self, template: str, context: dict[str, Any]
+        self, template: str | CompiledTemplate, context: dict[str, Any]
     ) -> tuple[str, Any]:
         """テンプレートをレンダリングし、フロントマターとコンテンツを分離"""
         from .yaml_generator import YAMLFrontmatterGenerator
 
-        frontmatter_match = re.match(
-            r"^---\s*\n(.*?)\n---\s*\n(.*)$", template, re.DOTALL
-        )
-
-        if frontmatter_match:
-            frontmatter_content = frontmatter_match.group(1)
-            body_content = frontmatter_match.group(2)
+        if isinstance(template, str):
+            template = self.compile(template)
 
+        if template.frontmatter is not None:
             # フロントマター部分をテンプレート処理
-            compiled_frontmatter_text = await self._compile_template(
-                frontmatter_content, context
+            compiled_frontmatter_text = await self._render_segment(
+                template.frontmatter, context
             )
-            compiled_body = await self._compile_template(body_content, context)
+            compiled_body = await self._render_segment(template.body, context)
 
             # YAML 生成器を使用して適切な YAML 構造を生成
             yaml_generator = YAMLFrontmatterGenerator()
@@ -50,9 +71,18 @@ class TemplateProcessor(LoggerMixin):
 
             return full_content, frontmatter_dict
         else:
-            compiled_content = await self._compile_template(template, context)
+            compiled_content = await self._render_segment(template.body, context)
             return compiled_content, None
 
+    async def _render_segment(
+        self, segment: CompiledSegment, context: dict[str, Any]
+    ) -> str:
+        rendered = segment.render(context, self)
+        if rendered is None:
+            # 非対応構文、または値にマーカー文字が含まれる場合
+            return await self._compile_template_legacy(segment.source, context)
+        return rendered
+
     def _parse_frontmatter_text(self, frontmatter_text: str) -> dict[str, Any]:
         """
         テンプレート処理されたフロントマターテキストを辞書に変換
@@ -159,7 +189,19 @@ class TemplateProcessor(LoggerMixin):
         return value
 
     async def _compile_template(self, template: str, context: dict[str, Any]) -> str:
-        """テンプレートコンパイル"""
+        """テンプレートコンパイル（フロントマター分割なし）"""
+        return await self._render_segment(
+            self.compiler.compile_segment(template), context
+        )
+
+    async def _compile_template_legacy(
+        self, template: str, context: dict[str, Any]
+    ) -> str:
+        """正規表現パイプラインによるテンプレート処理
+
+        コンパイラが扱えないセグメントのフォールバック（``_render_segment``）で、
+        コンパイル結果との一致は ``tests/unit/test_template_compiler.py`` で検証する。
+        """
         compiled = template
 
         # Process template inheritance first (extends/block)
@@ -673,96 +715,97 @@ class TemplateProcessor(LoggerMixin):
         function_pattern = r"\{\{\s*(\w+)\((.*?)\)\s*\}\}"
 
         def process_function(match):
-            func_name = match.group(1)
-            args = match.group(2)
-
-            if func_name == "tag_list":
-                if args in context and isinstance(context[args], list):
-                    tags = context[args]
-                    return " ".join(f"#{tag}" for tag in tags)
-                return ""
-            elif func_name == "date_format":
-                parts = [p.strip().strip("\"'") for p in args.split(",")]
-                if len(parts) >= 2:
-                    var_name = parts[0]
-                    format_str = parts[1]
-                    if var_name in context:
-                        value = context[var_name]
-                        if isinstance(value, datetime):
-                            return value.strftime(format_str)
-                return args
-            elif func_name == "now":
-                if args:
-                    try:
-                        return datetime.now().strftime(args.strip("\"'"))
-                    except ValueError:
-                        return datetime.now().isoformat()
-                return datetime.now().isoformat()
-            elif func_name == "today":
-                if args:
-                    try:
-                        return datetime.now().strftime(args.strip("\"'"))
-                    except ValueError:
-                        return datetime.now().strftime("%Y-%m-%d")
-                return datetime.now().strftime("%Y-%m-%d")
-            elif func_name == "truncate":
-                parts = args.split(",")
-                if len(parts) >= 2:
-                    var_name = parts[0].strip()
-                    try:
-                        max_len = int(parts[1].strip())
-                        if var_name in context:
-                            text = str(context[var_name])
-                            return (
-                                text[:max_len] + "..." if len(text) > max_len else text
-                            )
-                    except ValueError:
-                        pass
-                return args
-            elif func_name == "number_format":
-                parts = args.split(",")
-                if len(parts) >= 2:
-                    var_name = parts[0].strip()
-                    format_type = parts[1].strip().strip("\"'").strip()
-                    if var_name in context:
-                        value = context[var_name]
-                        if format_type == "currency" and isinstance(value, int | float):
-                            return f"¥{value:,.0f}"
-                        elif format_type == "percent" and isinstance(
-                            value, int | float
-                        ):
-                            return f"{value * 100:.1f}%"
-                return args
-            elif func_name == "length":
-                if args in context:
-                    value = context[args]
-                    if hasattr(value, "__len__"):
-                        return str(len(value))
-                return "0"
-            elif func_name == "default":
-                parts = args.split(",")
-                if len(parts) >= 2:
-                    var_name = parts[0].strip()
-                    default_val = parts[1].strip().strip("\"'").strip()
-                    value = context.get(var_name, default_val)
-                    if value is None:
-                        return default_val
-                    return str(value)
-                return args
-            elif func_name == "conditional":
-                parts = args.split(",")
-                if len(parts) >= 3:
-                    var_name = parts[0].strip()
-                    true_val = parts[1].strip().strip("\"'").strip()
-                    false_val = parts[2].strip().strip("\"'").strip()
-                    condition_result = context.get(var_name, False)
-                    return true_val if condition_result else false_val
-                return args
-
-            return match.group(0)
+            return self._call_custom_function(
+                match.group(1), match.group(2), context, match.group(0)
+            )
 
         return re.sub(function_pattern, process_function, content)
 
+    def _call_custom_function(
+        self, func_name: str, args: str, context: dict[str, Any], original: str
+    ) -> str:
+        """カスタム関数を 1 つ評価（未知の関数は元のタグを返す）"""
+        if func_name == "tag_list":
+            if args in context and isinstance(context[args], list):
+                tags = context[args]
+                return " ".join(f"#{tag}" for tag in tags)
+            return ""
+        elif func_name == "date_format":
+            parts = [p.strip().strip("\"'") for p in args.split(",")]
+            if len(parts) >= 2:
+                var_name = parts[0]
+                format_str = parts[1]
+                if var_name in context:
+                    value = context[var_name]
+                    if isinstance(value, datetime):
+                        return value.strftime(format_str)
+            return args
+        elif func_name == "now":
+            if args:
+                try:
+                    return datetime.now().strftime(args.strip("\"'"))
+                except ValueError:
+                    return datetime.now().isoformat()
+            return datetime.now().isoformat()
+        elif func_name == "today":
+            if args:
+                try:
+                    return datetime.now().strftime(args.strip("\"'"))
+                except ValueError:
+                    return datetime.now().strftime("%Y-%m-%d")
+            return datetime.now().strftime("%Y-%m-%d")
+        elif func_name == "truncate":
+            parts = args.split(",")
+            if len(parts) >= 2:
+                var_name = parts[0].strip()
+                try:
+                    max_len = int(parts[1].strip())
+                    if var_name in context:
+                        text = str(context[var_name])
+                        return text[:max_len] + "..." if len(text) > max_len else text
+                except ValueError:
+                    pass
+            return args
+        elif func_name == "number_format":
+            parts = args.split(",")
+            if len(parts) >= 2:
+                var_name = parts[0].strip()
+                format_type = parts[1].strip().strip("\"'").strip()
+                if var_name in context:
+                    value = context[var_name]
+                    if format_type == "currency" and isinstance(value, int | float):
+                        return f"¥{value:,.0f}"
+                    elif format_type == "percent" and isinstance(value, int | float):
+                        return f"{value * 100:.1f}%"
+            return args
+        elif func_name == "length":
+            if args in context:
+                value = context[args]
+                if hasattr(value, "__len__"):
+                    return str(len(value))
+            return "0"
+        elif func_name == "default":
+            parts = args.split(",")
+            if len(parts) >= 2:
+                var_name = parts[0].strip()
+                default_val = parts[1].strip().strip("\"'").strip()
+                value = context.get(var_name, default_val)
+                if value is None:
+                    return default_val
+                return str(value)
+            return args
+        elif func_name == "conditional":
+            parts = args.split(",")
+            if len(parts) >= 3:
+                var_name = parts[0].strip()
+                true_val = parts[1].strip().strip("\"'").strip()
+                false_val = parts[2].strip().strip("\"'").strip()
+                condition_result = context.get(var_name, False)
+                return true_val if condition_result else false_val
+            return args
+
+        return original
+
     async def _process_includes(self, content: str, context: dict[str, Any]) -> str:
         """インクルード処理"""
         include_pattern = r"\{\{\s*include\s+['\"](.+?)['\"]\s*\}\}"
@@ -859,10 +859,12 @@ class YAMLFrontmatterGenerator:
     def _find_related_notes(self, content: str, vault_path: str) -> list[str]:
         """
         コンテンツの類似性に基づいて関連ノートを検索
-        簡易的なキーワードベース検索を実装
+        Vault のキーワード転置インデックスを参照する（共有キーワード 2 つ以上）
         """
         import os
 
+        from src.obsidian.search.keyword_index import get_keyword_index
+
         if not os.path.exists(vault_path):
             return []
 
@@ -871,101 +873,16 @@ class YAMLFrontmatterGenerator:
         if not keywords:
             return []
 
-        related_notes = []
-
         try:
-            # .md ファイルを検索
-            for root, _dirs, files in os.walk(vault_path):
-                for file in files:
-                    if file.endswith(".md"):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, encoding="utf-8") as f:
-                                file_content = f.read()
-
-                            # キーワードマッチング
-                            matches = sum(
-                                1
-                                for keyword in keywords
-                                if keyword.lower() in file_content.lower()
-                            )
-                            if matches >= 2:  # 2 つ以上のキーワードがマッチ
-                                note_name = os.path.splitext(file)[0]
-                                related_notes.append((note_name, matches))
-
-                        except (UnicodeDecodeError, PermissionError):
-                            continue
+            return get_keyword_index(vault_path).find_related(keywords)
         except Exception:
             return []
 
-        # マッチ数でソートし、ノート名のみ返す
-        related_notes.sort(key=lambda x: x[1], reverse=True)
-        return [note[0] for note in related_notes[:5]]
-
     def _extract_keywords(self, content: str, min_length: int = 3) -> list[str]:
-        """コンテンツから重要なキーワードを抽出"""
-        import re
-        from collections import Counter
-
-        # 日本語と英語の単語を分けて処理
-        keywords = []
-
-        # 英語の単語を抽出（小文字に変換）
-        english_words = re.findall(r"\b[a-zA-Z]+\b", content.lower())
-        keywords.extend([word for word in english_words if len(word) >= min_length])
-
-        # 日本語の単語を抽出（カタカナ、ひらがな、漢字）
-        japanese_pattern = r"[ぁ-んァ-ヶー一-龯]+"
-        japanese_words = re.findall(japanese_pattern, content)
-        keywords.extend([word for word in japanese_words if len(word) >= min_length])
-
-        # ストップワード（簡易版）
-        stopwords = {
-            "the",
-            "is",
-            "at",
-            "which",
-            "on",
-            "and",
-            "or",
-            "but",
-            "if",
-            "then",
-            "with",
-            "for",
-            "from",
-            "about",
-            "が",
-            "の",
-            "を",
-            "に",
-            "は",
-            "で",
-            "と",
-            "から",
-            "まで",
-            "より",
-            "です",
-            "である",
-            "します",
-            "して",
-            "した",
-            "する",
-            "ます",
-            "ました",
-            "について",
-        }
-
-        # フィルタリング
-        filtered_keywords = [
-            word
-            for word in keywords
-            if len(word) >= min_length and word not in stopwords
-        ]
+        """コンテンツから重要なキーワードを抽出（頻度順で上位 10 件）"""
+        from src.obsidian.search.keyword_index import top_keywords
 
-        # 重複を除去し、頻度順で上位を選択
-        word_freq = Counter(filtered_keywords)
-        return [word for word, count in word_freq.most_common(10)]
+        return top_keywords(content, limit=10, min_length=min_length)
 
     def _generate_obsidian_metadata(
         self, title: str, content: str, **kwargs
@@ -2,18 +2,20 @@
 Access logging and security monitoring for MindBridge
 """
 
-import asyncio
 import json
 import os
-from collections import defaultdict
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
-import aiofiles
-
 from src.config import get_settings
+from src.security.log_writer import BackgroundLineWriter
+from src.security.window_counters import HourlyRollup, UserWindowCounters
 from src.utils.mixins import LoggerMixin
 
 
@@ -117,12 +119,16 @@ class AccessLogger(LoggerMixin):
         log_file: Path | None = None,
         max_log_file_size: int | None = None,
         max_backup_files: int | None = None,
+        flush_batch_size: int = 100,
+        flush_interval: float = 1.0,
     ):
         """Create a security access logger instance.
 
         ローテーションはデフォルトで 5 MB × 5 世代（約 25 MB）に設定され、
         `get_access_logger()` 経由で Settings (`ACCESS_LOG_ROTATION_SIZE_MB`,
         `ACCESS_LOG_ROTATION_BACKUPS`) から上書きされる。
+        ファイルへの書き込みはバックグラウンドスレッドがまとめて行い、
+        `flush_batch_size` 件たまるか `flush_interval` 秒経過で追記する。
         """
         self.log_file = log_file or Path("logs/security_access.jsonl")
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -148,22 +154,33 @@ class AccessLogger(LoggerMixin):
                     log_file=str(self.log_file),
                 )
 
-        # In-memory tracking for real-time analysis
-        self.recent_events: list[SecurityEvent] = []  # Last 1000 events
-        self.failed_attempts: defaultdict[str, list[datetime]] = defaultdict(
-            list
-        )  # Track failed attempts by user
-        self.rate_limits: defaultdict[str, list[datetime]] = defaultdict(
-            list
-        )  # Track rate limiting by user
-        self.suspicious_patterns: list[SecurityEvent] = []
-
         # Configuration （個人使用向けに大幅簡素化）
         self.max_recent_events = 100  # 個人使用では 100 イベントで十分
+
         self.failed_attempt_threshold = 20  # 個人使用では緩和
         self.failed_attempt_window = timedelta(hours=1)  # 個人使用では長めに設定
         self.rate_limit_threshold = 200  # 個人使用では高めに設定
         self.rate_limit_window = timedelta(minutes=30)  # 個人使用では長めに設定
+        # 個人使用では rapid command execution は正常なので閾値を大幅に緩和
+        self.command_burst_threshold = 50
+        self.command_burst_window = timedelta(minutes=5)
+        self.suspicious_flag_window = timedelta(hours=1)
+
+        # In-memory tracking for real-time analysis
+        self.recent_events: deque[SecurityEvent] = deque(maxlen=self.max_recent_events)
+        # Sliding-window counts per user (O(1) per event, idle users evicted)
+        self.failed_attempts = UserWindowCounters(
+            self.failed_attempt_window.total_seconds()
+        )
+        self.rate_limits = UserWindowCounters(self.rate_limit_window.total_seconds())
+        self.command_counts = UserWindowCounters(
+            self.command_burst_window.total_seconds()
+        )
+        # Hourly totals backing get_security_report
+        self.hourly_rollup = HourlyRollup()
+        self.suspicious_patterns: deque[SecurityEvent] = deque(maxlen=1000)
+        # Users flagged recently -> time of their last flag
+        self._flagged_users: OrderedDict[str, float] = OrderedDict()
         self.max_log_file_size = (
             max_log_file_size if max_log_file_size is not None else 5 * 1024 * 1024
         )
@@ -171,29 +188,37 @@ class AccessLogger(LoggerMixin):
             max_backup_files if max_backup_files is not None else 5
         )  # security logローテーション保持数
 
+        # ローテーション判定用に書き込み済みバイト数を数える（毎回 stat しない）
+        self._bytes_written = self.log_file.stat().st_size
+        self._writer = BackgroundLineWriter(
+            self._write_lines_sync,
+            batch_size=flush_batch_size,
+            flush_interval=flush_interval,
+            name="security-log-writer",
+        )
+
     async def log_event(self, event: SecurityEvent) -> None:
         """Log a security event"""
-        # Add to recent events
+        # Add to recent events (the deque drops the oldest)
         self.recent_events.append(event)
-        if len(self.recent_events) > self.max_recent_events:
-            self.recent_events.pop(0)
 
-        # Track failed attempts
-        if not event.success and event.user_id:
-            self.failed_attempts[event.user_id].append(event.timestamp)
-            self._cleanup_old_attempts(event.user_id)
+        now = event.timestamp.timestamp()
+        self.hourly_rollup.record(
+            now, event.event_type.value, event.user_id, event.success
+        )
 
-        # Track rate limiting
         if event.user_id:
-            self.rate_limits[event.user_id].append(event.timestamp)
-            self._cleanup_old_rate_limits(event.user_id)
+            # Track failed attempts
+            if not event.success:
+                self.failed_attempts.add(event.user_id, now)
+            # Track rate limiting
+            self.rate_limits.add(event.user_id, now)
 
         # Check for suspicious activity
         await self._analyze_suspicious_activity(event)
 
-        # Write to log file
-        await self._write_to_file(event)
-        await self._rotate_logs_if_needed()
+        # Queue for the background writer
+        self._write_to_file(event)
 
         # Log to application logger
         self.logger.info(
@@ -204,32 +229,54 @@ class AccessLogger(LoggerMixin):
             success=event.success,
         )
 
-    async def _write_to_file(self, event: SecurityEvent) -> None:
-        """Write event to log file in JSONL format"""
+    def _write_to_file(self, event: SecurityEvent) -> None:
+        """Queue event for the log file in JSONL format"""
         try:
-            async with aiofiles.open(self.log_file, "a") as f:
-                await f.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+            self._writer.append(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
         except Exception as e:
             self.logger.error(f"Failed to write security log: {e}")
 
-    async def _rotate_logs_if_needed(self) -> None:
-        """Rotate security logs when they exceed the configured size."""
-        if self.max_log_file_size <= 0:
-            return
-
-        try:
-            await asyncio.to_thread(self._rotate_logs_sync)
-        except Exception as exc:
-            self.logger.error(f"Failed to rotate security logs: {exc}")
+    async def flush(self) -> None:
+        """Wait until every logged event has been written to the log file."""
+        await self._writer.flush()
+
+    def close(self) -> None:
+        """Write buffered events and stop the background writer."""
+        self._writer.close()
+
+    def _write_lines_sync(self, lines: list[str]) -> None:
+        """Append a batch of lines (writer thread), rotating at the size limit."""
+        start = 0
+        while start < len(lines):
+            limit = self.max_log_file_size
+            chunk: list[bytes] = []
+            for line in islice(lines, start, None):
+                encoded = line.encode("utf-8")
+                chunk.append(encoded)
+                self._bytes_written += len(encoded)
+                if 0 < limit <= self._bytes_written:
+                    break
+            start += len(chunk)
+
+            with self.log_file.open("ab") as f:
+                f.write(b"".join(chunk))
+
+            if 0 < limit <= self._bytes_written:
+                try:
+                    self._rotate_logs_sync()
+                except Exception as exc:
+                    self.logger.error(f"Failed to rotate security logs: {exc}")
 
     def _rotate_logs_sync(self) -> None:
-        """Rotate the log file synchronously (used via asyncio.to_thread)."""
+        """Rotate the log file once the bytes written reach the size limit."""
         if not self.log_file.exists():
+            self._bytes_written = 0
             return
 
         if self.max_backup_files < 1:
             self.log_file.unlink(missing_ok=True)
             self.log_file.touch()
+            self._bytes_written = 0
             if hasattr(os, "chmod"):
                 try:
                     os.chmod(self.log_file, 0o600)
@@ -240,9 +287,6 @@ class AccessLogger(LoggerMixin):
                     )
             return
 
-        if self.log_file.stat().st_size < self.max_log_file_size:
-            return
-
         oldest_backup = self.log_file.with_name(
             f"{self.log_file.name}.{self.max_backup_files}"
         )
@@ -260,6 +304,7 @@ class AccessLogger(LoggerMixin):
         if backup_path.exists():
             backup_path.unlink()
         self.log_file.replace(backup_path)
+        self._bytes_written = 0
         if hasattr(os, "chmod"):
             try:
                 os.chmod(backup_path, 0o600)
@@ -279,27 +324,15 @@ class AccessLogger(LoggerMixin):
                 )
         self.logger.info("Rotated security access log", backup=str(backup_path.name))
 
-    def _cleanup_old_attempts(self, user_id: str) -> None:
-        """Remove old failed attempts outside the window"""
-        cutoff_time = datetime.now() - self.failed_attempt_window
-        self.failed_attempts[user_id] = [
-            ts for ts in self.failed_attempts[user_id] if ts > cutoff_time
-        ]
-
-    def _cleanup_old_rate_limits(self, user_id: str) -> None:
-        """Remove old rate limit entries outside the window"""
-        cutoff_time = datetime.now() - self.rate_limit_window
-        self.rate_limits[user_id] = [
-            ts for ts in self.rate_limits[user_id] if ts > cutoff_time
-        ]
-
     async def _analyze_suspicious_activity(self, event: SecurityEvent) -> None:
         """Analyze event for suspicious patterns"""
         if not event.user_id:
             return
 
+        now = event.timestamp.timestamp()
+
         # Check for excessive failed attempts
-        failed_count = len(self.failed_attempts.get(event.user_id, []))
+        failed_count = self.failed_attempts.count(event.user_id, now)
         if failed_count >= self.failed_attempt_threshold:
             await self._flag_suspicious_activity(
                 event.user_id,
@@ -311,7 +344,7 @@ class AccessLogger(LoggerMixin):
             )
 
         # Check for rate limit violations
-        rate_count = len(self.rate_limits.get(event.user_id, []))
+        rate_count = self.rate_limits.count(event.user_id, now)
         if rate_count >= self.rate_limit_threshold:
             await self._flag_suspicious_activity(
                 event.user_id,
@@ -336,6 +369,17 @@ class AccessLogger(LoggerMixin):
         )
 
         self.suspicious_patterns.append(suspicious_event)
+        flagged_at = suspicious_event.timestamp.timestamp()
+        self.hourly_rollup.record_suspicious(flagged_at)
+        self._flagged_users[user_id] = flagged_at
+        self._flagged_users.move_to_end(user_id)
+        # Oldest flags first: drop the ones outside the window
+        cutoff = flagged_at - self.suspicious_flag_window.total_seconds()
+        while self._flagged_users:
+            oldest_user, last_flag = next(iter(self._flagged_users.items()))
+            if last_flag >= cutoff:
+                break
+            del self._flagged_users[oldest_user]
 
         self.logger.warning(
             "Suspicious activity detected",
@@ -349,109 +393,91 @@ class AccessLogger(LoggerMixin):
         if not event.user_id:
             return
 
-        # Get recent commands from this user
-        recent_commands = [
-            e
-            for e in self.recent_events[-20:]  # Last 20 events
-            if (
-                e.user_id == event.user_id
-                and e.event_type == SecurityEventType.COMMAND_EXECUTION
-                and e.timestamp > datetime.now() - timedelta(minutes=5)
-            )
-        ]
-
-        # 個人使用では rapid command execution は正常なので閾値を大幅に緩和
-        if len(recent_commands) >= 50:
+        # Commands from this user in the burst window
+        command_count = self.command_counts.add(
+            event.user_id, event.timestamp.timestamp()
+        )
+        if command_count >= self.command_burst_threshold:
             await self._flag_suspicious_activity(
                 event.user_id,
                 "Excessive command execution detected",
-                {"command_count": len(recent_commands), "time_window": "5 minutes"},
+                {"command_count": command_count, "time_window": "5 minutes"},
             )
 
     async def get_security_report(self, hours: int = 24) -> dict[str, Any]:
-        """Generate security activity report"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-
-        # Filter events within time window
-        recent_events = [e for e in self.recent_events if e.timestamp > cutoff_time]
-
-        # Aggregate statistics
-        event_types: defaultdict[str, int] = defaultdict(int)
-        user_activity: defaultdict[str, int] = defaultdict(int)
-        failed_events = 0
+        """Generate security activity report
 
-        for event in recent_events:
-            event_types[event.event_type.value] += 1
-            if event.user_id:
-                user_activity[event.user_id] += 1
-            if not event.success:
-                failed_events += 1
+        Counts come from the hourly rollup, so the period is rounded out to
+        whole hours.
+        """
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        summary = self.hourly_rollup.summarize(time.time(), hours)
 
-        # Get recent suspicious activities
+        # Get recent suspicious activities (the latest ones are kept)
         recent_suspicious = [
             e for e in self.suspicious_patterns if e.timestamp > cutoff_time
         ]
 
         return {
             "report_period_hours": hours,
-            "total_events": len(recent_events),
-            "failed_events": failed_events,
-            "success_rate": (len(recent_events) - failed_events)
-            / max(1, len(recent_events))
+            "total_events": summary.total,
+            "failed_events": summary.failed,
+            "success_rate": (summary.total - summary.failed)
+            / max(1, summary.total)
             * 100,
-            "event_types": dict(event_types),
-            "most_active_users": dict(
-                sorted(user_activity.items(), key=lambda x: x[1], reverse=True)[:10]
-            ),
-            "suspicious_activities": len(recent_suspicious),
+            "event_types": dict(summary.event_types),
+            "most_active_users": dict(summary.users.most_common(10)),
+            "suspicious_activities": summary.suspicious,
             "suspicious_events": [e.to_dict() for e in recent_suspicious],
             "generated_at": datetime.now().isoformat(),
         }
 
     def is_user_suspicious(self, user_id: str) -> bool:
         """Check if a user has suspicious activity flags"""
+        now = time.time()
+
         # Check for recent failed attempts
-        if len(self.failed_attempts.get(user_id, [])) >= self.failed_attempt_threshold:
+        if self.failed_attempts.count(user_id, now) >= self.failed_attempt_threshold:
             return True
 
         # Check for recent suspicious events
-        recent_suspicious = [
-            e
-            for e in self.suspicious_patterns
-            if (
-                e.user_id == user_id
-                and e.timestamp > datetime.now() - timedelta(hours=1)
-            )
-        ]
-
-        return len(recent_suspicious) > 0
+        flagged_at = self._flagged_users.get(user_id)
+        return (
+            flagged_at is not None
+            and now - flagged_at < self.suspicious_flag_window.total_seconds()
+        )
 
     async def cleanup_old_logs(self, days: int = 30) -> None:
         """Clean up old log entries"""
+        # 書き込みスレッドで実行し、書き換え中に追記されたバッチを失わない
+        await self._writer.run(partial(self._cleanup_old_logs_sync, days))
+
+    def _cleanup_old_logs_sync(self, days: int) -> None:
+        """Rewrite the log file without entries older than ``days`` (writer thread)."""
         if not self.log_file.exists():
             return
 
         cutoff_time = datetime.now() - timedelta(days=days)
         temp_file = self.log_file.with_suffix(".tmp")
-
         try:
-            async with (
-                aiofiles.open(self.log_file) as infile,
-                aiofiles.open(temp_file, "w") as outfile,
+            with (
+                self.log_file.open(encoding="utf-8") as infile,
+                temp_file.open("w", encoding="utf-8") as outfile,
             ):
-                async for line in infile:
+                for line in infile:
                     try:
                         event_data = json.loads(line.strip())
                         event_time = datetime.fromisoformat(event_data["timestamp"])
 
                         if event_time > cutoff_time:
-                            await outfile.write(line)
+                            outfile.write(line)
                     except (json.JSONDecodeError, KeyError, ValueError):
                         # Keep malformed lines for manual review
-                        await outfile.write(line)
+                        outfile.write(line)
 
             # Replace original file
             temp_file.replace(self.log_file)
+            self._bytes_written = self.log_file.stat().st_size
             self.logger.info(f"Cleaned up security logs older than {days} days")
 
         except Exception as e:
@@ -496,3 +522,9 @@ async def log_security_event(
         success=success,
     )
     await logger.log_event(event)
+
+
+async def flush_access_logger() -> None:
+    """Write buffered security events to disk; call during shutdown."""
+    if _access_logger is not None:
+        await _access_logger.flush()
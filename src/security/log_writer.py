@@ -0,0 +1,173 @@
+"""
+Background writer that appends log lines in batches from a dedicated thread
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import queue
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from functools import partial
+from typing import Any, NamedTuple, TypeVar
+
+import structlog
+
+from src.monitoring.metrics import QUEUE_DEPTH
+
+logger = structlog.get_logger(__name__)
+
+# Writers that may still hold buffered lines, flushed at interpreter exit
+_LIVE_WRITERS: "weakref.WeakSet[BackgroundLineWriter]" = weakref.WeakSet()
+
+_STOP = object()
+
+T = TypeVar("T")
+
+
+class _Call(NamedTuple):
+    func: Callable[[], Any]
+    future: "concurrent.futures.Future[Any]"
+
+
+class BackgroundLineWriter:
+    """Queues lines and hands them to ``write_lines`` in batches.
+
+    ``append`` never blocks or touches the disk. The writer thread passes the
+    buffered lines on once ``batch_size`` of them are waiting or
+    ``flush_interval`` seconds after the first one arrived, whichever comes
+    first. ``write_lines`` runs on the writer thread only, so it never races
+    with itself; ``run`` executes other work on that thread the same way.
+    Lines still buffered at interpreter exit are written by an ``atexit``
+    hook.
+    """
+
+    def __init__(
+        self,
+        write_lines: Callable[[list[str]], None],
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        name: str = "log-writer",
+    ) -> None:
+        self.write_lines = write_lines
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.name = name
+
+        self.lines_written = 0
+        self.batches_written = 0
+
+        self._queue: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+        _LIVE_WRITERS.add(self)
+        QUEUE_DEPTH.set_function(partial(_queued_lines, weakref.ref(self)), queue=name)
+
+    def append(self, line: str) -> None:
+        """Queue a line for the next batch."""
+        self._ensure_thread()
+        self._queue.put(line)
+
+    def flush_sync(self, timeout: float | None = None) -> bool:
+        """Block until every line queued so far has been written."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    async def flush(self) -> None:
+        """Wait (off the event loop) until every queued line has been written."""
+        await asyncio.to_thread(self.flush_sync)
+
+    async def run(self, func: Callable[[], T]) -> T:
+        """Run ``func`` on the writer thread once the queued lines are written.
+
+        Lines appended meanwhile wait until ``func`` returns, so it may
+        rewrite or replace the output file without losing a batch.
+        """
+        self._ensure_thread()
+        future: concurrent.futures.Future[T] = concurrent.futures.Future()
+        self._queue.put(_Call(func, future))
+        return await asyncio.wrap_future(future)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Write the remaining lines and stop the writer thread."""
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        pending: list[str] = []
+        deadline: float | None = None
+        while True:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=max(0.0, timeout))
+                    if timeout is not None
+                    else self._queue.get()
+                )
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+
+            # Batch full, interval elapsed, flush or call requested, or stopping
+            if pending:
+                self._write(pending)
+                pending = []
+            deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif isinstance(item, _Call):
+                if item.future.set_running_or_notify_cancel():
+                    try:
+                        item.future.set_result(item.func())
+                    except BaseException as e:
+                        item.future.set_exception(e)
+            elif item is _STOP:
+                return
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            self.write_lines(lines)
+            self.lines_written += len(lines)
+            self.batches_written += 1
+        except Exception as e:
+            logger.error("Failed to write log batch", writer=self.name, error=str(e))
+
+
+def _queued_lines(ref: "weakref.ref[BackgroundLineWriter]") -> int | None:
+    writer = ref()
+    return writer._queue.qsize() if writer is not None else None
+
+
+@atexit.register
+def _close_live_writers() -> None:
+    for writer in list(_LIVE_WRITERS):
+        writer.close(timeout=2.0)
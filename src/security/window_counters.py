@@ -0,0 +1,164 @@
+"""
+Sliding-window and hourly counters for security event tracking
+
+All timestamps are POSIX seconds (``datetime.timestamp()``).
+"""
+
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+
+class SlidingWindowCounter:
+    """Event count over the last ``window_seconds``, kept in a ring of buckets.
+
+    Adding and counting are O(1) amortized; the window edge is accurate to
+    one bucket (``window_seconds / buckets``).
+    """
+
+    __slots__ = ("bucket_seconds", "last_seen", "_counts", "_head", "_total")
+
+    def __init__(self, window_seconds: float, buckets: int = 60) -> None:
+        self.bucket_seconds = window_seconds / buckets
+        self.last_seen = 0.0
+        self._counts = [0] * buckets
+        self._head: int | None = None
+        self._total = 0
+
+    def add(self, now: float, amount: int = 1) -> None:
+        head = self._advance(now)
+        self._counts[head % len(self._counts)] += amount
+        self._total += amount
+        self.last_seen = max(self.last_seen, now)
+
+    def count(self, now: float) -> int:
+        self._advance(now)
+        return self._total
+
+    def _advance(self, now: float) -> int:
+        """Expire the buckets that left the window; returns the newest bucket."""
+        index = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head = index
+            return index
+        if index <= self._head:
+            # Same bucket, or a late event: counted in the newest bucket
+            return self._head
+        size = len(self._counts)
+        for step in range(1, min(index - self._head, size) + 1):
+            slot = (self._head + step) % size
+            self._total -= self._counts[slot]
+            self._counts[slot] = 0
+        self._head = index
+        return index
+
+
+class UserWindowCounters:
+    """Per-user sliding-window counters with idle and capacity eviction.
+
+    Users are kept in least-recently-seen order, so users idle for longer
+    than the window (whose count is necessarily zero) are dropped from the
+    front in O(1) per event. ``max_users`` bounds memory under churn.
+    """
+
+    def __init__(
+        self, window_seconds: float, buckets: int = 60, max_users: int = 10_000
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.max_users = max_users
+        self._counters: OrderedDict[str, SlidingWindowCounter] = OrderedDict()
+
+    def add(self, user_id: str, now: float) -> int:
+        """Count one event for the user and return the user's count in the window."""
+        counter = self._counters.get(user_id)
+        if counter is None:
+            counter = self._counters[user_id] = SlidingWindowCounter(
+                self.window_seconds, self.buckets
+            )
+        else:
+            self._counters.move_to_end(user_id)
+        counter.add(now)
+        self._evict(now)
+        return counter.count(now)
+
+    def count(self, user_id: str, now: float | None = None) -> int:
+        counter = self._counters.get(user_id)
+        if counter is None:
+            return 0
+        return counter.count(time.time() if now is None else now)
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._counters
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._counters:
+            user_id, counter = next(iter(self._counters.items()))
+            if counter.last_seen >= cutoff and len(self._counters) <= self.max_users:
+                break
+            del self._counters[user_id]
+
+
+@dataclass
+class HourlyStats:
+    """Pre-aggregated event counts for one hour."""
+
+    total: int = 0
+    failed: int = 0
+    suspicious: int = 0
+    event_types: Counter[str] = field(default_factory=Counter)
+    users: Counter[str] = field(default_factory=Counter)
+
+
+class HourlyRollup:
+    """Event counts per hour for the last ``retention_hours`` hours."""
+
+    def __init__(self, retention_hours: int = 24 * 7) -> None:
+        self.retention_hours = retention_hours
+        self._hours: OrderedDict[int, HourlyStats] = OrderedDict()
+
+    def record(
+        self,
+        now: float,
+        event_type: str,
+        user_id: str | None,
+        success: bool,
+    ) -> None:
+        stats = self._hour(now)
+        stats.total += 1
+        stats.event_types[event_type] += 1
+        if user_id:
+            stats.users[user_id] += 1
+        if not success:
+            stats.failed += 1
+
+    def record_suspicious(self, now: float) -> None:
+        self._hour(now).suspicious += 1
+
+    def summarize(self, now: float, hours: int) -> HourlyStats:
+        """Totals over the hours that overlap the last ``hours`` hours."""
+        first_hour = int((now - hours * 3600) // 3600)
+        summary = HourlyStats()
+        for hour, stats in self._hours.items():
+            if hour < first_hour:
+                continue
+            summary.total += stats.total
+            summary.failed += stats.failed
+            summary.suspicious += stats.suspicious
+            summary.event_types.update(stats.event_types)
+            summary.users.update(stats.users)
+        return summary
+
+    def _hour(self, now: float) -> HourlyStats:
+        hour = int(now // 3600)
+        stats = self._hours.get(hour)
+        if stats is None:
+            stats = self._hours[hour] = HourlyStats()
+            oldest = hour - self.retention_hours
+            while self._hours and next(iter(self._hours)) <= oldest:
+                self._hours.popitem(last=False)
+        return stats
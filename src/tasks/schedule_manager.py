@@ -12,6 +12,7 @@ from structlog import get_logger
 from src.config import get_settings
 from src.obsidian import ObsidianFileManager
 from src.tasks.models import Schedule, ScheduleType
+from src.utils.json_store import AtomicJsonWriter
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -26,6 +27,7 @@ class ScheduleManager:
 
         # Ensure tasks directory exists
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
+        self._schedules_writer = AtomicJsonWriter(self.data_file, prefix="schedules_")
 
     async def create_schedule(
         self,
@@ -226,17 +228,7 @@ class ScheduleManager:
     async def _save_schedules(self, schedules: dict[str, Schedule]) -> None:
         """Save schedules to JSON file."""
         try:
-            data = {}
-            for schedule_id, schedule in schedules.items():
-                if isinstance(schedule, Schedule):
-                    data[schedule_id] = schedule.dict()
-                else:
-                    data[schedule_id] = schedule
-
-            async with aiofiles.open(self.data_file, "w", encoding="utf-8") as f:
-                await f.write(
-                    json.dumps(data, indent=2, default=str, ensure_ascii=False)
-                )
+            await self._schedules_writer.write(schedules)
         except Exception as e:
             logger.error("Failed to save schedules", error=str(e))
 
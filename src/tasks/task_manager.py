@@ -1,21 +1,18 @@
 """Task management functionality."""
 
-import asyncio
-import json
-import os
-import tempfile
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import aiofiles
 from structlog import get_logger
 
 from src.config import get_settings
 from src.obsidian import ObsidianFileManager
 from src.obsidian.models import VaultFolder
 from src.tasks.models import Task, TaskPriority, TaskStatus
+from src.tasks.task_repository import TaskRepository
+from src.utils.json_store import AtomicJsonWriter
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -33,6 +30,10 @@ class TaskManager:
         # Ensure tasks directory exists
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Loaded-once task cache with indexes; writes go through atomically
+        self._tasks_writer = AtomicJsonWriter(self.data_file, prefix="tasks_")
+        self.repository = TaskRepository(self.data_file, self._write_tasks_atomic)
+
     async def create_task(
         self,
         title: str,
@@ -61,9 +62,7 @@ class TaskManager:
             parent_task_id=parent_task_id,
         )
 
-        tasks = await self._load_tasks()
-        tasks[task.id] = task
-        await self._save_tasks(tasks)
+        await self.repository.put(task)
 
         # Create Obsidian note for the task
         await self._create_task_note(task)
@@ -79,12 +78,7 @@ class TaskManager:
 
     async def get_task(self, task_id: str) -> Task | None:
         """Get task by ID."""
-        tasks = await self._load_tasks()
-        task_data = tasks.get(task_id)
-
-        if task_data:
-            return Task(**task_data) if isinstance(task_data, dict) else task_data
-        return None
+        return await self.repository.get(task_id)
 
     async def list_tasks(
         self,
@@ -95,29 +89,15 @@ class TaskManager:
         include_subtasks: bool = True,
     ) -> list[Task]:
         """List tasks with optional filtering."""
-        tasks = await self._load_tasks()
-
-        result = []
-        for task_data in tasks.values():
-            task = Task(**task_data) if isinstance(task_data, dict) else task_data
-
-            # Apply filters
-            if status and task.status != status:
-                continue
-
-            if priority and task.priority != priority:
-                continue
-
-            if project and task.project != project:
-                continue
-
-            if active_only and task.status in [TaskStatus.DONE, TaskStatus.CANCELLED]:
-                continue
-
-            if not include_subtasks and task.parent_task_id:
-                continue
+        result = await self.repository.query(
+            status=status,
+            priority=priority,
+            project=project,
+            active_only=active_only,
+        )
 
-            result.append(task)
+        if not include_subtasks:
+            result = [task for task in result if not task.parent_task_id]
 
         # Sort by priority, then due date, then created date
         def sort_key(task: Task) -> tuple[int, date | None, datetime]:
@@ -142,22 +122,17 @@ class TaskManager:
         **updates: Any,
     ) -> Task | None:
         """Update task details."""
-        tasks = await self._load_tasks()
-
-        if task_id not in tasks:
+        task = await self.repository.get(task_id)
+        if not task:
             return None
 
-        task_data = tasks[task_id]
-        task = Task(**task_data) if isinstance(task_data, dict) else task_data
-
         # Update fields
         for field, value in updates.items():
             if hasattr(task, field):
                 setattr(task, field, value)
 
         task.updated_at = datetime.now()
-        tasks[task_id] = task
-        await self._save_tasks(tasks)
+        await self.repository.put(task)
 
         # Update Obsidian note
         await self._update_task_note(task)
@@ -194,9 +169,7 @@ class TaskManager:
                 task.notes = f"[{datetime.now().strftime('%Y-%m-%d %H:%M')}] {notes}"
 
         # Save updated task
-        tasks = await self._load_tasks()
-        tasks[task_id] = task
-        await self._save_tasks(tasks)
+        await self.repository.put(task)
 
         # Update Obsidian note
         await self._update_task_note(task)
@@ -236,9 +209,7 @@ class TaskManager:
                 task.notes = f"[完了] {completion_notes}"
 
         # Save updated task
-        tasks = await self._load_tasks()
-        tasks[task_id] = task
-        await self._save_tasks(tasks)
+        await self.repository.put(task)
 
         # Update Obsidian note
         await self._update_task_note(task)
@@ -254,25 +225,17 @@ class TaskManager:
 
     async def get_overdue_tasks(self) -> list[Task]:
         """Get all overdue tasks."""
-        tasks = await self.list_tasks(active_only=True)
-        return [task for task in tasks if task.is_overdue()]
+        yesterday = date.today() - timedelta(days=1)
+        return await self.repository.due_on_or_before(yesterday)
 
     async def get_due_soon_tasks(self, days: int = 3) -> list[Task]:
         """Get tasks due within specified days."""
-        tasks = await self.list_tasks(active_only=True)
-        return [task for task in tasks if task.is_due_soon(days)]
+        limit = date.today() + timedelta(days=days)
+        return await self.repository.due_on_or_before(limit)
 
     async def get_subtasks(self, parent_task_id: str) -> list[Task]:
         """Get all subtasks for a parent task."""
-        tasks = await self._load_tasks()
-
-        result = []
-        for task_data in tasks.values():
-            task = Task(**task_data) if isinstance(task_data, dict) else task_data
-
-            if task.parent_task_id == parent_task_id:
-                result.append(task)
-
+        result = await self.repository.query(parent_task_id=parent_task_id)
         return sorted(result, key=lambda x: x.created_at)
 
     async def get_tasks_by_project(self, project: str) -> list[Task]:
@@ -281,9 +244,7 @@ class TaskManager:
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
-        tasks = await self._load_tasks()
-
-        if task_id not in tasks:
+        if not await self.repository.get(task_id):
             return False
 
         # Check for subtasks
@@ -297,48 +258,12 @@ class TaskManager:
             return False
 
         # Remove task
-        del tasks[task_id]
-        await self._save_tasks(tasks)
+        if not await self.repository.delete(task_id):
+            return False
 
         logger.info("Task deleted", task_id=task_id)
         return True
 
-    async def _load_tasks(self) -> dict[str, Task]:
-        """Load tasks from JSON file."""
-        if not self.data_file.exists():
-            return {}
-
-        try:
-            async with aiofiles.open(self.data_file, encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
-
-                tasks = {}
-                for task_id, task_data in data.items():
-                    if isinstance(task_data, dict):
-                        tasks[task_id] = Task(**task_data)
-                    else:
-                        tasks[task_id] = task_data
-
-                return tasks
-        except Exception as e:
-            logger.error("Failed to load tasks", error=str(e))
-            return {}
-
-    async def _save_tasks(self, tasks: dict[str, Task]) -> None:
-        """Save tasks to JSON file."""
-        try:
-            data = {}
-            for task_id, task in tasks.items():
-                if isinstance(task, Task):
-                    data[task_id] = task.model_dump()
-                else:
-                    data[task_id] = task
-
-            await self._write_tasks_atomic(data)
-        except Exception as e:
-            logger.error("Failed to save tasks", error=str(e))
-
     async def _create_task_note(self, task: Task) -> None:
         """Create Obsidian note for task."""
         try:
@@ -443,29 +368,8 @@ class TaskManager:
             )
 
     async def _write_tasks_atomic(self, data: dict[str, Any]) -> None:
-        """Write tasks JSON using an atomic file replace."""
-
-        serialized = json.dumps(data, indent=2, ensure_ascii=False, default=str)
-
-        def _write() -> None:
-            self.data_file.parent.mkdir(parents=True, exist_ok=True)
-            fd, temp_path = tempfile.mkstemp(
-                dir=self.data_file.parent, prefix="tasks_", suffix=".json"
-            )
-            try:
-                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
-                    tmp_file.write(serialized)
-                    tmp_file.flush()
-                    os.fsync(tmp_file.fileno())
-                os.replace(temp_path, self.data_file)
-            finally:
-                if os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except FileNotFoundError:
-                        pass
-
-        await asyncio.to_thread(_write)
+        """Write tasks JSON using an atomic, coalescing file replace."""
+        await self._tasks_writer.write(data)
 
     def _build_note_paths(self, task: Task) -> tuple[str, Path]:
         """Generate stable filename and relative path for a task note."""
@@ -0,0 +1,261 @@
+"""In-memory, write-through task repository backed by tasks.json."""
+
+import asyncio
+import json
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+from structlog import get_logger
+
+from src.tasks.models import Task, TaskPriority, TaskStatus
+
+logger = get_logger(__name__)
+
+INACTIVE_STATUSES = frozenset({TaskStatus.DONE, TaskStatus.CANCELLED})
+
+# (status, priority, project, parent_task_id, due_date) captured at index time
+_IndexKeys = tuple[TaskStatus, TaskPriority, str | None, str | None, date | None]
+
+
+class TaskRepository:
+    """Load tasks once, keep secondary indexes and write changes through.
+
+    The JSON file is re-read only when its modification time or size changes,
+    so edits made outside the bot (e.g. in Obsidian) are still picked up.
+    """
+
+    def __init__(
+        self,
+        data_file: Path,
+        writer: Callable[[dict[str, Any]], Awaitable[None]],
+    ):
+        self.data_file = data_file
+        self._writer = writer
+        self._tasks: dict[str, Task] = {}
+        self._signature: tuple[int, int] | None = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Writes in flight; memory is ahead of disk while this is non-zero
+        self._pending_writes = 0
+
+        self._by_status: dict[TaskStatus, set[str]] = {}
+        self._by_priority: dict[TaskPriority, set[str]] = {}
+        self._by_project: dict[str, set[str]] = {}
+        self._by_parent: dict[str, set[str]] = {}
+        # Active tasks with a due date, ordered by (due_date, task_id)
+        self._due_queue: list[tuple[date, str]] = []
+        self._keys: dict[str, _IndexKeys] = {}
+
+    # === Read API ===
+
+    async def get(self, task_id: str) -> Task | None:
+        """Return a task by ID."""
+        await self._ensure_fresh()
+        return self._tasks.get(task_id)
+
+    async def all(self) -> list[Task]:
+        """Return every task."""
+        await self._ensure_fresh()
+        return list(self._tasks.values())
+
+    async def query(
+        self,
+        status: TaskStatus | None = None,
+        priority: TaskPriority | None = None,
+        project: str | None = None,
+        parent_task_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Task]:
+        """Return tasks matching all given filters using the indexes."""
+        await self._ensure_fresh()
+
+        filters: list[tuple[dict[Any, set[str]], Any]] = [
+            (self._by_status, status),
+            (self._by_priority, priority),
+            (self._by_project, project),
+            (self._by_parent, parent_task_id),
+        ]
+
+        candidates: set[str] | None = None
+        for index, value in filters:
+            if not value:
+                continue
+            ids = index.get(value, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        if candidates is None:
+            candidates = set(self._tasks)
+
+        result = []
+        for task_id in candidates:
+            if active_only and self._keys[task_id][0] in INACTIVE_STATUSES:
+                continue
+            result.append(self._tasks[task_id])
+        return result
+
+    async def due_on_or_before(self, limit: date) -> list[Task]:
+        """Return active tasks due on or before ``limit``, earliest first."""
+        await self._ensure_fresh()
+        end = bisect_right(self._due_queue, limit, key=lambda item: item[0])
+        return [self._tasks[task_id] for _, task_id in self._due_queue[:end]]
+
+    # === Write API ===
+
+    async def put(self, task: Task) -> None:
+        """Insert or replace a task and persist the change."""
+        async with self._lock:
+            await self._ensure_fresh_locked()
+            self._tasks[task.id] = task
+            self._index(task)
+        # Written outside the lock so concurrent updates share one flush
+        await self._persist()
+
+    async def delete(self, task_id: str) -> bool:
+        """Delete a task and persist the change."""
+        async with self._lock:
+            await self._ensure_fresh_locked()
+            if task_id not in self._tasks:
+                return False
+            del self._tasks[task_id]
+            self._unindex(task_id)
+        await self._persist()
+        return True
+
+    def invalidate(self) -> None:
+        """Drop the cached state so the next access reloads from disk."""
+        self._loaded = False
+        self._signature = None
+
+    # === Loading ===
+
+    def _stat_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.data_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _is_fresh(self) -> bool:
+        if not self._loaded:
+            return False
+        return self._pending_writes > 0 or self._stat_signature() == self._signature
+
+    async def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            await self._ensure_fresh_locked()
+
+    async def _ensure_fresh_locked(self) -> None:
+        if self._is_fresh():
+            return
+        signature = self._stat_signature()
+
+        if self._loaded:
+            logger.info("Task file changed externally, reloading")
+
+        self._replace_all(await self._read_tasks() if signature else [])
+        self._signature = signature
+        self._loaded = True
+
+    async def _read_tasks(self) -> list[Task]:
+        try:
+            async with aiofiles.open(self.data_file, encoding="utf-8") as f:
+                data = json.loads(await f.read())
+        except Exception as e:
+            logger.error("Failed to load tasks", error=str(e))
+            return []
+
+        tasks = []
+        for task_data in data.values():
+            if isinstance(task_data, dict):
+                tasks.append(Task(**task_data))
+        return tasks
+
+    # === Persistence ===
+
+    async def _persist(self) -> None:
+        # Models are serialized by the writer, no intermediate dump needed
+        data = dict(self._tasks)
+        self._pending_writes += 1
+        try:
+            await self._writer(data)
+        except Exception as e:
+            logger.error("Failed to save tasks", error=str(e))
+            # Memory may now be ahead of disk; force a reload on next access
+            self.invalidate()
+            return
+        finally:
+            self._pending_writes -= 1
+        if not self._pending_writes:
+            self._signature = self._stat_signature()
+
+    # === Indexes ===
+
+    def _replace_all(self, tasks: Iterable[Task]) -> None:
+        self._tasks = {}
+        self._by_status.clear()
+        self._by_priority.clear()
+        self._by_project.clear()
+        self._by_parent.clear()
+        self._due_queue.clear()
+        self._keys.clear()
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._index(task)
+
+    def _index(self, task: Task) -> None:
+        if task.id in self._keys:
+            self._unindex(task.id)
+
+        keys: _IndexKeys = (
+            task.status,
+            task.priority,
+            task.project,
+            task.parent_task_id,
+            task.due_date,
+        )
+        status, priority, project, parent_task_id, due_date = keys
+
+        self._by_status.setdefault(status, set()).add(task.id)
+        self._by_priority.setdefault(priority, set()).add(task.id)
+        if project:
+            self._by_project.setdefault(project, set()).add(task.id)
+        if parent_task_id:
+            self._by_parent.setdefault(parent_task_id, set()).add(task.id)
+        if due_date and status not in INACTIVE_STATUSES:
+            insort(self._due_queue, (due_date, task.id))
+        self._keys[task.id] = keys
+
+    def _unindex(self, task_id: str) -> None:
+        keys = self._keys.pop(task_id, None)
+        if keys is None:
+            return
+
+        status, priority, project, parent_task_id, due_date = keys
+        _discard(self._by_status, status, task_id)
+        _discard(self._by_priority, priority, task_id)
+        if project:
+            _discard(self._by_project, project, task_id)
+        if parent_task_id:
+            _discard(self._by_parent, parent_task_id, task_id)
+        if due_date and status not in INACTIVE_STATUSES:
+            entry = (due_date, task_id)
+            position = bisect_left(self._due_queue, entry)
+            if position < len(self._due_queue) and self._due_queue[position] == entry:
+                del self._due_queue[position]
+
+
+def _discard(index: dict[Any, set[str]], key: Any, task_id: str) -> None:
+    ids = index.get(key)
+    if ids is None:
+        return
+    ids.discard(task_id)
+    if not ids:
+        del index[key]
@@ -0,0 +1,202 @@
+"""Atomic, coalescing JSON persistence shared by the domain stores."""
+
+import asyncio
+import contextlib
+import os
+import tempfile
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pydantic_core
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+# Every writer that may still hold pending data, flushed on shutdown
+_WRITERS: "weakref.WeakSet[AtomicJsonWriter]" = weakref.WeakSet()
+
+# Called with the path of every completed atomic write, on the writing thread
+WriteListener = Callable[[Path], None]
+_write_listeners: list[WriteListener] = []
+
+
+def add_write_listener(listener: WriteListener) -> None:
+    """Call ``listener(path)`` after every completed ``write_bytes_atomic``."""
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+
+def dump_json(data: Any, indent: int | None = 2) -> bytes:
+    """Serialize data (including pydantic models, dates and Decimals) to UTF-8."""
+    return pydantic_core.to_json(data, indent=indent)
+
+
+def write_bytes_atomic(path: Path, payload: bytes, prefix: str = "tmp_") -> None:
+    """Write ``payload`` to ``path`` through a temp file and ``os.replace``.
+
+    The existing file mode is preserved so files created with restricted
+    permissions keep them after a rewrite. Write listeners are notified once
+    the new content is in place.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode: int | None = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = None
+
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=prefix, suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(payload)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+
+    for listener in list(_write_listeners):
+        try:
+            listener(path)
+        except Exception as e:
+            logger.warning("Write listener failed", path=str(path), error=str(e))
+
+
+class AtomicJsonWriter:
+    """Coalescing atomic writer for a single JSON file.
+
+    ``write`` keeps only the latest payload. If a flush is already running
+    (or the coalesce window is still open), later writes wait and share the
+    next flush, so N writes in a burst result in far fewer disk writes.
+    ``write`` returns once the data it passed has reached disk.
+
+    ``schedule`` is the fire-and-forget variant for derived data that is
+    cheap to lose: the snapshot is only taken when the flush runs and is
+    serialized off the event loop. ``flush`` closes an open coalesce window
+    early.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        prefix: str = "tmp_",
+        coalesce_window: float = 0.0,
+        indent: int | None = 2,
+    ):
+        self.path = path
+        self.prefix = prefix
+        self.coalesce_window = coalesce_window
+        self.indent = indent
+
+        self._pending: Any = None
+        self._has_pending = False
+        self._deferred = False
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_requested: asyncio.Event | None = None
+
+        self.writes_requested = 0
+        self.flushes = 0
+
+        _WRITERS.add(self)
+
+    async def write(self, data: Any) -> None:
+        """Persist ``data``, coalescing with concurrent writes."""
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+
+        self._set_pending(data, deferred=False)
+        self._waiters.append(waiter)
+        await waiter
+
+    def schedule(self, snapshot: Callable[[], Any]) -> None:
+        """Request a write of ``snapshot()`` without waiting for it.
+
+        ``snapshot`` runs on the event loop when the flush starts, so a burst
+        of changes inside the coalesce window costs one snapshot and one
+        write. Its result is serialized in a worker thread and therefore must
+        not be mutated afterwards (return copies of live containers).
+        """
+        self._set_pending(snapshot, deferred=True)
+
+    async def flush(self) -> None:
+        """Wait until every pending write has been flushed."""
+        while self._flush_task is not None and not self._flush_task.done():
+            if self._flush_requested is not None:
+                self._flush_requested.set()
+            await asyncio.shield(self._flush_task)
+
+    def _set_pending(self, data: Any, deferred: bool) -> None:
+        self._pending = data
+        self._has_pending = True
+        self._deferred = deferred
+        self.writes_requested += 1
+
+        if self._flush_task is None or self._flush_task.done():
+            if self.coalesce_window > 0:
+                self._flush_requested = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        if self._flush_requested is not None:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), self.coalesce_window
+                )
+            self._flush_requested = None
+
+        while self._has_pending:
+            data = self._pending
+            deferred = self._deferred
+            waiters = self._waiters
+            self._pending = None
+            self._has_pending = False
+            self._waiters = []
+
+            try:
+                if deferred:
+                    await asyncio.to_thread(self._dump_and_write, data())
+                else:
+                    payload = dump_json(data, indent=self.indent)
+                    await asyncio.to_thread(
+                        write_bytes_atomic, self.path, payload, self.prefix
+                    )
+                self.flushes += 1
+            except Exception as e:
+                logger.error(
+                    "Failed to write JSON file", path=str(self.path), error=str(e)
+                )
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _dump_and_write(self, data: Any) -> None:
+        write_bytes_atomic(self.path, dump_json(data, indent=self.indent), self.prefix)
+
+
+async def flush_all_writers() -> None:
+    """Flush every live writer; call during shutdown."""
+    writers = list(_WRITERS)
+    if not writers:
+        return
+    await asyncio.gather(
+        *(writer.flush() for writer in writers), return_exceptions=True
+    )
+    logger.info("JSON writers flushed", writers=len(writers))
@@ -38,6 +38,7 @@ class LazyLoader[T]:
 
         self._instance: T | None = None
         self._load_time: float | None = None
+        self._load_duration: float | None = None
         self._lock = threading.Lock() if thread_safe else None
 
         self._access_count = 0
@@ -85,6 +86,7 @@ class LazyLoader[T]:
             load_time = time.time() - start_time
 
             self._load_time = current_time
+            self._load_duration = load_time
             self._load_count += 1
 
             logger.info(
@@ -117,10 +119,36 @@ class LazyLoader[T]:
             "access_count": self._access_count,
             "load_count": self._load_count,
             "load_time": self._load_time,
+            "load_duration_ms": (
+                self._load_duration * 1000 if self._load_duration is not None else None
+            ),
             "cache_duration": self._cache_duration,
         }
 
 
+class LazyComponentProxy:
+    """最初の属性アクセス時にコンポーネントを読み込むプロキシ.
+
+    コンポーネントを受け取るクラスへそのまま渡せるため、重い import と初期化を
+    実際に使われるまで（またはバックグラウンドでの事前読み込みまで）遅らせられる。
+    """
+
+    __slots__ = ("_loader",)
+
+    def __init__(self, loader: LazyLoader[Any]) -> None:
+        object.__setattr__(self, "_loader", loader)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader.instance, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._loader.instance, name, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loader.is_loaded() else "not loaded"
+        return f"<LazyComponentProxy {self._loader._loader_func.__name__} ({state})>"
+
+
 class AsyncLazyLoader[T]:
     """非同期遅延読み込み（ Async Lazy Loading ）を実現するクラス."""
 
@@ -311,6 +339,50 @@ class LazyComponentManager:
             raise KeyError(f"Component '{name}' not found")
         return self._components[name].instance
 
+    def get_proxy(self, name: str) -> Any:
+        """最初の利用時に読み込まれるコンポーネントのプロキシを取得."""
+        if name not in self._components:
+            raise KeyError(f"Component '{name}' not found")
+        return LazyComponentProxy(self._components[name])
+
+    def has_component(self, name: str) -> bool:
+        """コンポーネントが登録済みかチェック."""
+        return name in self._components
+
+    def is_loaded(self, name: str) -> bool:
+        """コンポーネントが読み込み済みかチェック."""
+        component = self._components.get(name)
+        return component is not None and component.is_loaded()
+
+    async def warm_up(self, names: list[str]) -> dict[str, bool]:
+        """
+        コンポーネントをスレッドプールで事前に読み込む.
+
+        import と初期化をイベントループの外で行うため、読み込み中も他の処理は止まらない。
+
+        Args:
+            names: 読み込むコンポーネント名
+
+        Returns:
+            コンポーネントごとの読み込み成否
+        """
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, self.get_component, name)
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+        results = {}
+        for name, outcome in zip(names, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    "Failed to warm up component", name=name, error=str(outcome)
+                )
+            results[name] = not isinstance(outcome, BaseException)
+        return results
+
     async def get_async_component(self, name: str) -> Any:
         """非同期コンポーネントを取得."""
         if name not in self._async_components:
@@ -355,6 +355,7 @@ class TestSecurityIntegration:
             )
 
             await logger.log_event(event)
+            await logger.flush()
 
             # ログファイルの確認
             with open(temp_file.name) as f:
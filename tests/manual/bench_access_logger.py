@@ -0,0 +1,68 @@
+"""Benchmark for AccessLogger.log_event under a burst of command events.
+
+Logs events from a number of users as fast as possible and reports the
+throughput, then times a security report over the logged window.
+
+    uv run python tests/manual/bench_access_logger.py --events 20000 --users 200
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.security.access_logger import AccessLogger, SecurityEvent, SecurityEventType
+
+
+async def run(events: int, users: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "security_access.jsonl"
+        access_logger = AccessLogger(log_file=log_file)
+
+        start = time.perf_counter()
+        for index in range(events):
+            await access_logger.log_event(
+                SecurityEvent(
+                    event_type=SecurityEventType.COMMAND_EXECUTION,
+                    user_id=f"user-{index % users}",
+                    action="/status",
+                    success=index % 10 != 0,
+                )
+            )
+        logged = time.perf_counter() - start
+        if hasattr(access_logger, "flush"):
+            await access_logger.flush()
+        total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = await access_logger.get_security_report(hours=24)
+        report_ms = (time.perf_counter() - start) * 1000
+
+        lines = sum(1 for _ in log_file.open(encoding="utf-8"))
+        print(
+            f"{events} events from {users} users: log_event {logged:.2f}s "
+            f"({events / logged:,.0f}/s), written {total:.2f}s, {lines} lines; "
+            f"report {report_ms:.1f}ms (total_events={report['total_events']})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.users))
+
+
+if __name__ == "__main__":
+    main()
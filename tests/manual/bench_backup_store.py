@@ -0,0 +1,115 @@
+"""Benchmark for repeated vault backups through BackupManager.
+
+Backs up a vault several times, editing a few notes between runs, and
+reports the time of each backup, the bytes on disk under the backup
+directory and the longest event-loop stall seen while backing up. The last
+backup is then restored the same way.
+
+    uv run python tests/manual/bench_backup_store.py --notes 5000 --runs 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.obsidian.backup import BackupConfig, BackupManager
+
+
+def create_vault(root: Path, notes: int) -> None:
+    folder = root / "10_Notes"
+    folder.mkdir(parents=True)
+    for index in range(notes):
+        (folder / f"note_{index:05d}.md").write_text(
+            "---\n"
+            f"created: 2024-03-01T{index % 24:02d}:00:00\n"
+            "---\n\n" + f"# Note {index}\n\n" + f"body line {index}\n" * 40,
+            encoding="utf-8",
+        )
+    attachments = root / "80_Attachments"
+    attachments.mkdir()
+    for index in range(notes // 100):
+        (attachments / f"image_{index:03d}.png").write_bytes(os.urandom(200_000))
+
+
+def disk_usage(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+async def watch_loop(stalls: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        stalls.append(time.perf_counter() - start - 0.005)
+
+
+async def run(notes: int, runs: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        vault = root / "vault"
+        create_vault(vault, notes)
+        backups = root / "backups"
+        manager = BackupManager(
+            vault, BackupConfig(backup_directory=backups, max_backups=runs)
+        )
+
+        for run_index in range(runs):
+            # 前回から数件のノートだけ変更する
+            for index in range(0, notes, max(1, notes // 10)):
+                note = vault / "10_Notes" / f"note_{index:05d}.md"
+                note.write_text(f"edited in run {run_index}\n", encoding="utf-8")
+
+            stalls: list[float] = []
+            stop = asyncio.Event()
+            watcher = asyncio.create_task(watch_loop(stalls, stop))
+            await asyncio.sleep(0)
+            start = time.perf_counter()
+            result = await manager.create_backup(f"run {run_index}")
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await watcher
+
+            snapshot = getattr(result, "snapshot", None)
+            dedup = f"{snapshot.dedup_ratio:.1%}" if snapshot else "n/a"
+            print(
+                f"run {run_index}: {result.files_backed_up} files in {elapsed:.2f}s, "
+                f"dedup {dedup}, max loop stall {max(stalls, default=0) * 1000:.0f}ms, "
+                f"backups on disk {disk_usage(backups) / (1024 * 1024):.1f}MB"
+            )
+
+        stalls = []
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(watch_loop(stalls, stop))
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        restored = await manager.restore_backup(result.backup_path)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await watcher
+        print(
+            f"restore: {'ok' if restored else 'failed'} in {elapsed:.2f}s, "
+            f"max loop stall {max(stalls, default=0) * 1000:.0f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.notes, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark for re-tagging a large vault through MetadataManager.
+
+Creates a vault of synthetic notes, builds the vault indexes (as a running
+bot keeps them up to date), re-tags every note in one category with
+``bulk_update_metadata`` and reports the elapsed time, then checks that
+each note body is byte-identical to what was written.
+
+    uv run python tests/manual/bench_bulk_retag.py --notes 10000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.obsidian.file_manager import ObsidianFileManager
+from src.obsidian.metadata import MetadataManager
+
+
+def body(index: int) -> str:
+    return f"\n# Note {index}\n\n" + f"line {index} of the note body\n" * 40
+
+
+def create_vault(root: Path, notes: int) -> None:
+    for index in range(notes):
+        folder = root / "00_Inbox" / f"{index % 100:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        category = "work" if index % 2 == 0 else "life"
+        (folder / f"note_{index:05d}.md").write_text(
+            "---\n"
+            f"created: 2024-03-01T{index % 24:02d}:00:00\n"
+            "obsidian_folder: 00_Inbox\n"
+            f"ai_category: {category}\n"
+            "tags: [inbox]\n"
+            "---\n" + body(index),
+            encoding="utf-8",
+        )
+
+
+async def run(notes: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        create_vault(root, notes)
+        file_manager = ObsidianFileManager(root)
+        await file_manager.activity_rollup.rebuild()
+        file_manager.keyword_index.build()
+        metadata = MetadataManager(file_manager)
+
+        start = time.perf_counter()
+        result = await metadata.bulk_update_metadata(
+            {"category": "work"}, {"tags": ["inbox", "reviewed"]}, limit=notes
+        )
+        elapsed = time.perf_counter() - start
+
+        changed_bodies = 0
+        for path in root.rglob("note_*.md"):
+            index = int(path.stem.split("_")[1])
+            if not path.read_text(encoding="utf-8").endswith("---\n" + body(index)):
+                changed_bodies += 1
+
+    print(
+        f"notes={notes} updated={result['updated']} errors={result['errors']} "
+        f"elapsed={elapsed:.2f}s ({result['updated'] / elapsed:,.0f} notes/s) "
+        f"changed_bodies={changed_bodies}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(run(args.notes))
+
+
+if __name__ == "__main__":
+    main()
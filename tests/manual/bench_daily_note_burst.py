@@ -0,0 +1,98 @@
+"""Burst benchmark for activity-log entries on a single daily note.
+
+Posts a burst of concurrent messages to one day's Activity Log (as the bot
+does when several messages arrive close together) and reports throughput,
+the number of note writes and how many entries are missing from the note.
+
+    uv run python tests/manual/bench_daily_note_burst.py --messages 200
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.obsidian.daily_integration import DailyNoteIntegration
+from src.obsidian.file_manager import ObsidianFileManager
+
+
+def message(index: int) -> dict:
+    return {
+        "metadata": {
+            "content": {"raw_content": f"burst message #{index:05d}"},
+            "timing": {"created_at": {"iso": "2024-03-01T09:00:00"}},
+        }
+    }
+
+
+async def run_burst(messages: int, concurrent: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = ObsidianFileManager(Path(tmp))
+        integration = DailyNoteIntegration(file_manager)
+        day = datetime(2024, 3, 1)
+
+        writes = 0
+        update_note = file_manager.update_note
+
+        async def counting_update(*args, **kwargs):
+            nonlocal writes
+            writes += 1
+            return await update_note(*args, **kwargs)
+
+        file_manager.update_note = counting_update  # type: ignore[method-assign]
+
+        # ノートの作成は計測から除く
+        await integration.create_daily_note_if_not_exists(day)
+        writes = 0
+
+        start = time.perf_counter()
+        if concurrent:
+            await asyncio.gather(
+                *(
+                    integration.add_activity_log_entry(message(i), day)
+                    for i in range(messages)
+                )
+            )
+        else:
+            for i in range(messages):
+                await integration.add_activity_log_entry(message(i), day)
+        elapsed = time.perf_counter() - start
+
+        note_path = Path(tmp) / "01_DailyNotes" / "2024-03-01.md"
+        content = note_path.read_text(encoding="utf-8")
+        missing = sum(
+            1 for i in range(messages) if f"burst message #{i:05d}" not in content
+        )
+
+    mode = "concurrent" if concurrent else "sequential"
+    print(
+        f"{mode:<10}: {elapsed:.3f}s ({messages / elapsed:,.0f} entries/s) "
+        f"writes={writes} missing={missing}/{messages}"
+    )
+
+
+async def run(messages: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    await run_burst(messages, concurrent=True)
+    await run_burst(messages, concurrent=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark for repeated LocalDataManager.sync_with_remote runs.
+
+Syncs a vault to an empty remote folder, then edits a few notes on each side
+and syncs again, reporting the time of each run and the files and bytes
+transferred.
+
+    uv run python tests/manual/bench_delta_sync.py --notes 5000 --runs 3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.obsidian.local_data_manager import LocalDataManager
+
+
+def create_vault(root: Path, notes: int) -> None:
+    folder = root / "10_Notes"
+    folder.mkdir(parents=True)
+    for index in range(notes):
+        (folder / f"note_{index:05d}.md").write_text(
+            "---\n"
+            f"tags: [tag{index % 50}]\n"
+            "---\n\n" + f"# Note {index}\n\n" + f"body line {index}\n" * 40,
+            encoding="utf-8",
+        )
+
+
+def last_sync_log(manager: LocalDataManager) -> dict:
+    lines = manager.sync_log_file.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[-1])
+
+
+async def run(notes: int, runs: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        vault = root / "vault"
+        remote = root / "remote"
+        create_vault(vault, notes)
+        manager = LocalDataManager(vault)
+
+        for run_index in range(runs + 1):
+            if run_index:
+                # 前回から両側で数件のノートだけ変更する
+                for index in range(0, notes, max(1, notes // 10)):
+                    note = vault / "10_Notes" / f"note_{index:05d}.md"
+                    note.write_text(f"edited in run {run_index}\n", encoding="utf-8")
+                    remote_note = remote / "10_Notes" / f"note_{index + 1:05d}.md"
+                    remote_note.write_text(
+                        f"edited remotely in run {run_index}\n", encoding="utf-8"
+                    )
+
+            start = time.perf_counter()
+            success = await manager.sync_with_remote(remote, "both")
+            elapsed = time.perf_counter() - start
+            log = last_sync_log(manager)
+            print(
+                f"run {run_index}: {'ok' if success else 'failed'} in {elapsed:.2f}s, "
+                f"{log.get('files_synced', 0)} files / "
+                f"{log.get('bytes_synced', 'n/a')} bytes transferred"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.notes, args.runs))
+
+
+if __name__ == "__main__":
+    main()
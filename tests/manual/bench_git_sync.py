@@ -0,0 +1,140 @@
+"""Benchmark for syncing a burst of new notes to a git remote.
+
+Creates notes in a vault backed by a local bare repository and pushes them
+either with one ``sync_to_github`` call per note (as the note handler did) or
+through ``GitSyncScheduler``, reporting commits, git subprocesses and time.
+
+    uv run python tests/manual/bench_git_sync.py --notes 30 --window 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+from pydantic import SecretStr
+
+from src.obsidian import github_sync as github_sync_module
+from src.obsidian.github_sync import GitHubObsidianSync
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+async def make_sync(root: Path) -> GitHubObsidianSync:
+    bare = root / "remote.git"
+    git(root, "init", "-q", "--bare", "-b", "main", str(bare))
+    seed = root / "seed"
+    git(root, "clone", "-q", str(bare), str(seed))
+    (seed / "README.md").write_text("vault\n", encoding="utf-8")
+    git(seed, "add", ".")
+    git(seed, "commit", "-q", "-m", "initial")
+    git(seed, "push", "-q", "origin", "HEAD:main")
+
+    settings = SimpleNamespace(
+        obsidian_vault_path=root / "vault",
+        github_token=SecretStr("bench"),
+        obsidian_backup_repo=f"file://{bare}",
+        obsidian_backup_branch="main",
+        git_user_name="Bench",
+        git_user_email="bench@example.com",
+        obsidian_clone_strategy="full",
+    )
+    with patch.object(github_sync_module, "get_settings", return_value=settings):
+        sync = GitHubObsidianSync()
+    await sync.setup_git_repository()
+    await sync.sync_from_github()
+    return sync
+
+
+def write_note(vault: Path, index: int) -> Path:
+    path = vault / "00_Inbox" / f"note_{index:03d}.md"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(f"# Note {index}\n\nbody\n", encoding="utf-8")
+    return path
+
+
+async def per_note(sync: GitHubObsidianSync, notes: int) -> None:
+    for index in range(notes):
+        write_note(sync.vault_path, index)
+        await sync.sync_to_github(f"Auto-sync: note {index}")
+
+
+async def coalesced(sync: GitHubObsidianSync, notes: int, window: float) -> None:
+    from src.obsidian.change_feed import VaultChangeFeed
+    from src.obsidian.sync_scheduler import GitSyncScheduler
+
+    feed = VaultChangeFeed(sync.vault_path)
+    scheduler = GitSyncScheduler(sync, feed, window_seconds=window)
+    scheduler.start()
+    for index in range(notes):
+        feed.record(write_note(sync.vault_path, index))
+        await asyncio.sleep(0.01)
+    while feed.pending_count or not scheduler.commits:
+        await asyncio.sleep(0.05)
+    await scheduler.stop(flush=False)
+
+
+async def run(notes: int, window: float, modes: list[str]) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+    )
+    create_subprocess_exec = asyncio.create_subprocess_exec
+    spawned = 0
+
+    async def counting_exec(*args, **kwargs):
+        nonlocal spawned
+        spawned += 1
+        kwargs.setdefault("stdout", asyncio.subprocess.DEVNULL)
+        kwargs.setdefault("stderr", asyncio.subprocess.DEVNULL)
+        return await create_subprocess_exec(*args, **kwargs)
+
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            sync = await make_sync(Path(tmp))
+            spawned = 0
+            start = time.perf_counter()
+            with patch.object(
+                github_sync_module.asyncio, "create_subprocess_exec", counting_exec
+            ):
+                if mode == "per-note":
+                    await per_note(sync, notes)
+                else:
+                    await coalesced(sync, notes, window)
+            elapsed = time.perf_counter() - start
+            commits = int(git(Path(tmp) / "remote.git", "rev-list", "--count", "main"))
+            print(
+                f"{mode}: {notes} notes -> {commits - 1} commits, "
+                f"{spawned} git subprocesses, {elapsed:.2f}s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=30)
+    parser.add_argument("--window", type=float, default=0.5)
+    parser.add_argument(
+        "--mode", choices=["per-note", "coalesced"], action="append", dest="modes"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.notes, args.window, args.modes or ["per-note", "coalesced"]))
+
+
+if __name__ == "__main__":
+    main()
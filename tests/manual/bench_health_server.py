@@ -0,0 +1,115 @@
+"""Benchmark for health probes while another client is stalled.
+
+Starts the health server, opens connections that send an incomplete request
+and then stall (a slow scraper or load balancer), and times ``/probe`` and
+``/metrics`` requests made in the meantime.
+
+    uv run python tests/manual/bench_health_server.py --requests 50 --stalled 2
+"""
+
+import argparse
+import asyncio
+import inspect
+import logging
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import aiohttp
+import structlog
+from pydantic import SecretStr
+
+from src.monitoring import health_server as health_server_module
+from src.monitoring.health_server import HealthServer
+
+TOKEN = "bench-token"
+
+
+async def call(method, *args):  # type: ignore[no-untyped-def]
+    result = method(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+async def timed_get(session: aiohttp.ClientSession, url: str, timeout: float):  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    try:
+        async with session.get(
+            url,
+            headers={"X-Health-Token": TOKEN},
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            await response.read()
+            ok = response.status == 200
+    except (TimeoutError, aiohttp.ClientError):
+        ok = False
+    return ok, (time.perf_counter() - start) * 1000
+
+
+async def run(requests: int, stalled: int, timeout: float) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+    )
+    settings = SimpleNamespace(
+        health_endpoint_token=SecretStr(TOKEN), health_callback_state=None
+    )
+    bot = SimpleNamespace(is_ready=True, start_time=None, bot=None)
+
+    secure_settings = SimpleNamespace(get_secure_setting=lambda key: None)
+
+    with (
+        patch.object(health_server_module, "get_settings", return_value=settings),
+        patch.object(
+            health_server_module, "get_secure_settings", return_value=secure_settings
+        ),
+        patch.object(HealthServer, "_validate_security_requirements"),
+    ):
+        server = HealthServer(bot_instance=bot, port=18080)
+        await call(server.start)
+        base = f"http://127.0.0.1:{server.port}"
+
+        # Connections that never finish their request line
+        sockets = []
+        for _ in range(stalled):
+            sock = socket.create_connection(("127.0.0.1", server.port))
+            sock.sendall(b"GET /metrics HTTP/1.1\r\nHost: bench\r\n")
+            sockets.append(sock)
+        await asyncio.sleep(0.1)
+
+        async with aiohttp.ClientSession() as session:
+            for path in ("/probe", "/metrics"):
+                results = [
+                    await timed_get(session, base + path, timeout)
+                    for _ in range(requests)
+                ]
+                latencies = [ms for ok, ms in results if ok]
+                failed = len(results) - len(latencies)
+                median = statistics.median(latencies) if latencies else float("nan")
+                print(
+                    f"{path}: {len(latencies)}/{requests} ok, {failed} timed out "
+                    f"(>{timeout:.1f}s), median {median:.2f}ms "
+                    f"with {stalled} stalled connections"
+                )
+
+        for sock in sockets:
+            sock.close()
+        await call(server.stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--stalled", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.stalled, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
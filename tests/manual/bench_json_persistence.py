@@ -0,0 +1,101 @@
+"""Write-throughput benchmark for the shared JSON persistence layer.
+
+Compares the previous per-call ``json.dumps`` + full rewrite with
+``AtomicJsonWriter`` for a burst of concurrent updates.
+
+    uv run python tests/manual/bench_json_persistence.py --records 2000 --writes 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import aiofiles
+from pydantic import BaseModel
+
+from src.utils.json_store import AtomicJsonWriter
+
+
+class Record(BaseModel):
+    id: str
+    description: str
+    amount: Decimal
+    record_date: date
+    created_at: datetime
+
+
+def build_records(count: int) -> dict[str, Record]:
+    now = datetime.now()
+    return {
+        f"r{i}": Record(
+            id=f"r{i}",
+            description=f"支出 {i}",
+            amount=Decimal(i * 10 + 1),
+            record_date=date(2024, 1 + i % 12, 1 + i % 28),
+            created_at=now,
+        )
+        for i in range(count)
+    }
+
+
+async def legacy_write(path: Path, records: dict[str, Record]) -> None:
+    data = {record_id: record.model_dump() for record_id, record in records.items()}
+    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+        await f.write(json.dumps(data, indent=2, default=str, ensure_ascii=False))
+
+
+async def run(records_count: int, writes: int) -> None:
+    records = build_records(records_count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.json"
+        start = time.perf_counter()
+        for _ in range(writes):
+            await legacy_write(legacy_path, records)
+        legacy_elapsed = time.perf_counter() - start
+
+        sequential = AtomicJsonWriter(Path(tmp) / "sequential.json")
+        start = time.perf_counter()
+        for _ in range(writes):
+            await sequential.write(dict(records))
+        sequential_elapsed = time.perf_counter() - start
+
+        writer = AtomicJsonWriter(Path(tmp) / "store.json")
+        start = time.perf_counter()
+        await asyncio.gather(*(writer.write(dict(records)) for _ in range(writes)))
+        store_elapsed = time.perf_counter() - start
+
+    print(f"records={records_count} writes={writes}")
+    print(
+        f"legacy  : {legacy_elapsed:.3f}s "
+        f"({writes / legacy_elapsed:.1f} writes/s, {writes} disk writes)"
+    )
+    print(
+        f"atomic  : {sequential_elapsed:.3f}s "
+        f"({writes / sequential_elapsed:.1f} writes/s, "
+        f"{sequential.flushes} disk writes, awaited one by one)"
+    )
+    print(
+        f"burst   : {store_elapsed:.3f}s "
+        f"({writes / store_elapsed:.1f} writes/s, {writer.flushes} disk writes)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.records, args.writes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Micro-benchmark of metrics instrumentation overhead.
+
+Times SystemMetrics.add_performance_data with a full history and
+get_metrics_summary, then (when available) the registry primitives and the
+timed() helper, reporting nanoseconds per call.
+
+    uv run python tests/manual/bench_metrics.py --calls 200000
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.bot.metrics import SystemMetrics
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+
+
+def per_call_ns(function: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def report(name: str, ns: float, baseline: float = 0.0) -> None:
+    overhead = f" (+{ns - baseline:,.0f} ns over the bare call)" if baseline else ""
+    print(f"{name:<44} {ns:>10,.0f} ns/call{overhead}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    calls = args.calls
+
+    metrics = SystemMetrics()
+    operations = [f"operation-{index % 8}" for index in range(calls)]
+    for index in range(2000):
+        metrics.add_performance_data(operations[index % 8], 0.001 * (index % 50))
+
+    iterator = iter(operations)
+    report(
+        "SystemMetrics.add_performance_data",
+        per_call_ns(lambda: metrics.add_performance_data(next(iterator), 0.01), calls),
+    )
+    report(
+        "SystemMetrics.increment_message_count",
+        per_call_ns(metrics.increment_message_count, calls),
+    )
+    report(
+        "SystemMetrics.get_metrics_summary",
+        per_call_ns(metrics.get_metrics_summary, max(1, calls // 1000)),
+    )
+
+    def observe_all_and_summarize() -> None:
+        for operation in operations[:8]:
+            metrics.add_performance_data(operation, 0.01)
+        metrics.get_metrics_summary()
+
+    report(
+        "8 x add_performance_data + summary",
+        per_call_ns(observe_all_and_summarize, max(1, calls // 1000)),
+    )
+
+    try:
+        from src.monitoring.metrics import LATENCY_BUCKETS, MetricsRegistry, timed
+    except ImportError:
+        print("(registry primitives not available in this tree)")
+        return
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Bench", ("api",))
+    bound_counter = counter.labels(api="gemini")
+    histogram = registry.histogram(
+        "bench_seconds", "Bench", ("operation",), buckets=LATENCY_BUCKETS
+    )
+    bound_histogram = histogram.labels(operation="save")
+
+    report(
+        "Counter.inc(api=...)", per_call_ns(lambda: counter.inc(api="gemini"), calls)
+    )
+    report("BoundCounter.inc()", per_call_ns(bound_counter.inc, calls))
+    report(
+        "Histogram.observe(v, operation=...)",
+        per_call_ns(lambda: histogram.observe(0.02, operation="save"), calls),
+    )
+    report(
+        "BoundHistogram.observe(v)",
+        per_call_ns(lambda: bound_histogram.observe(0.02), calls),
+    )
+
+    def work() -> int:
+        return 1
+
+    bare = per_call_ns(work, calls)
+    report("bare function", bare)
+    report("@timed function", per_call_ns(timed("bench", histogram)(work), calls), bare)
+
+    def with_block() -> None:
+        with timed("bench", histogram):
+            pass
+
+    report("with timed(...) block", per_call_ns(with_block, calls))
+    report(
+        "Histogram.summary (p50/p95/p99, cached)",
+        per_call_ns(lambda: histogram.summary(operation="bench"), max(1, calls // 100)),
+    )
+
+    def observe_and_summarize() -> None:
+        bound_histogram.observe(0.02)
+        histogram.summary(operation="save")
+
+    report(
+        "observe + Histogram.summary (recomputed)",
+        per_call_ns(observe_and_summarize, max(1, calls // 100)),
+    )
+
+
+if __name__ == "__main__":
+    main()
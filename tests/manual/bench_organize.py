@@ -0,0 +1,74 @@
+"""Benchmark for VaultOrganizer.organize_notes_by_category on a large inbox.
+
+Fills the inbox with notes of several AI categories (with the vault indexes
+built, as a running bot keeps them), organizes them and reports the elapsed
+time and how many notes ended up in their category folders.
+
+    uv run python tests/manual/bench_organize.py --notes 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+import src.ai.models  # noqa: F401  # 初回 import のコストを計測から除く
+from src.obsidian.file_manager import ObsidianFileManager
+from src.obsidian.organizer import VaultOrganizer
+
+CATEGORIES = ["アイデア", "仕事", "タスク", "健康", "金融"]
+
+
+def create_inbox(root: Path, notes: int) -> None:
+    inbox = root / "00_Inbox"
+    inbox.mkdir(parents=True)
+    for index in range(notes):
+        (inbox / f"note_{index:05d}.md").write_text(
+            "---\n"
+            f"created: 2024-03-01T{index % 24:02d}:00:00\n"
+            "obsidian_folder: 00_Inbox\n"
+            f"ai_category: {CATEGORIES[index % len(CATEGORIES)]}\n"
+            "---\n\n" + f"# Note {index}\n\n" + "body line\n" * 40,
+            encoding="utf-8",
+        )
+
+
+async def run(notes: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        create_inbox(root, notes)
+        file_manager = ObsidianFileManager(root)
+        await file_manager.activity_rollup.rebuild()
+        file_manager.keyword_index.build()
+        organizer = VaultOrganizer(file_manager)
+
+        start = time.perf_counter()
+        result = await organizer.organize_notes_by_category()
+        elapsed = time.perf_counter() - start
+        left = len(list((root / "00_Inbox").glob("*.md")))
+
+    print(
+        f"notes={notes} moved={result['moved']} errors={result['errors']} "
+        f"left_in_inbox={left} elapsed={elapsed:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.notes))
+
+
+if __name__ == "__main__":
+    main()
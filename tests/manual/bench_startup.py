@@ -0,0 +1,83 @@
+"""Benchmark for the time from process start until the bot starts connecting.
+
+Runs ``src.main.main()`` in fresh interpreters with ``DiscordBot.run_async``
+replaced by a stub that records when it was called, marks the bot ready and
+then waits for the background startup (when there is one) to finish.
+
+    uv run python tests/manual/bench_startup.py --runs 3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CHILD = """
+import time
+start = time.perf_counter()
+import asyncio, logging, os, sys
+sys.path.insert(0, {root!r})
+import structlog
+import src.bot.client as client
+
+async def fake_run_async(self):
+    print(f"connect_started_ms={{(time.perf_counter() - start) * 1000:.0f}}")
+    self.is_ready = True
+    for task in asyncio.all_tasks():
+        if task.get_name() == "startup:background":
+            await task
+            print(f"background_done_ms={{(time.perf_counter() - start) * 1000:.0f}}")
+
+client.DiscordBot.run_async = fake_run_async
+import src.main as main_module
+import src.utils.logger as logger_module
+logger_module.setup_logging = lambda *a, **k: structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+)
+main_module.setup_logging = logger_module.setup_logging
+asyncio.run(main_module.main())
+"""
+
+
+def run_once(vault: Path) -> dict[str, str]:
+    env = {
+        **os.environ,
+        "DISCORD_BOT_TOKEN": "bench",
+        "DISCORD_GUILD_ID": "1",
+        "GEMINI_API_KEY": "bench",
+        "OBSIDIAN_VAULT_PATH": str(vault),
+        "ENVIRONMENT": "development",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=str(ROOT))],
+        env=env,
+        cwd=vault.parent,
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stdout
+    return dict(line.split("=", 1) for line in output.splitlines() if "_ms=" in line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        vault.mkdir()
+        for run_index in range(args.runs):
+            timings = run_once(vault)
+            print(
+                f"run {run_index}: connect started after "
+                f"{timings.get('connect_started_ms', '?')}ms, background startup "
+                f"done after {timings.get('background_done_ms', 'n/a')}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Render benchmark for the default note templates.
+
+Compares the legacy regex pipeline with the compiled render trees for the
+frontmatter and body of every default template.
+
+    uv run python tests/manual/bench_template_render.py --iterations 500
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import structlog
+
+from src.obsidian.template_system import TemplateEngine
+from src.obsidian.template_system.compiler import _FRONTMATTER
+
+
+async def run(iterations: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = TemplateEngine(Path(tmp))
+        await engine.create_default_templates()
+        processor = engine.template_processor
+
+        context = await engine.create_template_context(
+            content="今日のメモ\n" * 20,
+            author="bench",
+            timestamp=datetime(2024, 1, 2, 9, 30),
+            tags=["memo", "work"],
+            title="ベンチマーク",
+        )
+        context.update(tasks=["a", "b", "c"], goals=["g1"], attendees=["p1", "p2"])
+
+        names = await engine.list_available_templates()
+        segments: list[str] = []
+        for name in names:
+            match = _FRONTMATTER.match(await engine.load_template(name))
+            if match:
+                segments += [match.group(1), match.group(2)]
+        compiled = [processor.compiler.compile_segment(s) for s in segments]
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for source in segments:
+                await processor._compile_template_legacy(source, context)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for segment in compiled:
+                segment.render(context, processor)
+        compiled_elapsed = time.perf_counter() - start
+
+    renders = iterations * len(segments)
+    print(f"templates={len(names)} segments={len(segments)} renders={renders}")
+    print(
+        f"legacy  : {legacy_elapsed:.3f}s ({renders / legacy_elapsed:,.0f} segments/s)"
+    )
+    print(
+        f"compiled: {compiled_elapsed:.3f}s "
+        f"({renders / compiled_elapsed:,.0f} segments/s, "
+        f"x{legacy_elapsed / compiled_elapsed:.1f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Unit tests for the finance ledger and budget aggregation."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.finance.budget_manager import BudgetManager
+from src.finance.expense_manager import ExpenseManager
+from src.finance.models import BudgetCategory
+from src.obsidian import ObsidianFileManager
+
+
+@pytest.fixture
+def expense_manager(tmp_path, monkeypatch) -> ExpenseManager:
+    """Provide an ExpenseManager rooted in a temporary vault."""
+
+    from src.finance import budget_manager as budget_manager_module
+    from src.finance import expense_manager as expense_manager_module
+
+    new_settings = expense_manager_module.settings.model_copy(
+        update={"obsidian_vault_path": tmp_path}
+    )
+    monkeypatch.setattr(expense_manager_module, "settings", new_settings)
+    monkeypatch.setattr(budget_manager_module, "settings", new_settings)
+
+    file_manager = ObsidianFileManager(tmp_path, enable_local_data=False)
+    manager = ExpenseManager(file_manager)
+
+    async def _skip_daily_note(record, record_type):
+        return None
+
+    monkeypatch.setattr(manager, "_add_to_daily_note", _skip_daily_note)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_period_totals_use_running_aggregates(
+    expense_manager: ExpenseManager,
+) -> None:
+    manager = expense_manager
+
+    await manager.add_expense(
+        "lunch", Decimal("1200"), BudgetCategory.FOOD, date(2025, 1, 5)
+    )
+    await manager.add_expense(
+        "train", Decimal("300"), BudgetCategory.TRANSPORTATION, date(2025, 1, 31)
+    )
+    await manager.add_expense(
+        "dinner", Decimal("2500.50"), BudgetCategory.FOOD, date(2025, 2, 1)
+    )
+    await manager.add_income("salary", Decimal("300000"), date(2025, 1, 25))
+
+    # Full month served from the monthly totals
+    assert await manager.get_total_expenses(
+        date(2025, 1, 1), date(2025, 1, 31)
+    ) == Decimal("1500")
+    # Partial months on both edges
+    assert await manager.get_total_expenses(
+        date(2025, 1, 10), date(2025, 2, 1)
+    ) == Decimal("2800.50")
+    assert await manager.get_total_expenses_by_category(
+        date(2025, 1, 1), date(2025, 2, 28)
+    ) == {
+        BudgetCategory.FOOD: Decimal("3700.50"),
+        BudgetCategory.TRANSPORTATION: Decimal("300"),
+    }
+    assert await manager.get_net_balance(
+        date(2025, 1, 1), date(2025, 1, 31)
+    ) == Decimal("298500")
+
+    expenses = await manager.get_expenses_by_period(
+        date(2025, 1, 1), date(2025, 2, 28), BudgetCategory.FOOD
+    )
+    assert [e.description for e in expenses] == ["dinner", "lunch"]
+
+
+@pytest.mark.asyncio
+async def test_ledger_reloads_after_external_edit(
+    expense_manager: ExpenseManager, tmp_path
+) -> None:
+    manager = expense_manager
+    await manager.add_expense(
+        "book", Decimal("1000"), BudgetCategory.EDUCATION, date(2025, 3, 3)
+    )
+
+    # A fresh manager (e.g. after restart) reads the persisted ledger
+    reopened = ExpenseManager(manager.file_manager)
+    assert await reopened.get_total_expenses(
+        date(2025, 3, 1), date(2025, 3, 31)
+    ) == Decimal("1000")
+
+    await reopened.add_expense(
+        "pen", Decimal("200"), BudgetCategory.EDUCATION, date(2025, 3, 4)
+    )
+    assert await manager.get_total_expenses(
+        date(2025, 3, 1), date(2025, 3, 31)
+    ) == Decimal("1200")
+
+
+@pytest.mark.asyncio
+async def test_monthly_budget_summary(expense_manager: ExpenseManager) -> None:
+    budgets = BudgetManager(expense_manager.file_manager, expense_manager)
+    await expense_manager.add_expense(
+        "groceries", Decimal("9000"), BudgetCategory.FOOD, date(2025, 4, 10)
+    )
+
+    await budgets.set_budget(
+        BudgetCategory.FOOD, Decimal("10000"), date(2025, 4, 1), date(2025, 4, 30)
+    )
+    summary = await budgets.get_monthly_budget_summary(2025, 4)
+
+    assert summary["total_spent"] == Decimal("9000")
+    assert summary["near_limit_categories"] == ["food"]
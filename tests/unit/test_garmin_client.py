@@ -1,9 +1,21 @@
 """Tests for Garmin client behaviour"""
 
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
+from src.integrations.garmin.cache import GarminDataCache
+from src.integrations.garmin.models import HealthData, StepsData
+from src.integrations.garmin.rate_limit import TokenBucketRateLimiter
+
 
 class StubSettings:
     def __init__(self, email=None, password=None, username=None):
@@ -12,16 +24,68 @@ class StubSettings:
         self.garmin_username = username
 
 
-def create_client(monkeypatch: pytest.MonkeyPatch):
+def create_client(monkeypatch: pytest.MonkeyPatch, cache_dir: Path):
     from src.integrations.garmin import client as client_module
 
     monkeypatch.setattr(client_module, "get_settings", lambda: StubSettings())
 
-    return client_module.GarminClient()
+    return client_module.GarminClient(cache_dir=cache_dir)
+
+
+class FakeGarminBackend:
+    """Blocking fake of the garminconnect API with injected latency."""
+
+    def __init__(
+        self, latency: float, slow_calls: dict[tuple[str, str], float] | None = None
+    ):
+        self.latency = latency
+        self.slow_calls = slow_calls or {}
+        self.calls: list[tuple[str, str]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _call(self, name: str, day: str) -> None:
+        with self._lock:
+            self.calls.append((name, day))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.slow_calls.get((name, day), self.latency))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_sleep_data(self, day: str) -> dict:
+        self._call("sleep", day)
+        return {"dailySleepDTO": {"sleepTimeSeconds": 7 * 3600}}
+
+    def get_user_summary(self, day: str) -> dict:
+        self._call("summary", day)
+        return {"totalSteps": 8000}
+
+    def get_heart_rates(self, day: str) -> dict:
+        self._call("heart_rate", day)
+        return {"restingHeartRate": 55}
+
+    def get_activities_by_date(self, start: str, _end: str) -> list:
+        self._call("activities", start)
+        return []
+
 
+def create_range_client(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, backend: FakeGarminBackend
+):
+    client = create_client(monkeypatch, cache_dir=tmp_path)
+    client.client = backend
+    client.is_authenticated = True
+    client._last_authentication = datetime.now()
+    client.rate_limiter = TokenBucketRateLimiter(rate=1000.0, capacity=8)
+    return client
 
-def test_backoff_flags(monkeypatch: pytest.MonkeyPatch) -> None:
-    client = create_client(monkeypatch)
+
+def test_backoff_flags(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    client = create_client(monkeypatch, cache_dir=tmp_path)
 
     # Enter backoff three times to trigger lockout
     client._enter_backoff_period()
@@ -37,8 +101,10 @@ def test_backoff_flags(monkeypatch: pytest.MonkeyPatch) -> None:
     assert client._backoff_until is None
 
 
-def test_network_connectivity_check(monkeypatch: pytest.MonkeyPatch) -> None:
-    client = create_client(monkeypatch)
+def test_network_connectivity_check(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    client = create_client(monkeypatch, cache_dir=tmp_path)
 
     calls = {"count": 0}
 
@@ -54,3 +120,126 @@ def test_network_connectivity_check(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert client._check_network_connectivity() is False
     assert client._check_network_connectivity() is True
+
+
+async def test_health_data_range_fans_out_under_bounded_executor(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    backend = FakeGarminBackend(latency=0.05)
+    client = create_range_client(monkeypatch, tmp_path, backend)
+    start = date(2024, 3, 4)
+
+    started = time.perf_counter()
+    results = await client.get_health_data_range(start, start + timedelta(days=6))
+    elapsed = time.perf_counter() - started
+
+    assert [r.date for r in results] == [start + timedelta(days=i) for i in range(7)]
+    assert all(r.sleep and r.steps and r.heart_rate for r in results)
+    assert len(backend.calls) == 28
+    # 28 sequential calls would take at least 1.4s
+    assert elapsed < 1.0
+    assert 1 < backend.max_active <= client.max_concurrent_requests
+
+
+async def test_health_data_range_skips_valid_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    backend = FakeGarminBackend(latency=0.0)
+    client = create_range_client(monkeypatch, tmp_path, backend)
+    cached_day = date(2024, 3, 5)
+    client.cache.save_health_data(
+        HealthData(date=cached_day, steps=StepsData(date=cached_day, total_steps=1))
+    )
+
+    results = await client.get_health_data_range(date(2024, 3, 4), date(2024, 3, 6))
+
+    assert len(results) == 3
+    assert {day for _, day in backend.calls} == {"2024-03-04", "2024-03-06"}
+    assert results[1].is_cached_data is True
+
+
+async def test_health_data_range_yields_partial_results(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    backend = FakeGarminBackend(latency=0.01, slow_calls={("sleep", "2024-03-04"): 0.3})
+    client = create_range_client(monkeypatch, tmp_path, backend)
+
+    arrived = [
+        health_data.date
+        async for health_data in client.iter_health_data_range(
+            date(2024, 3, 4), date(2024, 3, 6)
+        )
+    ]
+
+    assert sorted(arrived) == [date(2024, 3, 4), date(2024, 3, 5), date(2024, 3, 6)]
+    assert arrived[-1] == date(2024, 3, 4)
+
+
+async def test_close_shuts_down_api_executor(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    client = create_client(monkeypatch, cache_dir=tmp_path)
+    await client._call_api(lambda: None)
+
+    await client.close()
+
+    with pytest.raises(RuntimeError):
+        client._executor.submit(lambda: None)
+
+
+async def test_token_bucket_limits_request_rate() -> None:
+    limiter = TokenBucketRateLimiter(rate=50.0, capacity=2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limiter.acquire() for _ in range(7)))
+    elapsed = time.perf_counter() - started
+
+    # 2 burst tokens, the remaining 5 refill at 50/s
+    assert elapsed >= 0.09
+
+
+def test_cache_migrates_legacy_files_with_private_permissions(tmp_path: Path) -> None:
+    legacy = tmp_path / "health_data_2024-03-01.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "date": "2024-03-01",
+                "steps": {"date": "2024-03-01", "total_steps": 4321},
+            }
+        ),
+        encoding="utf-8",
+    )
+    old = time.time() - 48 * 3600
+    os.utime(legacy, (old, old))
+
+    cache = GarminDataCache(tmp_path)
+
+    assert not legacy.exists()
+    assert cache.db_path.stat().st_mode & 0o777 == 0o600
+    migrated = cache.load_health_data(date(2024, 3, 1))
+    assert migrated is not None
+    assert migrated.steps is not None and migrated.steps.total_steps == 4321
+    # Freshness carries over from the legacy file's mtime
+    assert migrated.cache_age_hours is not None and migrated.cache_age_hours > 24
+    assert cache.is_cache_valid(date(2024, 3, 1)) is False
+
+
+def test_cache_metric_range_returns_daily_arrays(tmp_path: Path) -> None:
+    cache = GarminDataCache(tmp_path)
+    for day, steps in ((date(2024, 3, 1), 1000), (date(2024, 3, 3), 3000)):
+        cache.save_health_data(
+            HealthData(date=day, steps=StepsData(date=day, total_steps=steps))
+        )
+
+    series = cache.load_metric_range(date(2024, 3, 1), date(2024, 3, 4))
+
+    assert series.dates[0] == date(2024, 3, 1)
+    np.testing.assert_array_equal(
+        series.metric("daily_steps"), [1000.0, np.nan, 3000.0, np.nan]
+    )
+    assert np.isnan(series.metric("sleep_hours")).all()
+    assert cache.valid_dates(date(2024, 3, 1), date(2024, 3, 4)) == {
+        date(2024, 3, 1),
+        date(2024, 3, 3),
+    }
+    assert cache.get_cache_stats()["total_entries"] == 2
@@ -66,3 +66,91 @@ async def test_scheduler_uses_public_change_detection(
     await scheduler._check_significant_changes()
 
     analyzer.detect_significant_changes.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_integrator_correlates_rollup_range() -> None:
+    from datetime import date, timedelta
+
+    from src.health_analysis.integrator import HealthActivityIntegrator
+    from src.integrations.garmin.models import SleepData, StepsData
+
+    start = date(2024, 5, 1)
+    days = [start + timedelta(days=i) for i in range(4)]
+    activity = {
+        day: {
+            "message_count": i + 1,
+            "active_hours": [9],
+            "channel_activity": {},
+            "content_length_total": 100,
+            "ai_processed_count": 0,
+            "categories": {},
+            "tags": [],
+        }
+        for i, day in enumerate(days)
+    }
+    health = [
+        HealthData(
+            date=day,
+            sleep=SleepData(date=day, total_sleep_hours=8.0 - i),
+            steps=StepsData(date=day, total_steps=1000 * (i + 1)),
+        )
+        for i, day in enumerate(days)
+    ]
+
+    file_manager = MagicMock()
+    file_manager.activity_rollup.get_range = AsyncMock(return_value=activity)
+    integrator = HealthActivityIntegrator(file_manager)
+
+    result = await integrator.analyze_activity_correlation(health, start, days[-1])
+
+    file_manager.activity_rollup.get_range.assert_awaited_once_with(start, days[-1])
+    correlations = result.discord_activity_correlation
+    assert correlations["message_count_vs_daily_steps"] == 1.0
+    assert correlations["message_count_vs_sleep_hours"] == -1.0
+    # 分散ゼロの指標（活動時間数）は相関を計算しない
+    assert "active_hours_count_vs_daily_steps" not in correlations
+    assert result.sleep_steps_correlation == -1.0
+
+
+@pytest.mark.asyncio
+async def test_weekly_analysis_reads_metric_range_from_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from datetime import date
+
+    from src.health_analysis.scheduler import HealthAnalysisScheduler
+    from src.integrations.garmin.metrics import HealthMetricSeries
+
+    series = HealthMetricSeries(start_date=date(2024, 5, 6), end_date=date(2024, 5, 12))
+    garmin_client = MagicMock()
+    garmin_client.get_health_metric_range.return_value = series
+    analyzer = MagicMock()
+    analyzer.generate_weekly_summary = AsyncMock(return_value=MagicMock(insights=[]))
+    integrator = MagicMock()
+    integrator.analyze_activity_correlation = AsyncMock()
+
+    scheduler = HealthAnalysisScheduler(
+        garmin_client=garmin_client,
+        analyzer=analyzer,
+        integrator=integrator,
+        daily_integration=MagicMock(),
+    )
+    monkeypatch.setattr(
+        scheduler,
+        "_collect_week_health_data",
+        AsyncMock(return_value=[MagicMock(spec=HealthData)]),
+    )
+    monkeypatch.setattr(scheduler, "_save_analysis_to_daily_note", AsyncMock())
+    monkeypatch.setattr(scheduler, "_check_and_notify_significant_changes", AsyncMock())
+
+    await scheduler._run_weekly_analysis(date(2024, 5, 15))
+
+    garmin_client.get_health_metric_range.assert_called_once_with(
+        date(2024, 5, 6), date(2024, 5, 12)
+    )
+    assert analyzer.generate_weekly_summary.await_args.kwargs["metric_series"] is series
+    assert (
+        integrator.analyze_activity_correlation.await_args.kwargs["metric_series"]
+        is series
+    )
@@ -0,0 +1,128 @@
+"""Tests for the shared atomic JSON writer."""
+
+import asyncio
+import json
+import os
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError
+
+from src.utils.json_store import (
+    AtomicJsonWriter,
+    add_write_listener,
+    flush_all_writers,
+    remove_write_listener,
+    write_bytes_atomic,
+)
+
+
+class _Record(BaseModel):
+    id: str
+    amount: Decimal
+    day: date
+
+
+async def test_writer_serializes_models_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "records.json"
+    writer = AtomicJsonWriter(path, prefix="records_")
+
+    await writer.write(
+        {"a": _Record(id="a", amount=Decimal("12.5"), day=date(2024, 1, 2))}
+    )
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data == {"a": {"id": "a", "amount": "12.5", "day": "2024-01-02"}}
+    assert not list(tmp_path.glob("records_*.json"))
+
+
+async def test_concurrent_writes_are_coalesced(tmp_path: Path) -> None:
+    path = tmp_path / "burst.json"
+    writer = AtomicJsonWriter(path)
+
+    await asyncio.gather(*(writer.write({"value": i}) for i in range(50)))
+
+    assert writer.writes_requested == 50
+    assert writer.flushes < 50
+    assert json.loads(path.read_text(encoding="utf-8")) == {"value": 49}
+
+
+async def test_existing_file_mode_is_preserved(tmp_path: Path) -> None:
+    path = tmp_path / "private.json"
+    path.write_text("{}", encoding="utf-8")
+    os.chmod(path, 0o600)
+
+    await AtomicJsonWriter(path).write({"key": "値"})
+
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert json.loads(path.read_text(encoding="utf-8")) == {"key": "値"}
+
+
+async def test_failed_write_propagates_and_keeps_old_file(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    writer = AtomicJsonWriter(path)
+    await writer.write({"ok": True})
+
+    with pytest.raises(PydanticSerializationError):
+        await writer.write({"bad": object()})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"ok": True}
+
+
+async def test_flush_all_writers_waits_for_pending(tmp_path: Path) -> None:
+    path = tmp_path / "delayed.json"
+    writer = AtomicJsonWriter(path, coalesce_window=0.05)
+
+    pending = asyncio.create_task(writer.write({"late": 1}))
+    await asyncio.sleep(0)
+    await flush_all_writers()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"late": 1}
+    await pending
+
+
+async def test_scheduled_writes_take_one_snapshot_per_window(tmp_path: Path) -> None:
+    path = tmp_path / "derived.json"
+    writer = AtomicJsonWriter(path, coalesce_window=5.0)
+    state = {"count": 0}
+    snapshots: list[int] = []
+
+    def snapshot() -> dict[str, int]:
+        snapshots.append(state["count"])
+        return dict(state)
+
+    for count in range(100):
+        state["count"] = count
+        writer.schedule(snapshot)
+    # flush closes the coalesce window instead of waiting it out
+    await asyncio.wait_for(writer.flush(), timeout=1.0)
+
+    assert snapshots == [99]
+    assert writer.flushes == 1
+    assert json.loads(path.read_text(encoding="utf-8")) == {"count": 99}
+
+
+async def test_write_listeners_see_completed_writes(tmp_path: Path) -> None:
+    written: list[Path] = []
+
+    def listener(path: Path) -> None:
+        assert path.exists()
+        written.append(path)
+
+    def broken(path: Path) -> None:
+        raise RuntimeError("listener failure must not fail the write")
+
+    add_write_listener(broken)
+    add_write_listener(listener)
+    try:
+        await AtomicJsonWriter(tmp_path / "a.json").write({"a": 1})
+        write_bytes_atomic(tmp_path / "b.json", b"{}")
+    finally:
+        remove_write_listener(broken)
+        remove_write_listener(listener)
+    write_bytes_atomic(tmp_path / "c.json", b"{}")
+
+    assert written == [tmp_path / "a.json", tmp_path / "b.json"]
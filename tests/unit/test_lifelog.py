@@ -4,11 +4,15 @@
 基本的なライフログ機能のテストを実行
 """
 
-from datetime import date
+from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.lifelog.analyzer import LifelogAnalyzer
+from src.lifelog.daily_cube import LifelogDailyCube
+from src.lifelog.index import LifelogEntryIndex
+from src.lifelog.integrations.models import IntegrationData
 from src.lifelog.manager import LifelogManager
 from src.lifelog.message_handler import LifelogMessageHandler
 from src.lifelog.models import (
@@ -276,5 +280,221 @@ class TestLifelogManager:
         assert entry.title == "テスト エントリー"
 
 
+class TestLifelogEntryIndex:
+    """ライフログ二次インデックスのテスト"""
+
+    @staticmethod
+    def _entry(entry_id, timestamp, category=LifelogCategory.HEALTH, metadata=None):
+        return LifelogEntry(
+            id=entry_id,
+            timestamp=timestamp,
+            category=category,
+            type=LifelogType.EVENT,
+            title=entry_id,
+            content="",
+            metadata=metadata or {},
+        )
+
+    def test_date_range_and_category(self):
+        """日付範囲・カテゴリ検索のテスト"""
+        base = datetime(2025, 1, 10, 12, 0)
+        index = LifelogEntryIndex()
+        index.rebuild(
+            [
+                self._entry("a", base),
+                self._entry("b", base + timedelta(days=1), LifelogCategory.WORK),
+                self._entry("c", base - timedelta(days=3)),
+            ]
+        )
+
+        assert index.ids_in_date_range(date(2025, 1, 10), date(2025, 1, 11)) == [
+            "a",
+            "b",
+        ]
+        assert index.ids_by_category(LifelogCategory.HEALTH) == ["a", "c"]
+        assert index.ids_by_category("work") == ["b"]
+
+    def test_update_and_remove(self):
+        """再登録・削除でインデックスが追従することのテスト"""
+        index = LifelogEntryIndex()
+        entry = self._entry(
+            "a",
+            datetime(2025, 1, 10, 9, 0),
+            metadata={"integration_name": "garmin", "external_id": "x1"},
+        )
+        index.add(entry)
+        assert index.find_external("garmin", "x1") == "a"
+
+        entry.timestamp = datetime(2025, 2, 1, 9, 0)
+        entry.category = LifelogCategory.WORK
+        index.add(entry)
+        assert index.ids_in_date_range(date(2025, 1, 10), date(2025, 1, 10)) == []
+        assert index.ids_by_category(LifelogCategory.HEALTH) == []
+        assert index.ids_by_category(LifelogCategory.WORK) == ["a"]
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index.find_external("garmin", "x1") is None
+
+
+class TestLifelogDailyCube:
+    """日次集計キューブのテスト"""
+
+    @staticmethod
+    def _entry(entry_id, day, mood=None, energy=None, category=LifelogCategory.HEALTH):
+        return LifelogEntry(
+            id=entry_id,
+            timestamp=datetime.combine(day, datetime.min.time()),
+            category=category,
+            type=LifelogType.EVENT,
+            title=entry_id,
+            content="",
+            mood=mood,
+            energy_level=energy,
+        )
+
+    def test_incremental_updates_and_slices(self):
+        """差分更新と範囲スライスのテスト"""
+        cube = LifelogDailyCube()
+        day = date(2025, 3, 1)
+        cube.add(self._entry("a", day, mood=MoodLevel.GOOD, energy=2))
+        cube.add(self._entry("b", day, mood=MoodLevel.VERY_GOOD))
+        # 既存範囲より前後に大きく離れた日付で配列が拡張されること
+        cube.add(self._entry("c", date(2021, 1, 1), category=LifelogCategory.WORK))
+        cube.add(self._entry("d", date(2028, 12, 31), energy=5))
+
+        counts = cube.daily_counts(day - timedelta(days=1), day + timedelta(days=1))
+        assert counts.tolist() == [0, 2, 0]
+        assert cube.daily_mean("mood", day, day).tolist() == [4.5]
+        assert cube.daily_mean("energy", day, day).tolist() == [2.0]
+        assert cube.category_totals(date(2020, 1, 1), date(2029, 1, 1)) == {
+            "health": 3,
+            "work": 1,
+        }
+
+        cube.remove("b")
+        cube.add(self._entry("a", day + timedelta(days=1), mood=MoodLevel.BAD))
+        assert cube.daily_counts(day, day + timedelta(days=1)).tolist() == [0, 1]
+        assert cube.daily_mean("mood", day, day + timedelta(days=1))[1] == 2.0
+        # 範囲外のスライスは 0 埋め
+        assert cube.daily_counts(date(1999, 1, 1), date(1999, 1, 3)).sum() == 0
+
+    def test_rebuild_matches_incremental(self):
+        """再構築結果が差分更新と一致することのテスト"""
+        entries = [
+            self._entry(f"e{i}", date(2024, 1, 1) + timedelta(days=i * 3), energy=3)
+            for i in range(200)
+        ]
+        incremental = LifelogDailyCube()
+        for entry in entries:
+            incremental.add(entry)
+        rebuilt = LifelogDailyCube()
+        rebuilt.rebuild(entries)
+
+        start, end = date(2024, 1, 1), date(2025, 12, 31)
+        assert (
+            incremental.daily_counts(start, end) == rebuilt.daily_counts(start, end)
+        ).all()
+        assert len(rebuilt) == 200
+
+
+@pytest.mark.asyncio
+class TestLifelogAnalyzer:
+    """集計キューブを用いたアナライザーのテスト"""
+
+    @pytest.fixture
+    def lifelog_manager(self, tmp_path):
+        settings = MagicMock()
+        settings.obsidian_vault_path = str(tmp_path)
+        return LifelogManager(settings)
+
+    async def test_trend_and_correlation_from_cube(self, lifelog_manager):
+        """トレンド・相関がキューブから計算されることのテスト"""
+        start = date(2025, 1, 1)
+        entries = []
+        for offset in range(10):
+            level = offset % 5 + 1
+            entries.append(
+                LifelogEntry(
+                    timestamp=datetime.combine(
+                        start + timedelta(days=offset), datetime.min.time()
+                    ),
+                    category=LifelogCategory.MOOD,
+                    type=LifelogType.EVENT,
+                    title="記録",
+                    content="",
+                    mood=MoodLevel(level),
+                    energy_level=level,
+                )
+            )
+        await lifelog_manager.add_entries(entries)
+
+        ai_processor = AsyncMock()
+        ai_processor.process_text.return_value = None
+        analyzer = LifelogAnalyzer(lifelog_manager, ai_processor)
+
+        trend = await analyzer.analyze_life_trend(
+            "activity_count", start, start + timedelta(days=13)
+        )
+        assert len(trend.data_points) == 14
+        assert trend.max_value == 1.0
+
+        mood_trend = await analyzer.analyze_life_trend(
+            "mood", start, start + timedelta(days=13)
+        )
+        assert len(mood_trend.data_points) == 10
+
+        correlations = await analyzer.find_correlations(
+            start, start + timedelta(days=13)
+        )
+        assert correlations == [("mood", "energy", pytest.approx(1.0))]
+
+
+@pytest.mark.asyncio
+class TestLifelogManagerIntegration:
+    """外部連携データの一括統合テスト"""
+
+    @pytest.fixture
+    def lifelog_manager(self, tmp_path):
+        settings = MagicMock()
+        settings.obsidian_vault_path = str(tmp_path)
+        return LifelogManager(settings)
+
+    async def test_integrate_external_data_batches_and_dedups(
+        self, lifelog_manager, monkeypatch
+    ):
+        """重複を除外し 1 回の保存で統合されることのテスト"""
+        save_calls = 0
+        original_save = lifelog_manager._save_data
+
+        async def counting_save():
+            nonlocal save_calls
+            save_calls += 1
+            await original_save()
+
+        monkeypatch.setattr(lifelog_manager, "_save_data", counting_save)
+
+        timestamp = datetime(2025, 1, 10, 8, 0)
+        payload = [
+            IntegrationData(
+                integration_type="custom",
+                source_id=f"ev-{i % 50}",
+                timestamp=timestamp + timedelta(hours=i),
+                data={"title": f"event {i}"},
+            )
+            for i in range(100)
+        ]
+
+        assert await lifelog_manager.integrate_external_data(payload) == 50
+        assert save_calls == 1
+        assert await lifelog_manager.integrate_external_data(payload) == 0
+
+        entries = await lifelog_manager.get_entries_by_date_range(
+            date(2025, 1, 10), date(2025, 1, 10)
+        )
+        assert len(entries) == 16
+        assert entries[0].timestamp > entries[-1].timestamp
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
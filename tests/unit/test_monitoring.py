@@ -0,0 +1,309 @@
+"""Test startup tracking, metrics and endpoints of the health server."""
+
+import asyncio
+import sys
+import threading
+from collections.abc import AsyncIterator
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from pydantic import SecretStr
+
+from src.bot.metrics import APIUsageMonitor, SystemMetrics
+from src.monitoring.health_server import HealthCheckHandler
+from src.monitoring.metrics import (
+    CACHE_HIT_RATIO,
+    LATENCY_BUCKETS,
+    MESSAGE_PIPELINE_SECONDS,
+    MetricsRegistry,
+    get_metrics_registry,
+    record_cache_lookup,
+    timed,
+)
+from src.monitoring.startup import StartupTracker
+
+
+class TestStartupTracker:
+    """Test staged startup timings and readiness gating."""
+
+    async def test_readiness_waits_for_expected_steps(self) -> None:
+        """Expected steps keep the tracker not ready until they finish"""
+        tracker = StartupTracker()
+        tracker.expect("vault-sync", "index-warmup")
+        assert tracker.pending_steps() == ["vault-sync", "index-warmup"]
+
+        waiter = asyncio.create_task(tracker.wait_for("vault-sync"))
+        with tracker.step("vault-sync"):
+            await asyncio.sleep(0)
+            assert not waiter.done()
+        await asyncio.wait_for(waiter, 1)
+
+        with pytest.raises(RuntimeError), tracker.step("index-warmup"):
+            raise RuntimeError("index broken")
+
+        # A failed step no longer blocks readiness, but is reported
+        assert tracker.is_ready
+        report = tracker.report()
+        assert report["ready"] and report["ready_after_ms"] is not None
+        steps = {step["name"]: step for step in report["steps"]}
+        assert steps["vault-sync"]["status"] == "done"
+        assert steps["index-warmup"]["status"] == "failed"
+        assert steps["index-warmup"]["error"] == "index broken"
+
+    def test_import_times_are_recorded_once(self) -> None:
+        """First imports are timed; modules already loaded are not"""
+        sys.modules.pop("colorsys", None)
+        tracker = StartupTracker()
+
+        module = tracker.import_module("colorsys")
+        assert tracker.import_module("colorsys") is module
+        tracker.import_module("json")
+
+        imports = tracker.report()["imports_ms"]
+        assert list(imports) == ["colorsys"]
+        assert imports["colorsys"] >= 0
+
+
+class TestMetricsRegistry:
+    """Test the metrics registry and its Prometheus exposition."""
+
+    def test_render_counters_gauges_and_histograms(self) -> None:
+        """Series are rendered with labels, cumulative buckets, sum and count"""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("service",))
+        depth = registry.gauge("queue_depth", "Depth", ("queue",))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+
+        calls.inc(service="gemini")
+        calls.inc(2, service='say "hi"')
+        depth.set_function(lambda: 3, queue="writes")
+        depth.set_function(lambda: None, queue="gone")
+        for value in (0.05, 0.1, 0.5, 5):
+            latency.observe(value)
+
+        assert registry.counter("calls_total", "Calls", ("service",)) is calls
+        lines = registry.render().splitlines()
+        assert "# TYPE calls_total counter" in lines
+        assert 'calls_total{service="gemini"} 1' in lines
+        assert 'calls_total{service="say \\"hi\\""} 2' in lines
+        assert 'queue_depth{queue="writes"} 3' in lines
+        assert not any('queue="gone"' in line for line in lines)
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 5.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_rejects_mismatched_labels_and_types(self) -> None:
+        """Label sets and metric types are checked"""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("service",))
+
+        with pytest.raises(ValueError):
+            calls.inc(outcome="error")
+        with pytest.raises(ValueError):
+            calls.inc(-1, service="gemini")
+        with pytest.raises(ValueError):
+            registry.gauge("calls_total", "Calls", ("service",))
+
+    def test_counter_unit_increments_from_threads(self) -> None:
+        """Increments from several threads add up exactly"""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("service",))
+        bound = calls.labels(service="gemini")
+
+        def work() -> None:
+            for _ in range(10000):
+                bound.inc()
+                calls.inc(service="gemini")
+            bound.inc(0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert bound.value() == calls.value(service="gemini") == 160004.0
+        assert calls.value(service="speech") == 0.0
+        assert 'calls_total{service="gemini"} 160004' in registry.render()
+
+    def test_cache_hit_ratio_is_derived_from_lookups(self) -> None:
+        """The hit ratio gauge follows the lookup counters"""
+        for hit in (True, True, True, False):
+            record_cache_lookup("test_cache", hit)
+
+        assert CACHE_HIT_RATIO.value(cache="test_cache") == 0.75
+        assert 'mindbridge_cache_hit_ratio{cache="test_cache"} 0.75' in (
+            get_metrics_registry().render()
+        )
+
+
+class TestHealthServerEndpoints:
+    """Test the aiohttp health endpoints and their token checks."""
+
+    @pytest.fixture
+    async def client(self) -> AsyncIterator[TestClient]:
+        settings = SimpleNamespace(
+            health_endpoint_token=SecretStr("secret-token"),
+            health_callback_state=None,
+        )
+        bot = SimpleNamespace(
+            is_ready=True,
+            start_time=datetime.now(),
+            bot=SimpleNamespace(guilds=[object()]),
+        )
+        with patch("src.monitoring.health_server.get_settings", return_value=settings):
+            app = HealthCheckHandler(bot_instance=bot).create_app()
+        async with TestClient(TestServer(app)) as test_client:
+            yield test_client
+
+    async def test_metrics_require_token(self, client: TestClient) -> None:
+        """Protected scopes reject missing or wrong tokens"""
+        response = await client.get("/metrics")
+        assert response.status == 401
+
+        response = await client.get(
+            "/metrics", headers={"X-Health-Token": "wrong-token"}
+        )
+        assert response.status == 401
+
+        response = await client.get("/probe")
+        assert response.status == 200
+
+    async def test_metrics_use_prometheus_text_format(self, client: TestClient) -> None:
+        """/metrics serves the registry; the JSON summary moved to /metrics.json"""
+        MESSAGE_PIPELINE_SECONDS.observe(0.2, stage="handler")
+        headers = {"Authorization": "Bearer secret-token"}
+
+        response = await client.get("/metrics", headers=headers)
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        body = await response.text()
+        assert "# TYPE mindbridge_message_pipeline_seconds histogram" in body
+        assert 'mindbridge_message_pipeline_seconds_count{stage="handler"}' in body
+        assert "mindbridge_bot_connected 1" in body
+        assert "mindbridge_bot_guilds 1" in body
+
+        response = await client.get("/metrics.json", headers=headers)
+        assert response.status == 200
+        data = await response.json()
+        assert data["bot_status"] == {"connected": True, "guild_count": 1}
+
+        response = await client.get("/unknown", headers=headers)
+        assert response.status == 404
+
+
+class TestOperationTiming:
+    """Test percentile estimates and the timed() helper."""
+
+    def test_quantiles_are_estimated_from_buckets(self) -> None:
+        """p50/p95/p99 stay within one bucket of the exact values"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "op_seconds", "Ops", ("operation",), buckets=LATENCY_BUCKETS
+        )
+        bound = histogram.labels(operation="save")
+        for millis in range(1, 1001):
+            bound.observe(millis / 1000)
+
+        summary = histogram.summary(operation="save")
+        assert summary["count"] == 1000
+        assert summary["max"] == 1.0
+        assert summary["avg"] == pytest.approx(0.5005)
+        for key, exact in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            assert summary[key] == pytest.approx(exact, rel=0.19)
+        assert histogram.quantile(0.5, operation="missing") is None
+
+    def test_summaries_are_reused_until_the_next_observation(self) -> None:
+        """Cached summaries are copies and follow new observations"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "op_seconds", "Ops", ("operation",), buckets=LATENCY_BUCKETS
+        )
+        histogram.observe(0.01, operation="save")
+        histogram.labels(operation="idle")
+
+        first = histogram.summaries()
+        assert list(first) == [("save",)]
+        first[("save",)]["count"] = 99
+        assert histogram.summary(operation="save")["count"] == 1
+
+        histogram.observe(1.0, operation="save")
+        summary = histogram.summary(operation="save")
+        assert summary["count"] == 2
+        assert summary["max"] == 1.0
+
+    async def test_timed_records_blocks_and_functions(self) -> None:
+        """timed() works as a context manager and a sync/async decorator"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "op_seconds", "Ops", ("operation",), buckets=LATENCY_BUCKETS
+        )
+
+        @timed("sync", histogram)
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        @timed("async", histogram)
+        async def fail() -> None:
+            raise RuntimeError("boom")
+
+        with timed("block", histogram):
+            await asyncio.sleep(0.01)
+        assert add(1, 2) == 3
+        with pytest.raises(RuntimeError):
+            await fail()
+
+        assert histogram.count(operation="sync") == 1
+        assert histogram.count(operation="async") == 1
+        assert histogram.summary(operation="block")["max"] >= 0.01
+
+
+class TestBotMetrics:
+    """Test SystemMetrics and APIUsageMonitor on the metrics registry."""
+
+    def test_system_metrics_summary(self) -> None:
+        """Counters, bounded error history and per-operation percentiles"""
+        metrics = SystemMetrics()
+        metrics.increment_message_count()
+        metrics.record_ai_request(False, 250)
+        for index in range(150):
+            metrics.add_error({"type": "command_error", "index": index})
+        for _ in range(10):
+            metrics.add_performance_data("vault.save_note", 0.02)
+
+        summary = metrics.get_metrics_summary()
+        assert summary["total_messages_processed"] == 1
+        assert summary["failed_ai_requests"] == 1
+        assert summary["errors_last_hour"] == 150
+        assert len(metrics.error_history) == 100
+        assert metrics.error_history[0]["error"]["index"] == 50
+        assert summary["operations"]["vault.save_note"]["count"] == 10
+        assert summary["operations"]["vault.save_note"]["p95"] == pytest.approx(0.02)
+        assert summary["operations"]["ai_request"]["max"] == 0.25
+        assert 'mindbridge_errors_total{type="command_error"} 150' in (
+            metrics.registry.render()
+        )
+
+        metrics.reset_hourly_stats()
+        assert metrics.metrics["errors_last_hour"] == 0
+
+    def test_api_usage_monitor_enforces_hourly_limit(self) -> None:
+        """Requests over the hourly quota are refused and counted"""
+        monitor = APIUsageMonitor()
+        results = [monitor.record_api_usage("speech") for _ in range(3)]
+
+        assert results == [True, True, False]
+        status = monitor.get_usage_status()
+        assert status["hourly_usage"]["speech"] == 2
+        assert status["hourly_remaining"]["speech"] == 0
+        assert not monitor.is_api_available("speech")
+        rendered = monitor.registry.render()
+        assert (
+            'mindbridge_api_requests_rejected_total{api="speech",window="hourly"} 1'
+            in rendered
+        )
@@ -1,8 +1,12 @@
 """Test Obsidian functionality"""
 
+import asyncio
 import os
+import subprocess
 import tempfile
-from datetime import datetime
+import threading
+import time
+from datetime import date, datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -29,8 +33,17 @@ os.environ.update(
 )
 
 from src.ai.models import AIProcessingResult
+from src.obsidian.backup import (
+    BackupCancelledError,
+    BackupConfig,
+    BackupManager,
+    BackupProgress,
+    run_backup_task,
+)
+from src.obsidian.change_feed import VaultChangeFeed, get_change_feed
 from src.obsidian.file_manager import ObsidianFileManager
 from src.obsidian.github_sync import GitHubObsidianSync
+from src.obsidian.metadata import MetadataManager
 from src.obsidian.models import (
     FolderMapping,
     NoteFilename,
@@ -38,7 +51,10 @@ from src.obsidian.models import (
     ObsidianNote,
     VaultFolder,
 )
+from src.obsidian.organizer import VaultOrganizer
+from src.obsidian.sync_scheduler import GitSyncScheduler
 from src.obsidian.template_system import TemplateEngine
+from src.utils.json_store import flush_all_writers
 
 
 class DummyGitHubSettings:
@@ -279,6 +295,33 @@ class TestObsidianFileManager:
 
         assert "This is a test note content" in loaded_note.content
 
+        # The saved note is queued for the coalesced git sync
+        pending = self.file_manager.change_feed.take()
+        assert f"{VaultFolder.INBOX.value}/test_note.md" in pending
+
+    async def test_template_and_daily_note_writes_are_recorded(self) -> None:
+        """Templates and daily notes are queued for git sync and indexed"""
+        self.file_manager.change_feed.take()
+        await self.file_manager.initialize_vault()
+        await self.file_manager._create_template_files()
+        pending = self.file_manager.change_feed.take()
+        assert f"{VaultFolder.TEMPLATES.value}/Daily Note.md" in pending
+        assert f"{VaultFolder.TEMPLATES.value}/message_note_template.md" in pending
+
+        note = ObsidianNote(
+            filename="memo.md",
+            file_path=Path("memo.md"),
+            frontmatter=NoteFrontmatter(obsidian_folder=VaultFolder.INBOX.value),
+            content="daily memo",
+        )
+        saved = await self.file_manager.save_or_append_daily_note(note, "2024-05-01")
+
+        assert saved == self.temp_dir / "Daily Notes" / "daily-2024-05-01.md"
+        assert saved.exists()
+        assert "Daily Notes/daily-2024-05-01.md" in self.file_manager.change_feed.take()
+        day = await self.file_manager.activity_rollup.get_day(date(2024, 5, 1))
+        assert day.message_count == 1
+
     async def test_note_overwrite(self) -> None:
         """Existing note is overwritten when requested."""
         await self.file_manager.initialize_vault()
@@ -382,6 +425,516 @@ class TestObsidianFileManager:
         assert stats.total_words > 0
         # 新しい統計モデルには AI 処理関連の属性がないため削除
 
+    async def test_activity_rollup_tracks_saves_and_deletes(self) -> None:
+        """Daily activity rollup follows note saves, updates and deletes"""
+        await self.file_manager.initialize_vault()
+
+        paths = []
+        for i, created in enumerate(
+            ["2024-03-01T09:15:00", "2024-03-01T21:40:00", "2024-03-02T08:00:00"]
+        ):
+            note = ObsidianNote(
+                filename=f"activity_{i}.md",
+                file_path=self.temp_dir / VaultFolder.INBOX.value / f"activity_{i}.md",
+                frontmatter=NoteFrontmatter(
+                    obsidian_folder=VaultFolder.INBOX.value,
+                    created=created,
+                    discord_channel="memo",
+                    ai_processed=i != 1,
+                    ai_category="work",
+                    ai_tags=["#focus"],
+                ),
+                content="x" * 10,
+            )
+            saved = await self.file_manager.save_note(note)
+            assert saved is not None
+            paths.append(saved)
+
+        rollup = self.file_manager.activity_rollup
+        days = await rollup.get_range(date(2024, 3, 1), date(2024, 3, 2))
+        first = days[date(2024, 3, 1)]
+        assert first["message_count"] == 2
+        assert first["active_hours"] == [9, 21]
+        assert first["channel_activity"] == {"memo": 2}
+        assert first["content_length_total"] == 20
+        assert first["ai_processed_count"] == 1
+        assert first["tags"] == ["focus"]
+
+        await self.file_manager.delete_note(paths[2], backup=False)
+        days = await rollup.get_range(date(2024, 3, 1), date(2024, 3, 2))
+        assert set(days) == {date(2024, 3, 1)}
+
+        # 永続化された状態から再読込し、欠損時は Vault 走査で再構築する
+        await flush_all_writers()
+        reloaded = ObsidianFileManager(self.temp_dir).activity_rollup
+        assert await reloaded.get_range(date(2024, 3, 1), date(2024, 3, 1)) == days
+
+        reloaded.store_path.unlink()
+        rebuilt = ObsidianFileManager(self.temp_dir).activity_rollup
+        assert await rebuilt.get_range(date(2024, 3, 1), date(2024, 3, 1)) == days
+
+    async def test_activity_rollup_reconciles_external_changes(self) -> None:
+        """Notes added, edited or removed outside the app are picked up on load"""
+        inbox = self.temp_dir / VaultFolder.INBOX.value
+        inbox.mkdir(parents=True)
+        kept = inbox / "kept.md"
+        edited = inbox / "edited.md"
+        removed = inbox / "removed.md"
+        for path in (kept, edited, removed):
+            path.write_text(
+                "---\ncreated: 2024-04-01T09:00:00\ndiscord_channel: memo\n---\n"
+                "\n# Title\n\nbody\n",
+                encoding="utf-8",
+            )
+        await self.file_manager.activity_rollup.rebuild()
+
+        # git pull / Obsidian での変更を模擬する
+        edited.write_text(
+            "---\ncreated: 2024-04-02T10:00:00\ntags: [pulled]\n---\nlonger body\n",
+            encoding="utf-8",
+        )
+        removed.unlink()
+        (inbox / "added.md").write_text(
+            "---\ncreated: 2024-04-02T11:00:00\n---\nnew\n", encoding="utf-8"
+        )
+
+        rollup = ObsidianFileManager(self.temp_dir).activity_rollup
+        days = await rollup.get_range(date(2024, 4, 1), date(2024, 4, 2))
+        assert days[date(2024, 4, 1)]["message_count"] == 1
+        assert days[date(2024, 4, 1)]["content_length_total"] == len("body")
+        assert days[date(2024, 4, 2)]["message_count"] == 2
+        assert days[date(2024, 4, 2)]["active_hours"] == [10, 11]
+        assert days[date(2024, 4, 2)]["tags"] == ["pulled"]
+        assert [key for key, _ in await rollup.note_entries()] == [
+            "00_Inbox/added.md",
+            "00_Inbox/edited.md",
+            "00_Inbox/kept.md",
+        ]
+
+
+class TestBulkMetadata:
+    """Test bulk frontmatter updates"""
+
+    def setup_method(self) -> None:
+        """Setup test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_manager = ObsidianFileManager(self.temp_dir)
+        self.metadata = MetadataManager(self.file_manager)
+
+    def _write(self, relative: str, frontmatter: str, body: str) -> Path:
+        path = self.temp_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(f"---\n{frontmatter}\n---\n{body}".encode())
+        return path
+
+    async def test_rewrite_keeps_body_bytes(self) -> None:
+        """Only frontmatter lines change; the body is copied byte for byte"""
+        body = "\n# Title\r\n\nbody with  trailing spaces  \n---\nnot frontmatter\n"
+        target = self._write(
+            "00_Inbox/a.md",
+            "created: 2024-03-01T09:00:00\nai_category: work\ntags: [old]",
+            body,
+        )
+        other = self._write(
+            "00_Inbox/b.md", "created: 2024-03-01T10:00:00\nai_category: life", "b"
+        )
+        other_before = other.read_bytes()
+
+        result = await self.metadata.bulk_update_metadata(
+            {"category": "work"}, {"tags": ["new", "#review"], "unknown": 1}
+        )
+
+        assert result["processed"] == 1
+        assert result["updated"] == 1
+        assert result["updated_notes"] == [{"title": "a", "path": str(target)}]
+        data = target.read_bytes()
+        assert data.endswith(b"---\n" + body.encode())
+        assert b"tags: [new, review]\n" in data
+        assert b"modified: " in data
+        assert other.read_bytes() == other_before
+
+    async def test_dry_run_returns_diff_without_writing(self) -> None:
+        """Dry-run mode reports a diff per note and leaves files untouched"""
+        paths = [
+            self._write(f"00_Inbox/n{i}.md", f"created: 2024-03-0{i + 1}", "x")
+            for i in range(3)
+        ]
+        before = [path.read_bytes() for path in paths]
+
+        result = await self.metadata.bulk_update_metadata(
+            {"date_from": "2024-03-02", "date_to": "2024-03-03"},
+            {"status": "archived"},
+            dry_run=True,
+        )
+
+        assert result["dry_run"] is True
+        assert result["updated"] == 2
+        assert [change["path"] for change in result["changes"]] == [
+            str(paths[1]),
+            str(paths[2]),
+        ]
+        assert "+status: archived" in result["changes"][0]["diff"]
+        assert [path.read_bytes() for path in paths] == before
+
+    async def test_retag_block_list_note_stays_valid_yaml(self) -> None:
+        """Block-style lists are read and replaced as a whole, not line by line"""
+        import yaml
+
+        target = self._write(
+            "00_Inbox/block.md",
+            "created: 2024-03-01\ntags:\n  - inbox\n  - draft\nai_category: work",
+            "\nbody\n",
+        )
+
+        result = await self.metadata.bulk_update_metadata(
+            {"tags": ["draft"]}, {"tags": ["reviewed"]}
+        )
+
+        assert result["updated"] == 1
+        data = target.read_text(encoding="utf-8")
+        frontmatter = yaml.safe_load(data.split("---\n")[1])
+        assert frontmatter["tags"] == ["reviewed"]
+        assert frontmatter["ai_category"] == "work"
+        assert "- inbox" not in data
+        assert data.endswith("---\n\nbody\n")
+
+    async def test_tag_usage_reads_index_when_available(self) -> None:
+        """Tag analysis uses the activity rollup and follows bulk updates"""
+        self._write("00_Inbox/a.md", "created: 2024-03-01\nai_tags: [#ai]", "a")
+        self._write("00_Inbox/b.md", "created: 2024-03-02\ntags: [manual]", "b")
+
+        scanned = await self.metadata.analyze_tag_usage()
+        assert scanned["source"] == "frontmatter"
+        assert scanned["tag_frequency"] == {"ai": 1, "manual": 1}
+
+        await self.file_manager.activity_rollup.rebuild()
+        await self.metadata.bulk_update_metadata(
+            {"tags": ["manual"]}, {"tags": ["manual", "extra"]}
+        )
+
+        indexed = await self.metadata.analyze_tag_usage()
+        assert indexed["source"] == "index"
+        assert indexed["ai_tags_frequency"] == {"ai": 1}
+        assert indexed["manual_tags_frequency"] == {"extra": 1, "manual": 1}
+        assert indexed["notes_with_tags"] == 2
+
+
+class TestVaultOrganizerPlanner:
+    """Test index-driven note organization"""
+
+    def setup_method(self) -> None:
+        """Setup test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_manager = ObsidianFileManager(self.temp_dir)
+        self.organizer = VaultOrganizer(self.file_manager)
+
+    async def _save(self, folder: str, name: str, **frontmatter) -> Path:
+        note = ObsidianNote(
+            filename=name,
+            file_path=self.temp_dir / folder / name,
+            frontmatter=NoteFrontmatter(obsidian_folder=folder, **frontmatter),
+            content=f"body of {name}",
+        )
+        saved = await self.file_manager.save_note(note)
+        assert saved is not None
+        return saved
+
+    async def test_organize_plans_then_moves_in_one_batch(self) -> None:
+        """Notes move by category; unchanged frontmatter means a plain rename"""
+        inbox = VaultFolder.INBOX.value
+        idea = await self._save(inbox, "idea.md", ai_category="アイデア")
+        await self._save(inbox, "other.md", ai_category="その他")
+        await self._save(inbox, "tagged.md", ai_tags=["#health"])
+        filed = await self._save(
+            inbox,
+            "filed.md",
+            ai_category="アイデア",
+            vault_hierarchy=VaultFolder.IDEAS.value,
+            organization_level="category",
+        )
+        filed.write_text(
+            filed.read_text(encoding="utf-8").replace(
+                f"obsidian_folder: {inbox}",
+                f"obsidian_folder: {VaultFolder.IDEAS.value}",
+            ),
+            encoding="utf-8",
+        )
+        filed_bytes = filed.read_bytes()
+
+        planned = await self.organizer.organize_notes_by_category(dry_run=True)
+        assert planned["processed"] == 4
+        assert planned["moved"] == 3
+        assert planned["renames_only"] == 1
+        assert idea.exists()
+
+        result = await self.organizer.organize_notes_by_category()
+        assert result["moved"] == 3
+        assert result["errors"] == 0
+        assert len(result["renames"]) == 3
+
+        moved_idea = self.temp_dir / VaultFolder.IDEAS.value / "idea.md"
+        assert not idea.exists()
+        content = moved_idea.read_text(encoding="utf-8")
+        assert f"obsidian_folder: {VaultFolder.IDEAS.value}" in content
+        assert content.endswith("body of idea.md")
+        assert (self.temp_dir / VaultFolder.IDEAS.value / "filed.md").read_bytes() == (
+            filed_bytes
+        )
+        assert (self.temp_dir / VaultFolder.HEALTH.value / "tagged.md").exists()
+        assert (self.temp_dir / inbox / "other.md").exists()
+
+        keys = [
+            key for key, _ in await self.file_manager.activity_rollup.note_entries()
+        ]
+        assert f"{VaultFolder.IDEAS.value}/idea.md" in keys
+        assert f"{inbox}/idea.md" not in keys
+
+    async def test_organize_includes_notes_written_outside_the_app(self) -> None:
+        """Notes from git pull or Obsidian are planned without a rebuild"""
+        inbox = self.temp_dir / VaultFolder.INBOX.value
+        await self._save(VaultFolder.INBOX.value, "a.md", ai_category="アイデア")
+        (inbox / "b.md").write_text(
+            "---\nai_category: アイデア\n---\nb\n", encoding="utf-8"
+        )
+
+        fresh = VaultOrganizer(ObsidianFileManager(self.temp_dir))
+        planned = await fresh.organize_notes_by_category(dry_run=True)
+        assert planned["processed"] == 2
+
+        # 読み込み済みのロールアップでも、計画前に外部の変更を反映する
+        (inbox / "c.md").write_text(
+            "---\nai_category: アイデア\n---\nc\n", encoding="utf-8"
+        )
+        planned = await fresh.organize_notes_by_category(dry_run=True)
+        assert planned["processed"] == 3
+
+    async def test_archive_moves_old_active_notes(self) -> None:
+        """Old active notes move under the archive folder with archived status"""
+        ideas = VaultFolder.IDEAS.value
+        old = await self._save(ideas, "old.md", created="2020-01-01T09:00:00")
+        recent = await self._save(ideas, "recent.md")
+
+        result = await self.organizer.archive_old_notes(days_old=30)
+
+        assert result["archived"] == 1
+        assert result["archived_notes"][0]["path"] == f"{ideas}/old.md"
+        archived = self.temp_dir / VaultFolder.ARCHIVE.value / ideas / "old.md"
+        assert not old.exists()
+        assert "status: archived" in archived.read_text(encoding="utf-8")
+        assert recent.exists()
+
+        entries = dict(await self.file_manager.activity_rollup.note_entries())
+        assert entries[f"{VaultFolder.ARCHIVE.value}/{ideas}/old.md"].status == (
+            "archived"
+        )
+
+
+class TestBackupContentStore:
+    """Test deduplicated vault backups and snapshots"""
+
+    def setup_method(self) -> None:
+        """Setup test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.vault = self.temp_dir / "vault"
+        (self.vault / "notes").mkdir(parents=True)
+        (self.vault / ".obsidian").mkdir()
+        (self.vault / "notes" / "a.md").write_text("alpha " * 200, encoding="utf-8")
+        (self.vault / "notes" / "b.md").write_text("alpha " * 200, encoding="utf-8")
+        (self.vault / "notes" / "c.md").write_text("gamma", encoding="utf-8")
+        (self.vault / ".obsidian" / "app.json").write_text("{}", encoding="utf-8")
+
+    def _manager(self, max_backups: int = 10) -> BackupManager:
+        config = BackupConfig(
+            backup_directory=self.temp_dir / "backups", max_backups=max_backups
+        )
+        return BackupManager(self.vault, config)
+
+    async def test_backups_store_each_content_once(self) -> None:
+        """Identical files share one object; unchanged files are not read again"""
+        manager = self._manager()
+
+        first = await manager.create_backup("first")
+        second = await manager.create_backup("second")
+
+        assert first.success and first.snapshot is not None
+        assert first.files_backed_up == 3
+        assert first.snapshot.new_objects == 2
+        assert first.backup_path is not None and first.backup_path.suffix == ".json"
+        assert second.snapshot is not None
+        assert second.snapshot.new_objects == 0
+        assert second.snapshot.unchanged_files == 3
+        assert second.snapshot.dedup_ratio == 1.0
+        assert manager.store.usage()["objects"] == 2
+
+        names = [backup["name"] for backup in await manager.list_backups()]
+        assert len(names) == 2
+        assert all(name.startswith("vault_backup_") for name in names)
+
+    async def test_restore_rebuilds_vault_from_manifest(self) -> None:
+        """Restoring a manifest rebuilds the vault as it was backed up"""
+        manager = self._manager()
+        result = await manager.create_backup()
+        assert result.backup_path is not None
+
+        (self.vault / "notes" / "a.md").write_text("changed", encoding="utf-8")
+        (self.vault / "notes" / "new.md").write_text("new", encoding="utf-8")
+
+        backup_name = result.backup_path.stem
+        assert await manager.restore_backup(
+            manager.config.backup_directory / backup_name
+        )
+
+        assert (self.vault / "notes" / "a.md").read_text(encoding="utf-8") == (
+            "alpha " * 200
+        )
+        assert not (self.vault / "notes" / "new.md").exists()
+        assert not (self.vault / ".obsidian").exists()
+
+    async def test_retention_collects_unreferenced_objects(self) -> None:
+        """Expired manifests release objects no other manifest refers to"""
+        manager = self._manager(max_backups=1)
+        await manager.create_backup("old")
+        (self.vault / "notes" / "c.md").write_text("gamma v2", encoding="utf-8")
+
+        await manager.create_backup("new")
+
+        backups = await manager.list_backups()
+        assert [backup["name"] for backup in backups][0].endswith("_new")
+        assert len(backups) == 1
+        assert manager.store.usage()["objects"] == 2
+
+    async def test_backup_reports_progress_and_can_be_cancelled(self) -> None:
+        """Progress events arrive on the loop; a cancelled backup leaves nothing"""
+        manager = self._manager()
+        events: list[BackupProgress] = []
+
+        result = await manager.create_backup(progress=events.append)
+
+        assert result.success
+        assert events[0].files_total == 3 and not events[0].finished
+        assert events[-1].finished and events[-1].fraction == 1.0
+
+        cancel = threading.Event()
+        cancel.set()
+        cancelled = await manager.create_backup("cancelled", cancel=cancel)
+
+        assert not cancelled.success
+        assert "cancelled" in (cancelled.error_message or "")
+        assert len(await manager.list_backups()) == 1
+
+    async def test_cancelling_the_task_stops_the_worker(self) -> None:
+        """Cancelling the awaiting task sets the cancel event and waits for it"""
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def work(progress=None, cancel=None) -> None:
+            started.set()
+            while not cancel.is_set():
+                time.sleep(0.001)
+            stopped.set()
+            raise BackupCancelledError("stopped")
+
+        task = asyncio.create_task(run_backup_task(work))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert stopped.is_set()
+
+    async def test_local_snapshot_round_trip(self) -> None:
+        """Local snapshots restore from the store and keep the snapshot data"""
+        from src.obsidian.local_data_manager import LocalDataManager
+
+        local = LocalDataManager(self.vault)
+        snapshot = await local.create_snapshot("before_edit")
+        assert snapshot is not None and snapshot.suffix == ".json"
+
+        (self.vault / "notes" / "c.md").write_text("edited", encoding="utf-8")
+        assert await local.restore_snapshot(snapshot)
+
+        assert (self.vault / "notes" / "c.md").read_text(encoding="utf-8") == "gamma"
+        assert snapshot.exists()
+        assert local.store.read_manifest("before_edit", "snapshots").files
+
+
+class TestLocalDeltaSync:
+    """Test manifest-based sync between the vault and a remote folder"""
+
+    def setup_method(self) -> None:
+        """Setup test fixtures"""
+        from src.obsidian.local_data_manager import LocalDataManager
+
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.vault = self.temp_dir / "vault"
+        self.remote = self.temp_dir / "remote"
+        (self.vault / "notes").mkdir(parents=True)
+        for name in ("a", "b", "c"):
+            (self.vault / "notes" / f"{name}.md").write_text(
+                f"---\ntags: [{name}]\n---\n# {name}\n{name} body",
+                encoding="utf-8",
+            )
+        self.local = LocalDataManager(self.vault)
+
+    async def test_only_changes_are_transferred(self) -> None:
+        """Edits, renames and deletes are applied without copying the rest"""
+        assert await self.local.sync_with_remote(self.remote, "upload")
+        first = self.local.last_sync_report
+        assert first is not None and first.files_uploaded == 3
+
+        notes = self.vault / "notes"
+        (notes / "a.md").write_text("# a\nedited", encoding="utf-8")
+        (notes / "b.md").rename(notes / "renamed.md")
+        (notes / "c.md").unlink()
+
+        assert await self.local.sync_with_remote(self.remote, "both")
+        report = self.local.last_sync_report
+        assert report is not None
+        assert report.files_transferred == 1
+        assert report.bytes_uploaded == len("# a\nedited")
+        assert report.renamed_remote == 1 and report.deleted_remote == 1
+        assert sorted(p.name for p in (self.remote / "notes").iterdir()) == [
+            "a.md",
+            "renamed.md",
+        ]
+
+        assert await self.local.sync_with_remote(self.remote, "both")
+        assert self.local.last_sync_report.files_transferred == 0
+
+    async def test_conflicts_are_reported_and_downloads_update_the_index(
+        self,
+    ) -> None:
+        """Files changed on both sides are left alone; remote edits are indexed"""
+        assert await self.local.sync_with_remote(self.remote, "both")
+        index = self.local.data_index
+        index.notes_index["untouched"] = {"title": "kept"}
+
+        (self.vault / "notes" / "a.md").write_text("local edit", encoding="utf-8")
+        (self.remote / "notes" / "a.md").write_text("remote edit", encoding="utf-8")
+        (self.remote / "notes" / "b.md").write_text(
+            "---\ntags: [remote]\n---\n# b\nnew words", encoding="utf-8"
+        )
+        feed = get_change_feed(self.vault)
+        feed.take()
+
+        assert await self.local.sync_with_remote(self.remote, "both")
+        # ダウンロードしたノートのみ Git 同期の対象（ manifest は対象外）
+        assert list(feed.take()) == ["notes/b.md"]
+        report = self.local.last_sync_report
+        assert report is not None
+        assert [c["path"] for c in report.conflicts] == ["notes/a.md"]
+        assert report.files_downloaded == 1
+        assert (self.vault / "notes" / "a.md").read_text() == "local edit"
+        assert (self.remote / "notes" / "a.md").read_text() == "remote edit"
+
+        assert "untouched" in index.notes_index
+        assert "notes/b.md" in index.tags_index["remote"]
+        assert "notes/b.md" not in index.tags_index.get("b", set())
+
+        # 競合は解消されるまで毎回報告される
+        assert await self.local.sync_with_remote(self.remote, "both")
+        assert len(self.local.last_sync_report.conflicts) == 1
+
 
 @pytest.mark.asyncio
 async def test_obsidian_integration_with_message_handler() -> None:
@@ -683,3 +1236,305 @@ class TestGitHubSyncCredentials:
         assert "$GITHUB_TOKEN" in helper_arg
         assert captured["env"]["GITHUB_TOKEN"] == "secret-token"
         assert result.returncode == 0
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+class TestGitHubSyncCloneStrategies:
+    """Tests for shallow / partial / sparse fetching against a local bare repository"""
+
+    BIG_ATTACHMENT = 512 * 1024
+
+    @pytest.fixture
+    def remote(self, tmp_path):
+        bare = tmp_path / "remote.git"
+        _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(bare))
+        _git(bare, "config", "uploadpack.allowFilter", "true")
+
+        work = tmp_path / "work"
+        _git(tmp_path, "clone", "-q", str(bare), str(work))
+        (work / "notes").mkdir()
+        (work / "attachments").mkdir()
+        (work / "notes" / "a.md").write_text("# A\n", encoding="utf-8")
+        for version in range(3):
+            (work / "attachments" / "scan.bin").write_bytes(
+                os.urandom(self.BIG_ATTACHMENT)
+            )
+            _git(work, "add", ".")
+            _git(work, "commit", "-q", "-m", f"attachment v{version}")
+        _git(work, "push", "-q", "origin", "HEAD:main")
+        return bare, work
+
+    def _make_sync(self, tmp_path, bare, **options) -> GitHubObsidianSync:
+        settings = DummyGitHubSettings(
+            tmp_path / "vault", "secret-token", f"file://{bare}"
+        )
+        for key, value in options.items():
+            setattr(settings, key, value)
+        with patch("src.obsidian.github_sync.get_settings", return_value=settings):
+            return GitHubObsidianSync()
+
+    @pytest.mark.asyncio
+    async def test_blobless_sparse_sync_skips_unused_content(self, tmp_path, remote):
+        bare, _work = remote
+        sync = self._make_sync(
+            tmp_path,
+            bare,
+            obsidian_clone_strategy="blobless",
+            obsidian_sparse_folders="notes",
+        )
+
+        assert await sync.setup_git_repository()
+        assert await sync.sync_from_github()
+
+        vault = tmp_path / "vault"
+        assert (vault / "notes" / "a.md").read_text(encoding="utf-8") == "# A\n"
+        assert not (vault / "attachments").exists()
+
+        status = await sync.get_sync_status()
+        assert status["clone_strategy"] == "blobless"
+        assert status["sparse_folders"] == ["notes"]
+        assert status["last_fetch"]["mode"] == "initial"
+        assert status["last_fetch"]["fast_forward"] is True
+        # 添付ファイルの 3 バージョンはどれも取得していない
+        assert status["last_fetch"]["bytes"] < self.BIG_ATTACHMENT
+
+    @pytest.mark.asyncio
+    async def test_shallow_sync_fetches_incrementally(self, tmp_path, remote):
+        bare, work = remote
+        sync = self._make_sync(
+            tmp_path, bare, obsidian_clone_strategy="shallow", obsidian_clone_depth=1
+        )
+
+        assert await sync.setup_git_repository()
+        assert await sync.sync_from_github()
+        vault = tmp_path / "vault"
+        assert _git(vault, "rev-list", "--count", "HEAD").strip() == "1"
+        # 最新の添付ファイルだけを取得している
+        assert sync.last_fetch is not None
+        assert sync.last_fetch["bytes"] < 2 * self.BIG_ATTACHMENT
+
+        (work / "notes" / "a.md").write_text("# A\n\nupdated\n", encoding="utf-8")
+        _git(work, "commit", "-q", "-am", "update note")
+        _git(work, "push", "-q", "origin", "HEAD:main")
+
+        assert await sync.sync_from_github()
+        assert "updated" in (vault / "notes" / "a.md").read_text(encoding="utf-8")
+
+        status = await sync.get_sync_status()
+        assert status["shallow"] is True
+        assert status["clone_depth"] == 1
+        assert status["last_commit_message"] == "update note"
+        assert status["last_fetch"]["mode"] == "incremental"
+        assert status["last_fetch"]["fast_forward"] is True
+        assert status["last_fetch"]["bytes"] < self.BIG_ATTACHMENT
+
+
+class TestGitSyncScheduler:
+    """Tests for the coalesced, change-feed driven git sync"""
+
+    @pytest.fixture
+    async def synced_vault(self, tmp_path):
+        bare = tmp_path / "remote.git"
+        _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(bare))
+        work = tmp_path / "work"
+        _git(tmp_path, "clone", "-q", str(bare), str(work))
+        (work / "README.md").write_text("vault\n", encoding="utf-8")
+        _git(work, "add", ".")
+        _git(work, "commit", "-q", "-m", "initial")
+        _git(work, "push", "-q", "origin", "HEAD:main")
+
+        settings = DummyGitHubSettings(
+            tmp_path / "vault", "secret-token", f"file://{bare}"
+        )
+        settings.obsidian_clone_strategy = "full"
+        with patch("src.obsidian.github_sync.get_settings", return_value=settings):
+            sync = GitHubObsidianSync()
+        assert await sync.setup_git_repository()
+        assert await sync.sync_from_github()
+        feed = VaultChangeFeed(sync.vault_path)
+        return sync, feed, bare
+
+    @pytest.mark.asyncio
+    async def test_changes_in_window_become_one_commit(self, synced_vault):
+        sync, feed, bare = synced_vault
+        vault = sync.vault_path
+        scheduler = GitSyncScheduler(sync, feed, window_seconds=0.2)
+        # 停止中に書き込まれたファイルは起動後の全体ステージングで拾う
+        (vault / "offline.md").write_text("written while stopped\n", encoding="utf-8")
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if scheduler.commits:
+                    break
+                await asyncio.sleep(0.05)
+            assert scheduler.full_sweeps == 1
+
+            (vault / "notes").mkdir()
+            for index in range(5):
+                note = vault / "notes" / f"note_{index}.md"
+                note.write_text(f"# Note {index}\n", encoding="utf-8")
+                feed.record(note)
+            # Not reported by the change feed, so not committed
+            (vault / "scratch.md").write_text("draft\n", encoding="utf-8")
+
+            for _ in range(100):
+                if scheduler.commits == 2:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop(flush=False)
+
+        assert scheduler.commits == 2
+        assert scheduler.full_sweeps == 1
+        first = _git(bare, "log", "--format=%s", "--name-only", "-1", "main~1")
+        assert "offline.md" in first
+        log = _git(bare, "log", "--format=%s", "--name-only", "-1", "main")
+        assert log.count("notes/note_") == 5
+        assert "scratch.md" not in log
+        assert _git(bare, "rev-list", "--count", "main").strip() == "3"
+
+        stats = scheduler.get_stats()
+        assert stats["pending_paths"] == 0
+        assert stats["last_lag_seconds"] >= 0.2
+        assert stats["git_subprocesses"]["last_hour"] > 0
+
+    @pytest.mark.asyncio
+    async def test_idle_scheduler_sweeps_the_vault_periodically(self, synced_vault):
+        sync, feed, bare = synced_vault
+        vault = sync.vault_path
+        scheduler = GitSyncScheduler(sync, feed, window_seconds=0.1, full_sweep_every=3)
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if scheduler.full_sweeps:
+                    break
+                await asyncio.sleep(0.05)
+            # 変更フィードに記録されない書き込み（変更がなくても定期的に拾う）
+            (vault / "unrecorded.md").write_text("x\n", encoding="utf-8")
+            for _ in range(100):
+                if scheduler.full_sweeps == 2:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop(flush=False)
+
+        assert scheduler.full_sweeps == 2
+        tree = _git(bare, "ls-tree", "-r", "--name-only", "main")
+        assert "unrecorded.md" in tree
+
+    @pytest.mark.asyncio
+    async def test_store_saves_and_bulk_retags_are_committed(
+        self, synced_vault, monkeypatch
+    ):
+        from src.obsidian.bulk_metadata import BulkMetadataEngine
+        from src.tasks import task_manager as task_manager_module
+        from src.tasks.task_manager import TaskManager
+
+        sync, _feed, bare = synced_vault
+        vault = sync.vault_path
+        (vault / "notes").mkdir()
+        (vault / "notes" / "draft.md").write_text(
+            "---\ntitle: Draft\ntags: [inbox]\n---\n\n# Draft\n",
+            encoding="utf-8",
+        )
+        _git(vault, "add", ".")
+        _git(vault, "commit", "-q", "-m", "add draft")
+
+        monkeypatch.setattr(
+            task_manager_module,
+            "settings",
+            task_manager_module.settings.model_copy(
+                update={"obsidian_vault_path": vault}
+            ),
+        )
+        file_manager = ObsidianFileManager(vault, enable_local_data=False)
+        scheduler = GitSyncScheduler(sync, get_change_feed(vault), window_seconds=0.2)
+        scheduler.start()
+        try:
+            # tasks.json はノートと違い feed.record を経由せずに保存される
+            await TaskManager(file_manager).create_task("Weekly review")
+            result = await BulkMetadataEngine(file_manager).update(
+                {"tags": ["inbox"]}, {"tags": ["reviewed"]}
+            )
+            assert result.updated == 1
+            await flush_all_writers()
+
+            for _ in range(100):
+                if scheduler.commits:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop(flush=False)
+
+        assert scheduler.commits == 1
+        changed = _git(bare, "show", "--format=", "--name-only", "main").split()
+        assert f"{VaultFolder.TASKS.value}/tasks.json" in changed
+        assert "notes/draft.md" in changed
+        # 導出キャッシュは .gitignore の対象で、コミットされない
+        assert not any(path.startswith(".mindbridge/") for path in changed)
+
+    @pytest.mark.asyncio
+    async def test_derived_caches_are_untracked_and_ignored(self, synced_vault):
+        sync, feed, bare = synced_vault
+        vault = sync.vault_path
+        # 以前のデプロイで .gitignore と導出キャッシュがコミットされている
+        (vault / ".gitignore").write_text("*.tmp\n", encoding="utf-8")
+        (vault / ".mindbridge").mkdir()
+        (vault / ".mindbridge" / "keyword_index.json").write_text("{}", "utf-8")
+        _git(vault, "add", ".")
+        _git(vault, "commit", "-q", "-m", "old caches")
+
+        await sync._setup_gitignore()
+        await sync._setup_gitignore()
+
+        assert (vault / ".gitignore").read_text(encoding="utf-8") == (
+            "*.tmp\n\n# Caches derived from notes (rebuilt locally)\n.mindbridge/\n"
+        )
+        (vault / "a.md").write_text("a\n", encoding="utf-8")
+        feed.record("a.md")
+        assert await GitSyncScheduler(sync, feed).flush() is True
+
+        tree = _git(bare, "ls-tree", "-r", "--name-only", "main")
+        assert ".gitignore" in tree
+        assert "a.md" in tree
+        assert ".mindbridge" not in tree
+        assert (vault / ".mindbridge" / "keyword_index.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_push_backs_off_and_retries(self, synced_vault):
+        sync, feed, bare = synced_vault
+        vault = sync.vault_path
+        scheduler = GitSyncScheduler(
+            sync, feed, window_seconds=10, max_backoff_seconds=25
+        )
+
+        (vault / "a.md").write_text("a\n", encoding="utf-8")
+        feed.record("a.md")
+        _git(vault, "remote", "set-url", "origin", f"file://{bare}.missing")
+
+        assert await scheduler.flush() is False
+        assert scheduler.consecutive_failures == 1
+        assert scheduler.next_delay_seconds == 20
+        assert feed.pending_count == 1
+        assert await scheduler.flush() is False
+        assert scheduler.next_delay_seconds == 25
+
+        # The commit already exists locally; the retry only has to push it
+        _git(vault, "remote", "set-url", "origin", f"file://{bare}")
+        (vault / "README.md").unlink()
+        feed.record(vault / "README.md")
+        assert await scheduler.flush() is True
+        assert scheduler.consecutive_failures == 0
+        assert not sync.has_unpushed_commits
+        assert _git(bare, "rev-list", "--count", "main").strip() == "3"
+        assert "README.md" not in _git(bare, "ls-tree", "--name-only", "main")
@@ -2,6 +2,10 @@
 
 import json
 import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -11,6 +15,11 @@ from pydantic import SecretStr
 from src.config.secure_settings import SecureSettingsManager
 from src.monitoring.health_server import OAuthCodeVault
 from src.security.access_logger import AccessLogger, SecurityEvent, SecurityEventType
+from src.security.window_counters import (
+    HourlyRollup,
+    SlidingWindowCounter,
+    UserWindowCounters,
+)
 
 
 class DummySecureSettingsManager:
@@ -87,16 +96,16 @@ class TestOAuthCodeVault:
 class TestAccessLogger:
     """Test AccessLogger functionality"""
 
-    def test_init(self):
+    def test_init(self, tmp_path):
         """Test initialization"""
-        logger = AccessLogger()
+        logger = AccessLogger(log_file=tmp_path / "security_access.jsonl")
         assert logger.logger is not None
-        assert isinstance(logger.recent_events, list)
+        assert isinstance(logger.recent_events, deque)
 
     @pytest.mark.asyncio
-    async def test_log_event_success(self):
+    async def test_log_event_success(self, tmp_path):
         """Test logging successful event"""
-        logger = AccessLogger()
+        logger = AccessLogger(log_file=tmp_path / "security_access.jsonl")
 
         event = SecurityEvent(
             event_type=SecurityEventType.LOGIN_ATTEMPT,
@@ -114,9 +123,9 @@ class TestAccessLogger:
         assert logger.recent_events[0].action == "test_login"
 
     @pytest.mark.asyncio
-    async def test_log_event_failure(self):
+    async def test_log_event_failure(self, tmp_path):
         """Test logging failed event"""
-        logger = AccessLogger()
+        logger = AccessLogger(log_file=tmp_path / "security_access.jsonl")
 
         event = SecurityEvent(
             event_type=SecurityEventType.LOGIN_ATTEMPT,
@@ -129,7 +138,7 @@ class TestAccessLogger:
         await logger.log_event(event)
 
         # Failed attempts should be tracked
-        assert len(logger.failed_attempts["test_user"]) == 1
+        assert logger.failed_attempts.count("test_user") == 1
         # Event should be added to recent events
         assert len(logger.recent_events) == 1
 
@@ -150,6 +159,7 @@ class TestAccessLogger:
                     details={"payload": "x" * 64},
                 )
             )
+        await logger.flush()
 
         first_backup = tmp_path / "security_access.jsonl.1"
         second_backup = tmp_path / "security_access.jsonl.2"
@@ -162,6 +172,77 @@ class TestAccessLogger:
         assert not third_backup.exists()
         assert first_backup.stat().st_size > 0
 
+    @pytest.mark.asyncio
+    async def test_access_logger_writes_in_batches(self, tmp_path):
+        """Events are appended by the background writer in batches."""
+        log_path = tmp_path / "security_access.jsonl"
+        logger = AccessLogger(log_file=log_path, flush_batch_size=50)
+
+        for index in range(500):
+            await logger.log_event(
+                SecurityEvent(
+                    event_type=SecurityEventType.COMMAND_EXECUTION,
+                    user_id=f"user-{index % 3}",
+                    action=f"command-{index}",
+                )
+            )
+        await logger.flush()
+
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["action"] for line in lines] == [
+            f"command-{index}" for index in range(500)
+        ]
+        assert logger._writer.batches_written <= 20
+        assert logger._bytes_written == log_path.stat().st_size
+        assert len(logger.recent_events) == logger.max_recent_events
+        assert logger.recent_events[-1].action == "command-499"
+
+        # Buffered events are written when the logger is closed
+        await logger.log_event(
+            SecurityEvent(event_type=SecurityEventType.API_CALL, action="last")
+        )
+        logger.close()
+        last = log_path.read_text(encoding="utf-8").splitlines()[-1]
+        assert json.loads(last)["action"] == "last"
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_events_logged_during_rewrite(
+        self, tmp_path, monkeypatch
+    ):
+        """A batch appended just before the rewritten log replaces it is kept."""
+        log_path = tmp_path / "security_access.jsonl"
+        old = (datetime.now() - timedelta(days=60)).isoformat()
+        log_path.write_text(
+            json.dumps({"timestamp": old, "action": "old"}) + "\n", encoding="utf-8"
+        )
+        logger = AccessLogger(log_file=log_path, flush_batch_size=1)
+        await logger.log_event(
+            SecurityEvent(event_type=SecurityEventType.API_CALL, action="before")
+        )
+
+        original_replace = Path.replace
+
+        def replace_after_event(self, target):
+            if Path(target) == log_path:
+                logger._write_to_file(
+                    SecurityEvent(
+                        event_type=SecurityEventType.API_CALL, action="during"
+                    )
+                )
+                # 書き込みスレッドが並行して動いていれば、この間に追記される
+                time.sleep(0.3)
+            return original_replace(self, target)
+
+        monkeypatch.setattr(Path, "replace", replace_after_event)
+        await logger.cleanup_old_logs(days=30)
+        monkeypatch.undo()
+        await logger.flush()
+
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["action"] for line in lines] == ["before", "during"]
+        assert logger._bytes_written == log_path.stat().st_size
+        logger.close()
+
     def test_get_access_logger_respects_settings(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -201,14 +282,94 @@ class TestAccessLogger:
         access_logger_module._access_logger = None
 
 
+class TestWindowCounters:
+    """Test sliding-window and hourly security counters"""
+
+    def test_sliding_window_expires_old_buckets(self):
+        counter = SlidingWindowCounter(window_seconds=60, buckets=6)
+        for second in range(0, 60, 5):
+            counter.add(1000 + second)
+
+        assert counter.count(1059) == 12
+        # Each 10 s bucket that leaves the window takes its events with it
+        assert counter.count(1070) == 8
+        assert counter.count(1105) == 2
+        assert counter.count(2000) == 0
+
+    def test_user_counters_evict_idle_users(self):
+        counters = UserWindowCounters(window_seconds=60, max_users=3)
+        counters.add("idle", 1000)
+        for user in ("a", "b"):
+            counters.add(user, 1050)
+
+        assert counters.add("a", 1070) == 2
+        assert "idle" not in counters
+        assert counters.count("idle", 1070) == 0
+
+        for user in ("c", "d"):
+            counters.add(user, 1071)
+        assert len(counters) == 3
+        assert "b" not in counters
+
+    def test_hourly_rollup_summarizes_whole_hours(self):
+        rollup = HourlyRollup(retention_hours=3)
+        hour = 3600 * 1000
+        rollup.record(hour + 10, "api_call", "a", True)
+        rollup.record(hour + 3600 + 10, "api_call", "b", False)
+        rollup.record(hour + 7200 + 10, "command_execution", "b", True)
+
+        summary = rollup.summarize(hour + 7200 + 20, hours=1)
+        assert summary.total == 2
+        assert summary.failed == 1
+        assert summary.users == {"b": 2}
+
+        # Hours older than the retention are dropped
+        rollup.record(hour + 4 * 3600, "api_call", "c", True)
+        assert rollup.summarize(hour + 4 * 3600, hours=24).total == 2
+
+    @pytest.mark.asyncio
+    async def test_report_and_flags_use_counters(self, tmp_path):
+        logger = AccessLogger(log_file=tmp_path / "security_access.jsonl")
+
+        for index in range(300):
+            await logger.log_event(
+                SecurityEvent(
+                    event_type=SecurityEventType.COMMAND_EXECUTION,
+                    user_id="busy" if index % 2 else f"user-{index}",
+                    action="/status",
+                    success=index % 3 != 0,
+                )
+            )
+        await logger.flush()
+
+        report = await logger.get_security_report(hours=1)
+        # Counts cover every event, not only the recent_events buffer
+        assert report["total_events"] == 300
+        assert report["failed_events"] == 100
+        assert report["event_types"] == {"command_execution": 300}
+        assert next(iter(report["most_active_users"])) == "busy"
+
+        # 150 commands in 5 minutes trips the command burst check
+        assert logger.command_counts.count("busy") == 150
+        assert report["suspicious_activities"] > 0
+        assert logger.is_user_suspicious("busy")
+        assert not logger.is_user_suspicious("user-2")
+
+
 class TestSecurityIntegration:
     """Integration tests for security components"""
 
     @pytest.mark.asyncio
-    async def test_access_logging_integration(self):
+    async def test_access_logging_integration(self, tmp_path, monkeypatch):
         """Test access logging integration"""
+        from src.security import access_logger as access_logger_module
         from src.security.access_logger import get_access_logger, log_security_event
 
+        monkeypatch.setattr(
+            access_logger_module,
+            "_access_logger",
+            AccessLogger(log_file=tmp_path / "security_access.jsonl"),
+        )
         logger = get_access_logger()
         assert logger is not None
 
@@ -218,9 +379,9 @@ class TestSecurityIntegration:
         )
 
     @pytest.mark.asyncio
-    async def test_security_report_generation(self):
+    async def test_security_report_generation(self, tmp_path):
         """Test security report generation"""
-        logger = AccessLogger()
+        logger = AccessLogger(log_file=tmp_path / "security_access.jsonl")
 
         # Create some test events
         event1 = SecurityEvent(
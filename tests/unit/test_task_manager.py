@@ -72,3 +72,75 @@ async def test_update_task_keeps_note_path_and_updates_content(
     tasks_file = tmp_path / VaultFolder.TASKS.value / "tasks.json"
     data = json.loads(tasks_file.read_text(encoding="utf-8"))
     assert data[task.id]["title"] == "Renamed Task"
+
+
+@pytest.mark.asyncio
+async def test_queries_use_cached_indexes(patched_task_manager: TaskManager) -> None:
+    from datetime import date, timedelta
+
+    from src.tasks.models import TaskPriority, TaskStatus
+
+    manager = patched_task_manager
+    today = date.today()
+
+    overdue = await manager.create_task(
+        "Overdue", priority=TaskPriority.HIGH, due_date=today - timedelta(days=2)
+    )
+    soon = await manager.create_task(
+        "Soon", project="alpha", due_date=today + timedelta(days=2)
+    )
+    later = await manager.create_task("Later", due_date=today + timedelta(days=30))
+    child = await manager.create_task("Child", parent_task_id=soon.id)
+
+    assert [t.id for t in await manager.get_overdue_tasks()] == [overdue.id]
+    assert [t.id for t in await manager.get_due_soon_tasks(3)] == [
+        overdue.id,
+        soon.id,
+    ]
+    assert [t.id for t in await manager.get_subtasks(soon.id)] == [child.id]
+    assert [t.id for t in await manager.list_tasks(project="alpha")] == [soon.id]
+    assert [t.id for t in await manager.list_tasks(priority=TaskPriority.HIGH)] == [
+        overdue.id
+    ]
+
+    await manager.complete_task(overdue.id)
+    assert await manager.get_overdue_tasks() == []
+    done = await manager.list_tasks(status=TaskStatus.DONE)
+    assert [t.id for t in done] == [overdue.id]
+    active_ids = {t.id for t in await manager.list_tasks(active_only=True)}
+    assert active_ids == {soon.id, later.id, child.id}
+
+    # Loaded once: further reads must not re-parse the JSON file
+    load_calls = 0
+    original_read = manager.repository._read_tasks
+
+    async def counting_read():
+        nonlocal load_calls
+        load_calls += 1
+        return await original_read()
+
+    manager.repository._read_tasks = counting_read  # type: ignore[method-assign]
+    await manager.list_tasks()
+    await manager.get_task(soon.id)
+    assert load_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_external_edit_invalidates_cache(
+    patched_task_manager: TaskManager, tmp_path
+) -> None:
+    import os
+
+    manager = patched_task_manager
+    task = await manager.create_task("Original")
+
+    tasks_file = tmp_path / VaultFolder.TASKS.value / "tasks.json"
+    data = json.loads(tasks_file.read_text(encoding="utf-8"))
+    data[task.id]["title"] = "Edited in Obsidian"
+    tasks_file.write_text(json.dumps(data), encoding="utf-8")
+    stat = tasks_file.stat()
+    os.utime(tasks_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = await manager.get_task(task.id)
+    assert reloaded is not None
+    assert reloaded.title == "Edited in Obsidian"
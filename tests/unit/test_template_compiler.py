@@ -0,0 +1,127 @@
+"""Tests for the compiled template renderer against the legacy pipeline"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.obsidian.template_system import TemplateEngine
+from src.obsidian.template_system.compiler import _FRONTMATTER
+
+INLINE_TEMPLATES = [
+    "{{#if a}}A {{ x }}{{#elif b}}B{{#else}}C{{/if}} tail {{ x }}",
+    "{{#if a}}{{#else}}C{{/if}}",
+    "{{#each items}}- {{ name }} ({{ @index }}) {{ title }}\n{{/each}}",
+    "{{#each nums}}* {{ @item }}{{/each}}\n\n\n\n{{ missing }}",
+    "{{ each t in tasks }}{{ if a }}[{{ t }}]{{ endif }}{{ endeach }}",
+    "{{ tag_list(tags) }} {{ length(tags) }} {{ unknown(x) }}",
+    "{{ include 'foo' }}\n{{ endif }}{{/each}} {{ else }} {{#else}}",
+    '{{ title | upper | truncate:"3" }} {{ tags | join:" / " }}',
+    "{{ if amount > 10 and a }}big{{ else }}small{{ endif }}\n\n\n\n   end  ",
+    '{{ x }}\n\n   \n\n\n{{ empty | default:"" }}\n\n\n\n{{ x }}',
+]
+
+CONTEXTS: list[dict[str, Any]] = [
+    {
+        "a": True,
+        "x": "X",
+        "title": "Hello",
+        "items": [{"name": "n1", "title": None}, {"name": 2}],
+        "nums": [1, [2], 3.5],
+        "tasks": ["t1", "t2"],
+        "tags": ["p", "q"],
+        "amount": 1234.5,
+        "empty": "",
+    },
+    {"a": False, "b": True, "x": 5, "title": "", "items": [], "tasks": []},
+    {},
+]
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> TemplateEngine:
+    engine = TemplateEngine(tmp_path)
+    await engine.create_default_templates()
+    return engine
+
+
+async def _default_segments(engine: TemplateEngine) -> list[str]:
+    segments = []
+    for name in await engine.list_available_templates():
+        match = _FRONTMATTER.match(await engine.load_template(name))
+        assert match is not None
+        segments += [match.group(1), match.group(2)]
+    return segments
+
+
+async def test_compiled_output_matches_legacy_pipeline(
+    engine: TemplateEngine,
+) -> None:
+    processor = engine.template_processor
+    base = await engine.create_template_context(
+        content="本文\n\n\n\nmore",
+        author="author",
+        timestamp=datetime(2024, 1, 2, 3, 4, 5),
+        tags=["x", "y"],
+        title="T",
+    )
+    contexts = [
+        base,
+        {**base, "tasks": ["a", "b"], "goals": ["g"], "attendees": ["p1", "p2"]},
+        {**base, "title": "", "tags": [], "content": ""},
+        *CONTEXTS,
+    ]
+
+    for source in await _default_segments(engine) + INLINE_TEMPLATES:
+        segment = processor.compiler.compile_segment(source)
+        assert segment.supported, source
+        for context in contexts:
+            expected = await processor._compile_template_legacy(source, context)
+            assert segment.render(context, processor) == expected, source
+
+
+async def test_unsupported_syntax_falls_back_to_legacy(
+    engine: TemplateEngine,
+) -> None:
+    processor = engine.template_processor
+    source = "{{ if a }}{{ if b }}x{{ endif }}{{ endif }}"
+
+    compiled = processor.compile(source)
+
+    assert not compiled.supported
+    rendered, _ = await processor.render_template(compiled, {"a": True, "b": True})
+    assert rendered == await processor._compile_template_legacy(
+        source, {"a": True, "b": True}
+    )
+
+
+async def test_marker_in_context_value_falls_back_to_legacy(
+    engine: TemplateEngine,
+) -> None:
+    processor = engine.template_processor
+    source = "{{ title | upper }} / {{ tag_list(tags) }}"
+    context = {"title": "a\x00b", "tags": ["p"]}
+
+    assert processor.compile(source).body.render(context, processor) is None
+    rendered, _ = await processor.render_template(source, context)
+    assert rendered == await processor._compile_template_legacy(source, context)
+
+
+async def test_loader_recompiles_only_when_template_changes(
+    engine: TemplateEngine,
+) -> None:
+    loader = engine.template_loader
+    first = await loader.load_compiled_template("base_note")
+    assert await loader.load_compiled_template("base_note") is first
+
+    template_file = loader.template_path / "base_note.md"
+    template_file.write_text("# {{ title }}\n", encoding="utf-8")
+    stat = template_file.stat()
+    os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    updated = await loader.load_compiled_template("base_note")
+    assert updated is not first
+    rendered, _ = await engine.render_template("base_note", {"title": "新"})
+    assert rendered == "# 新"
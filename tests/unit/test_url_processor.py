@@ -0,0 +1,118 @@
+"""Tests for cached URL content extraction"""
+
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.ai.url_cache import URLContentCache, normalize_url
+from src.ai.url_processor import URLContentExtractor
+
+PAGE = (
+    "<html><head><title>Cached Page</title>"
+    '<meta name="description" content="desc"></head>'
+    "<body><main><p>本文です</p>{filler}</main></body></html>"
+)
+
+served: list[web.Request] = []
+
+
+@pytest.fixture
+async def server() -> TestServer:
+    served.clear()
+
+    async def page(request: web.Request) -> web.Response:
+        served.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text=PAGE.format(filler="x" * int(request.query.get("filler", 0))),
+            content_type="text/html",
+            headers={"ETag": '"v1"'},
+        )
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    yield test_server
+    await test_server.close()
+
+
+def test_normalize_url_drops_tracking_and_fragment() -> None:
+    assert (
+        normalize_url("HTTPS://Example.com:443/a?b=2&utm_source=x&a=1#top")
+        == "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com") == "http://example.com/"
+
+
+async def test_fetch_uses_cache_and_revalidates(
+    server: TestServer, tmp_path: Path
+) -> None:
+    extractor = URLContentExtractor(cache_dir=tmp_path)
+    url = str(server.make_url("/page"))
+
+    try:
+        first = await extractor.fetch_url_content(url)
+        assert first is not None
+        assert first["title"] == "Cached Page"
+        assert first["from_cache"] is False
+
+        # 新しいキャッシュはリクエストなしで返す
+        cached = await extractor.fetch_url_content(url + "#section")
+        assert cached is not None and cached["from_cache"] is True
+        assert len(served) == 1
+
+        # 古いキャッシュは ETag で再検証し、 304 ならキャッシュを返す
+        extractor.cache_fresh_hours = 0
+        revalidated = await extractor.fetch_url_content(url)
+        assert revalidated is not None
+        assert revalidated["content"] == first["content"]
+        assert revalidated["from_cache"] is True
+        assert served[-1].headers["If-None-Match"] == '"v1"'
+    finally:
+        await extractor.close()
+
+
+async def test_summary_cache_and_streaming_limit(
+    server: TestServer, tmp_path: Path
+) -> None:
+    extractor = URLContentExtractor(cache_dir=tmp_path)
+    url = str(server.make_url("/page"))
+
+    try:
+        result = await extractor.fetch_url_content(url)
+        assert result is not None
+        assert extractor.get_cached_summary(url) is None
+        extractor.store_summary(url, "要約")
+        assert extractor.get_cached_summary(url) == "要約"
+
+        long_url = str(server.make_url("/page").with_query(filler=100_000))
+        truncated = await extractor.fetch_url_content(long_url, max_content_length=1000)
+        assert truncated is not None
+        assert truncated["content_length"] < 1000
+    finally:
+        await extractor.close()
+
+
+def test_cache_purges_expired_entries_on_open(tmp_path: Path) -> None:
+    cache = URLContentCache(tmp_path)
+    cache.store("https://example.com/old", {"content": "old"})
+    cache.store("https://example.com/new", {"content": "new"})
+    with cache._lock:
+        cache._conn.execute(
+            "UPDATE url_cache SET fetched_at = ? WHERE url = ?",
+            (time.time() - 48 * 3600, "https://example.com/old"),
+        )
+        cache._conn.commit()
+    cache.close()
+
+    reopened = URLContentCache(tmp_path, max_age_hours=24)
+    try:
+        assert reopened.get("https://example.com/old") is None
+        assert reopened.get("https://example.com/new") is not None
+    finally:
+        reopened.close()
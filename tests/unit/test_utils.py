@@ -35,8 +35,9 @@ def _reset_logging_state() -> Iterator[None]:
 class TestLogger:
     """Test logging functionality."""
 
-    def test_setup_logging(self):
+    def test_setup_logging(self, tmp_path, monkeypatch: pytest.MonkeyPatch):
         """Test logging setup doesn't raise errors."""
+        monkeypatch.chdir(tmp_path)
         setup_logging()
         assert True  # If no exception, test passes
 
@@ -139,6 +140,44 @@ class TestLazyComponentManager:
         assert comp1 == comp2 == test_component
         factory.assert_called_once()  # Factory should only be called once
 
+    def test_proxy_loads_component_on_first_use(self):
+        """Test proxies defer the factory until an attribute is used."""
+        manager = LazyComponentManager()
+        component = Mock(value=42)
+        factory = Mock(return_value=component, __name__="heavy_factory")
+        manager.register_component("heavy", factory)
+
+        proxy = manager.get_proxy("heavy")
+        factory.assert_not_called()
+        assert not manager.is_loaded("heavy")
+
+        assert proxy.value == 42
+        assert manager.is_loaded("heavy")
+        assert manager.get_all_stats()["heavy"]["load_duration_ms"] is not None
+        factory.assert_called_once()
+
+    async def test_warm_up_loads_components_off_the_event_loop(self):
+        """Test warm-up builds components on the manager's worker threads."""
+        import threading
+
+        manager = LazyComponentManager()
+        threads: list[str] = []
+
+        def factory():
+            threads.append(threading.current_thread().name)
+            return Mock()
+
+        def failing_factory():
+            raise RuntimeError("broken")
+
+        manager.register_component("warm", factory)
+        manager.register_component("broken", failing_factory)
+
+        results = await manager.warm_up(["warm", "broken"])
+
+        assert results == {"warm": True, "broken": False}
+        assert threads and threads[0].startswith("lazy-")
+
     def test_component_manager_unregistered_component(self):
         """Test getting unregistered component raises KeyError."""
         manager = LazyComponentManager()
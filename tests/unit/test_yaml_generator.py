@@ -10,6 +10,7 @@ Template System Tests - YAML Generator and Template Engine
 - Obsidian 特化機能
 """
 
+import asyncio
 import tempfile
 from datetime import date, datetime
 from pathlib import Path
@@ -17,8 +18,10 @@ from unittest.mock import Mock
 
 import pytest
 
+from src.obsidian.search.keyword_index import KeywordIndex
 from src.obsidian.template_system import TemplateEngine
 from src.obsidian.template_system.yaml_generator import YAMLFrontmatterGenerator
+from src.utils.json_store import flush_all_writers
 
 
 class TestEnhancedYAMLFrontmatterGenerator:
@@ -371,3 +374,120 @@ Content: {{content}}
         # Load template
         loaded_content = await self.template_engine.load_template("test_template")
         assert loaded_content == test_content
+
+
+class TestRelatedNoteIndex:
+    """キーワード転置インデックスによる関連ノート検索のテスト"""
+
+    def _write_vault(self, vault: Path) -> None:
+        notes = {
+            "python_async.md": "Python asyncio tutorial with event loop examples",
+            "python_typing.md": "Python typing tutorial and generics",
+            "cooking.md": "Curry recipe with rice",
+            ".trash/old.md": "Python asyncio tutorial",
+        }
+        for name, body in notes.items():
+            path = vault / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding="utf-8")
+
+    def test_related_notes_use_keyword_index(self, tmp_path: Path) -> None:
+        self._write_vault(tmp_path)
+        generator = YAMLFrontmatterGenerator()
+
+        related = generator._find_related_notes(
+            "A python asyncio tutorial", str(tmp_path)
+        )
+
+        assert related == ["python_async", "python_typing"]
+        # 永続化されたインデックスは別インスタンスから読み込める
+        reloaded = KeywordIndex(tmp_path.resolve())
+        assert reloaded.find_related(["python", "tutorial"]) == [
+            "python_async",
+            "python_typing",
+        ]
+
+    def test_japanese_keywords_match_as_substrings(self, tmp_path: Path) -> None:
+        (tmp_path / "meeting.md").write_text(
+            "来週のプロジェクト会議の資料を準備した。予算の見直しも必要。",
+            encoding="utf-8",
+        )
+        (tmp_path / "retro.md").write_text(
+            "プロジェクトの振り返りと会議の準備", encoding="utf-8"
+        )
+        generator = YAMLFrontmatterGenerator()
+
+        related = generator._find_related_notes(
+            "プロジェクト会議の資料を準備。予算の見直し", str(tmp_path)
+        )
+
+        # 語の区切りがないため、連続した文字列として含むノートだけが一致する
+        assert related == ["meeting"]
+
+    def test_index_picks_up_changes_made_outside_the_app(self, tmp_path: Path) -> None:
+        self._write_vault(tmp_path)
+        KeywordIndex(tmp_path).build()
+
+        (tmp_path / "cooking.md").write_text(
+            "Python tutorial for a curry recipe", encoding="utf-8"
+        )
+        (tmp_path / "python_typing.md").unlink()
+        (tmp_path / "pulled.md").write_text(
+            "Python asyncio tutorial from git pull", encoding="utf-8"
+        )
+
+        reloaded = KeywordIndex(tmp_path)
+        assert reloaded.find_related(["python", "tutorial"]) == [
+            "cooking",
+            "pulled",
+            "python_async",
+        ]
+        assert reloaded.note_count == 3
+
+    async def test_index_follows_note_saves(self, tmp_path: Path) -> None:
+        from src.obsidian.file_manager import ObsidianFileManager
+        from src.obsidian.models import NoteFrontmatter, ObsidianNote
+
+        self._write_vault(tmp_path)
+        manager = ObsidianFileManager(tmp_path, enable_local_data=False)
+        index = manager.keyword_index
+        # 起動時のウォームアップと同じくワーカースレッドで構築する
+        await asyncio.to_thread(index.ensure_ready)
+        assert index.find_related(["curry", "recipe"]) == ["cooking"]
+
+        note = ObsidianNote(
+            filename="curry_night.md",
+            file_path=tmp_path / "curry_night.md",
+            frontmatter=NoteFrontmatter(obsidian_folder="00_Inbox"),
+            content="Curry recipe for the weekend",
+        )
+        saved = await manager.save_note(note)
+        assert saved is not None
+        assert index.find_related(["curry", "recipe"]) == ["cooking", "curry_night"]
+
+        await manager.delete_note(saved, backup=False)
+        assert index.find_related(["curry", "recipe"]) == ["cooking"]
+
+        # 保存ごとではなく、まとめて 1 回だけ書き込む
+        await flush_all_writers()
+        assert index._writer.flushes == 1
+        reloaded = KeywordIndex(tmp_path.resolve())
+        assert reloaded.find_related(["curry", "recipe"]) == ["cooking"]
+
+    async def test_lookup_on_event_loop_builds_in_background(
+        self, tmp_path: Path
+    ) -> None:
+        self._write_vault(tmp_path)
+        index = KeywordIndex(tmp_path)
+
+        # インデックス未構築の間は検索をブロックせず空を返す
+        assert index.find_related(["python", "tutorial"]) == []
+        for _ in range(100):
+            if index.is_ready:
+                break
+            await asyncio.sleep(0.01)
+
+        assert index.find_related(["python", "tutorial"]) == [
+            "python_async",
+            "python_typing",
+        ]